@@ -0,0 +1,197 @@
+import hashlib
+import json
+import os
+
+from app.sources import open_statement_binary, stat_statement, statement_exists
+
+# Bump whenever the rendered QIF fragments change shape, so stale caches are rebuilt
+CACHE_VERSION = 3
+
+DEFAULT_CACHE_DIR = ".ws2qif-cache"
+
+MANIFEST_FILENAME = "manifest.json"
+FRAGMENTS_DIRNAME = "fragments"
+
+
+def hash_file(file_path, chunk_size=1024 * 1024):
+    """
+    Compute the SHA-256 digest of a statement's content.
+
+    Args:
+        file_path (str): Path to the statement to hash, see `app.sources.open_statement`.
+        chunk_size (int): Number of bytes read at a time.
+
+    Returns:
+        str: Hex encoded SHA-256 digest.
+    """
+    digest = hashlib.sha256()
+    with open_statement_binary(file_path) as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_json(path, data):
+    """Write JSON to a temp file next to `path` and move it into place."""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w") as file:
+        json.dump(data, file)
+    os.replace(temp_path, path)
+
+
+class ConversionCache:
+    """
+    Persistent per-file cache of converted statements.
+
+    The cache directory holds a manifest keyed by the absolute path of every converted
+    statement, recording its size, modification time and SHA-256 content hash, plus one
+    content-addressed fragment file per distinct statement holding its rendered QIF entries
+    grouped by currency.
+
+    A statement is a hit when its size and mtime match the manifest. When only the mtime
+    changed (e.g. the file was copied or touched), the content hash is recomputed and the
+    fragment is reused if the content is unchanged.
+
+    Layout:
+        .ws2qif-cache/
+        ├── manifest.json
+        └── fragments/
+            └── {sha256}.json
+
+    Args:
+        cache_dir (str): Directory holding the manifest and fragments.
+        rebuild (bool): Ignore any existing manifest and start from an empty cache.
+        settings: JSON-serializable description of the conversion settings. A cache written
+                  with different settings is discarded.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, rebuild=False, settings=None):
+        self.cache_dir = cache_dir
+        self.fragments_dir = os.path.join(cache_dir, FRAGMENTS_DIRNAME)
+        self.manifest_path = os.path.join(cache_dir, MANIFEST_FILENAME)
+        self.settings = settings
+        self.files = {}
+        self.hits = 0
+        self.misses = 0
+        # Fingerprints taken at lookup time for statements that still need converting
+        self._pending = {}
+
+        if not rebuild:
+            self._load_manifest()
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, "r") as file:
+                manifest = json.load(file)
+        except (OSError, ValueError):
+            return
+
+        if (
+            manifest.get("version") == CACHE_VERSION
+            and manifest.get("settings") == self.settings
+        ):
+            self.files = manifest.get("files", {})
+
+    def update_settings(self, settings):
+        """
+        Switch to new conversion settings, forgetting every statement converted with others.
+
+        Args:
+            settings: JSON-serializable description of the conversion settings.
+        """
+        if settings != self.settings:
+            self.settings = settings
+            self.files = {}
+
+    def _fragment_path(self, content_hash):
+        return os.path.join(self.fragments_dir, f"{content_hash}.json")
+
+    def lookup(self, file_path):
+        """
+        Return the cached entries of a statement, or None if it has to be converted.
+
+        Args:
+            file_path (str): Path to a WealthSimple CSV statement.
+
+        Returns:
+            dict: Currency code to list of QIF entries, or None on a cache miss.
+        """
+        key = os.path.abspath(file_path)
+        size, mtime_ns = stat_statement(file_path)
+        record = self.files.get(key)
+
+        content_hash = None
+        if record is not None and record["size"] == size:
+            if record["mtime_ns"] == mtime_ns:
+                content_hash = record["sha256"]
+            else:
+                content_hash = hash_file(file_path)
+                if content_hash == record["sha256"]:
+                    record["mtime_ns"] = mtime_ns
+                else:
+                    record = None
+        else:
+            record = None
+
+        if record is not None:
+            try:
+                with open(self._fragment_path(content_hash), "r") as file:
+                    entries_by_currency = json.load(file)
+            except (OSError, ValueError):
+                pass
+            else:
+                self.hits += 1
+                return entries_by_currency
+
+        if content_hash is None:
+            content_hash = hash_file(file_path)
+        self._pending[key] = {
+            "size": size,
+            "mtime_ns": mtime_ns,
+            "sha256": content_hash,
+        }
+        self.misses += 1
+        return None
+
+    def store(self, file_path, entries_by_currency):
+        """
+        Record the freshly converted entries of a statement previously missed by `lookup`.
+
+        Args:
+            file_path (str): Path to a WealthSimple CSV statement.
+            entries_by_currency (dict): Currency code to list of QIF entries.
+        """
+        key = os.path.abspath(file_path)
+        record = self._pending.pop(key, None)
+        if record is None:
+            return
+
+        os.makedirs(self.fragments_dir, exist_ok=True)
+        _write_json(self._fragment_path(record["sha256"]), entries_by_currency)
+        self.files[key] = record
+
+    def prune(self):
+        """
+        Evict entries whose source statement no longer exists, and unreferenced fragments.
+
+        Returns:
+            int: Number of evicted manifest entries.
+        """
+        missing = [key for key in self.files if not statement_exists(key)]
+        for key in missing:
+            del self.files[key]
+
+        if os.path.isdir(self.fragments_dir):
+            referenced = {f"{record['sha256']}.json" for record in self.files.values()}
+            for filename in os.listdir(self.fragments_dir):
+                if filename not in referenced:
+                    os.remove(os.path.join(self.fragments_dir, filename))
+        return len(missing)
+
+    def save(self):
+        """Persist the manifest."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        _write_json(
+            self.manifest_path,
+            {"version": CACHE_VERSION, "settings": self.settings, "files": self.files},
+        )
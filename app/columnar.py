@@ -0,0 +1,440 @@
+import itertools
+import operator
+from array import array
+
+import app.main
+from app.main import (
+    convert_csv_file,
+    extract_equity_info,
+    extract_option_trade,
+    iter_csv_records,
+    iter_file_transactions,
+    parse_transaction,
+    render_qif_entry,
+)
+from app.money import (
+    CENT_PRICE_SCALE,
+    cents_from_float,
+    parse_amount,
+    price_units,
+    quantity_ratio,
+)
+from app.quarantine import ROW_ERRORS
+from app.sources import open_statement
+from app.transactions import Transaction
+
+try:
+    import numpy as np
+    from numpy.lib.stride_tricks import sliding_window_view
+except ImportError:  # pragma: no cover - exercised when NumPy is not installed
+    np = None
+
+# Transaction types whose price math is computed column-wise
+TRADE_TYPES = ("BUY", "SELL", "BUYTOOPEN", "SELLTOCLOSE")
+
+# Rows transposed at once by `load_columns`
+LOAD_CHUNK_ROWS = 256
+
+# Widest amount parsed on the character matrix: 16 integer digits fit in int64 cents
+MAX_AMOUNT_WIDTH = 19
+
+
+def parse_totals(amounts):
+    """
+    Parse a column of amount strings into absolute integer cents.
+
+    With NumPy, amounts in the usual statement form ('-1500.00') are parsed without any
+    per-row Python code: the column is joined into a single ASCII buffer, sliced into a
+    character matrix right-aligned on the last character of every amount, and the digits
+    are validated and weighted on the whole matrix. Any other amount goes through
+    `app.money.parse_amount`, so the result and the errors raised are the same as the
+    scalar path.
+
+    Args:
+        amounts (list): Amount strings (can be negative).
+
+    Returns:
+        numpy.ndarray or array.array: Absolute amounts in cents as int64.
+
+    Raises:
+        ValueError: If an amount is not a number.
+    """
+    if np is None:
+        return array("q", map(parse_amount, amounts))
+
+    lengths = np.fromiter(map(len, amounts), dtype=np.int64, count=len(amounts))
+    width = min(int(lengths.max(initial=0)), MAX_AMOUNT_WIDTH)
+    try:
+        text = "".join(amounts).encode("ascii")
+    except UnicodeEncodeError:
+        width = 0
+    if width < 4:
+        return np.fromiter(
+            map(parse_amount, amounts), dtype=np.int64, count=len(amounts)
+        )
+    # Padded so that the window of `width` characters of every amount is in the buffer
+    padding = b"0" * MAX_AMOUNT_WIDTH
+    characters = np.frombuffer(padding + text + padding, dtype=np.uint8)
+
+    ends = np.cumsum(lengths) + MAX_AMOUNT_WIDTH
+    first = ends - lengths + (characters[ends - lengths] == ord("-"))
+    spans = ends - first
+    # Row i holds the last `width` characters up to the end of amount i; the characters
+    # before its digits (sign, previous amount) are masked out as zeros
+    window = sliding_window_view(characters, width)[ends - width]
+    point = window[:, -3] == ord(".")
+    # Characters below '0' wrap around to large values, so one bound checks every digit
+    digits = (window - np.uint8(ord("0"))) * (
+        np.arange(width) >= width - spans[:, None]
+    )
+    digits[:, -3] = 0
+    invalid = (digits > 9).view(np.uint8) @ np.ones(width, dtype=np.uint8)
+    valid = point & (spans >= 4) & (lengths <= width) & (invalid == 0)
+
+    # Cents, tens of cents, nothing for the decimal point, then powers of ten for dollars
+    weights = np.zeros(width, dtype=np.int64)
+    weights[:-3] = 10 ** np.arange(width - 2, 1, -1, dtype=np.int64)
+    weights[-2:] = (10, 1)
+    cents = digits @ weights
+    for index in np.flatnonzero(~valid).tolist():
+        cents[index] = parse_amount(amounts[index])
+    return cents
+
+
+def price_column(totals, units):
+    """
+    Compute the unit prices of a column of trades, see `app.money.price_units`.
+
+    With NumPy, each distinct quantity is turned once into an exact (numerator,
+    denominator) pair, and the prices are divided on int64 columns with the same half to
+    even rounding. Rows whose intermediate products could overflow int64 go through
+    `price_units`, so the prices are exactly those of the scalar path.
+
+    Args:
+        totals (numpy.ndarray or array.array): Trade totals in cents.
+        units (list): Number of shares or contracts of every trade.
+
+    Returns:
+        list: Prices in units of 10**-PRICE_DECIMALS.
+
+    Raises:
+        ZeroDivisionError: If a quantity is 0.
+        TypeError: If a quantity is not a number.
+    """
+    if np is None:
+        return list(map(price_units, totals, units))
+
+    quantities = np.asarray(units, dtype=np.float64)
+    distinct, inverse = np.unique(quantities, return_inverse=True)
+    ratios = [
+        (int(quantity), 1) if not quantity % 1 else quantity_ratio(quantity)
+        for quantity in distinct.tolist()
+    ]
+    numerators, denominators = zip(*ratios) if ratios else ((), ())
+    try:
+        numerators = np.array(numerators, dtype=np.int64)[inverse]
+        denominators = np.array(denominators, dtype=np.int64)[inverse]
+    except OverflowError:
+        return list(map(price_units, totals.tolist(), units))
+
+    totals = np.asarray(totals, dtype=np.int64)
+    scaled = totals * denominators * CENT_PRICE_SCALE
+    exact = (
+        (np.abs(quantities) < 2**53)
+        & (numerators != 0)
+        & (np.abs(numerators) < 2**62)
+        & (np.abs(totals) * denominators.astype(np.float64) * CENT_PRICE_SCALE < 2**62)
+    )
+    negative = numerators < 0
+    scaled = np.where(negative, -scaled, scaled)
+    numerators = np.abs(numerators)
+    quotients, remainders = np.divmod(scaled, np.where(exact, numerators, 1))
+    twice = 2 * remainders
+    quotients += (twice > numerators) | ((twice == numerators) & (quotients & 1 == 1))
+
+    prices = quotients.tolist()
+    for index in np.flatnonzero(~exact).tolist():
+        prices[index] = price_units(int(totals[index]), units[index])
+    return prices
+
+
+def _column(values):
+    if np is not None:
+        return np.asarray(values, dtype=np.int64)
+    return array("q", values)
+
+
+def _add(left, right):
+    if np is not None:
+        return left + right
+    return array("q", map(operator.add, left, right))
+
+
+def _subtract(left, right):
+    if np is not None:
+        return left - right
+    return array("q", map(operator.sub, left, right))
+
+
+def _to_ints(column):
+    return column.tolist()
+
+
+def load_columns(csv_file):
+    """
+    Load a whole statement into columns.
+
+    Rows are transposed a chunk at a time, so only `LOAD_CHUNK_ROWS` row tuples are alive
+    at once: holding every row until the end would make the garbage collector scan them
+    over and over while the columns are built.
+
+    Args:
+        csv_file (iterable): Open statement file (or any iterable of CSV lines).
+
+    Returns:
+        tuple: (dates, transactions, descriptions, amounts, currencies) lists of strings,
+               all of the same length.
+    """
+    columns = ([], [], [], [], [])
+    records = iter_csv_records(csv_file)
+    while True:
+        chunk = list(itertools.islice(records, LOAD_CHUNK_ROWS))
+        if not chunk:
+            return columns
+        for column, values in zip(columns, zip(*chunk)):
+            column.extend(values)
+
+
+def _parse_descriptions(parse, indices, descriptions, currencies):
+    # Trades repeat the same few descriptions: parse each distinct one once. The
+    # (description, currency) pairs are only held for the distinct descriptions, so the
+    # garbage collector does not see one tuple per row
+    def pairs():
+        return zip(
+            map(descriptions.__getitem__, indices), map(currencies.__getitem__, indices)
+        )
+
+    infos = {pair: parse(*pair) for pair in dict.fromkeys(pairs())}
+    return list(map(infos.__getitem__, pairs()))
+
+
+def _select(positions, *columns):
+    return [list(map(column.__getitem__, positions)) for column in columns]
+
+
+def _store_trades(sources, indices, columns, action, *fields):
+    """
+    Build the records of a group of trade rows from whole columns.
+
+    `fields` are the symbol, quantity, price, total and fee columns. Every row of the group
+    gets the same iterator in `sources`, which builds the `Transaction` records with
+    `tuple.__new__` over the zipped columns as they are consumed in row order.
+    """
+    dates, _, _, _, currencies = columns
+    fees = fields[4:] or (itertools.repeat(0),)
+    records = map(
+        tuple.__new__,
+        itertools.repeat(Transaction),
+        zip(
+            map(dates.__getitem__, indices),
+            itertools.repeat(action),
+            map(currencies.__getitem__, indices),
+            *fields[:4],
+            *fees,
+            itertools.repeat(None),
+            itertools.repeat(None),
+        ),
+    )
+    for index in indices:
+        sources[index] = records
+
+
+def _convert_equity_trades(transaction_type, indices, columns, sources):
+    _, _, descriptions, amounts, currencies = columns
+    action = "Buy" if transaction_type == "BUY" else "Sell"
+
+    infos = _parse_descriptions(extract_equity_info, indices, descriptions, currencies)
+    # Rows without a usable unit are left to the scalar path, which raises the same error
+    kept = [position for position, info in enumerate(infos) if info[1]]
+    if not kept:
+        return
+    if len(kept) < len(infos):
+        indices, infos = _select(kept, indices, infos)
+    symbols = list(map(operator.itemgetter(0), infos))
+    units = list(map(operator.itemgetter(1), infos))
+
+    try:
+        totals = parse_totals(list(map(amounts.__getitem__, indices)))
+    except ValueError:
+        return
+
+    _store_trades(
+        sources,
+        indices,
+        columns,
+        action,
+        symbols,
+        units,
+        price_column(totals, units),
+        _to_ints(totals),
+    )
+
+
+def _convert_option_trades(transaction_type, indices, columns, sources):
+    _, _, descriptions, amounts, currencies = columns
+    action = "Buy" if transaction_type == "BUYTOOPEN" else "Sell"
+
+    infos = _parse_descriptions(extract_option_trade, indices, descriptions, currencies)
+    # Rows without contracts or fee are left to the scalar path, which raises the same error
+    kept = [
+        position
+        for position, info in enumerate(infos)
+        if info[1] and info[2] is not None
+    ]
+    if not kept:
+        return
+    if len(kept) < len(infos):
+        indices, infos = _select(kept, indices, infos)
+    option_names = list(map(operator.itemgetter(0), infos))
+    units = list(map(operator.itemgetter(1), infos))
+    fee_cents = {fee: cents_from_float(fee) for fee in {info[2] for info in infos}}
+    fees = list(map(fee_cents.__getitem__, map(operator.itemgetter(2), infos)))
+
+    try:
+        totals = parse_totals(list(map(amounts.__getitem__, indices)))
+    except ValueError:
+        return
+    if transaction_type == "BUYTOOPEN":
+        option_totals = _subtract(totals, _column(fees))
+    else:
+        option_totals = _add(totals, _column(fees))
+
+    _store_trades(
+        sources,
+        indices,
+        columns,
+        action,
+        option_names,
+        units,
+        price_column(option_totals, units),
+        _to_ints(totals),
+        fees,
+    )
+
+
+def iter_column_transactions(columns):
+    """
+    Parse a columnar statement into `Transaction` records.
+
+    Trade rows (BUY, SELL, BUYTOOPEN, SELLTOCLOSE) are grouped by transaction type; their
+    amounts are parsed, adjusted by the fees and divided into prices on whole int64
+    columns (see `parse_totals` and `price_column`), and each distinct description is
+    parsed once. Every other row, and any trade row the columns could not handle, goes
+    through `parse_transaction`, so the records and the errors raised are identical to the
+    scalar path.
+
+    Args:
+        columns (tuple): Columns as returned by `load_columns`.
+
+    Yields:
+        Transaction: Every parsed row, in row order.
+    """
+    transaction_types = columns[1]
+    sources = [None] * len(transaction_types)
+
+    # Row indices of every trade type, collected in a single pass over the column
+    groups = {transaction_type: [] for transaction_type in TRADE_TYPES}
+    for index, transaction_type in enumerate(transaction_types):
+        group = groups.get(transaction_type)
+        if group is not None:
+            group.append(index)
+
+    for transaction_type, indices in groups.items():
+        if not indices:
+            continue
+        if transaction_type in ("BUY", "SELL"):
+            _convert_equity_trades(transaction_type, indices, columns, sources)
+        else:
+            _convert_option_trades(transaction_type, indices, columns, sources)
+
+    # Every other row gets its record from the scalar parser, in row order
+    other_indices = [index for index, source in enumerate(sources) if source is None]
+    other_rows = map(parse_transaction, *_select(other_indices, *columns))
+    for index in other_indices:
+        sources[index] = other_rows
+
+    # Ignored rows were parsed to None
+    yield from filter(None, map(next, sources))
+
+
+def convert_columns(columns):
+    """
+    Convert a columnar statement into QIF entries.
+
+    Args:
+        columns (tuple): Columns as returned by `load_columns`.
+
+    Yields:
+        tuple: (currency, qif_entry) for every converted row, in row order, see
+               `iter_column_transactions`.
+    """
+    for transaction in iter_column_transactions(columns):
+        yield transaction.currency, render_qif_entry(transaction)
+
+
+def convert_csv_file_columnar(file_path, rejects=None):
+    """
+    Columnar counterpart of `app.main.convert_csv_file`.
+
+    Uses NumPy when it is installed and the stdlib `array` module otherwise.
+
+    Args:
+        file_path (str): Path to a WealthSimple CSV statement.
+        rejects (list): If given, a statement with rows that cannot be converted is
+                        converted again row by row by `app.main.convert_csv_file`, which
+                        records the bad rows in it instead of raising.
+
+    Returns:
+        dict: Currency code (e.g., 'USD') to the list of QIF entries for that currency,
+              in file order.
+    """
+    entries_by_currency = {}
+    try:
+        for transaction in iter_file_transactions_columnar(file_path):
+            entries_by_currency.setdefault(transaction.currency, []).append(
+                render_qif_entry(transaction)
+            )
+    except ROW_ERRORS:
+        if rejects is None:
+            raise
+        return convert_csv_file(file_path, rejects)
+    return entries_by_currency
+
+
+def iter_file_transactions_columnar(file_path, rejects=None):
+    """
+    Columnar counterpart of `app.main.iter_file_transactions`.
+
+    Args:
+        file_path (str): Path to a WealthSimple CSV statement.
+        rejects (list): If given, a statement with rows that cannot be converted, dates
+                        included, is parsed again row by row by
+                        `app.main.iter_file_transactions`, which records the bad rows in it
+                        instead of raising.
+
+    Returns:
+        iterator: `Transaction` records of every converted row, in file order.
+    """
+    if rejects is not None:
+        try:
+            transactions = list(iter_file_transactions_columnar(file_path))
+            # Dates are only formatted when rendering: check them like the scalar path does
+            for transaction in transactions:
+                app.main.format_qif_date(transaction.date)
+        except ROW_ERRORS:
+            return iter_file_transactions(file_path, rejects)
+        return iter(transactions)
+
+    with open_statement(file_path) as csv_file:
+        columns = load_columns(csv_file)
+    return iter_column_transactions(columns)
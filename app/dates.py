@@ -0,0 +1,126 @@
+from datetime import date as calendar_date
+from datetime import datetime
+from functools import lru_cache
+
+from app.memo import DEFAULT_PARSE_CACHE_SIZE
+
+DEFAULT_DATE_STYLE = "us"
+
+
+def split_date(date):
+    """
+    Split a statement date into its year, month and day digits.
+
+    Statement dates are ISO dates ('YYYY-MM-DD'), which are sliced at fixed positions and
+    only checked against the calendar. Anything else (e.g. a date with a time) goes through
+    `datetime.fromisoformat`.
+
+    Args:
+        date (str): Date as written in the statement (e.g., "2025-07-15").
+
+    Returns:
+        tuple: (year, month, day) strings of 4, 2 and 2 digits.
+
+    Raises:
+        ValueError: If the date cannot be read.
+    """
+    if (
+        isinstance(date, str)
+        and len(date) == 10
+        and date[4] == "-"
+        and date[7] == "-"
+        and date[:4].isdigit()
+        and date[5:7].isdigit()
+        and date[8:].isdigit()
+    ):
+        year, month, day = date[:4], date[5:7], date[8:]
+        try:
+            calendar_date(int(year), int(month), int(day))
+        except ValueError:
+            raise ValueError(f"Invalid date: {date!r}") from None
+        return year, month, day
+    try:
+        parsed = datetime.fromisoformat(date.strip())
+    except (ValueError, TypeError, AttributeError):
+        raise ValueError(f"Invalid date: {date!r}") from None
+    return f"{parsed.year:04d}", f"{parsed.month:02d}", f"{parsed.day:02d}"
+
+
+def parse_qif_date(text):
+    """
+    Read back a date written in any of the `DATE_STYLES`.
+
+    Args:
+        text (str): QIF date (e.g., "07/15/2025", "07/15'25" or "2025-07-15").
+
+    Returns:
+        str: ISO date ('YYYY-MM-DD').
+
+    Raises:
+        ValueError: If the date is not in one of the styles.
+    """
+    if len(text) == 10 and text[4] == "-" and text[7] == "-":
+        return text
+    if len(text) == 10 and text[2] == "/" and text[5] == "/":
+        return f"{text[6:]}-{text[:2]}-{text[3:5]}"
+    if len(text) == 8 and text[2] == "/" and text[5] in "'/":
+        century = "20" if text[5] == "'" else "19"
+        return f"{century}{text[6:]}-{text[:2]}-{text[3:5]}"
+    raise ValueError(f"Invalid QIF date: {text!r}")
+
+
+def entry_date(entry):
+    """Return the ISO date of a QIF entry, read from its leading `D` line."""
+    return parse_qif_date(entry[1 : entry.index("\n")])
+
+
+def _format_iso(year, month, day):
+    return f"{year}-{month}-{day}"
+
+
+def _format_us(year, month, day):
+    return f"{month}/{day}/{year}"
+
+
+def _format_quicken(year, month, day):
+    # Quicken marks years from 2000 on with an apostrophe before the two-digit year
+    separator = "'" if year >= "2000" else "/"
+    return f"{month}/{day}{separator}{year[2:]}"
+
+
+# Date style name -> function formatting (year, month, day) digits
+DATE_STYLES = {
+    "us": _format_us,
+    "quicken": _format_quicken,
+    "iso": _format_iso,
+}
+
+
+def date_formatter(style=DEFAULT_DATE_STYLE, maxsize=DEFAULT_PARSE_CACHE_SIZE):
+    """
+    Return a function converting statement dates to a QIF date style.
+
+    A statement only has a few distinct dates, each repeated on many rows, so results are
+    memoized in a bounded LRU cache.
+
+    Args:
+        style (str): 'us' (07/15/2025), 'quicken' (07/15'25) or 'iso' (2025-07-15).
+        maxsize (int): Number of dates kept in the memo.
+
+    Returns:
+        callable: Function taking a statement date and returning the formatted date; it
+                  raises ValueError if the date cannot be read.
+
+    Raises:
+        ValueError: If the style is not recognized
+    """
+    try:
+        format_digits = DATE_STYLES[style]
+    except KeyError:
+        raise ValueError(f"Invalid date style: {style}") from None
+
+    @lru_cache(maxsize=maxsize)
+    def format_date(date):
+        return format_digits(*split_date(date))
+
+    return format_date
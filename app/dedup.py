@@ -0,0 +1,356 @@
+import hashlib
+import json
+import os
+import sys
+from array import array
+
+from app.dates import split_date
+from app.money import parse_cents
+
+DEDUP_MODES = ("drop", "report")
+
+INDEX_VERSION = 3
+
+# Grow the table once more than this fraction of its slots is used
+MAX_LOAD_FACTOR = 2 / 3
+
+# Digest value marking an empty slot; real digests equal to it are remapped
+EMPTY = 0
+
+
+def normalize_row(record):
+    """
+    Reduce a statement row to the fields that identify it.
+
+    The key is (date, transaction, description, amount, currency) as read from the
+    statement, with the date reduced to its ISO day, the other columns stripped and the
+    amount parsed to signed cents, so '100.00' and '100.0' produce the same key while a
+    reversal of the same amount does not. Nothing depends on how the row is rendered, so a
+    saved index keeps matching after the date style or the symbol map change.
+
+    Args:
+        record (tuple): (date, transaction, description, amount, currency) values of the row.
+
+    Returns:
+        tuple: Normalized (date, transaction, description, cents, currency) key.
+    """
+    date, transaction_type, description, amount, currency = record
+    return (
+        "-".join(split_date(date)),
+        transaction_type.strip(),
+        description.strip(),
+        parse_cents(amount),
+        currency.strip(),
+    )
+
+
+def row_digest(account_name, key, occurrence):
+    """
+    Compute the 64-bit digest of a statement row.
+
+    `occurrence` numbers identical rows within a single statement, so genuinely repeated
+    transactions in one file are kept while a second copy of the same file is detected.
+
+    Args:
+        account_name (str): Account name with currency suffix (e.g., 'AB1234567CAD-USD').
+        key (tuple): Fields identifying the row, e.g. the key returned by `normalize_row`.
+        occurrence (int): Number of identical rows already seen in the same statement.
+
+    Returns:
+        int: Non-zero 64-bit digest.
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update("\x1f".join(map(str, (account_name, *key, occurrence))).encode())
+    return int.from_bytes(digest.digest(), "little") or 1
+
+
+class DigestIndex:
+    """
+    Compact hash index from 64-bit row digests to the id of the statement that owns them.
+
+    Digests and owners are stored in two flat `array` buffers with open addressing and
+    linear probing, i.e. 12 bytes per slot instead of a Python object per row, so tens of
+    millions of rows fit in a few hundred megabytes. Lookups and inserts are O(1).
+
+    Args:
+        capacity (int): Initial number of slots, rounded up to a power of two.
+    """
+
+    def __init__(self, capacity=1024):
+        size = 1
+        while size < capacity:
+            size *= 2
+        self._keys = array("Q", bytes(8 * size))
+        self._owners = array("I", bytes(4 * size))
+        self._mask = size - 1
+        self._size = 0
+        self.sources = []
+        self._source_ids = {}
+
+    def __len__(self):
+        return self._size
+
+    def source_id(self, source):
+        """
+        Return the id of a statement, registering it on first use.
+
+        Args:
+            source (str): Statement path.
+
+        Returns:
+            int: Statement id.
+        """
+        source_id = self._source_ids.get(source)
+        if source_id is None:
+            source_id = self._source_ids[source] = len(self.sources)
+            self.sources.append(source)
+        return source_id
+
+    def add(self, digest, owner):
+        """
+        Insert a digest unless it is already present.
+
+        Args:
+            digest (int): Non-zero 64-bit digest.
+            owner (int): Id of the statement the row comes from.
+
+        Returns:
+            int: Id of the statement owning the digest; `owner` if it was just inserted.
+        """
+        keys = self._keys
+        mask = self._mask
+        slot = digest & mask
+        while True:
+            key = keys[slot]
+            if key == EMPTY:
+                keys[slot] = digest
+                self._owners[slot] = owner
+                self._size += 1
+                if self._size > len(keys) * MAX_LOAD_FACTOR:
+                    self._grow()
+                return owner
+            if key == digest:
+                return self._owners[slot]
+            slot = (slot + 1) & mask
+
+    def _grow(self):
+        old_keys = self._keys
+        old_owners = self._owners
+        size = len(old_keys) * 2
+        self._keys = keys = array("Q", bytes(8 * size))
+        self._owners = owners = array("I", bytes(4 * size))
+        self._mask = mask = size - 1
+        for key, owner in zip(old_keys, old_owners):
+            if key != EMPTY:
+                slot = key & mask
+                while keys[slot] != EMPTY:
+                    slot = (slot + 1) & mask
+                keys[slot] = key
+                owners[slot] = owner
+
+    def save(self, path):
+        """
+        Persist the index to a file.
+
+        Args:
+            path (str): Destination file, replaced atomically.
+        """
+        header = {
+            "version": INDEX_VERSION,
+            "byteorder": sys.byteorder,
+            "slots": len(self._keys),
+            "size": self._size,
+            "sources": self.sources,
+        }
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as file:
+            file.write(json.dumps(header).encode() + b"\n")
+            self._keys.tofile(file)
+            self._owners.tofile(file)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load an index saved with `save`, or return an empty one if the file does not exist.
+
+        Args:
+            path (str): Index file.
+
+        Returns:
+            DigestIndex
+
+        Raises:
+            ValueError: If the file is not a digest index of a supported version, or is
+                        corrupt (e.g. truncated).
+        """
+        index = cls()
+        if not os.path.exists(path):
+            return index
+
+        with open(path, "rb") as file:
+            try:
+                header = json.loads(file.readline())
+            except ValueError:
+                raise ValueError(f"Invalid duplicate index: {path}")
+            if not isinstance(header, dict) or header.get("version") != INDEX_VERSION:
+                raise ValueError(f"Invalid duplicate index: {path}")
+
+            try:
+                slots = header["slots"]
+                byteorder = header["byteorder"]
+                size = header["size"]
+                sources = list(header["sources"])
+                if slots < 1 or slots & (slots - 1) or not 0 <= size < slots:
+                    raise ValueError(f"Invalid number of slots: {slots}")
+                index._keys = array("Q")
+                index._keys.fromfile(file, slots)
+                index._owners = array("I")
+                index._owners.fromfile(file, slots)
+                if file.read(1):
+                    raise ValueError("Trailing data")
+            except (EOFError, KeyError, TypeError, ValueError):
+                raise ValueError(f"Corrupt duplicate index: {path}")
+
+        if byteorder != sys.byteorder:
+            index._keys.byteswap()
+            index._owners.byteswap()
+        index._mask = slots - 1
+        index._size = size
+        index.sources = sources
+        index._source_ids = {source: i for i, source in enumerate(index.sources)}
+        return index
+
+
+class Deduplicator:
+    """
+    Drop or report rows that were already seen in another statement.
+
+    Every converted row is hashed once into a `DigestIndex`; a row whose digest is owned by
+    a different statement (the same month downloaded twice, overlapping statements) is a
+    duplicate. Rows repeated within a single statement are not duplicates.
+
+    Args:
+        mode (str): 'drop' to remove duplicates from the output, 'report' to keep them and
+                    only count them.
+        index (DigestIndex): Index to use, e.g. one loaded from a previous run. Default to a
+                             new, empty index.
+    """
+
+    def __init__(self, mode="drop", index=None):
+        if mode not in DEDUP_MODES:
+            raise ValueError(f"Invalid dedup mode: {mode}")
+        self.mode = mode
+        self.index = index if index is not None else DigestIndex()
+        # (source, first_source) -> number of duplicate rows
+        self.duplicates = {}
+
+    def filter_file(self, source, account_name, entries, records):
+        """
+        Filter the converted rows of one statement.
+
+        Rows are keyed by their statement `records` rather than by the entries themselves,
+        see `normalize_row`. Converters keep the file order of the rows within a currency, so
+        the entries of each currency line up with the records of that currency.
+
+        Args:
+            source (str): Statement path.
+            account_name (str): Account name without currency suffix.
+            entries (iterable): (currency, entry) pairs, in file order within a currency.
+            records (iterable): (date, transaction, description, amount, currency) values of
+                                the rows that produced the entries, in file order, i.e.
+                                `app.main.iter_entry_records`.
+
+        Yields:
+            tuple: (currency, entry) for every row to keep.
+        """
+        keep = self._file_filter(source, account_name, records)
+        for currency, entry in entries:
+            if keep(currency):
+                yield currency, entry
+
+    def filter_transactions(self, source, account_name, transactions, records):
+        """
+        Record counterpart of `filter_file`.
+
+        Args:
+            source (str): Statement path.
+            account_name (str): Account name without currency suffix.
+            transactions (iterable): `Transaction` records in file order.
+            records (iterable): Statement rows of the transactions, see `filter_file`.
+
+        Yields:
+            Transaction: Every record to keep.
+        """
+        keep = self._file_filter(source, account_name, records)
+        for transaction in transactions:
+            if keep(transaction.currency):
+                yield transaction
+
+    def _file_filter(self, source, account_name, records):
+        """
+        Return the predicate telling whether the next row of a currency is kept.
+
+        The predicate records every row it is called with in the index, so it must be
+        called once per row, in file order within each currency.
+        """
+        source = os.path.abspath(source)
+        source_id = self.index.source_id(source)
+        records_by_currency = {}
+        for record in records:
+            records_by_currency.setdefault(record[4], []).append(record)
+        pending = {
+            currency: iter(rows) for currency, rows in records_by_currency.items()
+        }
+        occurrences = {}
+
+        def keep(currency):
+            record = next(pending.get(currency, iter(())), None)
+            if record is None:
+                raise ValueError(f"Statement rows do not match its entries: {source}")
+            key = normalize_row(record)
+            occurrence = occurrences.get(key, 0)
+            occurrences[key] = occurrence + 1
+
+            digest = row_digest(f"{account_name}-{currency}", key, occurrence)
+            owner = self.index.add(digest, source_id)
+            if owner != source_id:
+                pair = (source, self.index.sources[owner])
+                self.duplicates[pair] = self.duplicates.get(pair, 0) + 1
+                return self.mode != "drop"
+            return True
+
+        return keep
+
+    def filter_entries_by_currency(
+        self, source, account_name, entries_by_currency, records
+    ):
+        """
+        Dict-based counterpart of `filter_file`.
+
+        Args:
+            source (str): Statement path.
+            account_name (str): Account name without currency suffix.
+            entries_by_currency (dict): Currency code to list of QIF entries.
+            records (iterable): Statement rows of the entries, see `filter_file`.
+
+        Returns:
+            dict: Currency code to list of QIF entries to keep.
+        """
+        pairs = (
+            (currency, qif)
+            for currency, qifs in entries_by_currency.items()
+            for qif in qifs
+        )
+        kept = {currency: [] for currency in entries_by_currency}
+        for currency, qif in self.filter_file(source, account_name, pairs, records):
+            kept[currency].append(qif)
+        return kept
+
+    def report(self):
+        """Print a summary of the duplicates found."""
+        total = sum(self.duplicates.values())
+        action = "Dropped" if self.mode == "drop" else "Found"
+        print(f"{action} {total} duplicate row(s)")
+        for (source, first_source), count in self.duplicates.items():
+            print(f"  {count} row(s) in {source} already in {first_source}")
@@ -0,0 +1,75 @@
+import re
+
+# Share count in an equity description: '10.0 shares' or '10 shares'
+UNITS_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s+shares")
+
+# Contract count and fee in an option description
+CONTRACTS_PATTERN = re.compile(r"(\d+)\s+contract")
+FEE_PATTERN = re.compile(r"Fee:\s*\$([\d.]+)")
+
+# Fused grammars: every field of a description family in a single left-to-right match,
+# in the order WealthSimple writes them. Each gap is skipped with a negated character class
+# rather than a backtracking `.*?`; a description that does not fit (e.g. another number
+# before the share count) leaves the field unmatched and goes through the fallback path.
+EQUITY_GRAMMAR = re.compile(
+    r"(?P<symbol>[^-]*)-"
+    r"(?:\D*(?P<units>\d+(?:\.\d+)?)\s+shares)?"
+    r"(?:[^(]*\(executed at (?P<executed>\d{4}-\d{2}-\d{2})\))?"
+)
+OPTION_GRAMMAR = re.compile(
+    r"(?P<name>[^:]*):"
+    r"(?:\D*(?P<contracts>\d+)\s+contract)?"
+    r"(?:[^(]*\(executed at (?P<executed>\d{4}-\d{2}-\d{2})\))?"
+    r"(?:[^$]*?Fee:\s*\$(?P<fee>[\d.]+))?"
+)
+
+
+def parse_equity_description(description):
+    """
+    Parse an equity trade description with the fused equity grammar.
+
+    Args:
+        description (str): Description such as 'AAPL - 10.0 shares (executed at 2025-07-01)'.
+
+    Examples:
+        "AAPL - 10.0 shares" → ("AAPL", 10.0, None)
+        "aapl - 10 shares (executed at 2025-07-01)" → ("AAPL", 10.0, "2025-07-01")
+
+    Returns:
+        tuple: (symbol, units, executed) with the bare uppercase symbol, the share count as a
+               float and the execution date (or None), or None if the description does not
+               follow the grammar. Callers then fall back to `extract_symbol` and
+               `extract_unit`, which scan the whole description field by field.
+    """
+    match = EQUITY_GRAMMAR.match(description)
+    if match is None or match.group("units") is None:
+        return None
+    return (
+        match.group("symbol").strip().upper(),
+        float(match.group("units")),
+        match.group("executed"),
+    )
+
+
+def parse_option_description(description):
+    """
+    Parse an option trade description with the fused option grammar.
+
+    Args:
+        description (str): Description such as
+            'SPY 450.00 USD CALL 2025-07-25: Bought 2 contract (executed at 2025-07-23), Fee: $1.50'.
+
+    Returns:
+        tuple: (option_name, contracts, fee, executed) as (str, int, float, str or None), or
+               None if the contracts or the fee are not found in that order. Callers then fall
+               back to `extract_option_info`, which searches each field independently.
+    """
+    match = OPTION_GRAMMAR.match(description)
+    if match is None or match.group("contracts") is None or match.group("fee") is None:
+        return None
+    return (
+        match.group("name").strip(),
+        int(match.group("contracts")),
+        float(match.group("fee")),
+        match.group("executed"),
+    )
@@ -0,0 +1,155 @@
+import fnmatch
+import os
+import re
+from typing import NamedTuple
+
+from app.sources import (
+    ARCHIVE_SUFFIX,
+    ZIP_MEMBER_SEPARATOR,
+    is_statement_name,
+    iter_archive_members,
+    split_source,
+)
+
+# Statement file name, capturing the account ID and the statement date
+STATEMENT_NAME_PATTERN = re.compile(
+    r"monthly-statement-transactions-(\w+)-(\d{4}-\d{2}-\d{2})\.csv(?:\.(?:gz|bz2|xz))?"
+)
+
+
+def parse_statement_name(filename):
+    """
+    Extract the account name and statement date from a statement file name.
+
+    Args:
+        filename (str): Statement file name, e.g.
+                        'monthly-statement-transactions-AB1234567CAD-2025-07-01.csv'.
+
+    Returns:
+        tuple: (account_name, date) with the date as an ISO 'YYYY-MM-DD' string, or
+               (None, None) if the name does not follow the WealthSimple naming scheme.
+    """
+    match = STATEMENT_NAME_PATTERN.search(filename)
+    if match:
+        return match.group(1), match.group(2)
+    return None, None
+
+
+class StatementFile(NamedTuple):
+    """
+    A statement found in the input folder, indexed by its file name.
+
+    Fields are ordered so that sorting a list of statements is chronological.
+    """
+
+    date: str
+    account_name: str
+    source: str
+
+
+def _matches(relative_path, patterns):
+    basename = relative_path.rsplit("/", 1)[-1]
+    return any(
+        fnmatch.fnmatch(relative_path, pattern) or fnmatch.fnmatch(basename, pattern)
+        for pattern in patterns
+    )
+
+
+class StatementSelector:
+    """
+    Find the statements of an input folder tree and select some of them by name.
+
+    The folder is walked recursively with `os.scandir`, so a tree laid out by year and
+    account is discovered with one directory read per folder and no extra `stat` calls.
+    Account and date are parsed from every file name once; filtering and chronological
+    sorting then work on that index, before any statement is opened.
+
+    Glob patterns are matched against the path relative to the input folder (with '/'
+    separators, '{archive}::{member}' for zip members) and against the file name. Hidden
+    directories are skipped, and directories matching an exclude pattern are not entered.
+
+    Args:
+        include (iterable): Glob patterns; when given, only matching statements are kept.
+        exclude (iterable): Glob patterns of statements and directories to skip.
+        accounts (iterable): Account IDs to keep, default to every account.
+        since (str): Earliest statement date to keep, as 'YYYY-MM-DD'.
+        until (str): Latest statement date to keep, as 'YYYY-MM-DD'.
+    """
+
+    def __init__(self, include=(), exclude=(), accounts=(), since=None, until=None):
+        self.include = tuple(include or ())
+        self.exclude = tuple(exclude or ())
+        self.accounts = frozenset(accounts or ())
+        self.since = str(since) if since is not None else None
+        self.until = str(until) if until is not None else None
+
+    def _selected_path(self, relative_path):
+        if self.include and not _matches(relative_path, self.include):
+            return False
+        return not (self.exclude and _matches(relative_path, self.exclude))
+
+    def _selected_statement(self, account_name, date):
+        if account_name is None:
+            return False
+        if self.accounts and account_name not in self.accounts:
+            return False
+        if self.since is not None and date < self.since:
+            return False
+        return self.until is None or date <= self.until
+
+    def scan(self, input_folder):
+        """
+        Walk the input folder and index the selected statements, in discovery order.
+
+        Args:
+            input_folder (str): Path to folder containing WealthSimple statements.
+
+        Yields:
+            StatementFile: Every selected statement whose name follows the naming scheme.
+        """
+        pending = [(input_folder, "")]
+        while pending:
+            directory, prefix = pending.pop()
+            with os.scandir(directory) as entries:
+                entries = list(entries)
+            for entry in entries:
+                relative_path = f"{prefix}{entry.name}"
+                if entry.is_dir():
+                    if not entry.name.startswith(".") and not (
+                        self.exclude and _matches(relative_path, self.exclude)
+                    ):
+                        pending.append((entry.path, f"{relative_path}/"))
+                elif is_statement_name(entry.name):
+                    yield from self._index(entry.name, entry.path, relative_path)
+                elif entry.name.endswith(ARCHIVE_SUFFIX) and not (
+                    self.exclude and _matches(relative_path, self.exclude)
+                ):
+                    for member_name, source in iter_archive_members(entry.path):
+                        _, member = split_source(source)
+                        yield from self._index(
+                            member_name,
+                            source,
+                            f"{relative_path}{ZIP_MEMBER_SEPARATOR}{member}",
+                        )
+
+    def _index(self, filename, source, relative_path):
+        account_name, date = parse_statement_name(filename)
+        if self._selected_statement(account_name, date) and self._selected_path(
+            relative_path
+        ):
+            yield StatementFile(date, account_name, source)
+
+    def select(self, input_folder):
+        """
+        Return the selected statements of the input folder, sorted chronologically.
+
+        Statements are ordered by date, then account, then path, so entries are merged
+        oldest first whatever the folder layout.
+
+        Args:
+            input_folder (str): Path to folder containing WealthSimple statements.
+
+        Returns:
+            list: StatementFile tuples.
+        """
+        return sorted(self.scan(input_folder))
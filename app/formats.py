@@ -0,0 +1,486 @@
+import abc
+import csv
+import re
+import shutil
+import tempfile
+from xml.sax.saxutils import escape
+
+from app.dates import date_formatter
+from app.dedup import row_digest
+from app.main import get_qif_header, render_qif_entry
+from app.money import divide_half_even, format_cents, format_price_units
+
+# QIF action -> sign of the cash movement of its total
+CASH_SIGNS = {"Buy": -1, "Sell": 1, "Div": 1, "XIn": 1, "XOut": -1, None: 1}
+
+# Every format but QIF writes ISO dates, whatever the QIF date style
+format_iso_date = date_formatter("iso")
+
+# Columns of the CSV ledger
+LEDGER_COLUMNS = (
+    "date",
+    "action",
+    "symbol",
+    "quantity",
+    "price",
+    "amount",
+    "fee",
+    "currency",
+    "payee",
+    "memo",
+)
+
+# Date of the Beancount `open` directives, before any statement
+BEANCOUNT_OPEN_DATE = "1970-01-01"
+
+# Top-level component of the Beancount accounts
+BEANCOUNT_INSTITUTION = "Wealthsimple"
+
+# Option symbols as built by `app.main.extract_option_info`
+OPTION_SYMBOL_PATTERN = re.compile(
+    r"^(\S+) (\d+(?:\.\d+)?) \S+ (CALL|PUT) (\d{4})-(\d\d)-(\d\d)$"
+)
+
+# Characters not allowed in a Beancount commodity or account component
+COMMODITY_INVALID_PATTERN = re.compile(r"[^A-Z0-9'._-]+")
+ACCOUNT_INVALID_PATTERN = re.compile(r"[^A-Za-z0-9-]+")
+
+# Bank and broker ids of the OFX account aggregates
+OFX_BANK_ID = "WEALTHSIMPLE"
+OFX_BROKER_ID = "wealthsimple.com"
+
+# OFX limits the length of payee names and tickers
+OFX_NAME_LENGTH = 32
+
+# Shares of the underlying per option contract
+OFX_SHARES_PER_CONTRACT = 100
+
+# Bytes of OFX transactions held in memory before they are spilled to a temporary file
+OFX_SPOOL_SIZE = 1 << 24
+
+OFX_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="no"?>\n'
+    '<?OFX OFXHEADER="200" VERSION="220" SECURITY="NONE" OLDFILEUID="NONE" NEWFILEUID="NONE"?>\n'
+    "<OFX>\n"
+)
+OFX_STATUS = "<STATUS><CODE>0</CODE><SEVERITY>INFO</SEVERITY></STATUS>"
+
+
+def cash_flow(transaction):
+    """
+    Return the signed cash movement of a transaction in cents.
+
+    Args:
+        transaction (Transaction): Parsed statement row.
+
+    Returns:
+        int: Positive for money entering the account, negative for money leaving it.
+    """
+    return CASH_SIGNS[transaction.type] * transaction.total
+
+
+def beancount_commodity(symbol):
+    """
+    Turn a symbol into a valid Beancount commodity name.
+
+    Option symbols are written in the compact OCC style, other symbols are upper-cased and
+    stripped of the characters Beancount does not accept.
+
+    Args:
+        symbol (str): Symbol of a trade (e.g., "SHOP-CT", "SPY 450.00 USD CALL 2025-07-25").
+
+    Examples:
+        "SHOP-CT" → "SHOP-CT"
+        "SPY 450.00 USD CALL 2025-07-25" → "SPY250725C450.00"
+
+    Returns:
+        str: The commodity name.
+    """
+    match = OPTION_SYMBOL_PATTERN.match(symbol or "")
+    if match:
+        root, strike, right, year, month, day = match.groups()
+        symbol = f"{root}{year[2:]}{month}{day}{right[0]}{strike}"
+    commodity = COMMODITY_INVALID_PATTERN.sub("-", str(symbol).upper()).strip("'._-")
+    if not commodity[:1].isalpha():
+        commodity = "X" + commodity
+    return commodity
+
+
+def beancount_account_component(name):
+    """
+    Turn an account nickname into a valid Beancount account name component.
+
+    Args:
+        name (str): Account nickname (e.g., "My-Investment-USD").
+
+    Returns:
+        str: The component, starting with a capital letter or a digit.
+    """
+    component = ACCOUNT_INVALID_PATTERN.sub("-", name).strip("-") or "Account"
+    return component[:1].upper() + component[1:]
+
+
+def beancount_string(text):
+    """Quote a string for a Beancount directive."""
+    text = "" if text is None else str(text)
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+class FormatWriter(abc.ABC):
+    """
+    Output stream of one account in one output format.
+
+    Subclasses render `Transaction` records; the header is written when the stream is
+    opened and the footer when it is closed, so every record is written as soon as it is
+    received.
+
+    Args:
+        file: Text file open for writing.
+        account_name (str): Account name with currency suffix (e.g., 'AB1234567CAD-USD').
+        config (dict): Parsed accounts configuration, see `app.main.export_qif_files`.
+    """
+
+    # File name extension of the format
+    extension = None
+    # Text encoding of the file, None for the locale encoding
+    encoding = None
+
+    def __init__(self, file, account_name, config):
+        self.file = file
+        self.account_name = account_name
+        self.config = config
+        self.nickname = config[account_name]["nickname"]
+        self.account_type = config[account_name]["type"]
+        self.currency = account_name.rsplit("-", 1)[-1]
+
+    def write_header(self):
+        """Write what precedes the first record."""
+
+    @abc.abstractmethod
+    def write(self, transaction):
+        """Write a record."""
+
+    def write_footer(self):
+        """Write what follows the last record."""
+
+    def close(self):
+        """Write the footer and close the file."""
+        try:
+            self.write_footer()
+        finally:
+            self.file.close()
+
+
+class QifWriter(FormatWriter):
+    """QIF file, byte-identical to the ones written by `app.main.stream_qif_files`."""
+
+    extension = "qif"
+
+    def write_header(self):
+        self.file.write(get_qif_header(self.account_name, self.config) + "\n")
+
+    def write(self, transaction):
+        self.file.write(render_qif_entry(transaction) + "\n")
+
+
+class CsvLedgerWriter(FormatWriter):
+    """
+    Flat CSV ledger with one row per transaction and signed amounts.
+
+    `amount` is the cash movement of the row (negative for buys and withdrawals), `price`
+    the unit price of trades and `fee` the commission already included in `amount`.
+    """
+
+    extension = "csv"
+
+    def __init__(self, file, account_name, config):
+        super().__init__(file, account_name, config)
+        self.writer = csv.writer(file, lineterminator="\n")
+
+    def write_header(self):
+        self.writer.writerow(LEDGER_COLUMNS)
+
+    def write(self, transaction):
+        date, action, currency, symbol, quantity, price, _, fee, memo, payee = (
+            transaction
+        )
+        self.writer.writerow(
+            (
+                format_iso_date(date),
+                action or "",
+                symbol or "",
+                "" if quantity is None else quantity,
+                "" if price is None else format_price_units(price),
+                format_cents(cash_flow(transaction)),
+                format_cents(fee),
+                currency,
+                payee or "",
+                memo or "",
+            )
+        )
+
+
+class BeancountWriter(FormatWriter):
+    """
+    Beancount ledger of one account.
+
+    Cash and positions are held in a single `Assets` account booked FIFO. Dividends go to
+    an `Income` account, realized gains are left for Beancount to balance against a second
+    `Income` account, fees go to an `Expenses` account and every other cash movement is a
+    transfer against an `Equity` account, like the QIF `XIn`/`XOut` actions. All these
+    accounts are named after the account nickname, so the ledgers of several accounts can
+    be included in the same file.
+    """
+
+    extension = "beancount"
+
+    def __init__(self, file, account_name, config):
+        super().__init__(file, account_name, config)
+        component = beancount_account_component(self.nickname)
+        self.assets = f"Assets:{BEANCOUNT_INSTITUTION}:{component}"
+        self.dividends = f"Income:{BEANCOUNT_INSTITUTION}:{component}:Dividends"
+        self.gains = f"Income:{BEANCOUNT_INSTITUTION}:{component}:Gains"
+        self.fees = f"Expenses:{BEANCOUNT_INSTITUTION}:{component}:Fees"
+        self.transfers = f"Equity:{BEANCOUNT_INSTITUTION}:{component}:Transfers"
+
+    def write_header(self):
+        self.file.write(
+            f"; {self.account_name}\n"
+            f'{BEANCOUNT_OPEN_DATE} open {self.assets} "FIFO"\n'
+            f"{BEANCOUNT_OPEN_DATE} open {self.dividends}\n"
+            f"{BEANCOUNT_OPEN_DATE} open {self.gains}\n"
+            f"{BEANCOUNT_OPEN_DATE} open {self.fees}\n"
+            f"{BEANCOUNT_OPEN_DATE} open {self.transfers}\n"
+        )
+
+    def write(self, transaction):
+        date, action, currency, symbol, quantity, _, total, fee, memo, payee = (
+            transaction
+        )
+        date = format_iso_date(date)
+        if action == "Buy":
+            lines = [
+                f'{date} * {beancount_string(symbol)} "Buy"',
+                f"  {self.assets}  {quantity} {beancount_commodity(symbol)}"
+                f" {{{{{format_cents(total - fee)} {currency}}}}}",
+            ]
+        elif action == "Sell":
+            lines = [
+                f'{date} * {beancount_string(symbol)} "Sell"',
+                f"  {self.assets}  -{quantity} {beancount_commodity(symbol)}"
+                f" {{}} @@ {format_cents(total + fee)} {currency}",
+                f"  {self.gains}",
+            ]
+        elif action == "Div":
+            lines = [
+                f'{date} * {beancount_string(symbol)} "Dividend"',
+                f"  {self.dividends}",
+            ]
+        else:
+            lines = [
+                f"{date} * {beancount_string(payee)} {beancount_string(memo)}",
+                f"  {self.transfers}",
+            ]
+        if fee:
+            lines.append(f"  {self.fees}  {format_cents(fee)} {currency}")
+        lines.append(
+            f"  {self.assets}  {format_cents(cash_flow(transaction))} {currency}"
+        )
+        self.file.write("\n" + "\n".join(lines) + "\n")
+
+
+class OfxWriter(FormatWriter):
+    """
+    OFX 2 statement of one account, e.g. for GnuCash.
+
+    Checking accounts are written as bank statements with their ledger balance, other
+    accounts as investment statements followed by the list of their securities; option
+    trades are written as BUYOPT/SELLOPT of option securities. Transaction ids (FITID) are
+    derived from the parsed fields of each row, so re-importing a later export of the same
+    account does not duplicate the rows already imported.
+
+    The statement period (DTSTART, DTEND, DTASOF) precedes the transactions, so these are
+    held in a spooled temporary file and the statement is assembled by `write_footer`.
+    """
+
+    extension = "ofx"
+    encoding = "utf-8"
+
+    def __init__(self, file, account_name, config):
+        super().__init__(file, account_name, config)
+        self.bank = self.account_type == "Checking"
+        # Number of identical rows seen so far, by row digest
+        self.occurrences = {}
+        # Securities referenced by the statement, in order of appearance
+        self.securities = {}
+        # Rendered transactions, until the statement period is known
+        self.entries = tempfile.SpooledTemporaryFile(
+            max_size=OFX_SPOOL_SIZE, mode="w+", encoding=self.encoding
+        )
+        self.start_date = None
+        self.end_date = None
+        # Sum of the cash movements, in cents
+        self.balance = 0
+
+    def transaction_id(self, transaction):
+        """Return the FITID of a record: a digest of its fields and occurrence."""
+        occurrence = self.occurrences.get(transaction, 0)
+        self.occurrences[transaction] = occurrence + 1
+        return f"{row_digest(self.account_name, transaction, occurrence):016x}"
+
+    def bank_transaction(self, transaction, date, fitid):
+        amount = cash_flow(transaction)
+        name = transaction.payee or transaction.type or ""
+        memo = f"<MEMO>{escape(transaction.memo)}</MEMO>" if transaction.memo else ""
+        return (
+            f"<STMTTRN><TRNTYPE>{'CREDIT' if amount >= 0 else 'DEBIT'}</TRNTYPE>"
+            f"<DTPOSTED>{date}</DTPOSTED><TRNAMT>{format_cents(amount)}</TRNAMT>"
+            f"<FITID>{fitid}</FITID><NAME>{escape(name[:OFX_NAME_LENGTH])}</NAME>{memo}"
+            "</STMTTRN>"
+        )
+
+    def security(self, symbol):
+        symbol = symbol or ""
+        unique_id = escape(symbol)
+        self.securities.setdefault(symbol, unique_id)
+        return f"<SECID><UNIQUEID>{unique_id}</UNIQUEID><UNIQUEIDTYPE>TICKER</UNIQUEIDTYPE></SECID>"
+
+    def trade(self, transaction, header):
+        buy = transaction.type == "Buy"
+        units = transaction.quantity if buy else f"-{transaction.quantity}"
+        price = transaction.price
+        option = OPTION_SYMBOL_PATTERN.match(transaction.symbol or "")
+        if option:
+            # Option prices are per contract, OFX wants the premium per share
+            price = divide_half_even(price, OFX_SHARES_PER_CONTRACT)
+            aggregate = "BUYOPT" if buy else "SELLOPT"
+            trade_type = (
+                "<OPTBUYTYPE>BUYTOOPEN</OPTBUYTYPE>"
+                if buy
+                else "<OPTSELLTYPE>SELLTOCLOSE</OPTSELLTYPE>"
+            )
+            trade_type += f"<SHPERCTRCT>{OFX_SHARES_PER_CONTRACT}</SHPERCTRCT>"
+        else:
+            aggregate = "BUYSTOCK" if buy else "SELLSTOCK"
+            trade_type = (
+                "<BUYTYPE>BUY</BUYTYPE>" if buy else "<SELLTYPE>SELL</SELLTYPE>"
+            )
+        detail = "INVBUY" if buy else "INVSELL"
+        return (
+            f"<{aggregate}><{detail}>"
+            f"{header}{self.security(transaction.symbol)}<UNITS>{units}</UNITS>"
+            f"<UNITPRICE>{format_price_units(price)}</UNITPRICE>"
+            f"<FEES>{format_cents(transaction.fee)}</FEES>"
+            f"<TOTAL>{format_cents(cash_flow(transaction))}</TOTAL>"
+            "<SUBACCTSEC>CASH</SUBACCTSEC><SUBACCTFUND>CASH</SUBACCTFUND>"
+            f"</{detail}>{trade_type}</{aggregate}>"
+        )
+
+    def write(self, transaction):
+        date = format_iso_date(transaction.date).replace("-", "")
+        if self.start_date is None or date < self.start_date:
+            self.start_date = date
+        if self.end_date is None or date > self.end_date:
+            self.end_date = date
+        self.balance += cash_flow(transaction)
+
+        fitid = self.transaction_id(transaction)
+        if self.bank:
+            self.entries.write(self.bank_transaction(transaction, date, fitid) + "\n")
+            return
+
+        action = transaction.type
+        header = f"<INVTRAN><FITID>{fitid}</FITID><DTTRADE>{date}</DTTRADE></INVTRAN>"
+        if action in ("Buy", "Sell"):
+            entry = self.trade(transaction, header)
+        elif action == "Div":
+            entry = (
+                f"<INCOME>{header}{self.security(transaction.symbol)}<INCOMETYPE>DIV</INCOMETYPE>"
+                f"<TOTAL>{format_cents(transaction.total)}</TOTAL>"
+                "<SUBACCTSEC>CASH</SUBACCTSEC><SUBACCTFUND>CASH</SUBACCTFUND></INCOME>"
+            )
+        else:
+            entry = (
+                f"<INVBANKTRAN>{self.bank_transaction(transaction, date, fitid)}"
+                "<SUBACCTFUND>CASH</SUBACCTFUND></INVBANKTRAN>"
+            )
+        self.entries.write(entry + "\n")
+
+    def security_info(self, symbol, unique_id):
+        info = (
+            f"<SECINFO><SECID><UNIQUEID>{unique_id}</UNIQUEID>"
+            f"<UNIQUEIDTYPE>TICKER</UNIQUEIDTYPE></SECID><SECNAME>{unique_id}</SECNAME>"
+            f"<TICKER>{escape(symbol[:OFX_NAME_LENGTH])}</TICKER></SECINFO>"
+        )
+        option = OPTION_SYMBOL_PATTERN.match(symbol)
+        if not option:
+            return f"<STOCKINFO>{info}</STOCKINFO>"
+        _, strike, right, year, month, day = option.groups()
+        return (
+            f"<OPTINFO>{info}<OPTTYPE>{right}</OPTTYPE><STRIKEPRICE>{strike}</STRIKEPRICE>"
+            f"<DTEXPIRE>{year}{month}{day}</DTEXPIRE>"
+            f"<SHPERCTRCT>{OFX_SHARES_PER_CONTRACT}</SHPERCTRCT></OPTINFO>"
+        )
+
+    def write_footer(self):
+        # Writers are opened on the first record of an account, so the period is known
+        start, end = self.start_date, self.end_date
+        account = escape(self.account_name)
+        period = f"<DTSTART>{start}</DTSTART><DTEND>{end}</DTEND>\n"
+        self.file.write(
+            f"{OFX_HEADER}<SIGNONMSGSRSV1>\n<SONRS>{OFX_STATUS}"
+            f"<DTSERVER>{end}</DTSERVER><LANGUAGE>ENG</LANGUAGE></SONRS>\n</SIGNONMSGSRSV1>\n"
+        )
+        if self.bank:
+            self.file.write(
+                f"<BANKMSGSRSV1>\n<STMTTRNRS>\n<TRNUID>0</TRNUID>\n{OFX_STATUS}\n"
+                f"<STMTRS>\n<CURDEF>{self.currency}</CURDEF>\n"
+                f"<BANKACCTFROM><BANKID>{OFX_BANK_ID}</BANKID>"
+                f"<ACCTID>{account}</ACCTID><ACCTTYPE>CHECKING</ACCTTYPE></BANKACCTFROM>\n"
+                f"<BANKTRANLIST>\n{period}"
+            )
+        else:
+            self.file.write(
+                f"<INVSTMTMSGSRSV1>\n<INVSTMTTRNRS>\n<TRNUID>0</TRNUID>\n{OFX_STATUS}\n"
+                f"<INVSTMTRS>\n<DTASOF>{end}</DTASOF>\n<CURDEF>{self.currency}</CURDEF>\n"
+                f"<INVACCTFROM><BROKERID>{OFX_BROKER_ID}</BROKERID>"
+                f"<ACCTID>{account}</ACCTID></INVACCTFROM>\n"
+                f"<INVTRANLIST>\n{period}"
+            )
+        self.entries.seek(0)
+        shutil.copyfileobj(self.entries, self.file)
+
+        if self.bank:
+            # The sum of the exported rows: the balance when the statements go back to the
+            # opening of the account
+            self.file.write(
+                f"</BANKTRANLIST>\n<LEDGERBAL><BALAMT>{format_cents(self.balance)}</BALAMT>"
+                f"<DTASOF>{end}</DTASOF></LEDGERBAL>\n"
+                "</STMTRS>\n</STMTTRNRS>\n</BANKMSGSRSV1>\n</OFX>\n"
+            )
+            return
+
+        self.file.write(
+            "</INVTRANLIST>\n</INVSTMTRS>\n</INVSTMTTRNRS>\n</INVSTMTMSGSRSV1>\n"
+        )
+        if self.securities:
+            self.file.write("<SECLISTMSGSRSV1>\n<SECLIST>\n")
+            for symbol, unique_id in self.securities.items():
+                self.file.write(self.security_info(symbol, unique_id) + "\n")
+            self.file.write("</SECLIST>\n</SECLISTMSGSRSV1>\n")
+        self.file.write("</OFX>\n")
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            self.entries.close()
+
+
+# Output format name -> writer class
+FORMAT_WRITERS = {
+    "qif": QifWriter,
+    "ofx": OfxWriter,
+    "beancount": BeancountWriter,
+    "csv": CsvLedgerWriter,
+}
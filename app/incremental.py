@@ -0,0 +1,155 @@
+import hashlib
+import json
+import os
+from collections import Counter
+
+from app.dates import entry_date, parse_qif_date
+
+INCREMENTAL_MODES = ("append", "delta")
+
+DEFAULT_STATE_FILE = ".ws2qif-state.json"
+
+# Bump whenever the shape of the high-water marks changes, so older state files are ignored
+STATE_VERSION = 1
+
+
+def entry_digest(entry):
+    """
+    Return a short content hash of a QIF entry.
+
+    The date line is hashed in ISO form, so the digest does not depend on `--date-format`.
+
+    Returns:
+        str: Hex encoded 64-bit BLAKE2b digest.
+    """
+    first_line = entry.index("\n")
+    content = f"{parse_qif_date(entry[1:first_line])}{entry[first_line:]}"
+    return hashlib.blake2b(content.encode(), digest_size=8).hexdigest()
+
+
+class ExportState:
+    """
+    High-water marks of the QIF entries already exported, per account, kept in a JSON file.
+
+    The mark of an account is the date of the last exported entry and the digests of every
+    exported entry on that date (the boundary rows). On the next run, entries dated before
+    the mark and boundary rows already exported are skipped; everything else is new. Rows
+    that show up later with a date before the mark (e.g. a statement of an older month
+    downloaded late) are therefore not exported.
+
+    Marks also record the QIF file they were written to and its size after the export, so
+    an append can detect a file that was removed, replaced or left half-written.
+
+    Layout:
+        {"version": 1, "accounts": {"AB1234567CAD-USD": {"date": "2025-07-31",
+         "boundary": ["1f2e...", ...], "file": "output/My-USD.qif", "size": 48213}}}
+
+    Args:
+        path (str): Path of the state file; missing or outdated files start empty.
+    """
+
+    def __init__(self, path=DEFAULT_STATE_FILE):
+        self.path = path
+        self.marks = {}
+        try:
+            with open(path) as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return
+        if data.get("version") == STATE_VERSION:
+            self.marks = data.get("accounts", {})
+
+    def select(self, account_name, entries):
+        """
+        Pick the entries of an account that were not exported yet.
+
+        Args:
+            account_name (str): Account name with currency suffix (e.g., 'AB1234567CAD-USD').
+            entries (iterable): Every QIF entry of the account, oldest first.
+
+        Returns:
+            tuple: (new_entries, mark) where new_entries lists the entries to export, in
+                   order, and mark is the high-water mark once they are exported, to be
+                   passed to `record`.
+        """
+        mark = self.marks.get(account_name)
+        if mark is None:
+            since = None
+            boundary = Counter()
+        else:
+            since = mark["date"]
+            boundary = Counter(mark["boundary"])
+
+        new_entries = []
+        last_date = since
+        # Boundary rows of the new mark: digests already known plus entries still to hash
+        last_digests = list(mark["boundary"]) if mark is not None else []
+        last_entries = []
+        for entry in entries:
+            date = entry_date(entry)
+            if since is not None and date <= since:
+                if date < since:
+                    continue
+                digest = entry_digest(entry)
+                if boundary[digest]:
+                    boundary[digest] -= 1
+                    continue
+            new_entries.append(entry)
+            if last_date is None or date > last_date:
+                last_date = date
+                last_digests = []
+                last_entries = [entry]
+            elif date == last_date:
+                last_entries.append(entry)
+
+        last_digests.extend(map(entry_digest, last_entries))
+        return new_entries, {"date": last_date, "boundary": last_digests}
+
+    def appendable_size(self, account_name, path):
+        """
+        Return the size of an account's QIF file after its last export, if it can be appended to.
+
+        Args:
+            account_name (str): Account name with currency suffix.
+            path (str): Path of the account's QIF file.
+
+        Returns:
+            int: The recorded size, or None if the account was never exported to `path`, or
+                 the file is gone or shorter than recorded, in which case it must be
+                 written again in full.
+        """
+        mark = self.marks.get(account_name)
+        if mark is None or mark.get("file") != path or mark.get("size") is None:
+            return None
+        try:
+            size = os.path.getsize(path)
+        except FileNotFoundError:
+            return None
+        if size < mark["size"]:
+            return None
+        return mark["size"]
+
+    def record(self, account_name, mark, path, size=None):
+        """
+        Store the mark of an account once its entries are written.
+
+        Args:
+            account_name (str): Account name with currency suffix.
+            mark (dict): Mark returned by `select`.
+            path (str): Path of the account's QIF file.
+            size (int): Size of the QIF file after the export when entries can be appended
+                        to it, None otherwise.
+        """
+        if mark["date"] is None:
+            return
+        self.marks[account_name] = {**mark, "file": path, "size": size}
+
+    def save(self):
+        """Write the marks to the state file, through a temp file moved into place."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as file:
+            json.dump({"version": STATE_VERSION, "accounts": self.marks}, file)
+        os.replace(temp_path, self.path)
@@ -1,10 +1,90 @@
 import argparse
 import csv
+import itertools
+import operator
 import os
-import re
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
 
 import yaml
 
+from app.cache import DEFAULT_CACHE_DIR, ConversionCache
+from app.dates import DATE_STYLES, DEFAULT_DATE_STYLE, date_formatter, entry_date
+from app.dedup import DEDUP_MODES, Deduplicator, DigestIndex
+from app.descriptions import (
+    CONTRACTS_PATTERN,
+    FEE_PATTERN,
+    UNITS_PATTERN,
+    parse_equity_description,
+    parse_option_description,
+)
+from app.discovery import StatementSelector, parse_statement_name
+from app.incremental import DEFAULT_STATE_FILE, INCREMENTAL_MODES, ExportState
+from app.memo import DEFAULT_PARSE_CACHE_SIZE, LRUCache
+from app.merge import DEFAULT_SPILL_THRESHOLD, ChronologicalMerger, merge_runs
+from app.money import (
+    cents_from_float,
+    format_cents,
+    format_price_units,
+    parse_amount,
+    price_units,
+)
+from app.output import (
+    DEFAULT_BUFFER_SIZE,
+    DEFAULT_WRITE_THREADS,
+    AtomicFile,
+    append_qif_entries,
+    discard_all,
+    publish_all,
+    write_qif_outputs,
+)
+from app.quarantine import (
+    DEFAULT_QUARANTINE_FILE,
+    ON_ERROR_MODES,
+    ROW_ERRORS,
+    Quarantine,
+    describe_error,
+)
+from app.shards import SPLIT_PERIODS, qif_writer_factory, remove_stale_shards
+from app.sources import open_statement
+from app.symbols import SymbolMap, load_symbol_map
+from app.transactions import Transaction
+
+# Exchange suffixes applied to symbols, see `configure_symbol_map`
+SYMBOL_MAP = SymbolMap()
+
+# Style of the QIF dates and its memoized formatter, see `configure_date_style`
+DATE_STYLE = DEFAULT_DATE_STYLE
+format_qif_date = date_formatter(DATE_STYLE)
+
+# Bounded LRU caches in front of the description parsers, keyed by (description, currency)
+EQUITY_PARSE_CACHE = LRUCache(DEFAULT_PARSE_CACHE_SIZE)
+OPTION_PARSE_CACHE = LRUCache(DEFAULT_PARSE_CACHE_SIZE)
+SYMBOL_PARSE_CACHE = LRUCache(DEFAULT_PARSE_CACHE_SIZE)
+PARSE_CACHES = {
+    "equity": EQUITY_PARSE_CACHE,
+    "option": OPTION_PARSE_CACHE,
+    "symbol": SYMBOL_PARSE_CACHE,
+}
+
+# Currencies that get a bucket for every account even when a statement has no rows in them
+DEFAULT_CURRENCIES = ("USD", "CAD")
+
+# Columns of a WealthSimple statement used for conversion, in `iter_csv_records` order
+CSV_COLUMNS = ("date", "transaction", "description", "amount", "currency")
+
+# Output formats of `--format`, see `app.formats`
+OUTPUT_FORMATS = ("qif", "ofx", "beancount", "csv")
+
+# Payee of US non-resident tax withholding rows
+NON_RESIDENT_TAX_PAYEE = "US Non-Resident Tax Withholding"
+
+# Sort key of `Transaction` records: their ISO statement date
+TRANSACTION_DATE = operator.attrgetter("date")
+
+# Write buffer of each open output file
+STREAM_BUFFER_SIZE = DEFAULT_BUFFER_SIZE
+
 
 def read_config(config_file):
     """
@@ -27,6 +107,7 @@ def extract_account_name(filename):
 
     The expected filename format is:
     'monthly-statement-transactions-{ACCOUNT_NAME}-{DATE}.csv'
+    optionally compressed as '.csv.gz', '.csv.bz2' or '.csv.xz'.
 
     Args:
         filename (str): The CSV filename.
@@ -34,12 +115,8 @@ def extract_account_name(filename):
     Returns:
         str: The extracted account name.
     """
-    pattern = r"monthly-statement-transactions-(\w+)-\d{4}-\d{2}-\d{2}.csv"
-    match = re.search(pattern, filename)
-    if match:
-        return match.group(1)
-    else:
-        return None
+    account_name, _ = parse_statement_name(filename)
+    return account_name
 
 
 def extract_option_info(description):
@@ -74,10 +151,10 @@ def extract_option_info(description):
     option_name = description[:colon_index].strip()
     after_colon = description[colon_index + 1 :]
 
-    contracts_match = re.search(r"(\d+)\s+contract", after_colon)
+    contracts_match = CONTRACTS_PATTERN.search(after_colon)
     contracts = int(contracts_match.group(1)) if contracts_match else None
 
-    fee_match = re.search(r"Fee:\s*\$([\d.]+)", after_colon)
+    fee_match = FEE_PATTERN.search(after_colon)
     fee = float(fee_match.group(1)) if fee_match else None
 
     return option_name, contracts, fee
@@ -112,12 +189,22 @@ def extract_symbol(description, currency):
     if dash_index == -1:
         return None
     else:
-        symbol = description[:dash_index].strip().upper()
-        CDR_SYMBOLS = ["TSLA", "DIS", "NVDA", "AAPL"]
-        if symbol in CDR_SYMBOLS and currency == "CAD":
-            return f"{symbol}-QH"
-        else:
-            return f"{symbol}-CT"
+        return qualify_symbol(description[:dash_index].strip().upper(), currency)
+
+
+def qualify_symbol(symbol, currency):
+    """
+    Apply the exchange suffix to a bare uppercase symbol.
+
+    Args:
+        symbol (str): Uppercase symbol (e.g., "AAPL").
+        currency (str): The transaction currency ("USD" or "CAD").
+
+    Returns:
+        str: The symbol with the suffix of its (symbol, currency) rule in `SYMBOL_MAP`,
+             e.g. "{symbol}-QH" for CDR symbols traded in CAD, "{symbol}-CT" otherwise.
+    """
+    return SYMBOL_MAP.render(symbol, currency)
 
 
 def extract_unit(input_string):
@@ -135,6 +222,7 @@ def extract_unit(input_string):
         "TSLA - 5.0 shares" → Returns: 5.0
         "SHOP - 15.0 shares" → Returns: 15.0
         "NVDA - 2.5 shares" → Returns: 2.5
+        "AAPL - 10 shares" → Returns: 10.0
 
     Returns:
         float: The extracted number of shares, or None if parsing fails.
@@ -142,8 +230,7 @@ def extract_unit(input_string):
     Note:
         Expected format is '{SYMBOL} - {NUMBER} shares'
     """
-    pattern = r"(\d+\.\d+)\s+shares"
-    match = re.search(pattern, input_string)
+    match = UNITS_PATTERN.search(input_string)
     if match:
         return float(match.group(1))
     else:
@@ -171,7 +258,7 @@ def generate_qif_entry(row, target_currency):
         Stock Purchase:
         Input: {'date': '2025-07-15', 'transaction': 'BUY', 'description': 'AAPL - 10.0 shares',
                 'amount': '-1500.00', 'currency': 'USD'}
-        Output: 'D07/15/2025\nNBuy\nYAAPL-CT\nI150.00\nQ10\nT1500.00\nO0.00\nCc\n^'
+        Output: 'D07/15/2025\nNBuy\nYAAPL-CT\nI150.00\nQ10.0\nT1500.00\nO0.00\nCc\n^'
 
         Options Trading:
         Input: {'date': '2025-07-23', 'transaction': 'BUYTOOPEN',
@@ -182,7 +269,7 @@ def generate_qif_entry(row, target_currency):
         Contribution:
         Input: {'date': '2025-07-16', 'transaction': 'CONT',
                 'description': 'Contribution (executed at 2025-07-16)', 'amount': '1000.0', 'currency': 'CAD'}
-        Output: 'D07/16/2025\nNXIn\nT1000.0\nO0.00\nCc\nPContribution\nMContribution (executed at 2025-07-16)\n^'
+        Output: 'D07/16/2025\nNXIn\nT1000.00\nO0.00\nCc\nPContribution\nMContribution (executed at 2025-07-16)\n^'
 
     Returns:
         str: Formatted QIF entry string, or None if:
@@ -192,63 +279,814 @@ def generate_qif_entry(row, target_currency):
     Raises:
         ValueError: If transaction type is not recognized
     """
-    transaction_type = row["transaction"]
-    total = abs(float(row["amount"]))
     currency = row["currency"]
-
     if currency != target_currency:
         return None
 
-    if transaction_type == "BUY":
-        symbol = extract_symbol(row["description"], currency)
-        unit = extract_unit(row["description"])
-        price = total / unit
-        return f'D{row["date"]}\nNBuy\nY{symbol}\nI{price}\nQ{unit}\nT{total}\nO0.00\nCc\n^'
-    elif transaction_type == "SELL":
-        symbol = extract_symbol(row["description"], currency)
-        unit = extract_unit(row["description"])
-        price = total / unit
-        return f'D{row["date"]}\nNSell\nY{symbol}\nI{price}\nQ{unit}\nT{total}\nO0.00\nCc\n^'
-    elif transaction_type == "BUYTOOPEN":
-        option_name, unit, fee = extract_option_info(row["description"])
-        option_total = total - fee
-        price = option_total / unit
-        return f'D{row["date"]}\nNBuy\nY{option_name}\nI{price}\nQ{unit}\nT{total}\nO{fee}\nCc\n^'
-    elif transaction_type == "SELLTOCLOSE":
-        option_name, unit, fee = extract_option_info(row["description"])
-        option_total = total + fee
-        price = option_total / unit
-        return f'D{row["date"]}\nNSell\nY{option_name}\nI{price}\nQ{unit}\nT{total}\nO{fee}\nCc\n^'
-    elif transaction_type == "DIV":
-        symbol = extract_symbol(row["description"], currency)
-        return f'D{row["date"]}\nNDiv\nY{symbol}\nT{total}\nO0.00\nCc\n^'
-    elif transaction_type == "CONT":
-        return f'D{row["date"]}\nNXIn\nT{total}\nO0.00\nCc\nPContribution\nM{row["description"]}\n^'
-    elif transaction_type == "FPLINT":  # Stock lending monthly interest payment
-        return f'D{row["date"]}\nNXIn\nT{total}\nO0.00\nCc\nPInterest\nM{row["description"]}\n^'
-    elif transaction_type == "NRT":
-        return f'D{row["date"]}\nNXOut\nT{total}\nO0.00\nCc\nPUS Non-Resident Tax Withholding\nM{row["description"]}\n^'
-    elif transaction_type in ("TRFOUT", "SPEND", "E_TRFOUT", "EFTOUT", "AFT_OUT"):
-        return f'D{row["date"]}\nT-{total}\nO0.00\nCc\nP{row["description"]}\n^'
-    elif transaction_type in ("CASHBACK", "EFT", "INT", "TRFIN", "TRFINTF", "REFUND"):
-        return f'D{row["date"]}\nT{total}\nO0.00\nCc\nP{row["description"]}\n^'
-    elif transaction_type in ("RECALL", "LOAN", "STKDIS", "STKREORG"):
+    return format_qif_entry(
+        row["date"], row["transaction"], row["description"], row["amount"], currency
+    )
+
+
+def extract_equity_info(description, currency):
+    """
+    Extract the symbol and number of shares of an equity trade in a single scan.
+
+    Uses the fused equity grammar, and falls back to `extract_symbol` and `extract_unit`
+    for descriptions it does not recognize. Results are memoized in `EQUITY_PARSE_CACHE`.
+
+    Args:
+        description (str): The transaction description (e.g., "AAPL - 10.0 shares").
+        currency (str): The transaction currency ("USD" or "CAD").
+
+    Returns:
+        tuple: (symbol, unit) as returned by `extract_symbol` and `extract_unit`.
+    """
+    key = (description, currency)
+    info = EQUITY_PARSE_CACHE.get(key)
+    if info is None:
+        parsed = parse_equity_description(description)
+        if parsed is None:
+            info = extract_symbol(description, currency), extract_unit(description)
+        else:
+            symbol, unit, _ = parsed
+            info = qualify_symbol(symbol, currency), unit
+        EQUITY_PARSE_CACHE.put(key, info)
+    return info
+
+
+def extract_option_trade(description, currency=None):
+    """
+    Extract the option name, contracts and fee of an option trade in a single scan.
+
+    Uses the fused option grammar, and falls back to `extract_option_info` for descriptions
+    it does not recognize. Results are memoized in `OPTION_PARSE_CACHE`.
+
+    Args:
+        description (str): The option transaction description.
+        currency (str): The transaction currency, part of the cache key.
+
+    Returns:
+        tuple: (option_name, contracts, fee) as returned by `extract_option_info`.
+    """
+    key = (description, currency)
+    info = OPTION_PARSE_CACHE.get(key)
+    if info is None:
+        parsed = parse_option_description(description)
+        info = extract_option_info(description) if parsed is None else parsed[:3]
+        OPTION_PARSE_CACHE.put(key, info)
+    return info
+
+
+def configure_parse_caches(maxsize):
+    """
+    Resize every description parser cache.
+
+    Also used as the initializer of worker processes, so they use the same size.
+
+    Args:
+        maxsize (int): Maximum number of descriptions kept per parser; 0 disables caching.
+    """
+    for parse_cache in PARSE_CACHES.values():
+        parse_cache.resize(maxsize)
+
+
+def configure_symbol_map(symbol_map):
+    """
+    Use a symbol map for every following conversion.
+
+    Parsed descriptions hold rendered symbols, so the parser caches are cleared.
+
+    Args:
+        symbol_map (SymbolMap): Exchange suffix rules, see `app.symbols.load_symbol_map`.
+    """
+    global SYMBOL_MAP
+    SYMBOL_MAP = symbol_map
+    for parse_cache in PARSE_CACHES.values():
+        parse_cache.clear()
+
+
+def configure_date_style(style):
+    """
+    Write the dates of every following QIF entry in a date style.
+
+    Args:
+        style (str): 'us' (07/15/2025), 'quicken' (07/15'25) or 'iso' (2025-07-15), see
+                     `app.dates.DATE_STYLES`.
+
+    Raises:
+        ValueError: If the style is not recognized
+    """
+    global DATE_STYLE, format_qif_date
+    format_qif_date = date_formatter(style)
+    DATE_STYLE = style
+
+
+def conversion_settings():
+    """
+    Describe the settings that change the rendered entries, for `ConversionCache`.
+
+    Returns:
+        dict: JSON-serializable settings.
+    """
+    return {"symbols": SYMBOL_MAP.fingerprint(), "date_style": DATE_STYLE}
+
+
+def _initialize_worker(parse_cache_size, symbol_map, date_style):
+    """Apply the parent's parser cache size, symbol map and date style in a worker process."""
+    configure_parse_caches(parse_cache_size)
+    configure_symbol_map(symbol_map)
+    configure_date_style(date_style)
+
+
+def _parse_buy(date, description, amount, currency):
+    total = parse_amount(amount)
+    symbol, unit = extract_equity_info(description, currency)
+    price = price_units(total, unit)
+    return Transaction(date, "Buy", currency, symbol, unit, price, total)
+
+
+def _parse_sell(date, description, amount, currency):
+    total = parse_amount(amount)
+    symbol, unit = extract_equity_info(description, currency)
+    price = price_units(total, unit)
+    return Transaction(date, "Sell", currency, symbol, unit, price, total)
+
+
+def _parse_buy_to_open(date, description, amount, currency):
+    total = parse_amount(amount)
+    option_name, unit, fee = extract_option_trade(description, currency)
+    fee = cents_from_float(fee)
+    price = price_units(total - fee, unit)
+    return Transaction(date, "Buy", currency, option_name, unit, price, total, fee)
+
+
+def _parse_sell_to_close(date, description, amount, currency):
+    total = parse_amount(amount)
+    option_name, unit, fee = extract_option_trade(description, currency)
+    fee = cents_from_float(fee)
+    price = price_units(total + fee, unit)
+    return Transaction(date, "Sell", currency, option_name, unit, price, total, fee)
+
+
+def _parse_dividend(date, description, amount, currency):
+    key = (description, currency)
+    symbol = SYMBOL_PARSE_CACHE.get(key)
+    if symbol is None:
+        symbol = extract_symbol(description, currency)
+        if symbol is not None:
+            SYMBOL_PARSE_CACHE.put(key, symbol)
+    return Transaction(date, "Div", currency, symbol, None, None, parse_amount(amount))
+
+
+def _parse_contribution(date, description, amount, currency):
+    total = parse_amount(amount)
+    return Transaction(
+        date, "XIn", currency, None, None, None, total, 0, description, "Contribution"
+    )
+
+
+def _parse_lending_interest(date, description, amount, currency):
+    total = parse_amount(amount)
+    return Transaction(
+        date, "XIn", currency, None, None, None, total, 0, description, "Interest"
+    )
+
+
+def _parse_non_resident_tax(date, description, amount, currency):
+    total = parse_amount(amount)
+    return Transaction(
+        date,
+        "XOut",
+        currency,
+        None,
+        None,
+        None,
+        total,
+        0,
+        description,
+        NON_RESIDENT_TAX_PAYEE,
+    )
+
+
+def _parse_withdrawal(date, description, amount, currency):
+    total = -parse_amount(amount)
+    return Transaction(
+        date, None, currency, None, None, None, total, 0, None, description
+    )
+
+
+def _parse_deposit(date, description, amount, currency):
+    total = parse_amount(amount)
+    return Transaction(
+        date, None, currency, None, None, None, total, 0, None, description
+    )
+
+
+# Transaction code -> handler(date, description, amount, currency) returning the parsed
+# `Transaction`. Handlers parse the amount string themselves, see `app.money`.
+# Resolved with a single dict lookup per row, whatever the position of the code in the table.
+TRANSACTION_HANDLERS = {
+    "BUY": _parse_buy,
+    "SELL": _parse_sell,
+    "BUYTOOPEN": _parse_buy_to_open,
+    "SELLTOCLOSE": _parse_sell_to_close,
+    "DIV": _parse_dividend,
+    "CONT": _parse_contribution,
+    "FPLINT": _parse_lending_interest,  # Stock lending monthly interest payment
+    "NRT": _parse_non_resident_tax,
+    "TRFOUT": _parse_withdrawal,
+    "SPEND": _parse_withdrawal,
+    "E_TRFOUT": _parse_withdrawal,
+    "EFTOUT": _parse_withdrawal,
+    "AFT_OUT": _parse_withdrawal,
+    "CASHBACK": _parse_deposit,
+    "EFT": _parse_deposit,
+    "INT": _parse_deposit,
+    "TRFIN": _parse_deposit,
+    "TRFINTF": _parse_deposit,
+    "REFUND": _parse_deposit,
+}
+
+# Transaction codes that do not produce a QIF entry
+IGNORED_TRANSACTIONS = frozenset(("RECALL", "LOAN", "STKDIS", "STKREORG"))
+
+
+def parse_transaction(date, transaction_type, description, amount, currency):
+    """
+    Parse the individual fields of a CSV transaction row into a `Transaction`.
+
+    The handler is picked from `TRANSACTION_HANDLERS` with one lookup; ignored transaction
+    types never parse the amount. Amounts are handled as integer cents and prices are
+    computed exactly, see `app.money`.
+
+    Args:
+        date (str): Transaction date (YYYY-MM-DD format)
+        transaction_type (str): Transaction type (BUY, SELL, BUYTOOPEN, etc.)
+        description (str): Transaction description
+        amount (str): Transaction amount (can be negative)
+        currency (str): Transaction currency (USD or CAD)
+
+    Returns:
+        Transaction: The parsed row, or None if the transaction type is in the ignored
+                     list (RECALL, LOAN, STKDIS, STKREORG)
+
+    Raises:
+        ValueError: If transaction type is not recognized
+    """
+    handler = TRANSACTION_HANDLERS.get(transaction_type)
+    if handler is None:
+        if transaction_type in IGNORED_TRANSACTIONS:
+            return None
+        raise ValueError(f"Invalid transaction type: {transaction_type}")
+    return handler(date, description, amount, currency)
+
+
+def _render_trade(transaction):
+    date, action, _, symbol, quantity, price, total, fee, _, _ = transaction
+    return (
+        f"D{format_qif_date(date)}\nN{action}\nY{symbol}\nI{format_price_units(price)}"
+        f"\nQ{quantity}\nT{format_cents(total)}\nO{format_cents(fee)}\nCc\n^"
+    )
+
+
+def _render_dividend(transaction):
+    date, _, _, symbol, _, _, total, fee, _, _ = transaction
+    return (
+        f"D{format_qif_date(date)}\nNDiv\nY{symbol}\nT{format_cents(total)}"
+        f"\nO{format_cents(fee)}\nCc\n^"
+    )
+
+
+def _render_transfer(transaction):
+    date, action, _, _, _, _, total, fee, memo, payee = transaction
+    return (
+        f"D{format_qif_date(date)}\nN{action}\nT{format_cents(total)}\nO{format_cents(fee)}"
+        f"\nCc\nP{payee}\nM{memo}\n^"
+    )
+
+
+def _render_cash(transaction):
+    date, _, _, _, _, _, total, fee, _, payee = transaction
+    return (
+        f"D{format_qif_date(date)}\nT{format_cents(total)}\nO{format_cents(fee)}"
+        f"\nCc\nP{payee}\n^"
+    )
+
+
+# QIF action -> renderer(transaction) returning the QIF entry
+QIF_RENDERERS = {
+    "Buy": _render_trade,
+    "Sell": _render_trade,
+    "Div": _render_dividend,
+    "XIn": _render_transfer,
+    "XOut": _render_transfer,
+    None: _render_cash,
+}
+
+
+def render_qif_entry(transaction):
+    """
+    Render a parsed transaction as a QIF entry.
+
+    See `generate_qif_entry` for the output format.
+
+    Args:
+        transaction (Transaction): Row parsed by `parse_transaction`.
+
+    Returns:
+        str: Formatted QIF entry string.
+    """
+    return QIF_RENDERERS[transaction.type](transaction)
+
+
+def format_qif_entry(date, transaction_type, description, amount, currency):
+    """
+    Generate a QIF entry from the individual fields of a CSV transaction row.
+
+    Positional core of `generate_qif_entry`: `parse_transaction` followed by
+    `render_qif_entry`. See `generate_qif_entry` for the output format.
+
+    Args:
+        date (str): Transaction date (YYYY-MM-DD format)
+        transaction_type (str): Transaction type (BUY, SELL, BUYTOOPEN, etc.)
+        description (str): Transaction description
+        amount (str): Transaction amount (can be negative)
+        currency (str): Transaction currency (USD or CAD)
+
+    Returns:
+        str: Formatted QIF entry string, or None if the transaction type is in the ignored
+             list (RECALL, LOAN, STKDIS, STKREORG)
+
+    Raises:
+        ValueError: If transaction type is not recognized
+    """
+    transaction = parse_transaction(
+        date, transaction_type, description, amount, currency
+    )
+    if transaction is None:
         return None
+    return render_qif_entry(transaction)
+
+
+def _as_records(rows):
+    """
+    Return the (date, transaction, description, amount, currency) tuples of CSV rows given
+    either as such tuples or as dicts.
+    """
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        return rows
+    rows = itertools.chain((first,), rows)
+    if isinstance(first, Mapping):
+        rows = map(operator.itemgetter(*CSV_COLUMNS), rows)
+    return rows
+
+
+def generate_qif_entries(rows, target_currencies=None, entries_by_currency=None):
+    """
+    Generate the QIF entries of a sequence of CSV transaction rows, grouped by currency.
+
+    Batch counterpart of `generate_qif_entry`: the handler and renderer tables, the ignored
+    codes and the currency filter are looked up once per call instead of once per row, and
+    every entry is appended to its currency list through a bound `append` kept per currency.
+
+    Args:
+        rows (iterable): CSV rows, either dicts with the keys listed in `generate_qif_entry`
+                         or (date, transaction, description, amount, currency) tuples as
+                         yielded by `iter_csv_records`.
+        target_currencies (iterable): Currencies to convert, default to every currency.
+                                      Rows in other currencies are skipped before parsing.
+        entries_by_currency (dict): Optional dict of currency code to list that receives
+                                    the entries, so buckets can be filled across calls.
+
+    Returns:
+        dict: Currency code to the list of QIF entries of that currency, in row order.
+              Every target currency has a list, even if no row matched it.
+
+    Raises:
+        ValueError: If a transaction type is not recognized
+    """
+    if entries_by_currency is None:
+        entries_by_currency = {}
+    wanted = None
+    if target_currencies is not None:
+        wanted = frozenset(target_currencies)
+        for currency in wanted:
+            entries_by_currency.setdefault(currency, [])
+
+    handlers = TRANSACTION_HANDLERS
+    renderers = QIF_RENDERERS
+    ignored = IGNORED_TRANSACTIONS
+    appenders = {}
+    for date, transaction_type, description, amount, currency in _as_records(rows):
+        if wanted is not None and currency not in wanted:
+            continue
+        handler = handlers.get(transaction_type)
+        if handler is None:
+            if transaction_type in ignored:
+                continue
+            raise ValueError(f"Invalid transaction type: {transaction_type}")
+        transaction = handler(date, description, amount, currency)
+        append = appenders.get(currency)
+        if append is None:
+            append = appenders[currency] = entries_by_currency.setdefault(
+                currency, []
+            ).append
+        append(renderers[transaction.type](transaction))
+    return entries_by_currency
+
+
+def iter_statement_files(input_folder, selector=None):
+    """
+    List the WealthSimple statements in the input folder tree, oldest first.
+
+    Picks up plain '.csv' statements, compressed '.csv.gz', '.csv.bz2' and '.csv.xz'
+    statements, and statements stored inside '.zip' archives, in the input folder and all
+    its subfolders. Files whose name does not follow the statement naming scheme are skipped.
+
+    Args:
+        input_folder (str): Path to folder containing WealthSimple CSV files.
+        selector (StatementSelector): Optional include/exclude globs and account/date
+                                      filters, default to every statement.
+
+    Yields:
+        tuple: (account_name, file_path) for every statement, sorted by statement date, where
+               file_path can be passed to `open_statement` ('{archive}::{member}' for zip
+               members).
+    """
+    if selector is None:
+        selector = StatementSelector()
+    for statement in selector.select(input_folder):
+        yield statement.account_name, statement.source
+
+
+def iter_csv_records(csv_file):
+    """
+    Read the columns needed for conversion from a CSV statement as plain tuples.
+
+    Fast alternative to `csv.DictReader`: the header is mapped to column indices once per
+    file, and every row is reduced to a tuple with a single `operator.itemgetter` call
+    instead of allocating a dict per row. Blank lines are skipped like `csv.DictReader` does.
+
+    Args:
+        csv_file (iterable): Open statement file (or any iterable of CSV lines).
+
+    Yields:
+        tuple: (date, transaction, description, amount, currency) for every row.
+
+    Raises:
+        KeyError: If the header lacks one of the required columns.
+    """
+    reader = csv.reader(csv_file)
+    header = next(reader, None)
+    if header is None:
+        return
+
+    get_columns = operator.itemgetter(*get_column_indices(header))
+    for values in reader:
+        if values:
+            yield get_columns(values)
+
+
+def iter_entry_records(file_path, rejected_lines=()):
+    """
+    Read the rows of a statement that produce an entry, as plain tuples.
+
+    Rows of ignored transaction types and the rows rejected in quarantine mode are skipped,
+    so the records line up, currency by currency, with the entries of every converter. Used
+    by `Deduplicator` to key the entries on the statement rows.
+
+    Args:
+        file_path (str): Path to a WealthSimple CSV statement, see `open_statement`.
+        rejected_lines (collection): Line numbers of the rejected rows of the statement.
+
+    Yields:
+        tuple: (date, transaction, description, amount, currency) for every such row.
+    """
+    with open_statement(file_path) as csv_file:
+        reader = csv.reader(csv_file)
+        header = next(reader, None)
+        if header is None:
+            return
+        try:
+            get_columns = operator.itemgetter(*get_column_indices(header))
+        except KeyError:
+            # The statement was rejected as a whole and produced no entry
+            return
+
+        for values in reader:
+            if values and reader.line_num not in rejected_lines:
+                record = get_columns(values)
+                if record[1] not in IGNORED_TRANSACTIONS:
+                    yield record
+
+
+def get_column_indices(header):
+    """
+    Map the columns needed for conversion to their indices in a statement header.
+
+    Args:
+        header (list): Column names of the statement.
+
+    Returns:
+        list: Index of every column of `CSV_COLUMNS`, in that order.
+
+    Raises:
+        KeyError: If the header lacks one of the required columns.
+    """
+    column_index = {name: index for index, name in enumerate(header)}
+    return [column_index[name] for name in CSV_COLUMNS]
+
+
+def iter_checked_transactions(csv_file, rejects):
+    """
+    Parse a statement into `Transaction` records, setting aside the rows that fail.
+
+    Used in `--on-error=quarantine` mode: a row raising one of `ROW_ERRORS` (unknown
+    transaction code, unreadable description, short row...) is recorded in `rejects` and
+    parsing carries on with the next row. A header lacking a required column rejects the
+    whole statement.
+
+    Args:
+        csv_file (iterable): Open statement file (or any iterable of CSV lines).
+        rejects (list): Receives a (line, reason, record) tuple for every rejected row,
+                        where record holds the `CSV_COLUMNS` values of the row.
+
+    Yields:
+        Transaction: Every parsed row, in file order.
+    """
+    reader = csv.reader(csv_file)
+    header = next(reader, None)
+    if header is None:
+        return
+
+    try:
+        indices = get_column_indices(header)
+    except KeyError as error:
+        rejects.append((reader.line_num, f"Missing column: {error}", ()))
+        return
+
+    get_columns = operator.itemgetter(*indices)
+    for values in reader:
+        if not values:
+            continue
+        try:
+            transaction = parse_transaction(*get_columns(values))
+            if transaction is not None:
+                # Dates are only formatted when rendering: check them while the row is known
+                format_qif_date(transaction.date)
+        except ROW_ERRORS as error:
+            record = tuple(
+                values[index] if index < len(values) else "" for index in indices
+            )
+            rejects.append((reader.line_num, describe_error(error), record))
+            continue
+        if transaction is not None:
+            yield transaction
+
+
+def iter_file_transactions(file_path, rejects=None):
+    """
+    Parse a single statement into `Transaction` records.
+
+    Each row is read once; rows that do not produce a transaction (ignored transaction
+    types) are skipped.
+
+    Args:
+        file_path (str): Path to a WealthSimple CSV statement, see `open_statement`.
+        rejects (list): If given, rows that cannot be converted are recorded in it instead
+                        of raising, see `iter_checked_transactions`.
+
+    Yields:
+        Transaction: Every parsed row, in file order.
+    """
+    with open_statement(file_path) as csv_file:
+        if rejects is not None:
+            yield from iter_checked_transactions(csv_file, rejects)
+            return
+        for date, transaction_type, description, amount, currency in iter_csv_records(
+            csv_file
+        ):
+            transaction = parse_transaction(
+                date, transaction_type, description, amount, currency
+            )
+            if transaction is not None:
+                yield transaction
+
+
+def iter_file_entries(file_path, rejects=None):
+    """
+    Parse a single statement and convert its rows into QIF entries.
+
+    Each row is parsed by `iter_file_transactions` and rendered for its own `currency`
+    column.
+
+    Args:
+        file_path (str): Path to a WealthSimple CSV statement, see `open_statement`.
+        rejects (list): Optional list receiving the rows that cannot be converted, see
+                        `iter_checked_transactions`.
+
+    Yields:
+        tuple: (currency, qif_entry) for every converted row, in file order.
+    """
+    for transaction in iter_file_transactions(file_path, rejects):
+        yield transaction.currency, render_qif_entry(transaction)
+
+
+def convert_csv_file(file_path, rejects=None):
+    """
+    Convert a single statement into QIF entries grouped by currency.
+
+    This is the unit of work handed to worker processes by `read_csv_files`, so it only
+    takes and returns picklable values. Rows are converted in one batch by
+    `generate_qif_entries`, unless rejected rows are collected.
+
+    Args:
+        file_path (str): Path to a WealthSimple CSV statement.
+        rejects (list): Optional list receiving the rows that cannot be converted, see
+                        `iter_checked_transactions`.
+
+    Returns:
+        dict: Currency code (e.g., 'USD') to the list of QIF entries for that currency,
+              in file order.
+    """
+    if rejects is None:
+        with open_statement(file_path) as csv_file:
+            return generate_qif_entries(iter_csv_records(csv_file))
+
+    entries_by_currency = {}
+    for currency, qif in iter_file_entries(file_path, rejects):
+        entries_by_currency.setdefault(currency, []).append(qif)
+    return entries_by_currency
+
+
+def get_converter(engine):
+    """
+    Return the per-file conversion function of a conversion engine.
+
+    Args:
+        engine (str): 'scalar' (row at a time) or 'columnar' (vectorized trade math, see
+                      `app.columnar`). Both produce identical entries.
+
+    Returns:
+        callable: Function taking a statement path (and an optional list receiving the
+                  rejected rows) and returning its entries by currency.
+
+    Raises:
+        ValueError: If the engine is not recognized
+    """
+    if engine == "scalar":
+        return convert_csv_file
+    elif engine == "columnar":
+        from app.columnar import convert_csv_file_columnar
+
+        return convert_csv_file_columnar
     else:
-        raise ValueError(f"Invalid transaction type: {transaction_type}")
+        raise ValueError(f"Invalid engine: {engine}")
+
+
+def _convert_file(converter, file_path, quarantined):
+    """
+    Convert a statement, collecting its rejected rows in quarantine mode.
+
+    Returns:
+        tuple: (entries_by_currency, rejects) where rejects is None unless `quarantined`.
+    """
+    rejects = [] if quarantined else None
+    return converter(file_path, rejects), rejects
 
 
-def read_csv_files(input_folder):
+def _convert_in_worker(engine, file_path, quarantined):
+    """
+    Convert a statement in a worker process and report the parser cache activity.
+
+    Returns:
+        tuple: (entries_by_currency, rejects, counters) where rejects lists the rows set
+               aside in quarantine mode (None otherwise) and counters maps each parser
+               cache name to the (hits, misses, evictions) added by this statement.
+    """
+    before = {
+        name: parse_cache.counters() for name, parse_cache in PARSE_CACHES.items()
+    }
+    entries_by_currency, rejects = _convert_file(
+        get_converter(engine), file_path, quarantined
+    )
+    counters = {
+        name: tuple(
+            after - start for after, start in zip(parse_cache.counters(), before[name])
+        )
+        for name, parse_cache in PARSE_CACHES.items()
+    }
+    return entries_by_currency, rejects, counters
+
+
+def convert_csv_files(file_paths, jobs=1, cache=None, engine="scalar", quarantine=None):
+    """
+    Convert a list of statements, optionally in parallel and through the conversion cache.
+
+    Args:
+        file_paths (list): Paths to WealthSimple CSV statements.
+        jobs (int): Number of worker processes, default to 1 (convert in the current process).
+        cache (ConversionCache): Optional cache; statements it already holds are not re-read,
+                                 freshly converted ones are added to it, and entries whose
+                                 source file is gone are evicted.
+        engine (str): Conversion engine, see `get_converter`.
+        quarantine (Quarantine): If given, rows that cannot be converted are recorded in it
+                                 instead of aborting the run. Statements with rejected rows
+                                 are not cached, so they are reported again on the next run.
+
+    Returns:
+        list: One dict of currency code to QIF entries per statement, in `file_paths` order.
+    """
+    quarantined = quarantine is not None
+    converter = get_converter(engine)
+    results = [None] * len(file_paths)
+    pending = []
+    for index, file_path in enumerate(file_paths):
+        cached = cache.lookup(file_path) if cache is not None else None
+        if cached is None:
+            pending.append(index)
+        else:
+            results[index] = cached
+
+    pending_paths = [file_paths[index] for index in pending]
+    if jobs > 1 and len(pending_paths) > 1:
+        # Results come back in submission order, so the merge is deterministic
+        # no matter which worker finishes first
+        chunksize = max(1, len(pending_paths) // (jobs * 4))
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_initialize_worker,
+            initargs=(EQUITY_PARSE_CACHE.maxsize, SYMBOL_MAP, DATE_STYLE),
+        ) as executor:
+            converted = []
+            for entries_by_currency, rejects, counters in executor.map(
+                _convert_in_worker,
+                [engine] * len(pending_paths),
+                pending_paths,
+                [quarantined] * len(pending_paths),
+                chunksize=chunksize,
+            ):
+                converted.append((entries_by_currency, rejects))
+                for name, worker_counters in counters.items():
+                    PARSE_CACHES[name].add_counters(*worker_counters)
+    else:
+        converted = (
+            _convert_file(converter, file_path, quarantined)
+            for file_path in pending_paths
+        )
+
+    for index, (entries_by_currency, rejects) in zip(pending, converted):
+        results[index] = entries_by_currency
+        if rejects:
+            quarantine.add(file_paths[index], rejects)
+        elif cache is not None:
+            cache.store(file_paths[index], entries_by_currency)
+
+    if cache is not None:
+        cache.prune()
+        cache.save()
+    return results
+
+
+def read_csv_files(
+    input_folder,
+    currencies=DEFAULT_CURRENCIES,
+    jobs=1,
+    cache=None,
+    engine="scalar",
+    dedup=None,
+    selector=None,
+    quarantine=None,
+):
     """
     Read all CSV files from the input folder and organize transactions by account and currency.
 
     Processes WealthSimple CSV exports and separates transactions by currency for each account.
-    Creates separate account entries for USD and CAD transactions to enable proper multi-currency
-    accounting in QIF format.
+    Each statement is opened and parsed exactly once; every row is routed to the bucket of its
+    own `currency` column, so accounts holding EUR or GBP cash get their own buckets without any
+    extra passes over the file.
 
     Args:
         input_folder (str): Path to folder containing WealthSimple CSV files.
                            Expected filename format: 'monthly-statement-transactions-{ACCOUNT_ID}-{DATE}.csv'
+        currencies (iterable): Currencies whose buckets are created up front for every account,
+                               default to ("USD", "CAD"). Currencies found in the data are added
+                               on first sight.
+        jobs (int): Number of worker processes used to convert statements in parallel,
+                    default to 1 (convert in the current process).
+        cache (ConversionCache): Optional persistent cache of converted statements; unchanged
+                                 statements are not re-read and their cached entries are
+                                 spliced into the result.
+        engine (str): Conversion engine, 'scalar' or 'columnar', default to 'scalar'.
+        dedup (Deduplicator): Optional duplicate filter; rows already seen in another
+                              statement are dropped or reported as they are merged.
+        selector (StatementSelector): Optional include/exclude globs and account/date filters
+                                      applied to file names before any statement is opened.
+        quarantine (Quarantine): Optional collector of the rows that cannot be converted;
+                                 without it the first such row raises.
 
     Examples:
         Input files:
@@ -268,32 +1106,221 @@ def read_csv_files(input_folder):
               and values are lists of QIF entry strings for that account/currency combination.
 
     Note:
-        - Automatically creates both USD and CAD variants for each account
+        - Automatically creates the buckets for `currencies` for each account
         - Empty lists are created even if no transactions exist for a currency
-        - Account ID is extracted from filename using regex pattern
+        - Account ID is extracted from filename using regex pattern; files that do not
+          follow the naming scheme are skipped
+        - Entries of every account are ordered by date: each statement is sorted by date
+          and the statements are k-way merged (`app.merge.merge_runs`); entries of the
+          same day keep the order of their statements, oldest first
+        - With jobs > 1 the output is identical to a serial run: per-file results are
+          merged in listing order, not in completion order
     """
     transactions_by_account = {}
 
-    for filename in os.listdir(input_folder):
-        if filename.endswith(".csv"):
-            account_name = extract_account_name(filename)
-            for target_currency in ["USD", "CAD"]:
-                per_currency_account_name = f"{account_name}-{target_currency}"
-                transactions_by_account.setdefault(per_currency_account_name, [])
-
-                file_path = os.path.join(input_folder, filename)
-                with open(file_path, "r") as csv_file:
-                    reader = csv.DictReader(csv_file)
-                    for row in reader:
-                        qif = generate_qif_entry(row, target_currency)
-                        if qif:
-                            transactions_by_account[per_currency_account_name].append(
-                                qif
-                            )
+    statements = list(iter_statement_files(input_folder, selector))
+    results = convert_csv_files(
+        [file_path for _, file_path in statements],
+        jobs=jobs,
+        cache=cache,
+        engine=engine,
+        quarantine=quarantine,
+    )
+
+    runs_by_account = {}
+    for (account_name, file_path), entries_by_currency in zip(statements, results):
+        if dedup is not None:
+            rejected_lines = (
+                quarantine.lines(file_path) if quarantine is not None else ()
+            )
+            entries_by_currency = dedup.filter_entries_by_currency(
+                file_path,
+                account_name,
+                entries_by_currency,
+                iter_entry_records(file_path, rejected_lines),
+            )
+        for currency in currencies:
+            transactions_by_account.setdefault(f"{account_name}-{currency}", [])
+
+        for currency, qifs in entries_by_currency.items():
+            key = f"{account_name}-{currency}"
+            transactions_by_account.setdefault(key, [])
+            runs_by_account.setdefault(key, []).append(qifs)
+
+    for key, runs in runs_by_account.items():
+        transactions_by_account[key] = merge_runs(runs, entry_date)
     return transactions_by_account
 
 
-def export_qif_files(account_data, config_filename):
+def _iter_cached_entries(converter, file_path, cache, rejects):
+    """
+    Convert a statement through the conversion cache, if any.
+
+    Yields:
+        tuple: (currency, qif_entry) for every entry of the statement.
+    """
+    entries_by_currency = cache.lookup(file_path) if cache is not None else None
+    if entries_by_currency is None:
+        entries_by_currency = converter(file_path, rejects)
+        if cache is not None and not rejects:
+            cache.store(file_path, entries_by_currency)
+    for currency, qifs in entries_by_currency.items():
+        for qif in qifs:
+            yield currency, qif
+
+
+def _filter_duplicates(filter_rows, file_path, account_name, rows, rejects):
+    """
+    Pass the rows of a statement through a `Deduplicator` filter.
+
+    Rejected rows are only known once the statement is read, so the rows are read first,
+    then matched with the statement rows that were not rejected.
+    """
+    rows = list(rows)
+    rejected_lines = {line for line, _, _ in rejects or ()}
+    return filter_rows(
+        file_path, account_name, rows, iter_entry_records(file_path, rejected_lines)
+    )
+
+
+def iter_csv_entries(
+    input_folder,
+    cache=None,
+    engine="scalar",
+    dedup=None,
+    selector=None,
+    quarantine=None,
+    spill_threshold=DEFAULT_SPILL_THRESHOLD,
+):
+    """
+    Lazily convert every CSV file in the input folder into QIF entries.
+
+    Streaming counterpart of `read_csv_files`: instead of collecting every entry into
+    per-account lists, statements are converted one at a time into sorted runs of a
+    `ChronologicalMerger`, which spills the runs of the largest accounts to disk whenever
+    more than `spill_threshold` entries, all accounts together, are held in memory. Memory
+    is thus bounded by `spill_threshold` plus one statement. Since the oldest entry of an
+    account may come from the last statement, nothing is yielded before every statement is
+    read; entries are then yielded account by account, in the order of `read_csv_files`.
+
+    Args:
+        input_folder (str): Path to folder containing WealthSimple CSV files.
+        cache (ConversionCache): Optional persistent cache of converted statements. Statements
+                                 are then converted a file at a time so they can be cached.
+        engine (str): Conversion engine, 'scalar' or 'columnar'. The columnar engine also
+                      converts a file at a time.
+        dedup (Deduplicator): Optional duplicate filter applied to every row.
+        selector (StatementSelector): Optional include/exclude globs and account/date filters.
+        quarantine (Quarantine): Optional collector of the rows that cannot be converted.
+        spill_threshold (int): Entries held in memory, all accounts together, before the
+                               largest accounts are merged into run files on disk.
+
+    Yields:
+        tuple: (account_name, qif_entry) where account_name carries the currency suffix
+               (e.g., 'AB1234567CAD-USD') and qif_entry is the QIF entry string.
+    """
+    converter = get_converter(engine)
+    with ChronologicalMerger(entry_date, spill_threshold) as merger:
+        for account_name, file_path in iter_statement_files(input_folder, selector):
+            rejects = [] if quarantine is not None else None
+            if cache is None and engine == "scalar":
+                entries = iter_file_entries(file_path, rejects)
+            else:
+                entries = _iter_cached_entries(converter, file_path, cache, rejects)
+            if dedup is not None:
+                entries = _filter_duplicates(
+                    dedup.filter_file, file_path, account_name, entries, rejects
+                )
+            runs = {}
+            for currency, qif in entries:
+                runs.setdefault(currency, []).append(qif)
+            for currency, qifs in runs.items():
+                merger.add(f"{account_name}-{currency}", qifs)
+            if rejects:
+                quarantine.add(file_path, rejects)
+
+        if cache is not None:
+            cache.prune()
+            cache.save()
+
+        for account_name, entries in merger.items():
+            for qif in entries:
+                yield account_name, qif
+
+
+def iter_csv_transactions(
+    input_folder,
+    engine="scalar",
+    dedup=None,
+    selector=None,
+    quarantine=None,
+    spill_threshold=DEFAULT_SPILL_THRESHOLD,
+):
+    """
+    Lazily parse every CSV file in the input folder into `Transaction` records.
+
+    Record counterpart of `iter_csv_entries`, used when the records are rendered in
+    several output formats: every row is read and parsed once, whatever the number of
+    formats. Records are ordered by date through a `ChronologicalMerger` and yielded in
+    the order `iter_csv_entries` yields entries.
+
+    Args:
+        input_folder (str): Path to folder containing WealthSimple CSV files.
+        engine (str): Conversion engine, 'scalar' or 'columnar'.
+        dedup (Deduplicator): Optional duplicate filter applied to every row.
+        selector (StatementSelector): Optional include/exclude globs and account/date filters.
+        quarantine (Quarantine): Optional collector of the rows that cannot be converted.
+        spill_threshold (int): Records held in memory, all accounts together, before the
+                               largest accounts are merged into run files on disk.
+
+    Yields:
+        tuple: (account_name, transaction) where account_name carries the currency suffix
+               (e.g., 'AB1234567CAD-USD').
+
+    Raises:
+        ValueError: If the engine is not recognized
+    """
+    if engine == "scalar":
+        read_transactions = iter_file_transactions
+    elif engine == "columnar":
+        from app.columnar import iter_file_transactions_columnar
+
+        read_transactions = iter_file_transactions_columnar
+    else:
+        raise ValueError(f"Invalid engine: {engine}")
+
+    with ChronologicalMerger(TRANSACTION_DATE, spill_threshold) as merger:
+        for account_name, file_path in iter_statement_files(input_folder, selector):
+            rejects = [] if quarantine is not None else None
+            transactions = read_transactions(file_path, rejects)
+            if dedup is not None:
+                transactions = _filter_duplicates(
+                    dedup.filter_transactions,
+                    file_path,
+                    account_name,
+                    transactions,
+                    rejects,
+                )
+            runs = {}
+            for transaction in transactions:
+                runs.setdefault(transaction.currency, []).append(transaction)
+            for currency, run in runs.items():
+                merger.add(f"{account_name}-{currency}", run)
+            if rejects:
+                quarantine.add(file_path, rejects)
+
+        for account_name, transactions in merger.items():
+            for transaction in transactions:
+                yield account_name, transaction
+
+
+def export_qif_files(
+    account_data,
+    config_filename,
+    buffer_size=STREAM_BUFFER_SIZE,
+    split_by=None,
+    max_entries=None,
+):
     """
     Export individual QIF files for each account in the account data dictionary.
 
@@ -304,6 +1331,11 @@ def export_qif_files(account_data, config_filename):
         account_data (dict): Dictionary where keys are account names with currency suffixes
                            (e.g., 'AB1234567CAD-USD') and values are lists of QIF entry strings.
         config_filename (str): Path to YAML configuration file containing account mappings with currency suffixes.
+        buffer_size (int): Size in bytes of the write buffer of each QIF file.
+        split_by (str): Split each account's file by 'year', 'quarter' or 'month' (e.g.,
+                        output/My-Investment-CAD-2024.qif), see `app.shards.ShardedQifWriter`.
+        max_entries (int): Maximum number of entries per file; larger accounts are split into
+                           numbered parts (e.g., output/My-Investment-CAD-1.qif).
 
     Configuration Example:
         accounts.yml:
@@ -339,68 +1371,383 @@ def export_qif_files(account_data, config_filename):
         - Checking accounts: '!Type:Bank'
 
     Raises:
-        ValueError: If account name from CSV is not found in configuration file, or if there's a currency mismatch for chequing accounts.
+        ValueError: If account name from CSV is not found in configuration file, or if there's a
+                    currency mismatch for chequing accounts.
 
     Note:
         - Skips accounts with no transactions (empty lists)
         - Creates output directory if it doesn't exist
         - Overwrites existing QIF files with same names
+        - Entries are streamed to the files (see `write_qif_files`), `account_data` is not modified
         - For chequing accounts, validates that the account currency suffix matches the expected currency
     """
 
     config = read_config(config_filename)
     print(config)
 
+    write_qif_files(
+        account_data, config, buffer_size, split_by=split_by, max_entries=max_entries
+    )
+
+
+def write_qif_files(
+    account_data,
+    config,
+    buffer_size=STREAM_BUFFER_SIZE,
+    threads=DEFAULT_WRITE_THREADS,
+    split_by=None,
+    max_entries=None,
+):
+    """
+    Write the QIF file of every non-empty account using an already parsed configuration.
+
+    Every account is validated before anything is written. Each file is then written by a
+    `QifFileWriter` to a temporary file next to its final path, the accounts in parallel
+    from a thread pool, and all files are published with `os.replace` once every one of
+    them is complete (see `app.output.write_qif_outputs`). A failed run therefore leaves
+    the previous QIF files untouched. The account history is never joined into a single
+    string and the lists in `account_data` are left untouched.
+
+    Args:
+        account_data (dict): Account names with currency suffixes to lists (or iterators)
+                             of QIF entry strings.
+        config (dict): Parsed accounts configuration, see `export_qif_files`.
+        buffer_size (int): Size in bytes of the write buffer of each QIF file.
+        threads (int): Maximum number of QIF files written at the same time.
+        split_by (str): Optional period splitting each account into several files.
+        max_entries (int): Optional maximum number of entries per file.
+
+    Raises:
+        ValueError: If an account is not configured, or on a chequing account currency mismatch.
+    """
+    files = []
     for account_name, transactions in account_data.items():
-        if len(transactions) == 0:
+        entries = iter(transactions)
+        first = next(entries, None)
+        if first is None:
             continue
 
         print(account_name)
-        if account_name not in config:
-            raise ValueError("Unknown account")
-
-        account_config = config[account_name]
-        account_type = account_config["type"]
-
-        # For chequing accounts, validate currency mismatch
-        if account_type == "Checking":
-            # Extract currency suffix from account name (e.g., 'WK23MTV36CAD-CAD' -> 'CAD')
-            if "-" in account_name:
-                account_currency_suffix = account_name.split("-")[-1]
-                # Extract base account name (e.g., 'WK23MTV36CAD-CAD' -> 'WK23MTV36CAD')
-                base_account_name = account_name.rsplit("-", 1)[0]
-
-                # Determine expected currency from base account name
-                # If base account ends with 'CAD', expect CAD; if ends with 'USD', expect USD
-                if base_account_name.endswith("CAD"):
-                    expected_currency = "CAD"
-                elif base_account_name.endswith("USD"):
-                    expected_currency = "USD"
-                else:
-                    # Default to CAD if unclear
-                    expected_currency = "CAD"
-
-                # Check for currency mismatch
-                if account_currency_suffix != expected_currency:
-                    raise ValueError(
-                        f"Currency mismatch for chequing account '{account_name}': "
-                        f"account suffix indicates '{account_currency_suffix}' but expected '{expected_currency}' "
-                        f"based on account base name '{base_account_name}'"
-                    )
-
-            transactions.insert(0, "!Type:Bank")
-        else:
-            transactions.insert(0, "!Type:Invst")
+        header = get_qif_header(account_name, config)
 
-        qif_content = "\n".join(transactions) + "\n"
+        filename = f"output/{config[account_name]['nickname']}.qif"
+        files.append((filename, header, itertools.chain((first,), entries)))
+
+    open_writer = qif_writer_factory(split_by, max_entries)
+    writers = write_qif_outputs(files, buffer_size, threads, open_writer)
+    for writer in writers:
+        for path in writer.paths:
+            print(f"Exported {path}")
+    _remove_stale_shards(writers, config)
+
+
+def _remove_stale_shards(writers, config):
+    """Remove the files of the exported accounts left by runs with other sharding options."""
+    other_paths = [
+        f"output/{account['nickname']}.qif"
+        for account in config.values()
+        if isinstance(account, Mapping) and "nickname" in account
+    ]
+    for writer in writers:
+        for path in remove_stale_shards(writer.path, writer.paths, other_paths):
+            print(f"Removed {path}")
+
+
+def export_incremental_qif_files(
+    account_data, config_filename, state, mode="append", buffer_size=STREAM_BUFFER_SIZE
+):
+    """
+    Export only the QIF entries that a previous run did not export.
+
+    Incremental counterpart of `export_qif_files`: the new entries of every account are
+    picked with the high-water marks of `state` (see `app.incremental.ExportState`), so
+    the files written, and what Quicken imports, grow with the new activity only.
+
+    In 'append' mode the new entries are appended to each account's QIF file, which keeps
+    the full history. A file that is missing, was never written incrementally or is shorter
+    than recorded is written again in full; one that is longer (an interrupted append) is
+    cut back first. In 'delta' mode only the new entries, with just the header when there are
+    none, are written to a separate `{nickname}-delta.qif` file, ready to be imported; the
+    account's full QIF file is left untouched.
+
+    The marks are updated in `state` but not saved, see `ExportState.save`.
+
+    Args:
+        account_data (dict): Account names with currency suffixes to lists of QIF entry
+                             strings, oldest first, e.g. from `read_csv_files`.
+        config_filename (str): Path to YAML configuration file containing account mappings.
+        state (ExportState): High-water marks of the previous runs.
+        mode (str): 'append' or 'delta'.
+        buffer_size (int): Size in bytes of the write buffer of each QIF file.
 
+    Raises:
+        ValueError: If an account is not configured, on a chequing account currency
+                    mismatch, or if the mode is not recognized.
+    """
+    if mode not in INCREMENTAL_MODES:
+        raise ValueError(f"Invalid incremental mode: {mode}")
+
+    config = read_config(config_filename)
+    print(config)
+
+    files = []
+    appends = []
+    marks = []
+    for account_name, transactions in account_data.items():
+        if not transactions:
+            continue
+        header = get_qif_header(account_name, config)
         filename = f"output/{config[account_name]['nickname']}.qif"
-        with open(filename, "w") as file:
-            file.write(qif_content)
-        print(f"Exported {filename}")
+        new_entries, mark = state.select(account_name, transactions)
+        print(f"{account_name}: {len(new_entries)} new of {len(transactions)} entries")
+
+        if mode == "delta":
+            # Written next to the full history, which a previous run may have exported
+            delta_filename = f"output/{config[account_name]['nickname']}-delta.qif"
+            files.append((delta_filename, header, new_entries))
+        else:
+            size = state.appendable_size(account_name, filename)
+            if size is None:
+                files.append((filename, header, transactions))
+            else:
+                appends.append((filename, new_entries, size))
+        marks.append((account_name, mark, filename))
 
+    for writer in write_qif_outputs(files, buffer_size):
+        print(f"Exported {writer.path}")
+    for filename, new_entries, size in appends:
+        append_qif_entries(filename, new_entries, size, buffer_size)
+        print(f"Appended {len(new_entries)} entries to {filename}")
 
-def main():
+    for account_name, mark, filename in marks:
+        size = os.path.getsize(filename) if mode == "append" else None
+        state.record(account_name, mark, filename, size)
+
+
+def get_qif_header(account_name, config):
+    """
+    Validate an account against the configuration and return its QIF header line.
+
+    Args:
+        account_name (str): Account name with currency suffix (e.g., 'AB1234567CAD-USD').
+        config (dict): Parsed accounts configuration.
+
+    Returns:
+        str: '!Type:Bank' for Checking accounts, '!Type:Invst' otherwise.
+
+    Raises:
+        ValueError: If the account is not configured, or if a chequing account's currency
+                    suffix does not match its base account name.
+    """
+    if account_name not in config:
+        raise ValueError("Unknown account")
+
+    account_config = config[account_name]
+    account_type = account_config["type"]
+
+    # For chequing accounts, validate currency mismatch
+    if account_type == "Checking":
+        # Extract currency suffix from account name (e.g., 'WK23MTV36CAD-CAD' -> 'CAD')
+        if "-" in account_name:
+            account_currency_suffix = account_name.split("-")[-1]
+            # Extract base account name (e.g., 'WK23MTV36CAD-CAD' -> 'WK23MTV36CAD')
+            base_account_name = account_name.rsplit("-", 1)[0]
+
+            # Determine expected currency from base account name
+            # If base account ends with 'CAD', expect CAD; if ends with 'USD', expect USD
+            if base_account_name.endswith("CAD"):
+                expected_currency = "CAD"
+            elif base_account_name.endswith("USD"):
+                expected_currency = "USD"
+            else:
+                # Default to CAD if unclear
+                expected_currency = "CAD"
+
+            # Check for currency mismatch
+            if account_currency_suffix != expected_currency:
+                raise ValueError(
+                    f"Currency mismatch for chequing account '{account_name}': "
+                    f"account suffix indicates '{account_currency_suffix}' but expected '{expected_currency}' "
+                    f"based on account base name '{base_account_name}'"
+                )
+
+        return "!Type:Bank"
+    return "!Type:Invst"
+
+
+def stream_qif_files(
+    entries,
+    config_filename,
+    buffer_size=STREAM_BUFFER_SIZE,
+    split_by=None,
+    max_entries=None,
+):
+    """
+    Write QIF files while consuming a stream of (account_name, qif_entry) pairs.
+
+    Streaming counterpart of `export_qif_files`. Each account's file is opened the first time
+    one of its entries arrives, the header is written, and every entry is written through as
+    soon as it is received. The writers themselves only hold `buffer_size` per open file;
+    with `iter_csv_entries` as the source, writing starts once every statement is read and
+    peak memory is bounded by its `spill_threshold`, not by the length of the history or
+    the number of accounts. The files are byte-identical to the ones
+    produced by `export_qif_files` for the same input. They are written to temporary files
+    and only published once the stream is exhausted, so a conversion error leaves the
+    previous QIF files untouched.
+
+    Args:
+        entries (iterable): (account_name, qif_entry) pairs, e.g. from `iter_csv_entries`.
+        config_filename (str): Path to YAML configuration file containing account mappings.
+        buffer_size (int): Size in bytes of the write buffer of each open QIF file.
+        split_by (str): Optional period splitting each account into several files, see
+                        `export_qif_files`.
+        max_entries (int): Optional maximum number of entries per file.
+
+    Raises:
+        ValueError: If account name from CSV is not found in configuration file, or if there's
+                    a currency mismatch for chequing accounts.
+    """
+    config = read_config(config_filename)
+    print(config)
+
+    open_writer = qif_writer_factory(split_by, max_entries)
+    writers = {}
+    try:
+        for account_name, qif in entries:
+            writer = writers.get(account_name)
+            if writer is None:
+                print(account_name)
+                header = get_qif_header(account_name, config)
+                filename = f"output/{config[account_name]['nickname']}.qif"
+                writer = writers[account_name] = open_writer(
+                    filename, header, buffer_size
+                )
+            writer.write(qif)
+    except BaseException:
+        discard_all(writers.values())
+        raise
+
+    publish_all(list(writers.values()))
+    for writer in writers.values():
+        for path in writer.paths:
+            print(f"Exported {path}")
+    _remove_stale_shards(writers.values(), config)
+
+
+def stream_format_files(
+    transactions, config_filename, formats, buffer_size=STREAM_BUFFER_SIZE
+):
+    """
+    Write one file per output format for each account while consuming a stream of records.
+
+    Multi-format counterpart of `stream_qif_files`: every (account_name, transaction)
+    pair is rendered by the writer of each requested format (see `app.formats`) as soon
+    as it is received, so all formats are produced from a single pass over the statements.
+    The QIF files are byte-identical to the ones written by `stream_qif_files`, and like
+    them all files are only published once the stream is exhausted.
+
+    Args:
+        transactions (iterable): (account_name, transaction) pairs, e.g. from
+                                 `iter_csv_transactions`.
+        config_filename (str): Path to YAML configuration file containing account mappings.
+        formats (iterable): Output format names, see `OUTPUT_FORMATS`.
+        buffer_size (int): Size in bytes of the write buffer of each open file.
+
+    Raises:
+        ValueError: If account name from CSV is not found in configuration file, if there's
+                    a currency mismatch for chequing accounts, or if a format is unknown.
+    """
+    from app.formats import FORMAT_WRITERS
+
+    writer_classes = [get_format_writer(FORMAT_WRITERS, name) for name in formats]
+    config = read_config(config_filename)
+    print(config)
+
+    writers = {}
+    outputs = []
+    try:
+        for account_name, transaction in transactions:
+            account_writers = writers.get(account_name)
+            if account_writers is None:
+                print(account_name)
+                # Validates the account, whatever the formats
+                get_qif_header(account_name, config)
+                account_writers = writers[account_name] = []
+                for writer_class in writer_classes:
+                    filename = f"output/{config[account_name]['nickname']}.{writer_class.extension}"
+                    output = AtomicFile(filename, buffer_size, writer_class.encoding)
+                    outputs.append(output)
+                    writer = writer_class(output.file, account_name, config)
+                    account_writers.append(writer)
+                    writer.write_header()
+            for writer in account_writers:
+                writer.write(transaction)
+        for account_writers in writers.values():
+            for writer in account_writers:
+                writer.close()
+    except BaseException:
+        discard_all(outputs)
+        raise
+
+    publish_all(outputs)
+    for output in outputs:
+        print(f"Exported {output.path}")
+
+
+def get_format_writer(format_writers, name):
+    """
+    Return the writer class of an output format.
+
+    Args:
+        format_writers (dict): Format name to writer class, i.e. `app.formats.FORMAT_WRITERS`.
+        name (str): Output format name (e.g., 'ofx').
+
+    Raises:
+        ValueError: If the format is not recognized
+    """
+    try:
+        return format_writers[name]
+    except KeyError:
+        raise ValueError(f"Invalid output format: {name}") from None
+
+
+def parse_formats(value):
+    """
+    Parse the comma-separated list of output formats given on the command line.
+
+    Args:
+        value (str): Format names (e.g., 'qif,ofx').
+
+    Returns:
+        tuple: Format names in the given order, without repeats.
+
+    Raises:
+        argparse.ArgumentTypeError: If a format is not recognized.
+    """
+    formats = tuple(dict.fromkeys(name.strip().lower() for name in value.split(",")))
+    for name in formats:
+        if name not in OUTPUT_FORMATS:
+            raise argparse.ArgumentTypeError(
+                f"invalid format: {name!r} (choose from {', '.join(OUTPUT_FORMATS)})"
+            )
+    return formats
+
+
+def print_stats(cache=None):
+    """
+    Print the hit/miss/eviction counters of the parser caches and the conversion cache.
+
+    Args:
+        cache (ConversionCache): Conversion cache used by the run, if any.
+    """
+    for name, parse_cache in PARSE_CACHES.items():
+        print(f"Parse cache ({name}): {parse_cache.describe()}")
+    if cache is not None:
+        print(f"Conversion cache: {cache.hits} hits, {cache.misses} misses")
+
+
+def _build_parser():
+    """Return the parser of the command line arguments."""
     parser = argparse.ArgumentParser(
         description="WealthSimple CSV to QIF Conversion CLI App"
     )
@@ -416,10 +1763,403 @@ def main():
         help="Path to the config for accounts, default to `accounts.yml`",
         default="accounts.yml",
     )
+    parser.add_argument(
+        "--include",
+        action="append",
+        metavar="GLOB",
+        help=(
+            "Only convert statements whose path (relative to the input folder) or file name "
+            "matches this glob; can be repeated"
+        ),
+    )
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        metavar="GLOB",
+        help=(
+            "Skip statements and folders whose relative path or name matches this glob; can be "
+            "repeated"
+        ),
+    )
+    parser.add_argument(
+        "--account",
+        action="append",
+        metavar="ACCOUNT_ID",
+        help="Only convert statements of this account (e.g. `AB1234567CAD`); can be repeated",
+    )
+    parser.add_argument(
+        "--since",
+        type=str,
+        metavar="YYYY-MM-DD",
+        help="Only convert statements dated on or after this date",
+    )
+    parser.add_argument(
+        "--until",
+        type=str,
+        metavar="YYYY-MM-DD",
+        help="Only convert statements dated on or before this date",
+    )
+    parser.add_argument(
+        "--format",
+        type=parse_formats,
+        metavar="FORMATS",
+        help=(
+            f"Comma-separated output formats among {', '.join(OUTPUT_FORMATS)}, all written from a "
+            "single pass over the statements, default to `qif`"
+        ),
+        default=("qif",),
+    )
+    parser.add_argument(
+        "--date-format",
+        choices=tuple(DATE_STYLES),
+        help=(
+            "Style of the QIF dates: `us` (07/15/2025), `quicken` (07/15'25) or `iso` "
+            "(2025-07-15), default to `us`"
+        ),
+        default=DEFAULT_DATE_STYLE,
+    )
+    parser.add_argument(
+        "--incremental",
+        choices=INCREMENTAL_MODES,
+        help=(
+            "Only export the transactions not exported by a previous run: `append` them to the QIF "
+            "files, or write a `delta` QIF holding only them"
+        ),
+    )
+    parser.add_argument(
+        "--state-file",
+        type=str,
+        help=(
+            "File keeping the last exported transaction of every account for `--incremental`, "
+            f"default to `{DEFAULT_STATE_FILE}`"
+        ),
+        default=DEFAULT_STATE_FILE,
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help=(
+            "Stream rows straight into the QIF files instead of collecting every account in memory "
+            "first"
+        ),
+    )
+    parser.add_argument(
+        "--split-by",
+        choices=tuple(SPLIT_PERIODS),
+        help=(
+            "Split the QIF file of every account into one file per `year`, `quarter` or `month` "
+            "(e.g. `My-TFSA-2024.qif`)"
+        ),
+    )
+    parser.add_argument(
+        "--max-entries",
+        type=int,
+        metavar="N",
+        help=(
+            "Split the QIF file of every account into numbered files of at most N transactions "
+            "(e.g. `My-TFSA-1.qif`)"
+        ),
+    )
+    parser.add_argument(
+        "--spill-threshold",
+        type=int,
+        help=(
+            "Entries held in memory by `--stream` and `--format`, all accounts together, before "
+            "the largest accounts are sorted to temporary files, default to "
+            f"{DEFAULT_SPILL_THRESHOLD}"
+        ),
+        default=DEFAULT_SPILL_THRESHOLD,
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        help=(
+            "Number of worker processes converting statement files in parallel, in batch and "
+            "watch mode (not with --stream or --format), default to 1"
+        ),
+        default=1,
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        help=f"Directory of the conversion cache, default to `{DEFAULT_CACHE_DIR}`",
+        default=DEFAULT_CACHE_DIR,
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Re-read every statement and leave the conversion cache untouched",
+    )
+    parser.add_argument(
+        "--rebuild-cache",
+        action="store_true",
+        help="Discard the conversion cache and rebuild it from every statement",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=("scalar", "columnar"),
+        help=(
+            "Conversion engine; `columnar` computes trade prices on whole columns (uses NumPy when "
+            "installed), default to `scalar`"
+        ),
+        default="scalar",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help=(
+            "Keep running, and reconvert the affected accounts whenever statements or the account "
+            "config change"
+        ),
+    )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        help="Seconds without changes to wait before reconverting in watch mode, default to 2",
+        default=2.0,
+    )
+    parser.add_argument(
+        "--dedup",
+        choices=DEDUP_MODES,
+        help=(
+            "Detect rows already seen in another statement (e.g. a month downloaded twice) and "
+            "`drop` or only `report` them"
+        ),
+    )
+    parser.add_argument(
+        "--dedup-index",
+        type=str,
+        help=(
+            "File keeping the duplicate index between runs, so rows exported by a previous run are "
+            "detected too"
+        ),
+    )
+    parser.add_argument(
+        "--on-error",
+        choices=ON_ERROR_MODES,
+        help=(
+            "`raise` stops at the first row that cannot be converted; `quarantine` sets such rows "
+            "aside in the quarantine file, converts everything else and exits with status 1, "
+            "default to `raise`"
+        ),
+        default="raise",
+    )
+    parser.add_argument(
+        "--quarantine-file",
+        type=str,
+        help=(
+            "CSV file receiving the rows set aside by `--on-error quarantine`, default to "
+            f"`{DEFAULT_QUARANTINE_FILE}`"
+        ),
+        default=DEFAULT_QUARANTINE_FILE,
+    )
+    parser.add_argument(
+        "--symbols",
+        type=str,
+        help=(
+            "YAML file of symbol suffix rules, applied on top of the `symbols` section of the "
+            "account config"
+        ),
+    )
+    parser.add_argument(
+        "--parse-cache-size",
+        type=int,
+        help=(
+            "Number of parsed descriptions kept per parser (LRU), 0 to disable, default to "
+            f"{DEFAULT_PARSE_CACHE_SIZE}"
+        ),
+        default=DEFAULT_PARSE_CACHE_SIZE,
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Print parser and conversion cache hit/miss/eviction counters when done",
+    )
+    return parser
+
+
+def _check_arguments(parser, args):
+    """Reject invalid values and combinations of options through `parser.error`."""
+    sharded = args.split_by or args.max_entries is not None
+    multi_format = args.format != ("qif",)
+    errors = (
+        (args.parse_cache_size < 0, "--parse-cache-size must be 0 or more"),
+        (args.spill_threshold < 1, "--spill-threshold must be 1 or more"),
+        (args.jobs < 1, "--jobs must be 1 or more"),
+        (
+            args.max_entries is not None and args.max_entries < 1,
+            "--max-entries must be 1 or more",
+        ),
+        (args.dedup and args.watch, "--dedup cannot be combined with --watch"),
+        (multi_format and args.watch, "--format cannot be combined with --watch"),
+        # Streaming runs convert the statements one at a time in this process
+        (
+            args.jobs > 1 and (args.stream or multi_format),
+            "--jobs cannot be combined with --stream or --format",
+        ),
+        (
+            args.on_error == "quarantine" and args.watch,
+            "--on-error quarantine cannot be combined with --watch",
+        ),
+        (
+            args.incremental and (args.watch or args.stream or multi_format),
+            "--incremental cannot be combined with --watch, --stream or --format",
+        ),
+        (
+            sharded and (args.watch or args.incremental or multi_format),
+            "--split-by and --max-entries cannot be combined with "
+            "--watch, --incremental or --format",
+        ),
+    )
+    for failed, message in errors:
+        if failed:
+            parser.error(message)
+
+
+def _load_deduplicator(parser, args):
+    """Return the `Deduplicator` of `--dedup`, or None."""
+    if not args.dedup:
+        return None
+    try:
+        index = DigestIndex.load(args.dedup_index) if args.dedup_index else None
+    except ValueError as error:
+        parser.error(str(error))
+    return Deduplicator(args.dedup, index=index)
+
+
+def _watch(args, cache, selector):
+    from app.watch import StatementWatcher
+
+    watcher = StatementWatcher(
+        args.input_folder,
+        args.account_config,
+        jobs=args.jobs,
+        cache=cache,
+        engine=args.engine,
+        selector=selector,
+        symbols_filename=args.symbols,
+    )
+    watcher.run(debounce=args.debounce)
+
+
+def _export_formats(args, dedup, selector, quarantine):
+    stream_format_files(
+        iter_csv_transactions(
+            args.input_folder,
+            engine=args.engine,
+            dedup=dedup,
+            selector=selector,
+            quarantine=quarantine,
+            spill_threshold=args.spill_threshold,
+        ),
+        args.account_config,
+        args.format,
+    )
+
+
+def _export_stream(args, cache, dedup, selector, quarantine):
+    stream_qif_files(
+        iter_csv_entries(
+            args.input_folder,
+            cache=cache,
+            engine=args.engine,
+            dedup=dedup,
+            selector=selector,
+            quarantine=quarantine,
+            spill_threshold=args.spill_threshold,
+        ),
+        args.account_config,
+        split_by=args.split_by,
+        max_entries=args.max_entries,
+    )
+
+
+def _export_batch(args, cache, dedup, selector, quarantine):
+    csv_data = read_csv_files(
+        args.input_folder,
+        jobs=args.jobs,
+        cache=cache,
+        engine=args.engine,
+        dedup=dedup,
+        selector=selector,
+        quarantine=quarantine,
+    )
+    if not args.incremental:
+        export_qif_files(
+            csv_data,
+            args.account_config,
+            split_by=args.split_by,
+            max_entries=args.max_entries,
+        )
+        return
+
+    state = ExportState(args.state_file)
+    export_incremental_qif_files(
+        csv_data, args.account_config, state, mode=args.incremental
+    )
+    # Rows fixed after being quarantined must still be exported by the next run
+    if quarantine:
+        print(f"Quarantined rows: {args.state_file} not updated")
+    else:
+        state.save()
+
+
+def _report(args, cache, dedup, quarantine):
+    """Print the run summaries, save the indexes and exit with 1 on quarantined rows."""
+    if dedup is not None:
+        dedup.report()
+        if args.dedup_index:
+            dedup.index.save(args.dedup_index)
+    if args.stats:
+        print_stats(cache)
+    if quarantine is not None:
+        quarantine.save()
+        quarantine.report()
+        if quarantine:
+            raise SystemExit(1)
+
+
+def main():
+    parser = _build_parser()
     args = parser.parse_args()
+    _check_arguments(parser, args)
+
+    selector = StatementSelector(
+        include=args.include,
+        exclude=args.exclude,
+        accounts=args.account,
+        since=args.since,
+        until=args.until,
+    )
+    quarantine = None
+    if args.on_error == "quarantine":
+        quarantine = Quarantine(args.quarantine_file)
+    dedup = _load_deduplicator(parser, args)
+
+    configure_parse_caches(args.parse_cache_size)
+    configure_date_style(args.date_format)
+    configure_symbol_map(
+        load_symbol_map(read_config(args.account_config), args.symbols)
+    )
 
-    csv_data = read_csv_files(args.input_folder)
-    export_qif_files(csv_data, args.account_config)
+    cache = None
+    # Multi-format runs render records and do not use the cache of QIF entries
+    if not args.no_cache and args.format == ("qif",):
+        cache = ConversionCache(
+            args.cache_dir,
+            rebuild=args.rebuild_cache,
+            settings=conversion_settings(),
+        )
+
+    if args.watch:
+        _watch(args, cache, selector)
+    elif args.format != ("qif",):
+        _export_formats(args, dedup, selector, quarantine)
+    elif args.stream:
+        _export_stream(args, cache, dedup, selector, quarantine)
+    else:
+        _export_batch(args, cache, dedup, selector, quarantine)
+    _report(args, cache, dedup, quarantine)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,107 @@
+from collections import OrderedDict
+
+# Default number of parsed descriptions kept per parser
+DEFAULT_PARSE_CACHE_SIZE = 4096
+
+
+class LRUCache:
+    """
+    Bounded mapping that evicts the least recently used key, with hit/miss/eviction counters.
+
+    Used in front of the description parsers: dividend, DRIP and recurring purchase
+    descriptions repeat thousands of times across an archive, so most rows are answered
+    from the cache instead of being parsed again.
+
+    Args:
+        maxsize (int): Maximum number of keys kept; 0 disables caching.
+    """
+
+    def __init__(self, maxsize=DEFAULT_PARSE_CACHE_SIZE):
+        if maxsize < 0:
+            raise ValueError(f"Invalid cache size: {maxsize}")
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        """
+        Return the value cached for a key and mark it as recently used.
+
+        Args:
+            key (hashable): Cache key.
+
+        Returns:
+            The cached value, or None on a miss.
+        """
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._data.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        """
+        Cache a value, evicting the least recently used key if the cache is full.
+
+        Args:
+            key (hashable): Cache key.
+            value: Value to cache; must not be None.
+        """
+        if self.maxsize == 0:
+            return
+        self._data[key] = value
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Drop every cached value, keeping the counters."""
+        self._data.clear()
+
+    def resize(self, maxsize):
+        """
+        Change the maximum size, evicting the oldest keys if needed.
+
+        Args:
+            maxsize (int): New maximum number of keys; 0 disables caching.
+        """
+        if maxsize < 0:
+            raise ValueError(f"Invalid cache size: {maxsize}")
+        self.maxsize = maxsize
+        while len(self._data) > maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def counters(self):
+        """Return (hits, misses, evictions)."""
+        return self.hits, self.misses, self.evictions
+
+    def add_counters(self, hits, misses, evictions):
+        """
+        Add counters collected elsewhere, e.g. by the same cache in a worker process.
+
+        Args:
+            hits (int): Number of hits to add.
+            misses (int): Number of misses to add.
+            evictions (int): Number of evictions to add.
+        """
+        self.hits += hits
+        self.misses += misses
+        self.evictions += evictions
+
+    def describe(self):
+        """Return a one-line summary of the counters."""
+        lookups = self.hits + self.misses
+        hit_rate = 100 * self.hits / lookups if lookups else 0.0
+        return (
+            f"{self.hits} hits, {self.misses} misses, {self.evictions} evictions"
+            f" ({hit_rate:.1f}% hit rate, {len(self)}/{self.maxsize} entries)"
+        )
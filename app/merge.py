@@ -0,0 +1,181 @@
+import heapq
+import itertools
+import pickle
+import tempfile
+from operator import gt, itemgetter
+
+# Entries held in memory by `ChronologicalMerger`, all accounts together, before sorted runs
+# are merged into run files on disk
+DEFAULT_SPILL_THRESHOLD = 500000
+
+# (key, item) pairs pickled together in a run file
+SPILL_CHUNK_ITEMS = 4096
+
+_first = itemgetter(0)
+_second = itemgetter(1)
+
+
+def sorted_run(items, key):
+    """
+    Sort the items of one statement by key, keeping the file order of equal keys.
+
+    Statements are almost always in date order already, which is checked in one pass
+    before falling back to a (stable) sort.
+
+    Args:
+        items (iterable): Items of one statement (QIF entries or transactions).
+        key (callable): Function returning the sort key of an item (e.g. its ISO date).
+
+    Returns:
+        list: (key, item) pairs in key order.
+    """
+    items = list(items)
+    keys = list(map(key, items))
+    run = list(zip(keys, items))
+    if any(map(gt, keys, keys[1:])):
+        run.sort(key=_first)
+    return run
+
+
+def merge_runs(runs, key):
+    """
+    Merge the items of several statements into one sequence ordered by key.
+
+    Every run is sorted by `sorted_run` and the runs are combined with a k-way
+    `heapq.merge`. Items with equal keys keep the order of their runs, so statements given
+    oldest first stay in that order within a day.
+
+    Args:
+        runs (iterable): One iterable of items per statement, oldest statement first.
+        key (callable): Function returning the sort key of an item.
+
+    Returns:
+        list: Every item, in key order.
+    """
+    runs = [sorted_run(run, key) for run in runs]
+    if len(runs) == 1:
+        return list(map(_second, runs[0]))
+    return list(map(_second, heapq.merge(*runs, key=_first)))
+
+
+class ChronologicalMerger:
+    """
+    Orders the items of every account by key, with an external merge sort for large accounts.
+
+    Statements are added one at a time as sorted runs (see `sorted_run`). Once the runs
+    held in memory, all accounts together, exceed `threshold` items, the runs of the
+    largest accounts are merged into run files in a temporary directory until half of
+    `threshold` is left. Memory therefore stays bounded by `threshold` plus one statement, whatever the
+    length of the history and the number of accounts. Iterating an account k-way merges
+    its run files and in-memory runs with `heapq.merge`, reading the run files
+    sequentially.
+
+    Items must be picklable. The merger is a context manager removing its run files.
+
+    Args:
+        key (callable): Function returning the sort key of an item (e.g. its ISO date).
+        threshold (int): Items kept in memory, all accounts together, before spilling the
+                         largest accounts to disk.
+        temp_dir (str): Directory of the run files, default to the system temp directory.
+    """
+
+    def __init__(self, key, threshold=DEFAULT_SPILL_THRESHOLD, temp_dir=None):
+        self.key = key
+        self.threshold = threshold
+        self.temp_dir = temp_dir
+        # Account name -> in-memory runs, in-memory item count and run files, in
+        # first-seen order
+        self._runs = {}
+        self._sizes = {}
+        self._files = {}
+        # Items held in memory, all accounts together
+        self.held = 0
+        self.spills = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def add(self, account_name, items):
+        """
+        Add the items of one statement to an account.
+
+        Args:
+            account_name (str): Account name with currency suffix.
+            items (iterable): Items of the statement, in file order.
+        """
+        run = sorted_run(items, self.key)
+        if not run:
+            return
+        runs = self._runs.setdefault(account_name, [])
+        self._files.setdefault(account_name, [])
+        runs.append(run)
+        self._sizes[account_name] = self._sizes.get(account_name, 0) + len(run)
+        self.held += len(run)
+        if self.held > self.threshold:
+            # Spill down to half the threshold, so that the next statements do not spill
+            # again at once
+            while self.held > self.threshold // 2:
+                self._spill(max(self._sizes, key=self._sizes.__getitem__))
+
+    def _spill(self, account_name):
+        runs = self._runs[account_name]
+        file = tempfile.TemporaryFile(dir=self.temp_dir)
+        merged = heapq.merge(*runs, key=_first)
+        while True:
+            chunk = list(itertools.islice(merged, SPILL_CHUNK_ITEMS))
+            if not chunk:
+                break
+            pickle.dump(chunk, file, pickle.HIGHEST_PROTOCOL)
+        file.seek(0)
+        self._files[account_name].append(file)
+        runs.clear()
+        self.held -= self._sizes[account_name]
+        self._sizes[account_name] = 0
+        self.spills += 1
+
+    @staticmethod
+    def _read_run(file):
+        while True:
+            try:
+                chunk = pickle.load(file)
+            except EOFError:
+                return
+            yield from chunk
+
+    def accounts(self):
+        """Return the account names in the order they were first added."""
+        return list(self._runs)
+
+    def iter_account(self, account_name):
+        """
+        Iterate the items of an account in key order.
+
+        Items with equal keys come in the order their statements were added. Each account
+        can be iterated once.
+
+        Returns:
+            iterator: Every item of the account.
+        """
+        streams = [self._read_run(file) for file in self._files.get(account_name, ())]
+        streams.extend(self._runs.get(account_name, ()))
+        if len(streams) == 1 and isinstance(streams[0], list):
+            return map(_second, streams[0])
+        return map(_second, heapq.merge(*streams, key=_first))
+
+    def items(self):
+        """Iterate (account_name, items) pairs, see `iter_account`."""
+        for account_name in self.accounts():
+            yield account_name, self.iter_account(account_name)
+
+    def close(self):
+        """Remove the run files."""
+        for files in self._files.values():
+            for file in files:
+                file.close()
+        self._files.clear()
+        self._runs.clear()
+        self._sizes.clear()
+        self.held = 0
@@ -0,0 +1,259 @@
+from fractions import Fraction
+from functools import lru_cache
+
+from app.memo import DEFAULT_PARSE_CACHE_SIZE
+
+# Amounts are held as integer cents
+CENTS_PER_UNIT = 100
+
+# Prices are rounded half to even to this many decimals, then trailing zeros are trimmed
+# down to two decimals: 150.00, 159.50, 142.857143
+PRICE_DECIMALS = 6
+PRICE_SCALE = 10**PRICE_DECIMALS
+
+# Price units per cent
+CENT_PRICE_SCALE = PRICE_SCALE // CENTS_PER_UNIT
+
+# Two-digit fractional parts, indexed by cents
+CENT_DIGITS = tuple(f"{cents:02d}" for cents in range(CENTS_PER_UNIT))
+
+
+def divide_half_even(numerator, denominator):
+    """
+    Divide two integers, rounding the quotient half to even.
+
+    Args:
+        numerator (int): Dividend.
+        denominator (int): Divisor.
+
+    Returns:
+        int: The rounded quotient.
+
+    Raises:
+        ZeroDivisionError: If the denominator is 0.
+    """
+    if denominator < 0:
+        numerator, denominator = -numerator, -denominator
+    quotient, remainder = divmod(numerator, denominator)
+    twice = 2 * remainder
+    if twice > denominator or (twice == denominator and quotient & 1):
+        quotient += 1
+    return quotient
+
+
+def parse_cents(amount):
+    """
+    Parse a decimal amount string into integer cents, digit by digit.
+
+    Amounts with more than two decimals are rounded half to even to the cent.
+
+    Args:
+        amount (str): Amount as written in the statement (e.g., "-1500.00", "1000.0").
+
+    Examples:
+        "-1500.00" → -150000
+        "1000.0" → 100000
+        "0.125" → 12
+
+    Returns:
+        int: The amount in cents.
+
+    Raises:
+        ValueError: If the amount is not a plain decimal number.
+    """
+    whole, _, fraction = amount.strip().partition(".")
+    if not whole.lstrip("+-") and not fraction:
+        raise ValueError(f"Invalid amount: {amount!r}")
+    try:
+        if len(fraction) <= 2:
+            return int(whole + fraction.ljust(2, "0"))
+        return divide_half_even(int(whole + fraction), 10 ** (len(fraction) - 2))
+    except ValueError:
+        raise ValueError(f"Invalid amount: {amount!r}") from None
+
+
+@lru_cache(maxsize=DEFAULT_PARSE_CACHE_SIZE)
+def parse_amount(amount):
+    """
+    Parse a statement amount into its absolute value in cents.
+
+    Statement amounts are normally written with two decimals: the cents are then the
+    integer read from the digits with the decimal point removed, in a single `int` call.
+    Any other amount, or one `int` rejects, goes through `parse_cents`. Recurring
+    contributions, transfers and fees repeat the same amounts, so results are memoized.
+
+    Args:
+        amount (str): Amount as written in the statement (e.g., "-1500.00").
+
+    Examples:
+        "-1500.00" → 150000
+        "1000.0" → 100000
+
+    Returns:
+        int: The absolute amount in cents.
+
+    Raises:
+        ValueError: If the amount is not a number.
+    """
+    # `int` ignores trailing whitespace, which `parse_cents` strips before finding the point
+    if amount[-3:-2] == "." and not amount[-1:].isspace():
+        try:
+            return abs(int(amount.replace(".", "", 1)))
+        except ValueError:
+            pass
+    return abs(parse_cents(amount))
+
+
+def cents_from_float(value):
+    """
+    Convert a float parsed from a description (e.g. a fee) into integer cents.
+
+    The result is exact for the digits the float was parsed from, not its binary value: a
+    float that is the closest one to a whole number of cents is that number of cents, and
+    any other float goes through its shortest decimal representation.
+
+    Args:
+        value (float): Amount in dollars (e.g., 1.5).
+
+    Returns:
+        int: The amount in cents (e.g., 150).
+    """
+    cents = round(value * CENTS_PER_UNIT)
+    if cents / CENTS_PER_UNIT == value:
+        return cents
+    return parse_cents(repr(float(value)))
+
+
+@lru_cache(maxsize=DEFAULT_PARSE_CACHE_SIZE)
+def format_cents(cents):
+    """
+    Format integer cents with exactly two decimals.
+
+    Totals repeat like the amounts they are parsed from, and fees are mostly 0, so results
+    are memoized.
+
+    Args:
+        cents (int): Amount in cents.
+
+    Examples:
+        150000 → "1500.00"
+        -5 → "-0.05"
+
+    Returns:
+        str: The formatted amount.
+    """
+    if cents > 0:
+        return f"{cents // CENTS_PER_UNIT}.{CENT_DIGITS[cents % CENTS_PER_UNIT]}"
+    if cents:
+        # Negative totals format directly rather than through a second cached call
+        whole, part = divmod(-cents, CENTS_PER_UNIT)
+        return f"-{whole}.{CENT_DIGITS[part]}"
+    return "0.00"
+
+
+@lru_cache(maxsize=DEFAULT_PARSE_CACHE_SIZE)
+def quantity_ratio(quantity):
+    """
+    Return a share or contract count as an exact (numerator, denominator) pair.
+
+    Fractional counts are taken from their shortest decimal representation, so 0.7 shares
+    is 7/10 rather than the nearest binary fraction. Share counts repeat across rows, so
+    results are memoized.
+
+    Args:
+        quantity (float or int): Number of shares or contracts.
+
+    Returns:
+        tuple: (numerator, denominator) integers.
+
+    Raises:
+        TypeError: If the quantity is not a number (e.g. None when it could not be parsed).
+    """
+    numerator, denominator = float(quantity).as_integer_ratio()
+    if denominator == 1:
+        return numerator, 1
+    text = repr(float(quantity))
+    whole, _, fraction = text.partition(".")
+    if "e" in text:
+        ratio = Fraction(text)
+        return ratio.numerator, ratio.denominator
+    return int(whole + fraction), 10 ** len(fraction)
+
+
+def price_units(cents, quantity):
+    """
+    Compute the unit price of a trade from its total and quantity.
+
+    The division is exact and the result is rounded half to even to `PRICE_DECIMALS`
+    decimals.
+
+    Args:
+        cents (int): Trade total in cents.
+        quantity (float or int): Number of shares or contracts.
+
+    Examples:
+        (150000, 10.0) → 150000000 (150.00)
+        (10000, 0.7) → 142857143 (142.857143)
+
+    Returns:
+        int: The price in units of 10**-PRICE_DECIMALS.
+
+    Raises:
+        ZeroDivisionError: If the quantity is 0.
+        TypeError: If the quantity is not a number.
+    """
+    if not quantity % 1:
+        numerator, denominator = int(quantity), 1
+    else:
+        numerator, denominator = quantity_ratio(quantity)
+    units, remainder = divmod(cents * denominator, numerator)
+    if not remainder:
+        return units * CENT_PRICE_SCALE
+    return divide_half_even(cents * denominator * CENT_PRICE_SCALE, numerator)
+
+
+def format_price_units(units):
+    """
+    Format a price in units of 10**-PRICE_DECIMALS, trimming trailing zeros down to two
+    decimals.
+
+    Args:
+        units (int): Price as returned by `price_units`.
+
+    Examples:
+        150000000 → "150.00"
+        142857143 → "142.857143"
+
+    Returns:
+        str: The formatted price.
+    """
+    sign = ""
+    if units < 0:
+        sign, units = "-", -units
+    whole, fraction = divmod(units, PRICE_SCALE)
+    if fraction % CENT_PRICE_SCALE == 0:
+        return f"{sign}{whole}.{CENT_DIGITS[fraction // CENT_PRICE_SCALE]}"
+    return f"{sign}{whole}.{fraction:0{PRICE_DECIMALS}d}".rstrip("0")
+
+
+def format_price(cents, quantity):
+    """
+    Compute and format the unit price of a trade from its total and quantity.
+
+    Args:
+        cents (int): Trade total in cents.
+        quantity (float or int): Number of shares or contracts.
+
+    Examples:
+        (150000, 10.0) → "150.00"
+        (31900, 2) → "159.50"
+        (10000, 0.7) → "142.857143"
+
+    Returns:
+        str: The formatted price, see `price_units` and `format_price_units`.
+
+    Raises:
+        ZeroDivisionError: If the quantity is 0.
+        TypeError: If the quantity is not a number.
+    """
+    return format_price_units(price_units(cents, quantity))
@@ -0,0 +1,229 @@
+import itertools
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# Write buffer of each open QIF file
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+
+# Entries joined into a single write: large enough to amortize the write calls, small
+# enough that the joined chunk stays a fraction of the buffer
+WRITE_CHUNK_ENTRIES = 1024
+
+# Threads writing account files at the same time in `write_qif_outputs`
+DEFAULT_WRITE_THREADS = 4
+
+# Tells apart the temporary files of outputs open at the same time in this process
+_TEMP_IDS = itertools.count()
+
+
+class AtomicFile:
+    """
+    Output file written under a temporary name and published with `os.replace`.
+
+    The temporary file lives in the directory of the final path, so publishing it is an
+    atomic rename: readers see either the previous file or the complete new one, never a
+    truncated file. A discarded output leaves the previous file untouched.
+
+    Used as a context manager, the file is published if the block succeeds and discarded
+    if it raises.
+
+    Args:
+        path (str): Final path of the file.
+        buffer_size (int): Size in bytes of the write buffer.
+        encoding (str): Text encoding of the file. Default to the locale encoding.
+    """
+
+    def __init__(self, path, buffer_size=DEFAULT_BUFFER_SIZE, encoding=None):
+        directory, name = os.path.split(path)
+        self.path = path
+        self.temp_path = os.path.join(
+            directory, f".{name}.{os.getpid()}-{next(_TEMP_IDS)}.tmp"
+        )
+        self.file = open(self.temp_path, "w", buffering=buffer_size, encoding=encoding)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.publish()
+        else:
+            self.discard()
+
+    @property
+    def paths(self):
+        """Return the final path in a list, like the shards of a `ShardedQifWriter`."""
+        return [self.path]
+
+    def finish(self):
+        """Flush and close the temporary file, without publishing it."""
+        self.file.close()
+
+    def replace(self):
+        """Move the finished temporary file over the final path."""
+        os.replace(self.temp_path, self.path)
+
+    def publish(self):
+        """Close the temporary file and move it over the final path."""
+        self.finish()
+        self.replace()
+
+    def discard(self):
+        """Close and remove the temporary file, leaving the final path untouched."""
+        self.file.close()
+        try:
+            os.remove(self.temp_path)
+        except FileNotFoundError:
+            pass
+
+
+class QifFileWriter(AtomicFile):
+    """
+    QIF file written through a large buffered handle, one entry at a time.
+
+    The header line is written when the file is opened and every entry is followed by a
+    newline, so the file holds the header and the entries one per line, ending with a
+    newline. Nothing is kept in memory beyond the write buffer and one chunk of entries:
+    the caller's lists are never copied nor modified, and entries can come from an
+    iterator. The file only appears at `path` once published, see `AtomicFile`.
+
+    Args:
+        path (str): Path of the QIF file, replaced if it exists.
+        header (str): QIF header line (e.g., '!Type:Bank').
+        buffer_size (int): Size in bytes of the write buffer.
+    """
+
+    def __init__(self, path, header, buffer_size=DEFAULT_BUFFER_SIZE):
+        super().__init__(path, buffer_size)
+        self.entries = 0
+        self.file.write(header + "\n")
+
+    def write(self, entry):
+        """Write a single QIF entry."""
+        self.file.write(entry)
+        self.file.write("\n")
+        self.entries += 1
+
+    def write_entries(self, entries):
+        """
+        Write a sequence of QIF entries.
+
+        Entries are joined a chunk of `WRITE_CHUNK_ENTRIES` at a time, which saves most of
+        the per-entry write calls without building the whole file in memory.
+
+        Args:
+            entries (iterable): QIF entry strings, e.g. a list or a generator.
+        """
+        self.entries += _write_chunks(self.file.write, entries)
+
+
+def _write_chunks(write, entries):
+    """Write QIF entries one per line, a chunk at a time, and return how many were written."""
+    count = 0
+    entries = iter(entries)
+    while True:
+        chunk = list(itertools.islice(entries, WRITE_CHUNK_ENTRIES))
+        if not chunk:
+            return count
+        write("\n".join(chunk))
+        write("\n")
+        count += len(chunk)
+
+
+def append_qif_entries(path, entries, size, buffer_size=DEFAULT_BUFFER_SIZE):
+    """
+    Append QIF entries to an existing QIF file.
+
+    The file is first cut back to `size` bytes, its length after the last complete export,
+    which drops whatever an interrupted append left behind.
+
+    Args:
+        path (str): Path of the QIF file.
+        entries (iterable): QIF entry strings.
+        size (int): Length in bytes the file had after the last complete export.
+        buffer_size (int): Size in bytes of the write buffer.
+
+    Returns:
+        int: Number of entries appended.
+    """
+    os.truncate(path, size)
+    with open(path, "a", buffering=buffer_size) as file:
+        return _write_chunks(file.write, entries)
+
+
+def publish_all(outputs):
+    """
+    Publish a set of output files together.
+
+    Every file is flushed before the first one is published, so a failed write (e.g. a
+    full disk) discards them all and leaves every previous file in place.
+
+    Args:
+        outputs (list): `AtomicFile` (or `ShardedQifWriter`) instances.
+    """
+    try:
+        for output in outputs:
+            output.finish()
+    except BaseException:
+        discard_all(outputs)
+        raise
+    for output in outputs:
+        output.replace()
+
+
+def discard_all(outputs):
+    """Discard a set of output files, see `AtomicFile.discard`."""
+    for output in outputs:
+        output.discard()
+
+
+def write_qif_outputs(
+    files,
+    buffer_size=DEFAULT_BUFFER_SIZE,
+    threads=DEFAULT_WRITE_THREADS,
+    open_writer=None,
+):
+    """
+    Write several QIF files concurrently, then publish them together.
+
+    Each file is written by its own `QifFileWriter` from a thread pool, so the writes of
+    different accounts overlap on slow or network storage. Files are only published once
+    all of them are written; if any write fails, no file is replaced.
+
+    Args:
+        files (list): (path, header, entries) tuples, where entries is an iterable of QIF
+                      entry strings.
+        buffer_size (int): Size in bytes of the write buffer of each file.
+        threads (int): Maximum number of files written at the same time.
+        open_writer (callable): Called with (path, header, buffer_size) to open each file,
+                                default to `QifFileWriter` (see `app.shards.qif_writer_factory`).
+
+    Returns:
+        list: The published writers, in `files` order.
+    """
+    open_writer = open_writer or QifFileWriter
+    writers = [None] * len(files)
+
+    def write(index, path, header, entries):
+        writer = writers[index] = open_writer(path, header, buffer_size)
+        writer.write_entries(entries)
+        writer.finish()
+
+    try:
+        if threads > 1 and len(files) > 1:
+            with ThreadPoolExecutor(max_workers=min(threads, len(files))) as executor:
+                futures = [
+                    executor.submit(write, index, *file)
+                    for index, file in enumerate(files)
+                ]
+                for future in futures:
+                    future.result()
+        else:
+            for index, file in enumerate(files):
+                write(index, *file)
+    except BaseException:
+        discard_all([writer for writer in writers if writer is not None])
+        raise
+
+    publish_all(writers)
+    return writers
@@ -0,0 +1,101 @@
+import csv
+import os
+
+ON_ERROR_MODES = ("raise", "quarantine")
+
+DEFAULT_QUARANTINE_FILE = "quarantine.csv"
+
+# Errors raised by a single malformed row: unknown transaction codes, descriptions the
+# parsers cannot read (e.g. a missing share count), short rows and missing columns
+ROW_ERRORS = (ValueError, TypeError, ZeroDivisionError, IndexError, KeyError)
+
+QUARANTINE_COLUMNS = (
+    "file",
+    "line",
+    "reason",
+    "date",
+    "transaction",
+    "description",
+    "amount",
+    "currency",
+)
+
+
+def describe_error(error):
+    """Return the reason recorded for a row rejected with `error`."""
+    return f"{type(error).__name__}: {error}"
+
+
+class Quarantine:
+    """
+    Rows rejected in `--on-error=quarantine` mode, written to a CSV file at the end of the run.
+
+    Converters record the rows they cannot convert as (line, reason, record) tuples, where
+    line is the line number in the statement and record the (date, transaction,
+    description, amount, currency) values of the row, and carry on with the next row.
+
+    Args:
+        path (str): Path of the quarantine CSV file.
+    """
+
+    def __init__(self, path=DEFAULT_QUARANTINE_FILE):
+        self.path = path
+        # (source, line, reason, record) of every rejected row, in conversion order
+        self.rows = []
+        # Rejected line numbers of each statement, so `lines` does not rescan every row
+        self.lines_by_source = {}
+
+    def __len__(self):
+        return len(self.rows)
+
+    def add(self, source, rejects):
+        """
+        Record the rows rejected in a statement.
+
+        Args:
+            source (str): Statement path.
+            rejects (iterable): (line, reason, record) tuples.
+        """
+        lines = self.lines_by_source.setdefault(source, set())
+        for line, reason, record in rejects:
+            self.rows.append((source, line, reason, record))
+            lines.add(line)
+
+    def lines(self, source):
+        """
+        Return the line numbers of the rows rejected in a statement.
+
+        Args:
+            source (str): Statement path, as passed to `add`.
+
+        Returns:
+            set: Line numbers in the statement.
+        """
+        return set(self.lines_by_source.get(source, ()))
+
+    def save(self):
+        """Write every rejected row to the quarantine file, replacing any previous one."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "w", newline="") as file:
+            writer = csv.writer(file, lineterminator="\n")
+            writer.writerow(QUARANTINE_COLUMNS)
+            for source, line, reason, record in self.rows:
+                writer.writerow((source, line, reason, *record))
+
+    def report(self):
+        """Print a summary of the rejected rows, grouped by reason."""
+        if not self.rows:
+            print("No rows quarantined")
+            return
+        sources = {source for source, _, _, _ in self.rows}
+        print(
+            f"Quarantined {len(self.rows)} row(s) from {len(sources)} statement(s)"
+            f" to {self.path}"
+        )
+        reasons = {}
+        for _, _, reason, _ in self.rows:
+            reasons[reason] = reasons.get(reason, 0) + 1
+        for reason, count in sorted(reasons.items(), key=lambda item: -item[1]):
+            print(f"  {count} row(s): {reason}")
@@ -0,0 +1,226 @@
+import functools
+import os
+import re
+
+from app.dates import parse_qif_date
+from app.output import DEFAULT_BUFFER_SIZE, QifFileWriter
+
+
+def _year(date):
+    return date[:4]
+
+
+def _quarter(date):
+    return f"{date[:4]}-Q{(int(date[5:7]) + 2) // 3}"
+
+
+def _month(date):
+    return date[:7]
+
+
+# Period of an ISO date used in the shard file names, keyed by `--split-by` choice
+SPLIT_PERIODS = {
+    "year": _year,
+    "quarter": _quarter,
+    "month": _month,
+}
+
+
+def _shard_pattern(path):
+    # Any name a `ShardedQifWriter` of `path` can produce, including `path` itself
+    root, extension = os.path.splitext(os.path.basename(path))
+    return re.compile(
+        rf"{re.escape(root)}(?:-\d{{4}}(?:-Q[1-4]|-\d\d)?)?(?:-\d+)?{re.escape(extension)}"
+    )
+
+
+def remove_stale_shards(path, keep, other_paths=()):
+    """
+    Remove the QIF files of an account left by runs with other sharding options.
+
+    A run with other `--split-by`/`--max-entries` options (or none) writes another set of
+    names, e.g. `My-TFSA-2024.qif` after `My-TFSA.qif`; importing the folder would then
+    import the transactions twice. Every file next to `path` named like one of its shards,
+    or `path` itself, is removed unless it was just written or it can be a file of another
+    account (e.g. `My-TFSA-2024.qif` of an account nicknamed `My-TFSA-2024`).
+
+    Args:
+        path (str): Path of the unsharded QIF file of the account (e.g., 'output/My-TFSA.qif').
+        keep (iterable): Paths written by the current run.
+        other_paths (iterable): Unsharded QIF paths of the other accounts.
+
+    Returns:
+        list: The removed paths.
+    """
+    directory = os.path.dirname(path)
+    pattern = _shard_pattern(path)
+    others = [
+        _shard_pattern(other)
+        for other in other_paths
+        if os.path.normpath(other) != os.path.normpath(path)
+    ]
+    kept = {os.path.normpath(kept_path) for kept_path in keep}
+    try:
+        names = sorted(os.listdir(directory or "."))
+    except FileNotFoundError:
+        return []
+
+    removed = []
+    for name in names:
+        stale_path = os.path.join(directory, name)
+        if (
+            not pattern.fullmatch(name)
+            or os.path.normpath(stale_path) in kept
+            or any(other.fullmatch(name) for other in others)
+        ):
+            continue
+        try:
+            os.remove(stale_path)
+        except FileNotFoundError:
+            continue
+        removed.append(stale_path)
+    return removed
+
+
+class ShardedQifWriter:
+    """
+    QIF output of one account split into several files by period and/or size.
+
+    Entries must arrive in date order (as produced by `read_csv_files` and
+    `iter_csv_entries`). Each shard is a `QifFileWriter` with the account's header, opened
+    when its first entry arrives and finished as soon as the next shard starts, so a
+    single shard is open at a time and nothing is buffered beyond its write buffer. Shard
+    names extend the account's file name with the period and, when `max_entries` is set,
+    the part number: `My-TFSA-2024.qif`, `My-TFSA-2024-Q3-2.qif`, `My-TFSA-1.qif`.
+
+    Shards are temporary files until published; like a single `AtomicFile`, the writer is
+    published with `publish_all` or removed with `discard_all`.
+
+    Args:
+        path (str): Path of the unsharded QIF file (e.g., 'output/My-TFSA.qif').
+        header (str): QIF header line written at the top of every shard.
+        buffer_size (int): Size in bytes of the write buffer of the open shard.
+        split_by (str): Key of `SPLIT_PERIODS`, or None to split by size only.
+        max_entries (int): Maximum number of entries per shard, or None.
+
+    Raises:
+        ValueError: If the period is not recognized or `max_entries` is below 1.
+    """
+
+    def __init__(
+        self,
+        path,
+        header,
+        buffer_size=DEFAULT_BUFFER_SIZE,
+        split_by=None,
+        max_entries=None,
+    ):
+        if split_by is not None and split_by not in SPLIT_PERIODS:
+            raise ValueError(f"Invalid split period: {split_by}")
+        if max_entries is not None and max_entries < 1:
+            raise ValueError(f"Invalid maximum entries per file: {max_entries}")
+        self.path = path
+        self.header = header
+        self.buffer_size = buffer_size
+        self.period = SPLIT_PERIODS[split_by] if split_by is not None else None
+        self.max_entries = max_entries
+        self.shards = []
+        self.entries = 0
+        self._root, self._extension = os.path.splitext(path)
+        self._shard = None
+        self._label = None
+        self._part = 0
+        self._finished_labels = set()
+        # Date line of the previous entry and its period, since most entries share a date
+        self._date_text = None
+        self._date_label = None
+
+    @property
+    def paths(self):
+        """Return the paths of the shards, in the order they were opened."""
+        return [shard.path for shard in self.shards]
+
+    def _open_shard(self, label):
+        if self._shard is not None:
+            self._shard.finish()
+        if label != self._label:
+            if label in self._finished_labels:
+                raise ValueError(f"Entries are not in date order: {label} starts again")
+            self._finished_labels.add(self._label)
+            self._label = label
+            self._part = 0
+        self._part += 1
+
+        suffixes = [label] if label is not None else []
+        if self.max_entries is not None:
+            suffixes.append(str(self._part))
+        path = "".join(
+            [self._root, *(f"-{suffix}" for suffix in suffixes), self._extension]
+        )
+        self._shard = QifFileWriter(path, self.header, self.buffer_size)
+        self.shards.append(self._shard)
+
+    def write(self, entry):
+        """Write a single QIF entry, starting a new shard when its period or size calls for it."""
+        label = self._label
+        if self.period is not None:
+            date_text = entry[1 : entry.index("\n")]
+            if date_text != self._date_text:
+                self._date_text = date_text
+                self._date_label = self.period(parse_qif_date(date_text))
+            label = self._date_label
+
+        shard = self._shard
+        if (
+            shard is None
+            or label != self._label
+            or (self.max_entries is not None and shard.entries >= self.max_entries)
+        ):
+            self._open_shard(label)
+            shard = self._shard
+        shard.write(entry)
+        self.entries += 1
+
+    def write_entries(self, entries):
+        """Write a sequence of QIF entries, e.g. a list or a generator."""
+        for entry in entries:
+            self.write(entry)
+
+    def finish(self):
+        """Flush and close every shard, without publishing them."""
+        for shard in self.shards:
+            shard.finish()
+
+    def replace(self):
+        """Move every finished shard over its final path."""
+        for shard in self.shards:
+            shard.replace()
+
+    def publish(self):
+        """Finish the shards and move them over their final paths."""
+        self.finish()
+        self.replace()
+
+    def discard(self):
+        """Remove every shard, leaving the final paths untouched."""
+        for shard in self.shards:
+            shard.discard()
+
+
+def qif_writer_factory(split_by=None, max_entries=None):
+    """
+    Return the callable opening the QIF output of an account.
+
+    Args:
+        split_by (str): Key of `SPLIT_PERIODS`, or None.
+        max_entries (int): Maximum number of entries per file, or None.
+
+    Returns:
+        callable: Called with (path, header, buffer_size); `QifFileWriter` when the output
+                  is not sharded, a `ShardedQifWriter` factory otherwise.
+    """
+    if split_by is None and max_entries is None:
+        return QifFileWriter
+    return functools.partial(
+        ShardedQifWriter, split_by=split_by, max_entries=max_entries
+    )
@@ -0,0 +1,189 @@
+import bz2
+import contextlib
+import gzip
+import io
+import lzma
+import os
+import zipfile
+
+# Separates a zip archive path from the name of a statement inside it,
+# e.g. 'input/2024.zip::monthly-statement-transactions-AB1234567CAD-2024-01-31.csv'
+ZIP_MEMBER_SEPARATOR = "::"
+
+# Openers for compressed statements, keyed by compression suffix
+COMPRESSED_OPENERS = {
+    ".gz": gzip.open,
+    ".bz2": bz2.open,
+    ".xz": lzma.open,
+}
+
+STATEMENT_SUFFIXES = (".csv",) + tuple(f".csv{suffix}" for suffix in COMPRESSED_OPENERS)
+
+ARCHIVE_SUFFIX = ".zip"
+
+
+def is_statement_name(filename):
+    """
+    Check whether a file name looks like a (possibly compressed) CSV statement.
+
+    Args:
+        filename (str): File name or zip member name.
+
+    Returns:
+        bool: True for names ending in '.csv', '.csv.gz', '.csv.bz2' or '.csv.xz'.
+    """
+    return filename.endswith(STATEMENT_SUFFIXES)
+
+
+def split_source(source):
+    """
+    Split a statement source into its archive path and member name.
+
+    Args:
+        source (str): Plain file path, or '{archive}::{member}' for a statement inside a zip.
+
+    Returns:
+        tuple: (path, member) where member is None for plain files.
+    """
+    path, separator, member = source.partition(ZIP_MEMBER_SEPARATOR)
+    return path, (member if separator else None)
+
+
+def iter_archive_members(archive_path):
+    """
+    List the statements stored in a zip archive.
+
+    Args:
+        archive_path (str): Path to a zip archive.
+
+    Yields:
+        tuple: (member_basename, source) for every statement in the archive, where source
+               can be passed to `open_statement`.
+    """
+    with zipfile.ZipFile(archive_path) as archive:
+        for member in archive.namelist():
+            basename = member.rsplit("/", 1)[-1]
+            if is_statement_name(basename):
+                yield basename, f"{archive_path}{ZIP_MEMBER_SEPARATOR}{member}"
+
+
+class ArchiveMemberText(io.TextIOWrapper):
+    """
+    Text stream over a zip member that closes the member and its archive with it.
+
+    Decompressors wrapping a file object leave it open when they are closed, so the
+    member stream and the ZipFile are held in an ExitStack closed along with the text.
+    """
+
+    def __init__(self, buffer, resources):
+        super().__init__(buffer)
+        self.resources = resources
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            self.resources.close()
+
+
+def open_archive_member(path, member):
+    """
+    Open a statement stored inside a zip archive for reading as text.
+
+    Args:
+        path (str): Path to the zip archive.
+        member (str): Name of the statement inside the archive, possibly compressed.
+
+    Returns:
+        ArchiveMemberText: Text stream that also closes the member and the archive.
+    """
+    with contextlib.ExitStack() as stack:
+        archive = stack.enter_context(zipfile.ZipFile(path))
+        stream = stack.enter_context(archive.open(member))
+        for suffix, opener in COMPRESSED_OPENERS.items():
+            if member.endswith(suffix):
+                stream = stack.enter_context(opener(stream, "rb"))
+                break
+        return ArchiveMemberText(stream, stack.pop_all())
+
+
+def open_statement(source):
+    """
+    Open a statement for reading as text, decompressing on the fly.
+
+    Plain '.csv' files are opened directly. '.csv.gz', '.csv.bz2' and '.csv.xz' files and
+    members of zip archives (themselves possibly compressed) are decoded straight from the
+    compressed stream without extracting anything to disk.
+
+    Args:
+        source (str): Plain file path, or '{archive}::{member}' for a statement inside a zip.
+
+    Returns:
+        file: Text stream positioned at the start of the CSV header.
+    """
+    path, member = split_source(source)
+    if member is not None:
+        return open_archive_member(path, member)
+
+    for suffix, opener in COMPRESSED_OPENERS.items():
+        if path.endswith(suffix):
+            return opener(path, "rt")
+    return open(path, "r")
+
+
+def open_statement_binary(source):
+    """
+    Open the raw bytes of a statement (compressed bytes for compressed files).
+
+    Args:
+        source (str): Plain file path, or '{archive}::{member}' for a statement inside a zip.
+
+    Returns:
+        file: Binary stream.
+    """
+    path, member = split_source(source)
+    if member is not None:
+        with zipfile.ZipFile(path) as archive:
+            return archive.open(member)
+    return open(path, "rb")
+
+
+def stat_statement(source):
+    """
+    Return the size and modification time of a statement.
+
+    Members of zip archives report their uncompressed size and the archive's mtime.
+
+    Args:
+        source (str): Plain file path, or '{archive}::{member}' for a statement inside a zip.
+
+    Returns:
+        tuple: (size, mtime_ns)
+    """
+    path, member = split_source(source)
+    stat = os.stat(path)
+    if member is None:
+        return stat.st_size, stat.st_mtime_ns
+    with zipfile.ZipFile(path) as archive:
+        return archive.getinfo(member).file_size, stat.st_mtime_ns
+
+
+def statement_exists(source):
+    """
+    Check whether a statement still exists.
+
+    Args:
+        source (str): Plain file path, or '{archive}::{member}' for a statement inside a zip.
+
+    Returns:
+        bool: True if the file (and the member, for archives) exists.
+    """
+    path, member = split_source(source)
+    if member is None:
+        return os.path.exists(path)
+    try:
+        with zipfile.ZipFile(path) as archive:
+            archive.getinfo(member)
+    except (OSError, KeyError, zipfile.BadZipFile):
+        return False
+    return True
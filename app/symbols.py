@@ -0,0 +1,171 @@
+import hashlib
+import json
+from types import MappingProxyType
+
+import yaml
+
+# Top-level key of the symbol section in accounts.yml
+SYMBOLS_CONFIG_KEY = "symbols"
+
+# Suffix of symbols without a specific rule
+DEFAULT_SUFFIX = "CT"
+
+# Built-in rules: CDRs get the '-QH' suffix when traded in CAD
+DEFAULT_SYMBOL_SUFFIXES = {
+    ("TSLA", "CAD"): "QH",
+    ("DIS", "CAD"): "QH",
+    ("NVDA", "CAD"): "QH",
+    ("AAPL", "CAD"): "QH",
+}
+
+
+class SymbolMap:
+    """
+    Table of exchange suffixes keyed by (symbol, currency), with a default suffix.
+
+    The table is frozen once built, and every rendered symbol ('TSLA-QH') is precomputed, so
+    rendering a row's symbol is a single dict lookup however many tickers are configured.
+    Symbols without a rule get the default suffix and are memoized on first sight.
+
+    Args:
+        suffixes (dict): (symbol, currency) to suffix, default to `DEFAULT_SYMBOL_SUFFIXES`.
+        default_suffix (str): Suffix of symbols without a rule, default to 'CT'.
+    """
+
+    def __init__(self, suffixes=None, default_suffix=DEFAULT_SUFFIX):
+        if suffixes is None:
+            suffixes = DEFAULT_SYMBOL_SUFFIXES
+        self.suffixes = MappingProxyType(dict(suffixes))
+        self.default_suffix = default_suffix
+        self._rendered = {
+            (symbol, currency): f"{symbol}-{suffix}"
+            for (symbol, currency), suffix in self.suffixes.items()
+        }
+
+    def __reduce__(self):
+        # Sent to worker processes; the mapping proxy itself cannot be pickled
+        return SymbolMap, (dict(self.suffixes), self.default_suffix)
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, SymbolMap)
+            and self.suffixes == other.suffixes
+            and self.default_suffix == other.default_suffix
+        )
+
+    def render(self, symbol, currency):
+        """
+        Return the symbol with its exchange suffix.
+
+        Args:
+            symbol (str): Uppercase symbol (e.g., "TSLA").
+            currency (str): The transaction currency (e.g., "CAD").
+
+        Returns:
+            str: Suffixed symbol (e.g., "TSLA-QH").
+        """
+        key = (symbol, currency)
+        rendered = self._rendered.get(key)
+        if rendered is None:
+            rendered = self._rendered[key] = f"{symbol}-{self.default_suffix}"
+        return rendered
+
+    def fingerprint(self):
+        """
+        Return a short digest of the rules, used to invalidate cached conversions.
+
+        Returns:
+            str: Hex encoded SHA-256 digest.
+        """
+        rules = sorted(
+            [symbol, currency, suffix]
+            for (symbol, currency), suffix in self.suffixes.items()
+        )
+        payload = json.dumps([self.default_suffix, rules])
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    @classmethod
+    def from_config(cls, section, base=None):
+        """
+        Build a symbol map from a `symbols` configuration section.
+
+        Rules are added on top of those of `base` (the built-in CDR rules by default); a rule
+        for the same symbol and currency replaces the inherited one.
+
+        Configuration Example:
+            ```yaml
+            symbols:
+              default: CT
+              CAD:
+                QH: [TSLA, DIS, NVDA, AAPL, AMZN, GOOGL]
+                NE: [XYZ]
+              USD:
+                CT: [SHOP]
+            ```
+
+        Args:
+            section (dict): Optional 'default' suffix, and for every currency a mapping of
+                            suffix to the list of symbols using it.
+            base (SymbolMap): Map whose rules and default suffix are inherited.
+
+        Returns:
+            SymbolMap
+
+        Raises:
+            ValueError: If the section does not follow this layout.
+        """
+        if section is None:
+            section = {}
+        if not isinstance(section, dict):
+            raise ValueError("Invalid symbols config: expected a mapping")
+
+        if base is None:
+            base = cls()
+        default_suffix = section.get("default", base.default_suffix)
+        if not isinstance(default_suffix, str):
+            raise ValueError(
+                f"Invalid symbols config: default suffix {default_suffix!r}"
+            )
+
+        suffixes = dict(base.suffixes)
+        for currency, rules in section.items():
+            if currency == "default":
+                continue
+            if not isinstance(rules, dict):
+                raise ValueError(
+                    f"Invalid symbols config for {currency}: expected a mapping"
+                )
+            for suffix, symbols in rules.items():
+                if not isinstance(symbols, list):
+                    raise ValueError(
+                        f"Invalid symbols config for {currency}: {suffix} needs a list of symbols"
+                    )
+                for symbol in symbols:
+                    suffixes[(str(symbol).upper(), currency)] = str(suffix)
+        return cls(suffixes, default_suffix)
+
+
+def load_symbol_map(config=None, symbols_filename=None):
+    """
+    Load the symbol map from the account configuration and/or a separate symbols file.
+
+    Args:
+        config (dict): Account configuration; its optional `symbols` section is used.
+        symbols_filename (str): Optional YAML file holding a symbols section, either at top
+                                level or under a `symbols` key. Its rules are applied after
+                                those of the account configuration.
+
+    Returns:
+        SymbolMap
+
+    Raises:
+        ValueError: If a symbols section is malformed.
+    """
+    symbol_map = SymbolMap.from_config((config or {}).get(SYMBOLS_CONFIG_KEY))
+    if symbols_filename:
+        with open(symbols_filename, "r") as file:
+            section = yaml.safe_load(file)
+        if isinstance(section, dict) and SYMBOLS_CONFIG_KEY in section:
+            section = section[SYMBOLS_CONFIG_KEY]
+        symbol_map = SymbolMap.from_config(section, base=symbol_map)
+    return symbol_map
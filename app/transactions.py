@@ -0,0 +1,26 @@
+from typing import NamedTuple
+
+
+class Transaction(NamedTuple):
+    """
+    A statement row parsed into typed fields, independent of any output format.
+
+    Rows are parsed once into these records; rendering them (e.g. as QIF entries with
+    `app.main.render_qif_entry`) is a separate stage, so several consumers can share one
+    parse. Being a tuple, a record holds no per-instance dict.
+
+    Money is held as integer cents and prices as integer units of 10**-6, see `app.money`.
+    """
+
+    date: str
+    # QIF action ('Buy', 'Sell', 'Div', 'XIn', 'XOut'), or None for a plain cash row
+    type: str
+    currency: str
+    symbol: str = None
+    quantity: float = None
+    price: int = None
+    # Signed total in cents: negative for money leaving a cash account
+    total: int = 0
+    fee: int = 0
+    memo: str = None
+    payee: str = None
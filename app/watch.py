@@ -0,0 +1,488 @@
+import csv
+import ctypes
+import ctypes.util
+import os
+import select
+import time
+import zipfile
+
+from app.dates import entry_date
+from app.main import (
+    configure_symbol_map,
+    conversion_settings,
+    convert_csv_files,
+    iter_statement_files,
+    read_config,
+    write_qif_files,
+)
+from app.merge import merge_runs
+from app.sources import stat_statement
+from app.symbols import load_symbol_map
+
+# inotify(7) event masks
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = os.O_NONBLOCK
+
+WATCH_MASK = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+)
+
+# Seconds of quiet after the last change before statements are reconverted
+DEFAULT_DEBOUNCE = 2.0
+
+# Seconds between two scans of the watched folders when inotify is not available
+DEFAULT_POLL_INTERVAL = 1.0
+
+# Errors that abort a refresh without stopping the daemon
+REFRESH_ERRORS = (
+    ValueError,
+    KeyError,
+    TypeError,
+    OSError,
+    csv.Error,
+    zipfile.BadZipFile,
+)
+
+
+class InotifyNotifier:
+    """
+    Wait for changes in a set of directories with Linux inotify.
+
+    Events are not decoded: any event on a watched directory only signals that it is worth
+    rescanning, and `StatementWatcher` works out what actually changed.
+
+    Args:
+        directories (iterable): Directories to watch.
+
+    Raises:
+        OSError: If inotify is not available on this platform.
+    """
+
+    def __init__(self, directories):
+        libc_name = ctypes.util.find_library("c")
+        if libc_name is None:
+            raise OSError("libc not found")
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+
+        self.fd = libc.inotify_init1(IN_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        for directory in directories:
+            watch = libc.inotify_add_watch(
+                self.fd, os.fsencode(directory), ctypes.c_uint32(WATCH_MASK)
+            )
+            if watch < 0:
+                os.close(self.fd)
+                raise OSError(ctypes.get_errno(), f"Cannot watch {directory}")
+
+    def wait(self, timeout):
+        """
+        Block until a change is seen or the timeout expires.
+
+        Args:
+            timeout (float): Seconds to wait, None to wait forever.
+
+        Returns:
+            bool: True if at least one change was seen.
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return False
+        # Drain every queued event; their content does not matter
+        while True:
+            try:
+                if not os.read(self.fd, 64 * 1024):
+                    break
+            except BlockingIOError:
+                break
+        return True
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingNotifier:
+    """
+    Portable fallback for `InotifyNotifier` that rescans the watched directories.
+
+    Files are stat'ed on their own rather than through their directory, so the config file
+    can be watched without the output and cache folders that usually sit next to it.
+
+    Args:
+        directories (iterable): Directories to watch.
+        interval (float): Seconds between two scans.
+        files (iterable): Single files to watch.
+    """
+
+    def __init__(self, directories, interval=DEFAULT_POLL_INTERVAL, files=()):
+        self.directories = list(directories)
+        self.files = list(files)
+        self.interval = interval
+        self.snapshot = self._scan()
+
+    def _scan(self):
+        snapshot = {}
+        for directory in self.directories:
+            try:
+                entries = os.scandir(directory)
+            except FileNotFoundError:
+                # Removed since the notifier was set up; its parent reports the removal
+                continue
+            with entries:
+                for entry in entries:
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    snapshot[entry.path] = (stat.st_size, stat.st_mtime_ns)
+        for filename in self.files:
+            try:
+                stat = os.stat(filename)
+            except FileNotFoundError:
+                snapshot[filename] = None
+                continue
+            snapshot[filename] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+
+    def wait(self, timeout):
+        """
+        Block until a change is seen or the timeout expires.
+
+        Args:
+            timeout (float): Seconds to wait, None to wait forever.
+
+        Returns:
+            bool: True if at least one change was seen.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            delay = self.interval
+            if deadline is not None:
+                delay = min(delay, max(0.0, deadline - time.monotonic()))
+            time.sleep(delay)
+
+            snapshot = self._scan()
+            if snapshot != self.snapshot:
+                self.snapshot = snapshot
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+
+    def close(self):
+        pass
+
+
+def create_notifier(directories, poll_interval=DEFAULT_POLL_INTERVAL, files=()):
+    """
+    Return an inotify based notifier, or a polling one where inotify is not available.
+
+    Args:
+        directories (iterable): Directories to watch.
+        poll_interval (float): Seconds between two scans for the polling fallback.
+        files (iterable): Single files to watch; inotify watches their directories, since
+                          editors often replace a file rather than write it in place.
+
+    Returns:
+        InotifyNotifier or PollingNotifier
+    """
+    directories = list(directories)
+    files = list(files)
+    try:
+        watched = list(directories)
+        for filename in files:
+            directory = os.path.dirname(os.path.abspath(filename))
+            if directory not in map(os.path.abspath, watched):
+                watched.append(directory)
+        return InotifyNotifier(watched)
+    except (OSError, AttributeError):
+        return PollingNotifier(directories, interval=poll_interval, files=files)
+
+
+class StatementWatcher:
+    """
+    Keep conversion state warm and reconvert only what changed.
+
+    Holds the parsed account configuration and the converted entries of every statement in
+    memory. On `refresh` it rescans the input folder, converts only new or modified
+    statements, and rewrites only the QIF files of the accounts those statements belong to.
+    A change to the configuration file (or the symbols file) reloads it and rewrites every
+    account; if the symbol suffix rules changed, every statement is reconverted.
+
+    Args:
+        input_folder (str): Path to folder containing WealthSimple CSV files.
+        config_filename (str): Path to YAML configuration file containing account mappings.
+        jobs (int): Number of worker processes used to convert statements.
+        cache (ConversionCache): Optional persistent cache of converted statements.
+        engine (str): Conversion engine, 'scalar' or 'columnar'.
+        selector (StatementSelector): Optional include/exclude globs and account/date filters.
+        symbols_filename (str): Optional YAML file of symbol suffix rules.
+    """
+
+    def __init__(
+        self,
+        input_folder,
+        config_filename,
+        jobs=1,
+        cache=None,
+        engine="scalar",
+        selector=None,
+        symbols_filename=None,
+    ):
+        self.input_folder = input_folder
+        self.config_filename = config_filename
+        self.jobs = jobs
+        self.cache = cache
+        self.engine = engine
+        self.selector = selector
+        self.symbols_filename = symbols_filename
+        self.symbol_map = None
+        self.config = None
+        self.config_fingerprint = None
+        # source -> (account_name, fingerprint, entries_by_currency), in listing order
+        self.statements = {}
+        # Account name with currency suffix -> path of the QIF file written for it
+        self.outputs = {}
+
+    def _config_fingerprint(self):
+        fingerprint = []
+        for filename in (self.config_filename, self.symbols_filename):
+            if filename:
+                stat = os.stat(filename)
+                fingerprint.append((stat.st_size, stat.st_mtime_ns))
+        return tuple(fingerprint)
+
+    def _reload_symbol_map(self):
+        symbol_map = load_symbol_map(self.config, self.symbols_filename)
+        if symbol_map == self.symbol_map:
+            return
+        if self.symbol_map is not None:
+            # Converted entries hold rendered symbols: convert everything again
+            self.statements = {}
+        self.symbol_map = symbol_map
+        configure_symbol_map(symbol_map)
+        if self.cache is not None:
+            self.cache.update_settings(conversion_settings())
+
+    def refresh(self):
+        """
+        Bring the QIF files up to date with the input folder and configuration.
+
+        The QIF file of an account whose statements were all removed is removed too, so
+        the output folder never holds transactions that are no longer in the input.
+
+        Returns:
+            set: Names (with currency suffix) of the accounts whose QIF files were rewritten
+                 or removed.
+        """
+        config_fingerprint = self._config_fingerprint()
+        config_changed = config_fingerprint != self.config_fingerprint
+        if config_changed:
+            self.config = read_config(self.config_filename)
+            self._reload_symbol_map()
+            self.config_fingerprint = config_fingerprint
+
+        listing = self._list_statements()
+        changed, affected = self._changes(listing)
+        # Events from unrelated files (e.g. the QIF files or the cache written by the last
+        # refresh) must not rewrite anything, or the watcher would keep waking itself up
+        if not config_changed and not changed and not affected:
+            return set()
+
+        converted = convert_csv_files(
+            [source for _, source, _ in changed],
+            jobs=self.jobs,
+            cache=self.cache,
+            engine=self.engine,
+        )
+        fresh = {
+            source: (account_name, fingerprint, entries_by_currency)
+            for (account_name, source, fingerprint), entries_by_currency in zip(
+                changed, converted
+            )
+        }
+        for account_name, _, _ in changed:
+            affected.add(account_name)
+
+        self.statements = {
+            source: fresh.get(source) or self.statements[source]
+            for _, source, _ in listing
+        }
+
+        account_data = self._account_data(None if config_changed else affected)
+        write_qif_files(account_data, self.config)
+        updated = {name for name, qifs in account_data.items() if qifs}
+        removed = self._remove_outputs(
+            [
+                name
+                for name in self.outputs
+                if name not in updated
+                and (config_changed or name.rsplit("-", 1)[0] in affected)
+            ]
+        )
+        for name in updated:
+            path = f"output/{self.config[name]['nickname']}.qif"
+            if self.outputs.get(name, path) != path:
+                # Renamed in the configuration
+                self._remove_outputs([name])
+            self.outputs[name] = path
+        return updated | removed
+
+    def _list_statements(self):
+        """Return the (account_name, source, fingerprint) of every statement."""
+        listing = []
+        for account_name, source in iter_statement_files(
+            self.input_folder, self.selector
+        ):
+            try:
+                fingerprint = stat_statement(source)
+            except (OSError, KeyError, zipfile.BadZipFile):
+                # Removed or still being written between listing and stat
+                continue
+            listing.append((account_name, source, fingerprint))
+        return listing
+
+    def _changes(self, listing):
+        """
+        Compare a listing with the statements already converted.
+
+        Returns:
+            tuple: (changed, affected), the listing entries of the new or modified
+                   statements, and the accounts of the modified or removed ones.
+        """
+        affected = set()
+        changed = []
+        for account_name, source, fingerprint in listing:
+            known = self.statements.get(source)
+            if known is None or known[1] != fingerprint:
+                changed.append((account_name, source, fingerprint))
+                if known is not None:
+                    affected.add(known[0])
+
+        current = {source for _, source, _ in listing}
+        for source, (account_name, _, _) in self.statements.items():
+            if source not in current:
+                affected.add(account_name)
+        return changed, affected
+
+    def _account_data(self, accounts=None):
+        """
+        Merge the converted statements into the QIF entries of every account.
+
+        Args:
+            accounts (set): Accounts (without currency suffix) to merge, default to all.
+
+        Returns:
+            dict: Account names with currency suffix to their entries, oldest first.
+        """
+        runs_by_account = {}
+        for account_name, _, entries_by_currency in self.statements.values():
+            if accounts is not None and account_name not in accounts:
+                continue
+            for currency, qifs in entries_by_currency.items():
+                runs_by_account.setdefault(f"{account_name}-{currency}", []).append(
+                    qifs
+                )
+        return {
+            account: merge_runs(runs, entry_date)
+            for account, runs in runs_by_account.items()
+        }
+
+    def _remove_outputs(self, names):
+        """Remove the QIF files written for accounts, e.g. ones left without entries."""
+        for name in names:
+            path = self.outputs.pop(name)
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            print(f"Removed {path}")
+        return set(names)
+
+    def watched_directories(self):
+        """Return the statement directories whose changes trigger a refresh."""
+        directories = [self.input_folder]
+        for root, subdirectories, _ in os.walk(self.input_folder):
+            # Hidden folders are not scanned for statements, so not watched either
+            subdirectories[:] = [
+                name for name in subdirectories if not name.startswith(".")
+            ]
+            directories.extend(os.path.join(root, name) for name in subdirectories)
+        return directories
+
+    def watched_files(self):
+        """Return the configuration files whose changes trigger a refresh."""
+        return [
+            filename
+            for filename in (self.config_filename, self.symbols_filename)
+            if filename
+        ]
+
+    def run(
+        self,
+        debounce=DEFAULT_DEBOUNCE,
+        poll_interval=DEFAULT_POLL_INTERVAL,
+        notifier=None,
+    ):
+        """
+        Convert everything once, then reconvert on every change until interrupted.
+
+        Bursts of changes (e.g. a batch of statements being copied in) are coalesced: a
+        refresh only starts once no change was seen for `debounce` seconds. Folders created
+        in the input folder are watched from the next refresh on.
+
+        Args:
+            debounce (float): Seconds of quiet required before reconverting.
+            poll_interval (float): Seconds between scans when inotify is not available.
+            notifier: Object with `wait(timeout)` and `close()`, default to `create_notifier`,
+                      which is then rebuilt whenever the statement folders change.
+        """
+        self.refresh()
+        rewatch = notifier is None
+        directories = self.watched_directories()
+        if rewatch:
+            notifier = create_notifier(directories, poll_interval, self.watched_files())
+
+        print(f"Watching {self.input_folder} for new statements")
+        try:
+            while True:
+                if not notifier.wait(None):
+                    continue
+                while notifier.wait(debounce):
+                    pass
+                if rewatch:
+                    current = self.watched_directories()
+                    if current != directories:
+                        # Watch new folders before the refresh scans them, so that nothing
+                        # added in between is missed
+                        notifier.close()
+                        directories = current
+                        notifier = create_notifier(
+                            directories, poll_interval, self.watched_files()
+                        )
+                try:
+                    updated = self.refresh()
+                except REFRESH_ERRORS as error:
+                    # Keep the daemon alive; the next change triggers another attempt
+                    print(f"Conversion failed: {error}")
+                    self.config_fingerprint = None
+                    continue
+                print(f"Updated {len(updated)} account(s)")
+        except KeyboardInterrupt:
+            pass
+        finally:
+            notifier.close()
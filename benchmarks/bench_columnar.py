@@ -0,0 +1,128 @@
+"""
+Benchmark the columnar engine against the scalar engine on trade rows.
+
+Parses a synthetic statement of BUY, SELL, BUYTOOPEN and SELLTOCLOSE rows into `Transaction`
+records with `iter_file_transactions` (scalar, a row at a time) and with
+`iter_file_transactions_columnar` (amounts parsed and prices divided on whole int64
+columns), then converts it into QIF entries with each engine. Reading the CSV, building
+the records and rendering them cost the same in both engines, so the trade math alone is
+also timed on rows already in memory. Both engines must produce the same records.
+
+Usage:
+    python -m benchmarks.bench_columnar --rows 200000
+"""
+
+import argparse
+import csv
+import os
+import tempfile
+import time
+
+from app.columnar import (
+    convert_csv_file_columnar,
+    iter_column_transactions,
+    iter_file_transactions_columnar,
+    load_columns,
+    np,
+)
+from app.main import (
+    convert_csv_file,
+    iter_csv_records,
+    iter_file_transactions,
+    parse_transaction,
+)
+
+SAMPLE_ROWS = [
+    ("BUY", "AAPL - 10.0 shares", "-1500.00"),
+    ("SELL", "SHOP - 5.0 shares", "750.00"),
+    ("BUY", "VFV - 0.7 shares", "-100.00"),
+    ("SELL", "TD - 3.0 shares", "262.35"),
+    ("BUY", "XEQT - 12.5 shares", "-401.13"),
+    (
+        "BUYTOOPEN",
+        "SPY 450.00 USD CALL 2025-07-25: Bought 2 contract (executed at 2025-07-23), Fee: $1.50",
+        "-320.50",
+    ),
+    (
+        "SELLTOCLOSE",
+        "SPY 450.00 USD CALL 2025-07-25: Sold 2 contract (executed at 2025-07-24), Fee: $1.50",
+        "410.75",
+    ),
+]
+
+
+def write_statement(file_path, rows):
+    with open(file_path, "w", newline="") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(
+            ["date", "transaction", "description", "amount", "balance", "currency"]
+        )
+        for index in range(rows):
+            transaction, description, amount = SAMPLE_ROWS[index % len(SAMPLE_ROWS)]
+            writer.writerow(
+                [
+                    f"2025-07-{index % 28 + 1:02d}",
+                    transaction,
+                    description,
+                    amount,
+                    "0.00",
+                    "USD",
+                ]
+            )
+
+
+def best_times(functions, file_path, repeat=7):
+    # Runs alternate between the engines, so a slower stretch of the machine hits both
+    best = [float("inf")] * len(functions)
+    for _ in range(repeat):
+        for position, function in enumerate(functions):
+            start = time.perf_counter()
+            function(file_path)
+            best[position] = min(best[position], time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        file_path = os.path.join(work_dir, "statement.csv")
+        write_statement(file_path, args.rows)
+
+        if list(iter_file_transactions(file_path)) != list(
+            iter_file_transactions_columnar(file_path)
+        ):
+            raise SystemExit("Scalar and columnar engines disagree")
+
+        with open(file_path, "r") as csv_file:
+            records = list(iter_csv_records(csv_file))
+        with open(file_path, "r") as csv_file:
+            columns = load_columns(csv_file)
+
+        cases = (
+            (
+                "trade math",
+                lambda path: [parse_transaction(*record) for record in records],
+                lambda path: list(iter_column_transactions(columns)),
+            ),
+            (
+                "parse",
+                lambda path: list(iter_file_transactions(path)),
+                lambda path: list(iter_file_transactions_columnar(path)),
+            ),
+            ("convert", convert_csv_file, convert_csv_file_columnar),
+        )
+        print(f"columnar engine with {'NumPy' if np is not None else 'array'}")
+        for name, scalar, columnar in cases:
+            scalar_time, columnar_time = best_times((scalar, columnar), file_path)
+            print(
+                f"{name}: scalar {args.rows / scalar_time:,.0f} rows/sec,"
+                f" columnar {args.rows / columnar_time:,.0f} rows/sec"
+                f" ({scalar_time / columnar_time:.2f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark the conversion of statement dates to QIF dates.
+
+Compares `datetime.strptime` + `strftime` per row against the fixed-position slicing of
+`app.dates.split_date`, alone and behind the bounded memo of `app.dates.date_formatter`
+used by the QIF renderers. Rows are drawn from a month of dates, each repeated on several
+rows like in a real statement.
+
+Usage:
+    python -m benchmarks.bench_dates --rows 200000
+"""
+
+import argparse
+import time
+from datetime import datetime
+
+from app.dates import DATE_STYLES, date_formatter, split_date
+
+# Rows per distinct date: a month of activity has a few dozen dates for thousands of rows
+ROWS_PER_DATE = 50
+
+STRFTIME_FORMATS = {"us": "%m/%d/%Y", "quicken": "%m/%d'%y", "iso": "%Y-%m-%d"}
+
+
+def strptime_date(date, style):
+    return datetime.strptime(date, "%Y-%m-%d").strftime(STRFTIME_FORMATS[style])
+
+
+def sliced_date(date, style):
+    return DATE_STYLES[style](*split_date(date))
+
+
+def throughput(function, dates, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for date in dates:
+            function(date)
+        best = min(best, time.perf_counter() - start)
+    return len(dates) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200000)
+    args = parser.parse_args()
+
+    distinct = [
+        f"2025-{month:02d}-{day:02d}" for month in range(1, 13) for day in range(1, 29)
+    ]
+    dates = [
+        distinct[(row // ROWS_PER_DATE) % len(distinct)] for row in range(args.rows)
+    ]
+
+    for style in ("us", "quicken"):
+        memoized = date_formatter(style)
+        for date in distinct:
+            if memoized(date) != strptime_date(date, style):
+                raise SystemExit(f"strptime and slicing disagree on {date} ({style})")
+
+        baseline = throughput(lambda date: strptime_date(date, style), dates)
+        sliced = throughput(lambda date: sliced_date(date, style), dates)
+        cached = throughput(date_formatter(style), dates)
+        print(
+            f"{style}: strptime {baseline:,.0f} rows/sec,"
+            f" slicing {sliced:,.0f} rows/sec ({sliced / baseline:.1f}x),"
+            f" slicing + memo {cached:,.0f} rows/sec ({cached / baseline:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
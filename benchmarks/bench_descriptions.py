@@ -0,0 +1,102 @@
+"""
+Benchmark description parsing for equity and option trades.
+
+Compares the per-field extractors (`extract_symbol` + `extract_unit`, `extract_option_info`)
+as they were before the fused grammars, kept here verbatim, against the single-scan
+`extract_equity_info` and `extract_option_trade` used by the converters.
+
+Usage:
+    python -m benchmarks.bench_descriptions --rows 200000
+"""
+
+import argparse
+import re
+import time
+
+from app.main import extract_equity_info, extract_option_trade
+
+EQUITY_DESCRIPTIONS = [
+    "AAPL - 10.0 shares",
+    "SHOP - 15.0 shares (executed at 2025-07-15)",
+    "GOOGL - 2.5 shares",
+]
+
+OPTION_DESCRIPTIONS = [
+    "SPY 450.00 USD CALL 2025-07-25: Bought 2 contract (executed at 2025-07-23), Fee: $1.50",
+    "AAPL 180.00 USD PUT 2025-07-30: Sold 1 contract (executed at 2025-07-25), Fee: $0.75",
+]
+
+
+def legacy_extract_equity_info(description, currency):
+    dash_index = description.find("-")
+    if dash_index == -1:
+        symbol = None
+    else:
+        symbol = description[:dash_index].strip().upper()
+        CDR_SYMBOLS = ["TSLA", "DIS", "NVDA", "AAPL"]
+        if symbol in CDR_SYMBOLS and currency == "CAD":
+            symbol = f"{symbol}-QH"
+        else:
+            symbol = f"{symbol}-CT"
+
+    match = re.search(r"(\d+\.\d+)\s+shares", description)
+    return symbol, float(match.group(1)) if match else None
+
+
+def legacy_extract_option_info(description):
+    colon_index = description.find(":")
+    if colon_index == -1:
+        return None, None, None
+
+    option_name = description[:colon_index].strip()
+    after_colon = description[colon_index + 1 :]
+
+    contracts_match = re.search(r"(\d+)\s+contract", after_colon)
+    contracts = int(contracts_match.group(1)) if contracts_match else None
+
+    fee_match = re.search(r"Fee:\s*\$([\d.]+)", after_colon)
+    fee = float(fee_match.group(1)) if fee_match else None
+
+    return option_name, contracts, fee
+
+
+def throughput(function, descriptions, rows, *args):
+    batch = (descriptions * (rows // len(descriptions) + 1))[:rows]
+    start = time.perf_counter()
+    for description in batch:
+        function(description, *args)
+    return rows / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200000)
+    args = parser.parse_args()
+
+    cases = (
+        (
+            "equity",
+            EQUITY_DESCRIPTIONS,
+            legacy_extract_equity_info,
+            extract_equity_info,
+            ("USD",),
+        ),
+        (
+            "option",
+            OPTION_DESCRIPTIONS,
+            legacy_extract_option_info,
+            extract_option_trade,
+            (),
+        ),
+    )
+    for name, descriptions, legacy, fused, extra in cases:
+        before = throughput(legacy, descriptions, args.rows, *extra)
+        after = throughput(fused, descriptions, args.rows, *extra)
+        print(
+            f"{name}: per-field {before:,.0f} rows/sec, fused {after:,.0f} rows/sec"
+            f" ({after / before:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Benchmark transaction dispatch per transaction type.
+
+Compares the original `if/elif` chain against the `TRANSACTION_HANDLERS` lookup of
+`parse_transaction`. Both resolve to the same handlers, so only the dispatch differs:
+the chain pays one failed comparison per code above the matching one, which hits cash
+account rows such as SPEND, EFT and INT and the ignored codes at the bottom of the chain.
+Each type is timed for the lookup alone and for a whole parsed row, with both row parsers
+built the same way around their lookup.
+
+Usage:
+    python -m benchmarks.bench_dispatch --number 200000
+"""
+
+import argparse
+import timeit
+
+from app.main import (
+    IGNORED_TRANSACTIONS,
+    TRANSACTION_HANDLERS,
+    _parse_buy,
+    _parse_buy_to_open,
+    _parse_contribution,
+    _parse_deposit,
+    _parse_dividend,
+    _parse_lending_interest,
+    _parse_non_resident_tax,
+    _parse_sell,
+    _parse_sell_to_close,
+    _parse_withdrawal,
+)
+
+OPTION_DESCRIPTION = "SPY 450.00 USD CALL 2025-07-25: Bought 2 contract (executed at 2025-07-23), Fee: $1.50"
+
+SAMPLE_ROWS = {
+    "BUY": ("AAPL - 10.0 shares", "-1500.00"),
+    "BUYTOOPEN": (OPTION_DESCRIPTION, "-320.50"),
+    "DIV": ("TD - Dividend payment", "15.75"),
+    "CONT": ("Contribution", "1000.0"),
+    "SPEND": ("Card purchase", "-50.00"),
+    "AFT_OUT": ("Pre-authorized debit", "-75.00"),
+    "EFT": ("Electronic funds transfer", "300.00"),
+    "INT": ("Interest payment", "8.50"),
+    "REFUND": ("Card refund", "12.00"),
+    "STKREORG": ("Stock reorganization", "0.00"),
+}
+
+
+def chain_handler(transaction_type):
+    """The original `if/elif` chain, in its original order, returning the handler."""
+    if transaction_type == "BUY":
+        return _parse_buy
+    elif transaction_type == "SELL":
+        return _parse_sell
+    elif transaction_type == "BUYTOOPEN":
+        return _parse_buy_to_open
+    elif transaction_type == "SELLTOCLOSE":
+        return _parse_sell_to_close
+    elif transaction_type == "DIV":
+        return _parse_dividend
+    elif transaction_type == "CONT":
+        return _parse_contribution
+    elif transaction_type == "FPLINT":
+        return _parse_lending_interest
+    elif transaction_type == "NRT":
+        return _parse_non_resident_tax
+    elif transaction_type in ("TRFOUT", "SPEND", "E_TRFOUT", "EFTOUT", "AFT_OUT"):
+        return _parse_withdrawal
+    elif transaction_type in ("CASHBACK", "EFT", "INT", "TRFIN", "TRFINTF", "REFUND"):
+        return _parse_deposit
+    elif transaction_type in ("RECALL", "LOAN", "STKDIS", "STKREORG"):
+        return None
+    else:
+        raise ValueError(f"Invalid transaction type: {transaction_type}")
+
+
+def table_handler(transaction_type):
+    """The lookup of `parse_transaction`, returning the handler."""
+    handler = TRANSACTION_HANDLERS.get(transaction_type)
+    if handler is None:
+        if transaction_type in IGNORED_TRANSACTIONS:
+            return None
+        raise ValueError(f"Invalid transaction type: {transaction_type}")
+    return handler
+
+
+def dispatch_row(lookup):
+    """Build a row parser that resolves the handler with `lookup`, as `parse_transaction` does."""
+
+    def parse(date, transaction_type, description, amount, currency):
+        handler = lookup(transaction_type)
+        if handler is None:
+            return None
+        return handler(date, description, amount, currency)
+
+    return parse
+
+
+def time_per_call(functions, args, number, repeat=7):
+    """Best time per call of each function in ns, alternating them so noise hits both."""
+    best = [float("inf")] * len(functions)
+    for _ in range(repeat):
+        for index, function in enumerate(functions):
+            elapsed = timeit.timeit(lambda: function(*args), number=number)
+            best[index] = min(best[index], elapsed)
+    return [elapsed / number * 1e9 for elapsed in best]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=200000)
+    args = parser.parse_args()
+
+    chain_row_parser = dispatch_row(chain_handler)
+    table_row_parser = dispatch_row(table_handler)
+    print(
+        f"{'type':>10} {'chain':>9} {'table':>9} {'speedup':>8}"
+        f" {'chain row':>10} {'table row':>10} {'speedup':>8}"
+    )
+    for transaction_type, (description, amount) in SAMPLE_ROWS.items():
+        code = (transaction_type,)
+        row = ("2025-07-01", transaction_type, description, amount, "USD")
+        chain, table = time_per_call((chain_handler, table_handler), code, args.number)
+        chain_row, table_row = time_per_call(
+            (chain_row_parser, table_row_parser), row, args.number
+        )
+        print(
+            f"{transaction_type:>10} {chain:>7.0f}ns {table:>7.0f}ns {chain / table:>7.2f}x"
+            f" {chain_row:>8.0f}ns {table_row:>8.0f}ns {chain_row / table_row:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Benchmark the money arithmetic of statement rows.
+
+Compares the original binary float path (`abs(float(amount))`, `total / unit` printed with
+`repr`), as it was before `app.money`, against a straightforward `decimal.Decimal` port and the
+integer-cents engine of `app.money` used by the converters. Cash rows parse and format the
+total; trade rows also adjust it by the fee and compute and format the unit price.
+`parse_amount` and `format_cents` are memoized, so cash rows are also timed over 3,000
+distinct amounts, which fit in their caches, and with every amount distinct, which misses
+both caches on every row.
+
+Usage:
+    python -m benchmarks.bench_money --rows 200000
+"""
+
+import argparse
+import time
+from decimal import ROUND_HALF_EVEN, Decimal
+
+from app.money import cents_from_float, format_cents, format_price, parse_amount
+
+# (amount, unit, fee) of typical rows; cash rows (deposits, dividends...) have no unit
+SAMPLE_ROWS = [
+    ("-1500.00", 10.0, None),
+    ("-6250.75", 2.5, None),
+    ("100.00", 0.7, None),
+    ("-320.50", 2, 1.5),
+    ("150.25", 1, 0.75),
+    ("15.75", None, None),
+    ("1000.00", None, None),
+    ("-50.00", None, None),
+]
+
+PRICE_QUANTUM = Decimal("0.000001")
+CENT_QUANTUM = Decimal("0.01")
+
+
+def legacy_float_row(amount, unit, fee):
+    total = abs(float(amount))
+    if unit is None:
+        return f"T{total}"
+    if fee is None:
+        return f"I{total / unit}\nQ{unit}\nT{total}\nO0.00"
+    price = (total - fee) / unit
+    return f"I{price}\nQ{unit}\nT{total}\nO{fee}"
+
+
+def decimal_row(amount, unit, fee):
+    total = abs(Decimal(amount)).quantize(CENT_QUANTUM, ROUND_HALF_EVEN)
+    if unit is None:
+        return f"T{total}"
+    fee = Decimal(repr(fee or 0)).quantize(CENT_QUANTUM, ROUND_HALF_EVEN)
+    price = ((total - fee) / Decimal(repr(unit))).quantize(
+        PRICE_QUANTUM, ROUND_HALF_EVEN
+    )
+    price = price.normalize()
+    if price.as_tuple().exponent > -2:
+        price = price.quantize(CENT_QUANTUM)
+    return f"I{price:f}\nQ{unit}\nT{total}\nO{fee}"
+
+
+def fixed_point_row(amount, unit, fee):
+    total = parse_amount(amount)
+    if unit is None:
+        return f"T{format_cents(total)}"
+    if fee is None:
+        return f"I{format_price(total, unit)}\nQ{unit}\nT{format_cents(total)}\nO0.00"
+    fee = cents_from_float(fee)
+    price = format_price(total - fee, unit)
+    return f"I{price}\nQ{unit}\nT{format_cents(total)}\nO{format_cents(fee)}"
+
+
+def distinct_cash_rows(count):
+    return [
+        (f"-{cents // 100}.{cents % 100:02d}", None, None) for cents in range(count)
+    ]
+
+
+def throughputs(functions, samples, rows, repeat=7):
+    # Runs alternate between the functions, so a slower stretch of the machine hits all
+    batch = (samples * (rows // len(samples) + 1))[:rows]
+    best = [float("inf")] * len(functions)
+    for _ in range(repeat):
+        for position, function in enumerate(functions):
+            start = time.perf_counter()
+            for amount, unit, fee in batch:
+                function(amount, unit, fee)
+            best[position] = min(best[position], time.perf_counter() - start)
+    return [rows / elapsed for elapsed in best]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200000)
+    args = parser.parse_args()
+
+    for amount, unit, fee in SAMPLE_ROWS:
+        if decimal_row(amount, unit, fee) != fixed_point_row(amount, unit, fee):
+            raise SystemExit(
+                f"Decimal and fixed-point disagree on {amount}, {unit}, {fee}"
+            )
+
+    cases = (
+        ("cash rows", [row for row in SAMPLE_ROWS if row[1] is None]),
+        ("cash rows, 3,000 amounts", distinct_cash_rows(3000)),
+        ("cash rows, all distinct", distinct_cash_rows(args.rows)),
+        ("trade rows", [row for row in SAMPLE_ROWS if row[1] is not None]),
+        ("all rows", SAMPLE_ROWS),
+    )
+    for name, samples in cases:
+        baseline, decimal, fixed_point = throughputs(
+            (legacy_float_row, decimal_row, fixed_point_row), samples, args.rows
+        )
+        print(
+            f"{name}: float {baseline:,.0f} rows/sec,"
+            f" decimal {decimal:,.0f} rows/sec ({decimal / baseline:.2f}x),"
+            f" fixed-point {fixed_point:,.0f} rows/sec ({fixed_point / baseline:.2f}x,"
+            f" {fixed_point / decimal:.2f}x decimal)"
+        )
+
+
+if __name__ == "__main__":
+    main()
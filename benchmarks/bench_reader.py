@@ -0,0 +1,113 @@
+"""
+Benchmark the statement readers on a synthetic WealthSimple statement.
+
+Compares the original `csv.DictReader` + `generate_qif_entry` loop against the tuple-based
+`iter_csv_records` + `format_qif_entry` loop, and against the batched `generate_qif_entries`
+used by `read_csv_files`.
+
+Usage:
+    python -m benchmarks.bench_reader --rows 1000000
+"""
+
+import argparse
+import csv
+import os
+import tempfile
+import time
+
+from app.main import (
+    format_qif_entry,
+    generate_qif_entries,
+    generate_qif_entry,
+    iter_csv_records,
+)
+
+SAMPLE_ROWS = [
+    ("BUY", "AAPL - 10.0 shares", "-1500.00", "USD"),
+    ("SELL", "SHOP - 5.0 shares", "750.00", "CAD"),
+    ("DIV", "TD - Dividend payment", "15.75", "CAD"),
+    ("CONT", "Contribution (executed at 2025-07-16)", "1000.0", "CAD"),
+    ("SPEND", "Card purchase", "-50.00", "USD"),
+    ("EFT", "Electronic funds transfer", "300.00", "CAD"),
+    ("INT", "Interest payment", "8.50", "CAD"),
+    (
+        "BUYTOOPEN",
+        "SPY 450.00 USD CALL 2025-07-25: Bought 2 contract (executed at 2025-07-23), Fee: $1.50",
+        "-320.50",
+        "USD",
+    ),
+]
+
+
+def write_statement(file_path, rows):
+    with open(file_path, "w", newline="") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(
+            ["date", "transaction", "description", "amount", "balance", "currency"]
+        )
+        for index in range(rows):
+            transaction, description, amount, currency = SAMPLE_ROWS[
+                index % len(SAMPLE_ROWS)
+            ]
+            writer.writerow(
+                [
+                    f"2025-07-{index % 28 + 1:02d}",
+                    transaction,
+                    description,
+                    amount,
+                    "0.00",
+                    currency,
+                ]
+            )
+
+
+def dict_reader(file_path):
+    count = 0
+    with open(file_path, "r") as csv_file:
+        for row in csv.DictReader(csv_file):
+            if generate_qif_entry(row, row["currency"]):
+                count += 1
+    return count
+
+
+def tuple_reader(file_path):
+    count = 0
+    with open(file_path, "r") as csv_file:
+        for date, transaction, description, amount, currency in iter_csv_records(
+            csv_file
+        ):
+            if format_qif_entry(date, transaction, description, amount, currency):
+                count += 1
+    return count
+
+
+def batch_reader(file_path):
+    with open(file_path, "r") as csv_file:
+        entries_by_currency = generate_qif_entries(iter_csv_records(csv_file))
+    return sum(map(len, entries_by_currency.values()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1000000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        file_path = os.path.join(work_dir, "statement.csv")
+        write_statement(file_path, args.rows)
+
+        for name, reader in (
+            ("DictReader", dict_reader),
+            ("tuple reader", tuple_reader),
+            ("batch reader", batch_reader),
+        ):
+            start = time.perf_counter()
+            count = reader(file_path)
+            elapsed = time.perf_counter() - start
+            print(
+                f"{name:>14}: {count} rows in {elapsed:.2f}s ({count / elapsed:,.0f} rows/sec)"
+            )
+
+
+if __name__ == "__main__":
+    main()
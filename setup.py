@@ -16,6 +16,9 @@ setup(
             'black>=23.0.0',
             'isort>=5.12.0',
         ],
+        'columnar': [
+            'numpy>=1.20',
+        ],
         'test': [
             'pytest>=7.0.0',
             'pytest-cov>=4.0.0',
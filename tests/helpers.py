@@ -0,0 +1,41 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+# Statement date of the tests that do not depend on it
+STATEMENT_DATE = "2025-07-01"
+
+
+def write_statement(input_folder, account, content, date=STATEMENT_DATE):
+    """
+    Write a WealthSimple statement named the way the real downloads are.
+
+    Args:
+        input_folder (str): Folder receiving the statement.
+        account (str): Account ID (e.g., 'AB1234567CAD').
+        content (str): CSV content of the statement.
+        date (str): Statement date in the file name.
+
+    Returns:
+        str: Path of the statement.
+    """
+    filename = f"monthly-statement-transactions-{account}-{date}.csv"
+    file_path = os.path.join(input_folder, filename)
+    with open(file_path, "w") as csv_file:
+        csv_file.write(content)
+    return file_path
+
+
+class StatementTestCase(unittest.TestCase):
+    """Test case with a scratch `work_dir`, removed afterwards, and an empty input folder in it."""
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.work_dir)
+        self.input_folder = os.path.join(self.work_dir, "input")
+        os.mkdir(self.input_folder)
+
+    def write_statement(self, account, content, date=STATEMENT_DATE):
+        """Write a statement into the input folder, see `write_statement`."""
+        return write_statement(self.input_folder, account, content, date)
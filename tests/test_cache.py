@@ -0,0 +1,109 @@
+import json
+import os
+import unittest
+from unittest.mock import patch
+
+from app.cache import CACHE_VERSION, ConversionCache
+from app.main import read_csv_files
+from tests.helpers import StatementTestCase
+
+CSV_CONTENT = """date,transaction,description,amount,currency
+2025-07-01,BUY,AAPL - 10.0 shares,-1500.00,USD
+2025-07-02,CONT,Contribution,1000.0,CAD
+"""
+
+
+class TestConversionCache(StatementTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cache_dir = os.path.join(self.work_dir, "cache")
+
+    def test_unchanged_statement_is_not_reconverted(self):
+        """Test a second run splices cached entries without re-reading the statement"""
+        self.write_statement("CACHE123CAD", CSV_CONTENT)
+
+        first = read_csv_files(self.input_folder, cache=ConversionCache(self.cache_dir))
+
+        cache = ConversionCache(self.cache_dir)
+        with patch("app.main.convert_csv_file") as mock_convert:
+            second = read_csv_files(self.input_folder, cache=cache)
+
+        mock_convert.assert_not_called()
+        self.assertEqual(second, first)
+        self.assertEqual((cache.hits, cache.misses), (1, 0))
+
+    def test_touched_statement_with_same_content_is_a_hit(self):
+        """Test a changed mtime falls back to the content hash"""
+        file_path = self.write_statement("TOUCH123CAD", CSV_CONTENT)
+        read_csv_files(self.input_folder, cache=ConversionCache(self.cache_dir))
+
+        stat = os.stat(file_path)
+        os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        cache = ConversionCache(self.cache_dir)
+        self.assertIsNotNone(cache.lookup(file_path))
+        self.assertEqual(cache.hits, 1)
+
+    def test_modified_statement_is_reconverted(self):
+        """Test a statement whose content changed is converted again"""
+        file_path = self.write_statement("EDIT123CAD", CSV_CONTENT)
+        read_csv_files(self.input_folder, cache=ConversionCache(self.cache_dir))
+
+        self.write_statement(
+            "EDIT123CAD", CSV_CONTENT + "2025-07-03,INT,Interest,1.00,CAD\n"
+        )
+        os.utime(file_path, ns=(0, 0))
+
+        cache = ConversionCache(self.cache_dir)
+        result = read_csv_files(self.input_folder, cache=cache)
+
+        self.assertEqual(cache.misses, 1)
+        self.assertEqual(len(result["EDIT123CAD-CAD"]), 2)
+
+    def test_removed_statement_is_evicted(self):
+        """Test entries and fragments of deleted statements are evicted"""
+        kept = self.write_statement("KEEP123CAD", CSV_CONTENT)
+        removed = self.write_statement(
+            "GONE123CAD", CSV_CONTENT.replace("1000.0", "2000.0")
+        )
+        read_csv_files(self.input_folder, cache=ConversionCache(self.cache_dir))
+
+        os.remove(removed)
+        read_csv_files(self.input_folder, cache=ConversionCache(self.cache_dir))
+
+        with open(os.path.join(self.cache_dir, "manifest.json")) as file:
+            manifest = json.load(file)
+        self.assertEqual(list(manifest["files"]), [os.path.abspath(kept)])
+        self.assertEqual(len(os.listdir(os.path.join(self.cache_dir, "fragments"))), 1)
+
+    def test_rebuild_ignores_existing_manifest(self):
+        """Test rebuild=True converts every statement again"""
+        self.write_statement("REBUILD123CAD", CSV_CONTENT)
+        read_csv_files(self.input_folder, cache=ConversionCache(self.cache_dir))
+
+        cache = ConversionCache(self.cache_dir, rebuild=True)
+        read_csv_files(self.input_folder, cache=cache)
+
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+
+    def test_version_or_settings_mismatch_discards_cache(self):
+        """Test a manifest from another cache version or other settings is not used"""
+        file_path = self.write_statement("VERSION123CAD", CSV_CONTENT)
+        read_csv_files(self.input_folder, cache=ConversionCache(self.cache_dir))
+
+        manifest_path = os.path.join(self.cache_dir, "manifest.json")
+        with open(manifest_path) as file:
+            manifest = json.load(file)
+        manifest["version"] = CACHE_VERSION - 1
+        with open(manifest_path, "w") as file:
+            json.dump(manifest, file)
+
+        self.assertIsNone(ConversionCache(self.cache_dir).lookup(file_path))
+
+        read_csv_files(self.input_folder, cache=ConversionCache(self.cache_dir))
+        cache = ConversionCache(self.cache_dir, settings={"date_style": "us"})
+        self.assertIsNone(cache.lookup(file_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import unittest
+from unittest.mock import patch
+
+from app import columnar
+from app.columnar import convert_columns, load_columns
+from app.main import get_converter, iter_file_entries, read_csv_files
+from tests.helpers import StatementTestCase
+
+ACCOUNT = "COL123CAD"
+
+CSV_CONTENT = """date,transaction,description,amount,balance,currency
+2025-07-01,BUY,AAPL - 10.0 shares,-1500.00,0.00,USD
+2025-07-02,SELL,TSLA - 3.0 shares,1000.00,0.00,CAD
+2025-07-03,BUY,GOOGL - 2.5 shares,-6250.75,0.00,USD
+2025-07-04,BUYTOOPEN,"SPY 450.00 USD CALL 2025-07-25: Bought 2 contract (executed at 2025-07-23), Fee: $1.50",-320.50,0.00,USD
+2025-07-05,SELLTOCLOSE,"AAPL 180.00 USD PUT 2025-07-30: Sold 3 contract (executed at 2025-07-25), Fee: $0.75",150.25,0.00,USD
+2025-07-06,DIV,TD - Dividend payment,15.75,0.00,CAD
+2025-07-07,RECALL,Stock recall,0.00,0.00,USD
+2025-07-08,CONT,Contribution,1000.0,0.00,CAD
+2025-07-09,SELL,SHOP - 0.7 shares,100.00,0.00,CAD
+"""
+
+
+class TestColumnarEngine(StatementTestCase):
+    def assert_matches_scalar(self, file_path):
+        with open(file_path, "r") as csv_file:
+            columnar_entries = list(convert_columns(load_columns(csv_file)))
+        self.assertEqual(columnar_entries, list(iter_file_entries(file_path)))
+        return columnar_entries
+
+    def test_columnar_matches_scalar(self):
+        """Test the columnar engine renders exactly the same entries as the scalar path"""
+        file_path = self.write_statement(ACCOUNT, CSV_CONTENT)
+
+        entries = self.assert_matches_scalar(file_path)
+
+        self.assertEqual(len(entries), 8)
+        # Prices are rounded to 6 decimals by both engines
+        self.assertIn("I142.857143", entries[-1][1])
+
+    def test_columnar_integer_share_counts(self):
+        """Test integer share counts are priced like the scalar path"""
+        file_path = self.write_statement(
+            ACCOUNT,
+            "date,transaction,description,amount,currency\n"
+            "2025-07-10,BUY,MSFT - 4 shares,-1600.00,USD\n",
+        )
+
+        entries = self.assert_matches_scalar(file_path)
+
+        self.assertIn("I400.00\nQ4.0\nT1600.00\n", entries[0][1])
+
+    def test_columnar_matches_scalar_with_stdlib_arrays(self):
+        """Test the stdlib array fallback used when NumPy is not installed"""
+        file_path = self.write_statement(ACCOUNT, CSV_CONTENT)
+
+        with patch.object(columnar, "np", None):
+            self.assert_matches_scalar(file_path)
+
+    @unittest.skipIf(columnar.np is None, "NumPy is not installed")
+    def test_columnar_matches_scalar_with_numpy(self):
+        """Test the NumPy backend"""
+        file_path = self.write_statement(ACCOUNT, CSV_CONTENT)
+
+        self.assert_matches_scalar(file_path)
+
+    def test_columnar_empty_statement(self):
+        """Test a statement with only a header"""
+        file_path = self.write_statement(
+            ACCOUNT, "date,transaction,description,amount,currency\n"
+        )
+
+        self.assertEqual(self.assert_matches_scalar(file_path), [])
+
+    def test_columnar_raises_like_scalar(self):
+        """Test rows the columns cannot handle raise the scalar path's errors"""
+        header = "date,transaction,description,amount,currency\n"
+
+        file_path = self.write_statement(
+            ACCOUNT, header + "2025-07-01,BUY,AAPL - 10 lots,-1500.00,USD\n"
+        )
+        with self.assertRaises(TypeError):
+            get_converter("columnar")(file_path)
+
+        file_path = self.write_statement(
+            ACCOUNT, header + "2025-07-01,BUY,AAPL - 0.0 shares,-1500.00,USD\n"
+        )
+        with self.assertRaises(ZeroDivisionError):
+            get_converter("columnar")(file_path)
+
+        file_path = self.write_statement(
+            ACCOUNT, header + "2025-07-01,BUY,AAPL - 1.0 shares,oops,USD\n"
+        )
+        with self.assertRaises(ValueError):
+            get_converter("columnar")(file_path)
+
+        file_path = self.write_statement(
+            ACCOUNT,
+            header
+            + "2025-07-01,BUY,AAPL - 1.0 shares,-10.00,USD\n"
+            + "2025-07-02,INVALID_TYPE,Unknown,1.00,USD\n",
+        )
+        with self.assertRaises(ValueError) as context:
+            get_converter("columnar")(file_path)
+        self.assertIn("Invalid transaction type: INVALID_TYPE", str(context.exception))
+
+    def test_read_csv_files_columnar_engine(self):
+        """Test read_csv_files output does not depend on the engine"""
+        self.write_statement(ACCOUNT, CSV_CONTENT)
+        self.write_statement("COL456USD", CSV_CONTENT.replace("USD\n", "CAD\n"))
+
+        self.assertEqual(
+            read_csv_files(self.input_folder, engine="columnar"),
+            read_csv_files(self.input_folder),
+        )
+
+    def test_get_converter_invalid_engine(self):
+        """Test get_converter rejects unknown engines"""
+        with self.assertRaises(ValueError):
+            get_converter("gpu")
+
+
+if __name__ == "__main__":
+    unittest.main()
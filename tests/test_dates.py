@@ -0,0 +1,69 @@
+import unittest
+from datetime import date, timedelta
+
+import app.main
+from app.dates import date_formatter, split_date
+from app.main import configure_date_style, conversion_settings, format_qif_entry
+
+
+class TestDates(unittest.TestCase):
+    def tearDown(self):
+        configure_date_style("us")
+
+    def test_split_date(self):
+        """Test ISO dates are sliced and other ISO forms are parsed"""
+        self.assertEqual(split_date("2025-07-15"), ("2025", "07", "15"))
+        self.assertEqual(split_date("2025-07-15 10:30:00"), ("2025", "07", "15"))
+        self.assertEqual(split_date(" 2025-07-15T10:30:00Z "), ("2025", "07", "15"))
+        for text in ("", "07/15/2025", "2025-13-01", "2025-07-xx", None):
+            with self.assertRaises(ValueError):
+                split_date(text)
+
+    def test_styles(self):
+        """Test every style against strftime over several years of dates"""
+        formats = {"us": "%m/%d/%Y", "quicken": "%m/%d'%y", "iso": "%Y-%m-%d"}
+        for style, strftime_format in formats.items():
+            format_date = date_formatter(style, maxsize=16)
+            day = date(2023, 12, 25)
+            while day < date(2026, 1, 10):
+                self.assertEqual(
+                    format_date(day.isoformat()), day.strftime(strftime_format)
+                )
+                day += timedelta(days=3)
+
+        # Before 2000 Quicken writes a plain slash
+        self.assertEqual(date_formatter("quicken")("1999-12-31"), "12/31/99")
+        with self.assertRaises(ValueError):
+            date_formatter("european")
+
+    def test_memo_is_bounded(self):
+        """Test repeated dates are answered from a memo that never outgrows its size"""
+        format_date = date_formatter("us", maxsize=4)
+        for _ in range(3):
+            for day in range(1, 11):
+                format_date(f"2025-07-{day:02d}")
+
+        info = format_date.cache_info()
+        self.assertEqual((info.currsize, info.maxsize), (4, 4))
+        self.assertEqual(format_date("2025-07-10"), "07/10/2025")
+        self.assertEqual(format_date.cache_info().hits, info.hits + 1)
+
+    def test_configured_style_applies_to_entries(self):
+        """Test the configured style is used for entries and is part of the cache settings"""
+        row = ("2025-07-15", "CONT", "Contribution", "1000.00", "CAD")
+        self.assertTrue(format_qif_entry(*row).startswith("D07/15/2025\n"))
+        self.assertEqual(conversion_settings()["date_style"], "us")
+
+        configure_date_style("quicken")
+        self.assertTrue(format_qif_entry(*row).startswith("D07/15'25\n"))
+        configure_date_style("iso")
+        self.assertTrue(format_qif_entry(*row).startswith("D2025-07-15\n"))
+        self.assertEqual(app.main.DATE_STYLE, "iso")
+
+        with self.assertRaises(ValueError):
+            configure_date_style("european")
+        self.assertEqual(app.main.DATE_STYLE, "iso")
+
+
+if __name__ == "__main__":
+    unittest.main()
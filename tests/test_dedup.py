@@ -0,0 +1,224 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from app import main
+from app.dedup import Deduplicator, DigestIndex, normalize_row, row_digest
+from app.main import iter_csv_entries, iter_csv_transactions, read_csv_files
+from app.quarantine import Quarantine
+from app.symbols import SymbolMap
+from tests.helpers import StatementTestCase
+
+CSV_CONTENT = """date,transaction,description,amount,currency
+2025-07-01,BUY,AAPL - 10.0 shares,-1500.00,USD
+2025-07-02,CONT,Contribution,1000.0,CAD
+2025-07-02,CONT,Contribution,1000.0,CAD
+"""
+
+OVERLAP_CONTENT = """date,transaction,description,amount,currency
+2025-07-02,CONT,Contribution,1000.00,CAD
+2025-07-03,DIV,AAPL dividend,5.25,USD
+"""
+
+
+class TestDigestIndex(unittest.TestCase):
+    def test_add_returns_owner(self):
+        """Test the first statement to add a digest keeps owning it"""
+        index = DigestIndex()
+        self.assertEqual(index.add(42, 0), 0)
+        self.assertEqual(index.add(42, 1), 0)
+        self.assertEqual(index.add(43, 1), 1)
+        self.assertEqual(len(index), 2)
+
+    def test_grow_keeps_every_digest(self):
+        """Test the table grows past its initial capacity without losing entries"""
+        index = DigestIndex(capacity=4)
+        digests = [row_digest("ACCOUNT-CAD", ("2025-07-01", i), 0) for i in range(5000)]
+        for i, digest in enumerate(digests):
+            index.add(digest, i % 7)
+
+        self.assertEqual(len(index), 5000)
+        for i, digest in enumerate(digests):
+            self.assertEqual(index.add(digest, 99), i % 7)
+
+    def test_save_and_load(self):
+        """Test a persisted index reports rows seen in a previous run"""
+        with tempfile.TemporaryDirectory() as work_dir:
+            path = os.path.join(work_dir, "dedup.idx")
+            index = DigestIndex()
+            owner = index.source_id("/input/first.csv")
+            index.add(12345, owner)
+            index.save(path)
+
+            loaded = DigestIndex.load(path)
+            self.assertEqual(loaded.sources, ["/input/first.csv"])
+            self.assertEqual(
+                loaded.add(12345, loaded.source_id("/input/second.csv")), owner
+            )
+            self.assertEqual(
+                len(DigestIndex.load(os.path.join(work_dir, "missing"))), 0
+            )
+
+    def test_load_invalid_file(self):
+        """Test loading a file that is not an index fails clearly"""
+        with tempfile.TemporaryDirectory() as work_dir:
+            path = os.path.join(work_dir, "dedup.idx")
+            with open(path, "wb") as file:
+                file.write(b"not an index\n")
+
+            with self.assertRaises(ValueError):
+                DigestIndex.load(path)
+
+    def test_load_truncated_file(self):
+        """Test a truncated index is reported as corrupt"""
+        with tempfile.TemporaryDirectory() as work_dir:
+            path = os.path.join(work_dir, "dedup.idx")
+            index = DigestIndex()
+            index.add(12345, index.source_id("/input/first.csv"))
+            index.save(path)
+            with open(path, "r+b") as file:
+                file.truncate(os.path.getsize(path) - 100)
+
+            with self.assertRaisesRegex(ValueError, "Corrupt duplicate index"):
+                DigestIndex.load(path)
+
+    def test_normalize_row(self):
+        """Test rows differing only in amount formatting and spacing share a key"""
+        self.assertEqual(
+            normalize_row(
+                ("2025-07-02 10:30:00", "CONT", "Contribution ", "1000.0", "CAD")
+            ),
+            normalize_row(("2025-07-02", "CONT", "Contribution", "1000.00", "CAD")),
+        )
+
+    def test_normalize_row_keeps_sign(self):
+        """Test a row and its reversal of the same amount get different keys"""
+        self.assertNotEqual(
+            normalize_row(("2025-07-02", "SPEND", "Coffee", "-12.34", "CAD")),
+            normalize_row(("2025-07-02", "SPEND", "Coffee", "12.34", "CAD")),
+        )
+
+
+class TestDeduplicator(StatementTestCase):
+    def test_invalid_mode(self):
+        """Test an unknown mode is rejected"""
+        with self.assertRaises(ValueError):
+            Deduplicator("merge")
+
+    def test_read_csv_files_drops_cross_file_duplicates(self):
+        """Test rows repeated in another statement are dropped, repeats within one are kept"""
+        self.write_statement("DUP123CAD", CSV_CONTENT, "2025-07-01")
+        self.write_statement("DUP123CAD", OVERLAP_CONTENT, "2025-07-31")
+        self.write_statement("DUP123CAD", CSV_CONTENT, "2025-08-01")
+
+        dedup = Deduplicator("drop")
+        result = read_csv_files(self.input_folder, dedup=dedup)
+
+        self.assertEqual(len(result["DUP123CAD-CAD"]), 2)
+        self.assertEqual(len(result["DUP123CAD-USD"]), 2)
+        self.assertEqual(sum(dedup.duplicates.values()), 4)
+
+    def test_duplicates_are_per_account(self):
+        """Test identical rows in two different accounts are not duplicates"""
+        self.write_statement("ONE123CAD", CSV_CONTENT, "2025-07-01")
+        self.write_statement("TWO123CAD", CSV_CONTENT, "2025-07-01")
+
+        dedup = Deduplicator("drop")
+        result = read_csv_files(self.input_folder, dedup=dedup)
+
+        self.assertEqual(result, read_csv_files(self.input_folder))
+        self.assertEqual(dedup.duplicates, {})
+
+    def test_report_mode_keeps_rows(self):
+        """Test report mode counts duplicates without dropping them"""
+        self.write_statement("DUP123CAD", CSV_CONTENT, "2025-07-01")
+        self.write_statement("DUP123CAD", OVERLAP_CONTENT, "2025-07-31")
+
+        dedup = Deduplicator("report")
+        result = read_csv_files(self.input_folder, dedup=dedup)
+
+        self.assertEqual(result, read_csv_files(self.input_folder))
+        self.assertEqual(sum(dedup.duplicates.values()), 1)
+        with patch("builtins.print") as mock_print:
+            dedup.report()
+        mock_print.assert_any_call("Found 1 duplicate row(s)")
+
+    def test_streaming_matches_batch(self):
+        """Test the streaming path drops the same rows as the batch path"""
+        self.write_statement("DUP123CAD", CSV_CONTENT, "2025-07-01")
+        self.write_statement("DUP123CAD", OVERLAP_CONTENT, "2025-07-31")
+
+        batch = read_csv_files(self.input_folder, dedup=Deduplicator("drop"))
+        streamed = {}
+        for account_name, qif in iter_csv_entries(
+            self.input_folder, dedup=Deduplicator("drop")
+        ):
+            streamed.setdefault(account_name, []).append(qif)
+
+        self.assertEqual(streamed, {name: qifs for name, qifs in batch.items() if qifs})
+
+    def test_persisted_index_across_runs(self):
+        """Test rows exported by a previous run are dropped when they reappear elsewhere"""
+        index_path = os.path.join(self.work_dir, "dedup.idx")
+        self.write_statement("DUP123CAD", CSV_CONTENT, "2025-07-01")
+
+        first = Deduplicator("drop", index=DigestIndex.load(index_path))
+        read_csv_files(self.input_folder, dedup=first)
+        first.index.save(index_path)
+
+        # Same statement again: not a duplicate of itself
+        again = Deduplicator("drop", index=DigestIndex.load(index_path))
+        result = read_csv_files(self.input_folder, dedup=again)
+        self.assertEqual(len(result["DUP123CAD-CAD"]), 2)
+
+        self.write_statement("DUP123CAD", OVERLAP_CONTENT, "2025-07-31")
+        later = Deduplicator("drop", index=DigestIndex.load(index_path))
+        result = read_csv_files(self.input_folder, dedup=later)
+        self.assertEqual(len(result["DUP123CAD-CAD"]), 2)
+        self.assertEqual(len(result["DUP123CAD-USD"]), 2)
+
+    def test_persisted_index_ignores_rendering_settings(self):
+        """Test a saved index still matches after the date style and symbol map change"""
+        index_path = os.path.join(self.work_dir, "dedup.idx")
+        self.write_statement("DUP123CAD", CSV_CONTENT, "2025-07-01")
+        first = Deduplicator("drop")
+        read_csv_files(self.input_folder, dedup=first)
+        first.index.save(index_path)
+
+        self.addCleanup(main.configure_date_style, main.DATE_STYLE)
+        self.addCleanup(main.configure_symbol_map, main.SYMBOL_MAP)
+        main.configure_date_style("iso")
+        main.configure_symbol_map(SymbolMap.from_config({"USD": {"NE": ["AAPL"]}}))
+        self.write_statement("DUP123CAD", CSV_CONTENT, "2025-08-01")
+        later = Deduplicator("report", index=DigestIndex.load(index_path))
+        result = read_csv_files(self.input_folder, dedup=later)
+
+        self.assertIn("YAAPL-NE", result["DUP123CAD-USD"][0])
+        self.assertEqual(sum(later.duplicates.values()), 3)
+
+    def test_quarantined_rows_are_skipped(self):
+        """Test rejected rows do not shift the keys of the rows after them"""
+        bad_content = CSV_CONTENT.replace(
+            "2025-07-02,CONT", "2025-07-01,BOGUS,Unknown,1.00,CAD\n2025-07-02,CONT", 1
+        )
+        self.write_statement("DUP123CAD", OVERLAP_CONTENT, "2025-07-01")
+        self.write_statement("DUP123CAD", bad_content, "2025-07-31")
+
+        dedup = Deduplicator("drop")
+        result = read_csv_files(self.input_folder, dedup=dedup, quarantine=Quarantine())
+        self.assertEqual(len(result["DUP123CAD-CAD"]), 2)
+        self.assertEqual(sum(dedup.duplicates.values()), 1)
+
+        dedup = Deduplicator("drop")
+        transactions = list(
+            iter_csv_transactions(
+                self.input_folder, dedup=dedup, quarantine=Quarantine()
+            )
+        )
+        self.assertEqual(len(transactions), 4)
+        self.assertEqual(sum(dedup.duplicates.values()), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
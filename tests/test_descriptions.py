@@ -0,0 +1,87 @@
+import unittest
+
+from app.descriptions import parse_equity_description, parse_option_description
+from app.main import (
+    extract_equity_info,
+    extract_option_info,
+    extract_option_trade,
+    extract_symbol,
+    extract_unit,
+    format_qif_entry,
+)
+
+EQUITY_DESCRIPTIONS = [
+    "AAPL - 10.0 shares",
+    "tsla - 5.0 shares",
+    "SHOP - 15.0 shares in CAD",
+    "AAPL - Purchase of 10.0 shares at market price",
+    "TSLA - 5.0 shares (executed at 2025-07-15)",
+    "BRK.B - 0.25 shares",
+]
+
+OPTION_DESCRIPTIONS = [
+    "SPY 450.00 USD CALL 2025-07-25: Bought 2 contract (executed at 2025-07-23), Fee: $1.50",
+    "AAPL 180.00 USD PUT 2025-07-30: Sold 1 contract (executed at 2025-07-25), Fee: $0.75",
+    "TSLA 250.00 USD CALL 2025-08-15: Bought 15 contract (executed at 2025-08-10) Fee: $3.75",
+    "NVDA 500.50 USD CALL 2025-09-20: Bought 3 contract, Fee: $5",
+]
+
+
+class TestDescriptionGrammar(unittest.TestCase):
+    def test_equity_grammar_matches_field_extractors(self):
+        """Test the fused equity grammar agrees with extract_symbol and extract_unit"""
+        for description in EQUITY_DESCRIPTIONS:
+            for currency in ("USD", "CAD"):
+                self.assertEqual(
+                    extract_equity_info(description, currency),
+                    (extract_symbol(description, currency), extract_unit(description)),
+                    description,
+                )
+
+    def test_option_grammar_matches_field_extractors(self):
+        """Test the fused option grammar agrees with extract_option_info"""
+        for description in OPTION_DESCRIPTIONS:
+            self.assertIsNotNone(parse_option_description(description), description)
+            self.assertEqual(
+                extract_option_trade(description), extract_option_info(description)
+            )
+
+    def test_execution_date(self):
+        """Test the execution date is captured in the same scan"""
+        self.assertEqual(
+            parse_equity_description("tsla - 5 shares (executed at 2025-07-15)"),
+            ("TSLA", 5.0, "2025-07-15"),
+        )
+        self.assertEqual(
+            parse_option_description(OPTION_DESCRIPTIONS[0]),
+            ("SPY 450.00 USD CALL 2025-07-25", 2, 1.5, "2025-07-23"),
+        )
+        self.assertIsNone(parse_equity_description("AAPL - 10.0 shares")[2])
+
+    def test_fallback_for_unrecognized_descriptions(self):
+        """Test descriptions outside the grammars fall back to the field extractors"""
+        # No dash before the share count
+        self.assertIsNone(parse_equity_description("AAPL 10.0 shares"))
+        self.assertEqual(extract_equity_info("AAPL 10.0 shares", "USD"), (None, 10.0))
+
+        # Fee written before the contract count
+        description = "SPY 450.00 USD CALL 2025-07-25: Fee: $1.50, Bought 2 contract"
+        self.assertIsNone(parse_option_description(description))
+        self.assertEqual(
+            extract_option_trade(description),
+            ("SPY 450.00 USD CALL 2025-07-25", 2, 1.5),
+        )
+
+    def test_integer_share_count(self):
+        """Test integer share counts no longer break the price division"""
+        qif = format_qif_entry(
+            "2025-07-01", "BUY", "AAPL - 10 shares", "-1500.00", "USD"
+        )
+
+        self.assertEqual(
+            qif, "D07/01/2025\nNBuy\nYAAPL-CT\nI150.00\nQ10.0\nT1500.00\nO0.00\nCc\n^"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+import os
+import tempfile
+import unittest
+import zipfile
+
+from app.discovery import StatementFile, StatementSelector, parse_statement_name
+from app.main import iter_statement_files, read_csv_files
+
+CSV_CONTENT = """date,transaction,description,amount,currency
+2025-07-01,CONT,Contribution,1000.0,CAD
+"""
+
+
+def statement_name(account, date, suffix=".csv"):
+    return f"monthly-statement-transactions-{account}-{date}{suffix}"
+
+
+class TestStatementSelector(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.input_folder = self.work_dir.name
+
+    def tearDown(self):
+        self.work_dir.cleanup()
+
+    def write(self, relative_path, content=CSV_CONTENT):
+        file_path = os.path.join(self.input_folder, *relative_path.split("/"))
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, "w") as file:
+            file.write(content)
+        return file_path
+
+    def write_tree(self):
+        """Lay statements out by year and account, out of chronological order on disk."""
+        return {
+            "2025-feb": self.write(
+                f"2025/ACCT1CAD/{statement_name('ACCT1CAD', '2025-02-28')}"
+            ),
+            "2024-dec": self.write(
+                f"2024/ACCT1CAD/{statement_name('ACCT1CAD', '2024-12-31')}"
+            ),
+            "2025-jan-2": self.write(
+                f"2025/ACCT2CAD/{statement_name('ACCT2CAD', '2025-01-31')}"
+            ),
+            "2025-jan-1": self.write(
+                f"2025/ACCT1CAD/{statement_name('ACCT1CAD', '2025-01-31')}"
+            ),
+        }
+
+    def test_parse_statement_name(self):
+        """Test account and date are both taken from the file name"""
+        self.assertEqual(
+            parse_statement_name(
+                statement_name("AB1234567CAD", "2025-07-01", ".csv.gz")
+            ),
+            ("AB1234567CAD", "2025-07-01"),
+        )
+        self.assertEqual(parse_statement_name("invalid-format.csv"), (None, None))
+
+    def test_recursive_chronological_order(self):
+        """Test nested statements are found and sorted by date, then account"""
+        paths = self.write_tree()
+        self.write("2025/notes.txt")
+        self.write("2025/invalid-format.csv")
+
+        statements = StatementSelector().select(self.input_folder)
+
+        self.assertEqual(
+            statements,
+            [
+                StatementFile("2024-12-31", "ACCT1CAD", paths["2024-dec"]),
+                StatementFile("2025-01-31", "ACCT1CAD", paths["2025-jan-1"]),
+                StatementFile("2025-01-31", "ACCT2CAD", paths["2025-jan-2"]),
+                StatementFile("2025-02-28", "ACCT1CAD", paths["2025-feb"]),
+            ],
+        )
+
+    def test_filter_by_account_and_date(self):
+        """Test account and date filters are applied from the file names"""
+        paths = self.write_tree()
+
+        selector = StatementSelector(
+            accounts=["ACCT1CAD"], since="2025-01-01", until="2025-01-31"
+        )
+
+        self.assertEqual(
+            [statement.source for statement in selector.select(self.input_folder)],
+            [paths["2025-jan-1"]],
+        )
+
+    def test_include_and_exclude_globs(self):
+        """Test globs match relative paths and file names"""
+        paths = self.write_tree()
+
+        include = StatementSelector(include=["2025/*"])
+        self.assertEqual(
+            {statement.source for statement in include.select(self.input_folder)},
+            {paths["2025-jan-1"], paths["2025-jan-2"], paths["2025-feb"]},
+        )
+
+        exclude = StatementSelector(exclude=["2025/ACCT1CAD", "*2024-12-31.csv"])
+        self.assertEqual(
+            [statement.source for statement in exclude.select(self.input_folder)],
+            [paths["2025-jan-2"]],
+        )
+
+    def test_hidden_directories_are_skipped(self):
+        """Test hidden folders such as caches are not scanned"""
+        self.write(f".ws2qif-cache/{statement_name('HIDDEN1CAD', '2025-01-31')}")
+        visible = self.write(statement_name("VISIBLE1CAD", "2025-01-31"))
+
+        self.assertEqual(
+            list(iter_statement_files(self.input_folder)), [("VISIBLE1CAD", visible)]
+        )
+
+    def test_zip_members_are_filtered(self):
+        """Test zip members are indexed and filtered like plain files"""
+        archive_path = os.path.join(self.input_folder, "2025.zip")
+        with zipfile.ZipFile(archive_path, "w") as archive:
+            archive.writestr(statement_name("ZIP1CAD", "2025-01-31"), CSV_CONTENT)
+            archive.writestr(statement_name("ZIP1CAD", "2025-02-28"), CSV_CONTENT)
+
+        selector = StatementSelector(since="2025-02-01")
+        self.assertEqual(
+            list(iter_statement_files(self.input_folder, selector)),
+            [("ZIP1CAD", f"{archive_path}::{statement_name('ZIP1CAD', '2025-02-28')}")],
+        )
+        self.assertEqual(
+            StatementSelector(exclude=["*.zip"]).select(self.input_folder), []
+        )
+
+    def test_read_csv_files_selector(self):
+        """Test read_csv_files only converts the selected statements"""
+        self.write_tree()
+
+        result = read_csv_files(
+            self.input_folder, selector=StatementSelector(accounts=["ACCT2CAD"])
+        )
+
+        self.assertEqual(set(result), {"ACCT2CAD-USD", "ACCT2CAD-CAD"})
+        self.assertEqual(len(result["ACCT2CAD-CAD"]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,332 @@
+import argparse
+import os
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+from unittest.mock import patch
+
+import app.main
+from app.dedup import Deduplicator
+from app.formats import (
+    FORMAT_WRITERS,
+    FormatWriter,
+    beancount_account_component,
+    beancount_commodity,
+    cash_flow,
+)
+from app.main import (
+    OUTPUT_FORMATS,
+    iter_csv_entries,
+    iter_csv_transactions,
+    parse_formats,
+    parse_transaction,
+    stream_format_files,
+    stream_qif_files,
+)
+
+OPTION_DESCRIPTION = "SPY 450.00 USD CALL 2025-07-25: Bought 2 contract (executed at 2025-07-23), Fee: $1.50"
+
+CSV_CONTENT = f"""date,transaction,description,amount,balance,currency
+2025-07-01,BUY,AAPL - 10.0 shares,-1500.00,0.00,USD
+2025-07-02,SELL,AAPL - 3.0 shares,1000.00,0.00,USD
+2025-07-04,BUYTOOPEN,"{OPTION_DESCRIPTION}",-320.50,0.00,USD
+2025-07-06,DIV,TD - Dividend payment,15.75,0.00,CAD
+2025-07-08,CONT,Contribution,1000.0,0.00,CAD
+2025-07-09,NRT,Tax <withheld> & more,-5.25,0.00,USD
+"""
+
+CHECKING_CONTENT = """date,transaction,description,amount,balance,currency
+2025-07-09,SPEND,Card purchase,-50.00,0.00,CAD
+2025-07-10,SPEND,Card purchase,-50.00,0.00,CAD
+2025-07-11,EFT,Payroll,2000.00,0.00,CAD
+"""
+
+CONFIG = {
+    "AB1234567CAD-USD": {"nickname": "My-Investment-USD", "type": "Investment"},
+    "AB1234567CAD-CAD": {"nickname": "my investment cad", "type": "Investment"},
+    "CD7654321CAD-CAD": {"nickname": "My-Chequing", "type": "Checking"},
+}
+
+
+class TestFormatHelpers(unittest.TestCase):
+    def test_formats_registry(self):
+        """Test every format of the command line has a writer"""
+        self.assertEqual(tuple(FORMAT_WRITERS), OUTPUT_FORMATS)
+        self.assertEqual(
+            {writer.extension for writer in FORMAT_WRITERS.values()},
+            {"qif", "ofx", "beancount", "csv"},
+        )
+        self.assertEqual(FormatWriter.__abstractmethods__, {"write"})
+
+    def test_parse_formats(self):
+        """Test the --format list is split, normalized and validated"""
+        self.assertEqual(parse_formats("qif"), ("qif",))
+        self.assertEqual(parse_formats("OFX, csv,ofx"), ("ofx", "csv"))
+        with self.assertRaises(argparse.ArgumentTypeError):
+            parse_formats("qif,xlsx")
+
+    def test_cash_flow(self):
+        """Test totals are signed by the direction of the cash movement"""
+        buy = parse_transaction(
+            "2025-07-01", "BUY", "AAPL - 10.0 shares", "-1500.00", "USD"
+        )
+        tax = parse_transaction("2025-07-09", "NRT", "Tax", "-5.25", "USD")
+        dividend = parse_transaction(
+            "2025-07-06", "DIV", "TD - Dividend", "15.75", "CAD"
+        )
+        spend = parse_transaction("2025-07-09", "SPEND", "Card", "-50.00", "CAD")
+        self.assertEqual(
+            [cash_flow(t) for t in (buy, tax, dividend, spend)],
+            [-150000, -525, 1575, -5000],
+        )
+
+    def test_beancount_names(self):
+        """Test symbols and nicknames are turned into valid Beancount names"""
+        self.assertEqual(beancount_commodity("SHOP-CT"), "SHOP-CT")
+        self.assertEqual(beancount_commodity("brk.b"), "BRK.B")
+        self.assertEqual(
+            beancount_commodity("SPY 450.00 USD CALL 2025-07-25"), "SPY250725C450.00"
+        )
+        self.assertEqual(
+            beancount_commodity("AAPL 180 USD PUT 2025-07-30"), "AAPL250730P180"
+        )
+        self.assertEqual(beancount_commodity("3M"), "X3M")
+        self.assertEqual(
+            beancount_account_component("my investment cad"), "My-investment-cad"
+        )
+
+
+class TestStreamFormatFiles(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.input_folder = os.path.join(self.work_dir.name, "input")
+        os.mkdir(self.input_folder)
+        os.mkdir(os.path.join(self.work_dir.name, "output"))
+        for account_id, content in (
+            ("AB1234567CAD", CSV_CONTENT),
+            ("CD7654321CAD", CHECKING_CONTENT),
+        ):
+            file_path = os.path.join(
+                self.input_folder,
+                f"monthly-statement-transactions-{account_id}-2025-07-31.csv",
+            )
+            with open(file_path, "w") as csv_file:
+                csv_file.write(content)
+
+        self.cwd = os.getcwd()
+        os.chdir(self.work_dir.name)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.work_dir.cleanup()
+
+    def export(self, formats, **kwargs):
+        with patch("app.main.read_config", return_value=CONFIG):
+            with patch("builtins.print"):
+                stream_format_files(
+                    iter_csv_transactions(self.input_folder, **kwargs),
+                    "dummy_config.yml",
+                    formats,
+                    buffer_size=16,
+                )
+
+    def read_output(self):
+        contents = {}
+        for name in sorted(os.listdir("output")):
+            with open(os.path.join("output", name), "r") as file:
+                contents[name] = file.read()
+            os.remove(os.path.join("output", name))
+        return contents
+
+    def test_qif_identical_to_stream_qif_files(self):
+        """Test QIF files written with other formats are the ones of stream_qif_files"""
+        with patch("app.main.read_config", return_value=CONFIG):
+            with patch("builtins.print"):
+                stream_qif_files(
+                    iter_csv_entries(self.input_folder), "dummy_config.yml"
+                )
+        expected = self.read_output()
+
+        self.export(("qif", "csv"))
+        written = self.read_output()
+
+        self.assertEqual(
+            sorted(written),
+            sorted(
+                list(expected)
+                + ["My-Chequing.csv", "My-Investment-USD.csv", "my investment cad.csv"]
+            ),
+        )
+        for name, content in expected.items():
+            self.assertEqual(written[name], content)
+
+    def test_single_read_for_all_formats(self):
+        """Test every statement is opened once whatever the number of formats"""
+        with patch("app.main.open_statement", wraps=app.main.open_statement) as opened:
+            self.export(OUTPUT_FORMATS)
+
+        self.assertEqual(opened.call_count, 2)
+        self.assertEqual(len(self.read_output()), 3 * len(OUTPUT_FORMATS))
+
+    def test_csv_ledger(self):
+        """Test the CSV ledger has signed amounts and one row per transaction"""
+        self.export(("csv",))
+        written = self.read_output()
+
+        self.assertEqual(
+            written["My-Investment-USD.csv"].splitlines(),
+            [
+                "date,action,symbol,quantity,price,amount,fee,currency,payee,memo",
+                "2025-07-01,Buy,AAPL-CT,10.0,150.00,-1500.00,0.00,USD,,",
+                "2025-07-02,Sell,AAPL-CT,3.0,333.333333,1000.00,0.00,USD,,",
+                "2025-07-04,Buy,SPY 450.00 USD CALL 2025-07-25,2,159.50,-320.50,1.50,USD,,",
+                "2025-07-09,XOut,,,,-5.25,0.00,USD,US Non-Resident Tax Withholding,"
+                "Tax <withheld> & more",
+            ],
+        )
+
+    def test_beancount_ledger(self):
+        """Test Beancount transactions balance with exact total costs"""
+        self.export(("beancount",))
+        ledger = self.read_output()["My-Investment-USD.beancount"]
+
+        self.assertIn(
+            '1970-01-01 open Assets:Wealthsimple:My-Investment-USD "FIFO"\n', ledger
+        )
+        self.assertIn(
+            '2025-07-04 * "SPY 450.00 USD CALL 2025-07-25" "Buy"\n'
+            "  Assets:Wealthsimple:My-Investment-USD  2 SPY250725C450.00 {{319.00 USD}}\n"
+            "  Expenses:Wealthsimple:My-Investment-USD:Fees  1.50 USD\n"
+            "  Assets:Wealthsimple:My-Investment-USD  -320.50 USD\n",
+            ledger,
+        )
+        self.assertIn(
+            '2025-07-02 * "AAPL-CT" "Sell"\n'
+            "  Assets:Wealthsimple:My-Investment-USD  -3.0 AAPL-CT {} @@ 1000.00 USD\n"
+            "  Income:Wealthsimple:My-Investment-USD:Gains\n"
+            "  Assets:Wealthsimple:My-Investment-USD  1000.00 USD\n",
+            ledger,
+        )
+
+    def test_ofx_statements(self):
+        """Test OFX statements are well formed with stable, unique transaction ids"""
+        self.export(("ofx",))
+        first = self.read_output()
+        self.export(("ofx",))
+        self.assertEqual(self.read_output(), first)
+
+        bank = ET.fromstring(first["My-Chequing.ofx"].split("\n", 2)[2])
+        amounts = [element.text for element in bank.iter("TRNAMT")]
+        fitids = [element.text for element in bank.iter("FITID")]
+        self.assertEqual(amounts, ["-50.00", "-50.00", "2000.00"])
+        self.assertEqual(len(set(fitids)), 3)
+        self.assertEqual(bank.find(".//ACCTTYPE").text, "CHECKING")
+
+        investment = ET.fromstring(first["My-Investment-USD.ofx"].split("\n", 2)[2])
+        buy = investment.find(".//BUYSTOCK/INVBUY")
+        self.assertEqual(
+            (
+                buy.find("UNITS").text,
+                buy.find("UNITPRICE").text,
+                buy.find("TOTAL").text,
+            ),
+            ("10.0", "150.00", "-1500.00"),
+        )
+        self.assertEqual(investment.find(".//INVSELL/UNITS").text, "-3.0")
+        self.assertEqual(
+            investment.find(".//INVBANKTRAN//MEMO").text, "Tax <withheld> & more"
+        )
+        self.assertEqual(
+            [element.text for element in investment.iter("TICKER")],
+            ["AAPL-CT", "SPY 450.00 USD CALL 2025-07-25"],
+        )
+
+    def test_ofx_statement_aggregates(self):
+        """Test OFX statements carry the sign-on, period, balance and option aggregates"""
+        with open(
+            os.path.join(
+                self.input_folder,
+                "monthly-statement-transactions-CD7654321CAD-2025-08-31.csv",
+            ),
+            "w",
+            encoding="utf-8",
+        ) as csv_file:
+            csv_file.write(CHECKING_CONTENT.splitlines()[0] + "\n")
+            csv_file.write("2025-08-01,SPEND,Café crème,-4.50,0.00,CAD\n")
+        self.export(("ofx",))
+
+        with open(os.path.join("output", "My-Chequing.ofx"), "rb") as file:
+            bank = ET.fromstring(file.read().decode("utf-8").split("\n", 2)[2])
+        self.assertEqual(bank.find("SIGNONMSGSRSV1/SONRS/DTSERVER").text, "20250801")
+        statement = bank.find(".//STMTRS")
+        self.assertEqual(statement.find("BANKTRANLIST/DTSTART").text, "20250709")
+        self.assertEqual(statement.find("BANKTRANLIST/DTEND").text, "20250801")
+        self.assertEqual(statement.find("LEDGERBAL/BALAMT").text, "1895.50")
+        self.assertEqual(statement.find("LEDGERBAL/DTASOF").text, "20250801")
+        self.assertIn("Café crème", [element.text for element in bank.iter("NAME")])
+
+        investment = ET.fromstring(
+            self.read_output()["My-Investment-USD.ofx"].split("\n", 2)[2]
+        )
+        statement = investment.find(".//INVSTMTRS")
+        self.assertEqual(statement.find("DTASOF").text, "20250709")
+        self.assertEqual(statement.find("INVTRANLIST/DTSTART").text, "20250701")
+        self.assertEqual(statement.find("INVTRANLIST/DTEND").text, "20250709")
+        self.assertEqual(len(investment.findall(".//BUYSTOCK")), 1)
+        option = investment.find(".//BUYOPT")
+        self.assertEqual(
+            (
+                option.find("INVBUY/UNITS").text,
+                option.find("INVBUY/UNITPRICE").text,
+                option.find("OPTBUYTYPE").text,
+                option.find("SHPERCTRCT").text,
+            ),
+            ("2", "1.595", "BUYTOOPEN", "100"),
+        )
+        option_info = investment.find(".//OPTINFO")
+        self.assertEqual(
+            (
+                option_info.find("SECINFO/TICKER").text,
+                option_info.find("OPTTYPE").text,
+                option_info.find("STRIKEPRICE").text,
+                option_info.find("DTEXPIRE").text,
+            ),
+            ("SPY 450.00 USD CALL 2025-07-25", "CALL", "450.00", "20250725"),
+        )
+
+    def test_dedup_and_columnar_engine(self):
+        """Test records go through the duplicate filter and both engines alike"""
+        self.export(("csv",))
+        scalar = self.read_output()
+        self.export(("csv",), engine="columnar")
+        self.assertEqual(self.read_output(), scalar)
+
+        duplicate = os.path.join(
+            self.input_folder,
+            "monthly-statement-transactions-CD7654321CAD-2025-08-31.csv",
+        )
+        with open(duplicate, "w") as csv_file:
+            csv_file.write(CHECKING_CONTENT)
+        dedup = Deduplicator("drop")
+        self.export(("csv",), dedup=dedup)
+
+        self.assertEqual(self.read_output(), scalar)
+        self.assertEqual(sum(dedup.duplicates.values()), 3)
+
+    def test_unknown_account(self):
+        """Test unknown accounts are rejected before any file is written"""
+        with patch("app.main.read_config", return_value={}):
+            with patch("builtins.print"):
+                with self.assertRaises(ValueError) as context:
+                    stream_format_files(
+                        iter_csv_transactions(self.input_folder),
+                        "dummy_config.yml",
+                        ("ofx",),
+                    )
+
+        self.assertIn("Unknown account", str(context.exception))
+        self.assertEqual(os.listdir("output"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from app.dates import parse_qif_date
+from app.incremental import STATE_VERSION, ExportState, entry_digest
+from app.main import export_incremental_qif_files, export_qif_files
+
+
+def bank_entry(date, amount, payee="Deposit"):
+    return f"D{date}\nT{amount}\nO0.00\nCc\nP{payee}\n^"
+
+
+JULY = [
+    bank_entry("07/01/2025", "100.00"),
+    bank_entry("07/15/2025", "5.00", "Coffee"),
+    bank_entry("07/31/2025", "20.00"),
+]
+# Same-day repeat of the boundary row, a new row on the boundary date and a later row
+AUGUST = JULY + [
+    bank_entry("07/31/2025", "20.00"),
+    bank_entry("07/31/2025", "7.50", "Refund"),
+    bank_entry("08/02/2025", "300.00"),
+]
+CONFIG = {"WK23MTV36CAD-CAD": {"nickname": "My-Checking", "type": "Checking"}}
+
+
+class TestIncremental(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.state_path = os.path.join(self.work_dir, "state", "export.json")
+        self.cwd = os.getcwd()
+        os.chdir(self.work_dir)
+        os.mkdir("output")
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.work_dir)
+
+    def export(self, entries, mode="append", path="output/My-Checking.qif"):
+        state = ExportState(self.state_path)
+        with patch("app.main.read_config", return_value=CONFIG), patch(
+            "builtins.print"
+        ):
+            export_incremental_qif_files(
+                {"WK23MTV36CAD-CAD": list(entries)},
+                "dummy_config.yml",
+                state,
+                mode=mode,
+            )
+        state.save()
+        with open(path) as file:
+            return file.read()
+
+    def full_export(self, entries):
+        with patch("app.main.read_config", return_value=CONFIG), patch(
+            "builtins.print"
+        ):
+            export_qif_files({"WK23MTV36CAD-CAD": list(entries)}, "dummy_config.yml")
+        with open("output/My-Checking.qif") as file:
+            return file.read()
+
+    def test_parse_qif_date(self):
+        """Test dates of every style are read back as ISO dates"""
+        for text in ("07/15/2025", "07/15'25", "2025-07-15"):
+            self.assertEqual(parse_qif_date(text), "2025-07-15")
+        self.assertEqual(parse_qif_date("12/31/99"), "1999-12-31")
+        with self.assertRaises(ValueError):
+            parse_qif_date("15.07.2025")
+
+    def test_select_new_entries(self):
+        """Test only entries past the mark, or unseen boundary rows, are new"""
+        state = ExportState(self.state_path)
+        new_entries, mark = state.select("ACC-CAD", JULY)
+        self.assertEqual(new_entries, JULY)
+        self.assertEqual(mark["date"], "2025-07-31")
+        state.record("ACC-CAD", mark, "output/acc.qif")
+
+        new_entries, mark = state.select("ACC-CAD", AUGUST)
+        self.assertEqual(new_entries, AUGUST[3:])
+        self.assertEqual(mark["date"], "2025-08-02")
+        self.assertEqual(mark["boundary"], [entry_digest(AUGUST[-1])])
+
+        # Digests do not depend on the date style
+        self.assertEqual(
+            entry_digest(bank_entry("07/31'25", "20.00")), entry_digest(JULY[-1])
+        )
+
+    def test_append_mode(self):
+        """Test later runs only append new entries and match a full export"""
+        self.assertEqual(self.export(JULY), self.full_export(JULY))
+        expected = self.full_export(AUGUST)
+        os.remove("output/My-Checking.qif")
+
+        self.export(JULY)
+        self.assertEqual(self.export(AUGUST), expected)
+        # Nothing new: the file is left as it is
+        self.assertEqual(self.export(AUGUST), expected)
+
+        # An interrupted append is cut back, a removed file is written again in full
+        with open("output/My-Checking.qif", "a") as file:
+            file.write("D08/0")
+        self.assertEqual(self.export(AUGUST), expected)
+        os.remove("output/My-Checking.qif")
+        self.assertEqual(self.export(AUGUST), expected)
+
+        with open(self.state_path) as file:
+            mark = json.load(file)["accounts"]["WK23MTV36CAD-CAD"]
+        self.assertEqual(mark["size"], len(expected))
+
+    def test_delta_mode(self):
+        """Test delta files only hold the entries new since the previous run"""
+        delta_path = "output/My-Checking-delta.qif"
+        full = self.export(JULY)
+        delta = self.export(AUGUST, mode="delta", path=delta_path)
+        self.assertEqual(delta, "\n".join(["!Type:Bank"] + AUGUST[3:]) + "\n")
+        self.assertEqual(
+            self.export(AUGUST, mode="delta", path=delta_path), "!Type:Bank\n"
+        )
+        # The full history is left alone, and written again in full by the next append
+        with open("output/My-Checking.qif") as file:
+            self.assertEqual(file.read(), full)
+        self.assertEqual(self.export(AUGUST), self.full_export(AUGUST))
+
+        with self.assertRaises(ValueError):
+            self.export(AUGUST, mode="overwrite")
+
+    def test_outdated_state_is_ignored(self):
+        """Test a state file of another version starts from scratch"""
+        self.export(JULY)
+        with open(self.state_path) as file:
+            data = json.load(file)
+        data["version"] = STATE_VERSION + 1
+        with open(self.state_path, "w") as file:
+            json.dump(data, file)
+
+        self.assertEqual(ExportState(self.state_path).marks, {})
+        self.assertEqual(
+            ExportState(os.path.join(self.work_dir, "missing.json")).marks, {}
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
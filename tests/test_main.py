@@ -6,9 +6,56 @@ from unittest.mock import MagicMock, mock_open, patch
 
 import yaml
 
-from app.main import (export_qif_files, extract_account_name,
-                      extract_option_info, extract_symbol, extract_unit,
-                      generate_qif_entry, read_config, read_csv_files)
+from app.main import (
+    CSV_COLUMNS,
+    IGNORED_TRANSACTIONS,
+    TRANSACTION_HANDLERS,
+    export_qif_files,
+    extract_account_name,
+    extract_option_info,
+    extract_symbol,
+    extract_unit,
+    format_qif_entry,
+    generate_qif_entries,
+    generate_qif_entry,
+    iter_csv_entries,
+    iter_csv_records,
+    main,
+    read_config,
+    read_csv_files,
+    stream_qif_files,
+)
+from app.symbols import SYMBOLS_CONFIG_KEY
+
+
+class FakeDirEntry:
+    """Minimal stand-in for os.DirEntry describing a plain file."""
+
+    def __init__(self, directory, name):
+        self.name = name
+        self.path = os.path.join(directory, name)
+
+    def is_dir(self):
+        return False
+
+
+class FakeScandirIterator(list):
+    """List of entries usable as a context manager, like os.scandir()'s result."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+def fake_scandir(names):
+    """Build an os.scandir replacement listing `names` as the files of a flat folder."""
+
+    def scandir(directory):
+        return FakeScandirIterator(FakeDirEntry(directory, name) for name in names)
+
+    return scandir
 
 
 class TestMain(unittest.TestCase):
@@ -125,16 +172,16 @@ class TestMain(unittest.TestCase):
         result = extract_account_name(filename)
         self.assertIsNone(result)
 
-    @patch("os.listdir")
+    @patch("os.scandir")
     @patch(
         "builtins.open",
         new_callable=mock_open,
         read_data="date,transaction,description,amount,currency\n2025-07-01,BUY,AAPL - 10.0 shares,-1500.00,USD\n",
     )
-    def test_read_csv_files(self, mock_open_file, mock_listdir):
-        mock_listdir.return_value = [
-            "monthly-statement-transactions-TEST123456-2025-07-01.csv"
-        ]
+    def test_read_csv_files(self, mock_open_file, mock_scandir):
+        mock_scandir.side_effect = fake_scandir(
+            ["monthly-statement-transactions-TEST123456-2025-07-01.csv"]
+        )
         csv_data = read_csv_files("input_folder")
         # Should have 2 accounts (TEST123456-USD and TEST123456-CAD)
         self.assertEqual(len(csv_data), 2)
@@ -464,7 +511,7 @@ class TestMain(unittest.TestCase):
         # Test with integer instead of decimal format
         description = "AAPL - 10 shares"
         result = extract_unit(description)
-        self.assertIsNone(result)  # Function expects decimal format (e.g., 10.0)
+        self.assertEqual(result, 10.0)  # Integer share counts are accepted
 
         # Test with missing dash
         description = "AAPL 10.0 shares"
@@ -659,7 +706,7 @@ class TestMain(unittest.TestCase):
             "currency": "USD",
         }
         result = generate_qif_entry(row, "USD")
-        expected = "D2025-07-15\nNBuy\nYAAPL-CT\nI150.0\nQ10.0\nT1500.0\nO0.00\nCc\n^"
+        expected = "D07/15/2025\nNBuy\nYAAPL-CT\nI150.00\nQ10.0\nT1500.00\nO0.00\nCc\n^"
         self.assertEqual(result, expected)
 
     def test_generate_qif_entry_buy_transaction_cad(self):
@@ -672,7 +719,7 @@ class TestMain(unittest.TestCase):
             "currency": "CAD",
         }
         result = generate_qif_entry(row, "CAD")
-        expected = "D2025-07-16\nNBuy\nYSHOP-CT\nI150.0\nQ5.0\nT750.0\nO0.00\nCc\n^"
+        expected = "D07/16/2025\nNBuy\nYSHOP-CT\nI150.00\nQ5.0\nT750.00\nO0.00\nCc\n^"
         self.assertEqual(result, expected)
 
     def test_generate_qif_entry_buy_cdr_symbol_cad(self):
@@ -685,7 +732,7 @@ class TestMain(unittest.TestCase):
             "currency": "CAD",
         }
         result = generate_qif_entry(row, "CAD")
-        expected = "D2025-07-17\nNBuy\nYTSLA-QH\nI250.0\nQ2.0\nT500.0\nO0.00\nCc\n^"
+        expected = "D07/17/2025\nNBuy\nYTSLA-QH\nI250.00\nQ2.0\nT500.00\nO0.00\nCc\n^"
         self.assertEqual(result, expected)
 
     def test_generate_qif_entry_sell_transaction_usd(self):
@@ -698,7 +745,7 @@ class TestMain(unittest.TestCase):
             "currency": "USD",
         }
         result = generate_qif_entry(row, "USD")
-        expected = "D2025-07-18\nNSell\nYMSFT-CT\nI300.0\nQ8.0\nT2400.0\nO0.00\nCc\n^"
+        expected = "D07/18/2025\nNSell\nYMSFT-CT\nI300.00\nQ8.0\nT2400.00\nO0.00\nCc\n^"
         self.assertEqual(result, expected)
 
     def test_generate_qif_entry_sell_transaction_cad(self):
@@ -711,7 +758,7 @@ class TestMain(unittest.TestCase):
             "currency": "CAD",
         }
         result = generate_qif_entry(row, "CAD")
-        expected = "D2025-07-19\nNSell\nYRY-CT\nI120.0\nQ15.0\nT1800.0\nO0.00\nCc\n^"
+        expected = "D07/19/2025\nNSell\nYRY-CT\nI120.00\nQ15.0\nT1800.00\nO0.00\nCc\n^"
         self.assertEqual(result, expected)
 
     def test_generate_qif_entry_buytoopen_options_usd(self):
@@ -724,7 +771,7 @@ class TestMain(unittest.TestCase):
             "currency": "USD",
         }
         result = generate_qif_entry(row, "USD")
-        expected = "D2025-07-23\nNBuy\nYSPY 450.00 USD CALL 2025-07-25\nI159.5\nQ2\nT320.5\nO1.5\nCc\n^"
+        expected = "D07/23/2025\nNBuy\nYSPY 450.00 USD CALL 2025-07-25\nI159.50\nQ2\nT320.50\nO1.50\nCc\n^"
         self.assertEqual(result, expected)
 
     def test_generate_qif_entry_selltoclose_options_usd(self):
@@ -737,7 +784,7 @@ class TestMain(unittest.TestCase):
             "currency": "USD",
         }
         result = generate_qif_entry(row, "USD")
-        expected = "D2025-07-25\nNSell\nYAAPL 180.00 USD PUT 2025-07-30\nI151.0\nQ1\nT150.25\nO0.75\nCc\n^"
+        expected = "D07/25/2025\nNSell\nYAAPL 180.00 USD PUT 2025-07-30\nI151.00\nQ1\nT150.25\nO0.75\nCc\n^"
         self.assertEqual(result, expected)
 
     def test_generate_qif_entry_dividend_usd(self):
@@ -750,7 +797,7 @@ class TestMain(unittest.TestCase):
             "currency": "USD",
         }
         result = generate_qif_entry(row, "USD")
-        expected = "D2025-07-20\nNDiv\nYAAPL-CT\nT25.5\nO0.00\nCc\n^"
+        expected = "D07/20/2025\nNDiv\nYAAPL-CT\nT25.50\nO0.00\nCc\n^"
         self.assertEqual(result, expected)
 
     def test_generate_qif_entry_dividend_cad(self):
@@ -763,7 +810,7 @@ class TestMain(unittest.TestCase):
             "currency": "CAD",
         }
         result = generate_qif_entry(row, "CAD")
-        expected = "D2025-07-21\nNDiv\nYTD-CT\nT15.75\nO0.00\nCc\n^"
+        expected = "D07/21/2025\nNDiv\nYTD-CT\nT15.75\nO0.00\nCc\n^"
         self.assertEqual(result, expected)
 
     def test_generate_qif_entry_contribution_cad(self):
@@ -776,7 +823,7 @@ class TestMain(unittest.TestCase):
             "currency": "CAD",
         }
         result = generate_qif_entry(row, "CAD")
-        expected = "D2025-07-16\nNXIn\nT1000.0\nO0.00\nCc\nPContribution\nMContribution (executed at 2025-07-16)\n^"
+        expected = "D07/16/2025\nNXIn\nT1000.00\nO0.00\nCc\nPContribution\nMContribution (executed at 2025-07-16)\n^"
         self.assertEqual(result, expected)
 
     def test_generate_qif_entry_contribution_usd(self):
@@ -789,7 +836,7 @@ class TestMain(unittest.TestCase):
             "currency": "USD",
         }
         result = generate_qif_entry(row, "USD")
-        expected = "D2025-07-22\nNXIn\nT500.0\nO0.00\nCc\nPContribution\nMMonthly contribution\n^"
+        expected = "D07/22/2025\nNXIn\nT500.00\nO0.00\nCc\nPContribution\nMMonthly contribution\n^"
         self.assertEqual(result, expected)
 
     def test_generate_qif_entry_fplint_usd(self):
@@ -802,7 +849,7 @@ class TestMain(unittest.TestCase):
             "currency": "USD",
         }
         result = generate_qif_entry(row, "USD")
-        expected = "D2025-07-30\nNXIn\nT12.5\nO0.00\nCc\nPInterest\nMStock lending interest payment\n^"
+        expected = "D07/30/2025\nNXIn\nT12.50\nO0.00\nCc\nPInterest\nMStock lending interest payment\n^"
         self.assertEqual(result, expected)
 
     def test_generate_qif_entry_nrt_usd(self):
@@ -815,7 +862,10 @@ class TestMain(unittest.TestCase):
             "currency": "USD",
         }
         result = generate_qif_entry(row, "USD")
-        expected = "D2025-07-31\nNXOut\nT5.25\nO0.00\nCc\nPUS Non-Resident Tax Withholding\nMUS Non-Resident Tax Withholding\n^"
+        expected = (
+            "D07/31/2025\nNXOut\nT5.25\nO0.00\nCc\n"
+            "PUS Non-Resident Tax Withholding\nMUS Non-Resident Tax Withholding\n^"
+        )
         self.assertEqual(result, expected)
 
     def test_generate_qif_entry_trfout_transactions(self):
@@ -829,7 +879,7 @@ class TestMain(unittest.TestCase):
             "currency": "CAD",
         }
         result = generate_qif_entry(row, "CAD")
-        expected = "D2025-08-01\nT-200.0\nO0.00\nCc\nPTransfer to external account\n^"
+        expected = "D08/01/2025\nT-200.00\nO0.00\nCc\nPTransfer to external account\n^"
         self.assertEqual(result, expected)
 
         # Test SPEND
@@ -841,7 +891,7 @@ class TestMain(unittest.TestCase):
             "currency": "USD",
         }
         result = generate_qif_entry(row, "USD")
-        expected = "D2025-08-02\nT-50.0\nO0.00\nCc\nPCard purchase\n^"
+        expected = "D08/02/2025\nT-50.00\nO0.00\nCc\nPCard purchase\n^"
         self.assertEqual(result, expected)
 
         # Test E_TRFOUT
@@ -853,7 +903,7 @@ class TestMain(unittest.TestCase):
             "currency": "CAD",
         }
         result = generate_qif_entry(row, "CAD")
-        expected = "D2025-08-03\nT-100.0\nO0.00\nCc\nPElectronic transfer out\n^"
+        expected = "D08/03/2025\nT-100.00\nO0.00\nCc\nPElectronic transfer out\n^"
         self.assertEqual(result, expected)
 
         # Test EFTOUT
@@ -865,7 +915,7 @@ class TestMain(unittest.TestCase):
             "currency": "USD",
         }
         result = generate_qif_entry(row, "USD")
-        expected = "D2025-08-04\nT-75.0\nO0.00\nCc\nPEFT withdrawal\n^"
+        expected = "D08/04/2025\nT-75.00\nO0.00\nCc\nPEFT withdrawal\n^"
         self.assertEqual(result, expected)
 
         # Test AFT_OUT
@@ -877,7 +927,7 @@ class TestMain(unittest.TestCase):
             "currency": "CAD",
         }
         result = generate_qif_entry(row, "CAD")
-        expected = "D2025-08-05\nT-125.0\nO0.00\nCc\nPAutomated transfer out\n^"
+        expected = "D08/05/2025\nT-125.00\nO0.00\nCc\nPAutomated transfer out\n^"
         self.assertEqual(result, expected)
 
     def test_generate_qif_entry_incoming_transactions(self):
@@ -891,7 +941,7 @@ class TestMain(unittest.TestCase):
             "currency": "USD",
         }
         result = generate_qif_entry(row, "USD")
-        expected = "D2025-08-06\nT15.0\nO0.00\nCc\nPCredit card cashback\n^"
+        expected = "D08/06/2025\nT15.00\nO0.00\nCc\nPCredit card cashback\n^"
         self.assertEqual(result, expected)
 
         # Test EFT
@@ -903,7 +953,7 @@ class TestMain(unittest.TestCase):
             "currency": "CAD",
         }
         result = generate_qif_entry(row, "CAD")
-        expected = "D2025-08-07\nT300.0\nO0.00\nCc\nPElectronic funds transfer\n^"
+        expected = "D08/07/2025\nT300.00\nO0.00\nCc\nPElectronic funds transfer\n^"
         self.assertEqual(result, expected)
 
         # Test INT
@@ -915,7 +965,7 @@ class TestMain(unittest.TestCase):
             "currency": "USD",
         }
         result = generate_qif_entry(row, "USD")
-        expected = "D2025-08-08\nT8.5\nO0.00\nCc\nPInterest payment\n^"
+        expected = "D08/08/2025\nT8.50\nO0.00\nCc\nPInterest payment\n^"
         self.assertEqual(result, expected)
 
         # Test TRFIN
@@ -927,7 +977,7 @@ class TestMain(unittest.TestCase):
             "currency": "CAD",
         }
         result = generate_qif_entry(row, "CAD")
-        expected = "D2025-08-09\nT250.0\nO0.00\nCc\nPTransfer in from external\n^"
+        expected = "D08/09/2025\nT250.00\nO0.00\nCc\nPTransfer in from external\n^"
         self.assertEqual(result, expected)
 
         # Test TRFINTF
@@ -939,7 +989,7 @@ class TestMain(unittest.TestCase):
             "currency": "USD",
         }
         result = generate_qif_entry(row, "USD")
-        expected = "D2025-08-10\nT2.0\nO0.00\nCc\nPInternal transfer fee\n^"
+        expected = "D08/10/2025\nT2.00\nO0.00\nCc\nPInternal transfer fee\n^"
         self.assertEqual(result, expected)
 
         # Test REFUND
@@ -951,7 +1001,7 @@ class TestMain(unittest.TestCase):
             "currency": "CAD",
         }
         result = generate_qif_entry(row, "CAD")
-        expected = "D2025-08-11\nT45.0\nO0.00\nCc\nPPurchase refund\n^"
+        expected = "D08/11/2025\nT45.00\nO0.00\nCc\nPPurchase refund\n^"
         self.assertEqual(result, expected)
 
     def test_generate_qif_entry_ignored_transactions(self):
@@ -1032,7 +1082,9 @@ class TestMain(unittest.TestCase):
             "currency": "USD",
         }
         result = generate_qif_entry(row, "USD")
-        expected = "D2025-08-17\nNBuy\nYGOOGL-CT\nI2500.3\nQ2.5\nT6250.75\nO0.00\nCc\n^"
+        expected = (
+            "D08/17/2025\nNBuy\nYGOOGL-CT\nI2500.30\nQ2.5\nT6250.75\nO0.00\nCc\n^"
+        )
         self.assertEqual(result, expected)
 
         # Test fractional options contracts and fees
@@ -1044,7 +1096,7 @@ class TestMain(unittest.TestCase):
             "currency": "USD",
         }
         result = generate_qif_entry(row, "USD")
-        expected = "D2025-08-18\nNBuy\nYNVDA 800.00 USD CALL 2025-09-15\nI500.0\nQ3\nT1502.25\nO2.25\nCc\n^"
+        expected = "D08/18/2025\nNBuy\nYNVDA 800.00 USD CALL 2025-09-15\nI500.00\nQ3\nT1502.25\nO2.25\nCc\n^"
         self.assertEqual(result, expected)
 
     def test_generate_qif_entry_negative_amounts_handling(self):
@@ -1058,7 +1110,7 @@ class TestMain(unittest.TestCase):
             "currency": "USD",
         }
         result = generate_qif_entry(row, "USD")
-        expected = "D2025-08-19\nNBuy\nYAMZN-CT\nI3500.0\nQ1.0\nT3500.0\nO0.00\nCc\n^"
+        expected = "D08/19/2025\nNBuy\nYAMZN-CT\nI3500.00\nQ1.0\nT3500.00\nO0.00\nCc\n^"
         self.assertEqual(result, expected)
 
         # SELL transactions typically have positive amounts in CSV
@@ -1070,9 +1122,60 @@ class TestMain(unittest.TestCase):
             "currency": "USD",
         }
         result = generate_qif_entry(row, "USD")
-        expected = "D2025-08-20\nNSell\nYAMZN-CT\nI3600.0\nQ1.0\nT3600.0\nO0.00\nCc\n^"
+        expected = (
+            "D08/20/2025\nNSell\nYAMZN-CT\nI3600.00\nQ1.0\nT3600.00\nO0.00\nCc\n^"
+        )
         self.assertEqual(result, expected)
 
+    # Tests for generate_qif_entries function
+    def test_generate_qif_entries_matches_generate_qif_entry(self):
+        """Test generate_qif_entries groups the same entries as generate_qif_entry by currency"""
+        rows = [
+            dict(zip(CSV_COLUMNS, values))
+            for values in (
+                ("2025-08-01", "BUY", "AAPL - 10.0 shares", "-1500.00", "USD"),
+                ("2025-08-02", "CONT", "Contribution", "1000.0", "CAD"),
+                ("2025-08-03", "STKDIS", "Stock distribution", "0.00", "USD"),
+                ("2025-08-04", "SPEND", "Card purchase", "-50.00", "EUR"),
+                ("2025-08-05", "DIV", "TD - Dividend payment", "15.75", "CAD"),
+            )
+        ]
+        expected = {}
+        for row in rows:
+            entry = generate_qif_entry(row, row["currency"])
+            if entry is not None:
+                expected.setdefault(row["currency"], []).append(entry)
+
+        self.assertEqual(generate_qif_entries(rows), expected)
+        # Tuples as yielded by iter_csv_records give the same result
+        records = [tuple(row[column] for column in CSV_COLUMNS) for row in rows]
+        self.assertEqual(generate_qif_entries(iter(records)), expected)
+
+    def test_generate_qif_entries_target_currencies(self):
+        """Test only target currencies are converted and each gets a list"""
+        rows = [
+            ("2025-08-01", "CONT", "Contribution", "1000.0", "CAD"),
+            ("2025-08-02", "INVALID_TYPE", "Skipped before parsing", "1.00", "EUR"),
+        ]
+        result = generate_qif_entries(rows, target_currencies=("USD", "CAD"))
+        self.assertEqual(sorted(result), ["CAD", "USD"])
+        self.assertEqual(result["USD"], [])
+        self.assertEqual(len(result["CAD"]), 1)
+
+        with self.assertRaises(ValueError) as context:
+            generate_qif_entries(rows)
+        self.assertIn("Invalid transaction type: INVALID_TYPE", str(context.exception))
+
+    def test_generate_qif_entries_appends_to_buckets(self):
+        """Test entries are appended to the lists passed in across calls"""
+        buckets = {"CAD": ["existing"]}
+        row = ("2025-08-01", "CONT", "Contribution", "1000.0", "CAD")
+        generate_qif_entries([row], entries_by_currency=buckets)
+        result = generate_qif_entries([row], entries_by_currency=buckets)
+        self.assertIs(result, buckets)
+        self.assertEqual(len(buckets["CAD"]), 3)
+        self.assertEqual(generate_qif_entries([]), {})
+
     # Tests for read_config function
     def test_read_config_valid_yaml_file(self):
         """Test read_config with valid YAML configuration file"""
@@ -1354,6 +1457,9 @@ WK23MTV36CAD-CAD
 
             # Check that all accounts have required fields
             for account_id, account_config in result.items():
+                if account_id == SYMBOLS_CONFIG_KEY:
+                    # Symbol suffix rules, not an account
+                    continue
                 self.assertIn("nickname", account_config)
                 self.assertIn("type", account_config)
                 self.assertIsInstance(account_config["nickname"], str)
@@ -1376,19 +1482,25 @@ WK23MTV36CAD-CAD
             self.skipTest("accounts.yml file not found in project directory")
 
     # Tests for read_csv_files function
-    @patch("os.listdir")
+    @patch("os.scandir")
     @patch("builtins.open", new_callable=mock_open)
-    def test_read_csv_files_multiple_files(self, mock_open_file, mock_listdir):
+    def test_read_csv_files_multiple_files(self, mock_open_file, mock_scandir):
         """Test read_csv_files with multiple CSV files"""
         # Mock directory listing with multiple CSV files
-        mock_listdir.return_value = [
-            "monthly-statement-transactions-ACCOUNT1-2025-07-01.csv",
-            "monthly-statement-transactions-ACCOUNT2-2025-06-30.csv",
-            "other-file.txt",  # Should be ignored
-        ]
+        mock_scandir.side_effect = fake_scandir(
+            [
+                "monthly-statement-transactions-ACCOUNT1-2025-07-01.csv",
+                "monthly-statement-transactions-ACCOUNT2-2025-06-30.csv",
+                "other-file.txt",  # Should be ignored
+            ]
+        )
 
         # Mock CSV content for first file
-        csv_content1 = "date,transaction,description,amount,currency\n2025-07-01,BUY,AAPL - 10.0 shares,-1500.00,USD\n2025-07-02,SELL,TSLA - 5.0 shares,1000.00,CAD\n"
+        csv_content1 = (
+            "date,transaction,description,amount,currency\n"
+            "2025-07-01,BUY,AAPL - 10.0 shares,-1500.00,USD\n"
+            "2025-07-02,SELL,TSLA - 5.0 shares,1000.00,CAD\n"
+        )
         # Mock CSV content for second file
         csv_content2 = "date,transaction,description,amount,currency\n2025-06-30,DIV,MSFT - Dividend payment,25.50,USD\n"
 
@@ -1429,55 +1541,54 @@ WK23MTV36CAD-CAD
         # ACCOUNT2-CAD should be empty
         self.assertEqual(len(result["ACCOUNT2-CAD"]), 0)
 
-    @patch("os.listdir")
+    @patch("os.scandir")
     @patch("builtins.open", new_callable=mock_open)
-    def test_read_csv_files_empty_directory(self, mock_open_file, mock_listdir):
+    def test_read_csv_files_empty_directory(self, mock_open_file, mock_scandir):
         """Test read_csv_files with empty directory"""
-        mock_listdir.return_value = []
+        mock_scandir.side_effect = fake_scandir([])
 
         result = read_csv_files("empty_folder")
 
         self.assertEqual(result, {})
 
-    @patch("os.listdir")
+    @patch("os.scandir")
     @patch("builtins.open", new_callable=mock_open)
-    def test_read_csv_files_no_csv_files(self, mock_open_file, mock_listdir):
+    def test_read_csv_files_no_csv_files(self, mock_open_file, mock_scandir):
         """Test read_csv_files with directory containing no CSV files"""
-        mock_listdir.return_value = ["file1.txt", "file2.pdf", "readme.md"]
+        mock_scandir.side_effect = fake_scandir(["file1.txt", "file2.pdf", "readme.md"])
 
         result = read_csv_files("no_csv_folder")
 
         self.assertEqual(result, {})
 
-    @patch("os.listdir")
+    @patch("os.scandir")
     @patch("builtins.open", new_callable=mock_open)
-    def test_read_csv_files_invalid_filename_format(self, mock_open_file, mock_listdir):
+    def test_read_csv_files_invalid_filename_format(self, mock_open_file, mock_scandir):
         """Test read_csv_files with CSV files that don't match expected format"""
-        mock_listdir.return_value = [
-            "invalid-format.csv",
-            "monthly-statement-transactions-INVALID.csv",  # Missing date
-            "daily-statement-transactions-ACCOUNT1-2025-07-01.csv",  # Wrong prefix
-        ]
+        mock_scandir.side_effect = fake_scandir(
+            [
+                "invalid-format.csv",
+                "monthly-statement-transactions-INVALID.csv",  # Missing date
+                "daily-statement-transactions-ACCOUNT1-2025-07-01.csv",  # Wrong prefix
+            ]
+        )
 
         result = read_csv_files("invalid_folder")
 
-        # Should be empty since no files match the expected format
-        # Note: extract_account_name returns None for invalid formats, which creates 'None-USD' and 'None-CAD' keys
-        # But since the files don't match the pattern, they won't be processed, so these should be empty
-        expected_keys = {"None-USD", "None-CAD"}
-        self.assertEqual(set(result.keys()), expected_keys)
-        self.assertEqual(len(result["None-USD"]), 0)
-        self.assertEqual(len(result["None-CAD"]), 0)
+        # Should be empty since no files match the expected format: files without an
+        # account ID are skipped instead of creating 'None-USD' and 'None-CAD' buckets
+        self.assertEqual(result, {})
+        mock_open_file.assert_not_called()
 
-    @patch("os.listdir")
+    @patch("os.scandir")
     @patch("builtins.open", new_callable=mock_open)
     def test_read_csv_files_mixed_currencies_single_file(
-        self, mock_open_file, mock_listdir
+        self, mock_open_file, mock_scandir
     ):
         """Test read_csv_files with single file containing mixed currency transactions"""
-        mock_listdir.return_value = [
-            "monthly-statement-transactions-MIXED123-2025-07-01.csv"
-        ]
+        mock_scandir.side_effect = fake_scandir(
+            ["monthly-statement-transactions-MIXED123-2025-07-01.csv"]
+        )
 
         csv_content = """date,transaction,description,amount,currency
 2025-07-01,BUY,AAPL - 10.0 shares,-1500.00,USD
@@ -1505,13 +1616,13 @@ WK23MTV36CAD-CAD
         # CAD account should have 3 transactions (SHOP BUY, TD DIV, CONT)
         self.assertEqual(len(result["MIXED123-CAD"]), 3)
 
-    @patch("os.listdir")
+    @patch("os.scandir")
     @patch("builtins.open", new_callable=mock_open)
-    def test_read_csv_files_empty_csv_file(self, mock_open_file, mock_listdir):
+    def test_read_csv_files_empty_csv_file(self, mock_open_file, mock_scandir):
         """Test read_csv_files with empty CSV file"""
-        mock_listdir.return_value = [
-            "monthly-statement-transactions-EMPTY123-2025-07-01.csv"
-        ]
+        mock_scandir.side_effect = fake_scandir(
+            ["monthly-statement-transactions-EMPTY123-2025-07-01.csv"]
+        )
 
         # CSV with only headers
         csv_content = "date,transaction,description,amount,currency\n"
@@ -1525,13 +1636,13 @@ WK23MTV36CAD-CAD
         self.assertEqual(len(result["EMPTY123-USD"]), 0)
         self.assertEqual(len(result["EMPTY123-CAD"]), 0)
 
-    @patch("os.listdir")
+    @patch("os.scandir")
     @patch("builtins.open", new_callable=mock_open)
-    def test_read_csv_files_ignored_transactions(self, mock_open_file, mock_listdir):
+    def test_read_csv_files_ignored_transactions(self, mock_open_file, mock_scandir):
         """Test read_csv_files with transactions that should be ignored"""
-        mock_listdir.return_value = [
-            "monthly-statement-transactions-IGNORE123-2025-07-01.csv"
-        ]
+        mock_scandir.side_effect = fake_scandir(
+            ["monthly-statement-transactions-IGNORE123-2025-07-01.csv"]
+        )
 
         csv_content = """date,transaction,description,amount,currency
 2025-07-01,BUY,AAPL - 10.0 shares,-1500.00,USD
@@ -1554,13 +1665,13 @@ WK23MTV36CAD-CAD
         self.assertIn("AAPL-CT", usd_transactions[0])
         self.assertIn("MSFT-CT", usd_transactions[1])
 
-    @patch("os.listdir")
+    @patch("os.scandir")
     @patch("builtins.open", new_callable=mock_open)
-    def test_read_csv_files_options_transactions(self, mock_open_file, mock_listdir):
+    def test_read_csv_files_options_transactions(self, mock_open_file, mock_scandir):
         """Test read_csv_files with options trading transactions"""
-        mock_listdir.return_value = [
-            "monthly-statement-transactions-OPTIONS123-2025-07-01.csv"
-        ]
+        mock_scandir.side_effect = fake_scandir(
+            ["monthly-statement-transactions-OPTIONS123-2025-07-01.csv"]
+        )
 
         csv_content = """date,transaction,description,amount,currency
 2025-07-23,BUYTOOPEN,SPY 450.00 USD CALL 2025-07-25: Bought 2 contract (executed at 2025-07-23) Fee: $1.50,-320.50,USD
@@ -1579,15 +1690,15 @@ WK23MTV36CAD-CAD
         self.assertIn("SPY 450.00 USD CALL 2025-07-25", usd_transactions[0])
         self.assertIn("AAPL 180.00 USD PUT 2025-07-30", usd_transactions[1])
 
-    @patch("os.listdir")
+    @patch("os.scandir")
     @patch("builtins.open", new_callable=mock_open)
     def test_read_csv_files_various_transaction_types(
-        self, mock_open_file, mock_listdir
+        self, mock_open_file, mock_scandir
     ):
         """Test read_csv_files with various transaction types"""
-        mock_listdir.return_value = [
-            "monthly-statement-transactions-VARIOUS123-2025-07-01.csv"
-        ]
+        mock_scandir.side_effect = fake_scandir(
+            ["monthly-statement-transactions-VARIOUS123-2025-07-01.csv"]
+        )
 
         csv_content = """date,transaction,description,amount,currency
 2025-07-01,BUY,AAPL - 10.0 shares,-1500.00,USD
@@ -1619,35 +1730,35 @@ WK23MTV36CAD-CAD
         self.assertIn("NDiv", transaction_text)  # DIV
         self.assertIn("NXIn", transaction_text)  # CONT, FPLINT, CASHBACK, EFT, INT
         self.assertIn("NXOut", transaction_text)  # NRT
-        self.assertIn("T-200.0", transaction_text)  # TRFOUT (negative amount)
+        self.assertIn("T-200.00", transaction_text)  # TRFOUT (negative amount)
 
-    @patch("os.listdir")
-    def test_read_csv_files_directory_not_found(self, mock_listdir):
+    @patch("os.scandir")
+    def test_read_csv_files_directory_not_found(self, mock_scandir):
         """Test read_csv_files with non-existent directory"""
-        mock_listdir.side_effect = FileNotFoundError("Directory not found")
+        mock_scandir.side_effect = FileNotFoundError("Directory not found")
 
         with self.assertRaises(FileNotFoundError):
             read_csv_files("nonexistent_folder")
 
-    @patch("os.listdir")
+    @patch("os.scandir")
     @patch("builtins.open", new_callable=mock_open)
-    def test_read_csv_files_file_read_error(self, mock_open_file, mock_listdir):
+    def test_read_csv_files_file_read_error(self, mock_open_file, mock_scandir):
         """Test read_csv_files with file read error"""
-        mock_listdir.return_value = [
-            "monthly-statement-transactions-ERROR123-2025-07-01.csv"
-        ]
+        mock_scandir.side_effect = fake_scandir(
+            ["monthly-statement-transactions-ERROR123-2025-07-01.csv"]
+        )
         mock_open_file.side_effect = IOError("Permission denied")
 
         with self.assertRaises(IOError):
             read_csv_files("error_folder")
 
-    @patch("os.listdir")
+    @patch("os.scandir")
     @patch("builtins.open", new_callable=mock_open)
-    def test_read_csv_files_malformed_csv(self, mock_open_file, mock_listdir):
+    def test_read_csv_files_malformed_csv(self, mock_open_file, mock_scandir):
         """Test read_csv_files with malformed CSV content"""
-        mock_listdir.return_value = [
-            "monthly-statement-transactions-MALFORMED123-2025-07-01.csv"
-        ]
+        mock_scandir.side_effect = fake_scandir(
+            ["monthly-statement-transactions-MALFORMED123-2025-07-01.csv"]
+        )
 
         # CSV with missing columns
         csv_content = """date,transaction,description
@@ -1659,13 +1770,13 @@ WK23MTV36CAD-CAD
         with self.assertRaises(KeyError):
             read_csv_files("malformed_folder")
 
-    @patch("os.listdir")
+    @patch("os.scandir")
     @patch("builtins.open", new_callable=mock_open)
-    def test_read_csv_files_cdr_symbol_handling(self, mock_open_file, mock_listdir):
+    def test_read_csv_files_cdr_symbol_handling(self, mock_open_file, mock_scandir):
         """Test read_csv_files with CDR symbols in different currencies"""
-        mock_listdir.return_value = [
-            "monthly-statement-transactions-CDR123-2025-07-01.csv"
-        ]
+        mock_scandir.side_effect = fake_scandir(
+            ["monthly-statement-transactions-CDR123-2025-07-01.csv"]
+        )
 
         csv_content = """date,transaction,description,amount,currency
 2025-07-01,BUY,TSLA - 5.0 shares,-1250.00,CAD
@@ -1703,14 +1814,80 @@ WK23MTV36CAD-CAD
         # TSLA in USD should get -CT suffix (not CDR when in USD)
         self.assertIn("TSLA-CT", usd_transactions)
 
+    @patch("os.scandir")
+    @patch("builtins.open", new_callable=mock_open)
+    def test_read_csv_files_single_pass_per_file(self, mock_open_file, mock_scandir):
+        """Test read_csv_files opens each statement once and routes rows by currency"""
+        mock_scandir.side_effect = fake_scandir(
+            ["monthly-statement-transactions-ONCE123-2025-07-01.csv"]
+        )
+
+        csv_content = """date,transaction,description,amount,currency
+2025-07-01,BUY,AAPL - 10.0 shares,-1500.00,USD
+2025-07-02,EFT,Deposit,200.00,EUR
+2025-07-03,BUY,SHOP - 5.0 shares,-750.00,CAD"""
+
+        mock_open_file.return_value = mock_open(read_data=csv_content).return_value
+
+        result = read_csv_files("once_folder")
+
+        # The file is opened a single time regardless of how many currencies it holds
+        self.assertEqual(mock_open_file.call_count, 1)
+
+        # Default currencies are always present, others are discovered from the data
+        self.assertEqual(
+            list(result.keys()), ["ONCE123-USD", "ONCE123-CAD", "ONCE123-EUR"]
+        )
+        self.assertEqual(len(result["ONCE123-USD"]), 1)
+        self.assertEqual(len(result["ONCE123-CAD"]), 1)
+        self.assertEqual(len(result["ONCE123-EUR"]), 1)
+        self.assertIn("PDeposit", result["ONCE123-EUR"][0])
+
+    @patch("os.scandir")
+    @patch("builtins.open", new_callable=mock_open)
+    def test_read_csv_files_custom_currencies(self, mock_open_file, mock_scandir):
+        """Test read_csv_files pre-creates buckets for the requested currencies"""
+        mock_scandir.side_effect = fake_scandir(
+            ["monthly-statement-transactions-GBP123-2025-07-01.csv"]
+        )
+        csv_content = "date,transaction,description,amount,currency\n2025-07-01,INT,Interest,1.00,GBP\n"
+        mock_open_file.return_value = mock_open(read_data=csv_content).return_value
+
+        result = read_csv_files("gbp_folder", currencies=("GBP", "EUR"))
+
+        self.assertEqual(list(result.keys()), ["GBP123-GBP", "GBP123-EUR"])
+        self.assertEqual(len(result["GBP123-GBP"]), 1)
+        self.assertEqual(len(result["GBP123-EUR"]), 0)
+
     # Tests for export_qif_files function
+    def export_to_work_dir(self, account_data, config_data):
+        """Run export_qif_files in a scratch folder and return the published files by name"""
+        with tempfile.TemporaryDirectory() as work_dir:
+            cwd = os.getcwd()
+            os.chdir(work_dir)
+            try:
+                os.mkdir("output")
+                with patch(
+                    "app.main.read_config", return_value=config_data
+                ) as mock_read_config:
+                    export_qif_files(account_data, "dummy_config.yml")
+                mock_read_config.assert_called_once_with("dummy_config.yml")
+
+                contents = {}
+                for name in sorted(os.listdir("output")):
+                    with open(os.path.join("output", name)) as file:
+                        contents[name] = file.read()
+                return contents
+            finally:
+                os.chdir(cwd)
+
     def test_export_qif_files_investment_account_basic(self):
         """Test export_qif_files with basic Investment account"""
         # Create test data
         account_data = {
             "TEST123CAD-USD": [
-                "D2025-07-15\nNBuy\nYAAPL-CT\nI150.0\nQ10.0\nT1500.0\nO0.00\nCc\n^",
-                "D2025-07-16\nNSell\nYMSFT-CT\nI300.0\nQ5.0\nT1500.0\nO0.00\nCc\n^",
+                "D07/15/2025\nNBuy\nYAAPL-CT\nI150.00\nQ10.0\nT1500.00\nO0.00\nCc\n^",
+                "D07/16/2025\nNSell\nYMSFT-CT\nI300.00\nQ5.0\nT1500.00\nO0.00\nCc\n^",
             ]
         }
 
@@ -1719,38 +1896,25 @@ WK23MTV36CAD-CAD
             "TEST123CAD-USD": {"nickname": "My-Test-Investment", "type": "Investment"}
         }
 
-        # Mock read_config to return our test config data
-        with patch(
-            "app.main.read_config", return_value=config_data
-        ) as mock_read_config:
-            with patch("builtins.open", mock_open()) as mock_file:
-                export_qif_files(account_data, "dummy_config.yml")
+        files = self.export_to_work_dir(account_data, config_data)
 
-                # Verify read_config was called
-                mock_read_config.assert_called_once_with("dummy_config.yml")
-
-                # Verify file was opened for writing
-                mock_file.assert_called_with("output/My-Test-Investment.qif", "w")
-
-                # Verify content written to file
-                handle = mock_file.return_value
-                written_content = "".join(
-                    call.args[0] for call in handle.write.call_args_list
-                )
+        # Verify the file is named after the nickname
+        self.assertEqual(list(files), ["My-Test-Investment.qif"])
+        written_content = files["My-Test-Investment.qif"]
 
-                # Should start with Investment header
-                self.assertIn("!Type:Invst", written_content)
-                # Should contain the transactions
-                self.assertIn("AAPL-CT", written_content)
-                self.assertIn("MSFT-CT", written_content)
+        # Should start with Investment header
+        self.assertTrue(written_content.startswith("!Type:Invst\n"))
+        # Should contain the transactions
+        self.assertIn("AAPL-CT", written_content)
+        self.assertIn("MSFT-CT", written_content)
 
     def test_export_qif_files_checking_account_basic(self):
         """Test export_qif_files with basic Checking account"""
         # Create test data
         account_data = {
             "WK23MTV36CAD-CAD": [
-                "D2025-07-15\nT1000.0\nO0.00\nCc\nPDeposit\n^",
-                "D2025-07-16\nT-500.0\nO0.00\nCc\nPWithdrawal\n^",
+                "D07/15/2025\nT1000.00\nO0.00\nCc\nPDeposit\n^",
+                "D07/16/2025\nT-500.00\nO0.00\nCc\nPWithdrawal\n^",
             ]
         }
 
@@ -1759,25 +1923,17 @@ WK23MTV36CAD-CAD
             "WK23MTV36CAD-CAD": {"nickname": "My-Checking", "type": "Checking"}
         }
 
-        # Mock read_config to return our test config data
-        with patch("app.main.read_config", return_value=config_data):
-            with patch("builtins.open", mock_open()) as mock_file:
-                export_qif_files(account_data, "dummy_config.yml")
+        files = self.export_to_work_dir(account_data, config_data)
 
-                # Verify file was opened for writing
-                mock_file.assert_called_with("output/My-Checking.qif", "w")
+        # Verify the file is named after the nickname
+        self.assertEqual(list(files), ["My-Checking.qif"])
+        written_content = files["My-Checking.qif"]
 
-                # Verify content written to file
-                handle = mock_file.return_value
-                written_content = "".join(
-                    call.args[0] for call in handle.write.call_args_list
-                )
-
-                # Should start with Bank header
-                self.assertIn("!Type:Bank", written_content)
-                # Should contain the transactions
-                self.assertIn("T1000.0", written_content)
-                self.assertIn("T-500.0", written_content)
+        # Should start with Bank header
+        self.assertTrue(written_content.startswith("!Type:Bank\n"))
+        # Should contain the transactions
+        self.assertIn("T1000.00", written_content)
+        self.assertIn("T-500.00", written_content)
 
     def test_export_qif_files_empty_transactions_skipped(self):
         """Test export_qif_files skips accounts with empty transaction lists"""
@@ -1785,7 +1941,7 @@ WK23MTV36CAD-CAD
         account_data = {
             "EMPTY123CAD-USD": [],
             "NONEMPTY456CAD-USD": [
-                "D2025-07-15\nNBuy\nYAAPL-CT\nI150.0\nQ10.0\nT1500.0\nO0.00\nCc\n^"
+                "D07/15/2025\nNBuy\nYAAPL-CT\nI150.00\nQ10.0\nT1500.00\nO0.00\nCc\n^"
             ],
         }
 
@@ -1798,21 +1954,17 @@ WK23MTV36CAD-CAD
             },
         }
 
-        # Mock read_config to return our test config data
-        with patch("app.main.read_config", return_value=config_data):
-            with patch("builtins.open", mock_open()) as mock_file:
-                export_qif_files(account_data, "dummy_config.yml")
+        files = self.export_to_work_dir(account_data, config_data)
 
-                # Should only be called once (for non-empty account)
-                self.assertEqual(mock_file.call_count, 1)
-                mock_file.assert_called_with("output/Non-Empty-Account.qif", "w")
+        # Should only write the non-empty account
+        self.assertEqual(list(files), ["Non-Empty-Account.qif"])
 
     def test_export_qif_files_unknown_account_error(self):
         """Test export_qif_files raises ValueError for unknown account"""
         # Create test data with account not in config
         account_data = {
             "UNKNOWN123CAD-USD": [
-                "D2025-07-15\nNBuy\nYAAPL-CT\nI150.0\nQ10.0\nT1500.0\nO0.00\nCc\n^"
+                "D07/15/2025\nNBuy\nYAAPL-CT\nI150.00\nQ10.0\nT1500.00\nO0.00\nCc\n^"
             ]
         }
 
@@ -1843,7 +1995,7 @@ WK23MTV36CAD-CAD
         # Create test data - CAD base account with USD suffix (mismatch)
         account_data = {
             "WK23MTV36CAD-USD": [  # CAD base account but USD suffix
-                "D2025-07-15\nT1000.0\nO0.00\nCc\nPDeposit\n^"
+                "D07/15/2025\nT1000.00\nO0.00\nCc\nPDeposit\n^"
             ]
         }
 
@@ -1875,7 +2027,7 @@ WK23MTV36CAD-CAD
         # Create test data - USD base account with CAD suffix (mismatch)
         account_data = {
             "WK5DRT238USD-CAD": [  # USD base account but CAD suffix
-                "D2025-07-15\nT1000.0\nO0.00\nCc\nPDeposit\n^"
+                "D07/15/2025\nT1000.00\nO0.00\nCc\nPDeposit\n^"
             ]
         }
 
@@ -1910,10 +2062,10 @@ WK23MTV36CAD-CAD
         # Create test data with matching currencies
         account_data = {
             "WK23MTV36CAD-CAD": [  # CAD base account with CAD suffix (match)
-                "D2025-07-15\nT1000.0\nO0.00\nCc\nPDeposit\n^"
+                "D07/15/2025\nT1000.00\nO0.00\nCc\nPDeposit\n^"
             ],
             "WK5DRT238USD-USD": [  # USD base account with USD suffix (match)
-                "D2025-07-16\nT500.0\nO0.00\nCc\nPDeposit\n^"
+                "D07/16/2025\nT500.00\nO0.00\nCc\nPDeposit\n^"
             ],
         }
 
@@ -1923,24 +2075,21 @@ WK23MTV36CAD-CAD
             "WK5DRT238USD-USD": {"nickname": "USD-Checking", "type": "Checking"},
         }
 
-        # Mock read_config to return our test config data
-        with patch("app.main.read_config", return_value=config_data):
-            with patch("builtins.open", mock_open()) as mock_file:
-                # Should not raise any exceptions
-                export_qif_files(account_data, "dummy_config.yml")
+        # Should not raise any exceptions
+        files = self.export_to_work_dir(account_data, config_data)
 
-                # Should be called twice (once for each account)
-                self.assertEqual(mock_file.call_count, 2)
+        # Should write one file for each account
+        self.assertEqual(list(files), ["CAD-Checking.qif", "USD-Checking.qif"])
 
     def test_export_qif_files_investment_accounts_no_currency_validation(self):
         """Test export_qif_files does not validate currency for Investment accounts"""
         # Create test data - Investment accounts should not have currency validation
         account_data = {
             "H16530307CAD-USD": [  # CAD base account with USD suffix (should be OK for Investment)
-                "D2025-07-15\nNBuy\nYAAPL-CT\nI150.0\nQ10.0\nT1500.0\nO0.00\nCc\n^"
+                "D07/15/2025\nNBuy\nYAAPL-CT\nI150.00\nQ10.0\nT1500.00\nO0.00\nCc\n^"
             ],
             "H16530307CAD-CAD": [  # CAD base account with CAD suffix
-                "D2025-07-16\nNBuy\nYSHOP-CT\nI100.0\nQ5.0\nT500.0\nO0.00\nCc\n^"
+                "D07/16/2025\nNBuy\nYSHOP-CT\nI100.00\nQ5.0\nT500.00\nO0.00\nCc\n^"
             ],
         }
 
@@ -1950,26 +2099,23 @@ WK23MTV36CAD-CAD
             "H16530307CAD-CAD": {"nickname": "Investment-CAD", "type": "Investment"},
         }
 
-        # Mock read_config to return our test config data
-        with patch("app.main.read_config", return_value=config_data):
-            with patch("builtins.open", mock_open()) as mock_file:
-                # Should not raise any exceptions for Investment accounts
-                export_qif_files(account_data, "dummy_config.yml")
+        # Should not raise any exceptions for Investment accounts
+        files = self.export_to_work_dir(account_data, config_data)
 
-                # Should be called twice (once for each account)
-                self.assertEqual(mock_file.call_count, 2)
+        # Should write one file for each account
+        self.assertEqual(len(files), 2)
 
     def test_export_qif_files_multiple_mixed_accounts(self):
         """Test export_qif_files with multiple Investment and Checking accounts"""
         # Create test data with mixed account types
         account_data = {
             "H16530307CAD-USD": [
-                "D2025-07-15\nNBuy\nYAAPL-CT\nI150.0\nQ10.0\nT1500.0\nO0.00\nCc\n^"
+                "D07/15/2025\nNBuy\nYAAPL-CT\nI150.00\nQ10.0\nT1500.00\nO0.00\nCc\n^"
             ],
             "H16530307CAD-CAD": [
-                "D2025-07-16\nNBuy\nYTSLA-QH\nI250.0\nQ2.0\nT500.0\nO0.00\nCc\n^"
+                "D07/16/2025\nNBuy\nYTSLA-QH\nI250.00\nQ2.0\nT500.00\nO0.00\nCc\n^"
             ],
-            "WK23MTV36CAD-CAD": ["D2025-07-17\nT1000.0\nO0.00\nCc\nPDeposit\n^"],
+            "WK23MTV36CAD-CAD": ["D07/17/2025\nT1000.00\nO0.00\nCc\nPDeposit\n^"],
         }
 
         # Create config data
@@ -1979,29 +2125,19 @@ WK23MTV36CAD-CAD
             "WK23MTV36CAD-CAD": {"nickname": "Checking-CAD", "type": "Checking"},
         }
 
-        # Mock read_config to return our test config data
-        with patch("app.main.read_config", return_value=config_data):
-            with patch("builtins.open", mock_open()) as mock_file:
-                export_qif_files(account_data, "dummy_config.yml")
-
-                # Should be called three times (once for each account)
-                self.assertEqual(mock_file.call_count, 3)
+        files = self.export_to_work_dir(account_data, config_data)
 
-                # Verify correct filenames were used
-                expected_calls = [
-                    ("output/Investment-USD.qif", "w"),
-                    ("output/Investment-CAD.qif", "w"),
-                    ("output/Checking-CAD.qif", "w"),
-                ]
-                actual_calls = [call.args for call in mock_file.call_args_list]
-                self.assertEqual(set(actual_calls), set(expected_calls))
+        # Verify correct filenames were used, one for each account
+        self.assertEqual(
+            set(files), {"Investment-USD.qif", "Investment-CAD.qif", "Checking-CAD.qif"}
+        )
 
     def test_export_qif_files_special_characters_in_nicknames(self):
         """Test export_qif_files with special characters in account nicknames"""
         # Create test data
         account_data = {
             "SPECIAL123CAD-USD": [
-                "D2025-07-15\nNBuy\nYAAPL-CT\nI150.0\nQ10.0\nT1500.0\nO0.00\nCc\n^"
+                "D07/15/2025\nNBuy\nYAAPL-CT\nI150.00\nQ10.0\nT1500.00\nO0.00\nCc\n^"
             ]
         }
 
@@ -2013,19 +2149,16 @@ WK23MTV36CAD-CAD
             }
         }
 
-        # Mock read_config to return our test config data
-        with patch("app.main.read_config", return_value=config_data):
-            with patch("builtins.open", mock_open()) as mock_file:
-                export_qif_files(account_data, "dummy_config.yml")
+        files = self.export_to_work_dir(account_data, config_data)
 
-                # Verify filename includes special characters
-                mock_file.assert_called_with("output/My-Special_Account.Test.qif", "w")
+        # Verify filename includes special characters
+        self.assertEqual(list(files), ["My-Special_Account.Test.qif"])
 
     def test_export_qif_files_config_file_not_found(self):
         """Test export_qif_files with non-existent config file"""
         account_data = {
             "TEST123CAD-USD": [
-                "D2025-07-15\nNBuy\nYAAPL-CT\nI150.0\nQ10.0\nT1500.0\nO0.00\nCc\n^"
+                "D07/15/2025\nNBuy\nYAAPL-CT\nI150.00\nQ10.0\nT1500.00\nO0.00\nCc\n^"
             ]
         }
 
@@ -2038,7 +2171,7 @@ WK23MTV36CAD-CAD
         """Test export_qif_files with invalid YAML config file"""
         account_data = {
             "TEST123CAD-USD": [
-                "D2025-07-15\nNBuy\nYAAPL-CT\nI150.0\nQ10.0\nT1500.0\nO0.00\nCc\n^"
+                "D07/15/2025\nNBuy\nYAAPL-CT\nI150.00\nQ10.0\nT1500.00\nO0.00\nCc\n^"
             ]
         }
 
@@ -2065,28 +2198,25 @@ TEST123CAD-USD:
     def test_export_qif_files_account_without_hyphen(self):
         """Test export_qif_files with account name without hyphen (edge case)"""
         # Create test data with account name without hyphen
-        account_data = {"NOHYPHEN": ["D2025-07-15\nT1000.0\nO0.00\nCc\nPDeposit\n^"]}
+        account_data = {"NOHYPHEN": ["D07/15/2025\nT1000.00\nO0.00\nCc\nPDeposit\n^"]}
 
         # Create config data
         config_data = {
             "NOHYPHEN": {"nickname": "No-Hyphen-Account", "type": "Checking"}
         }
 
-        # Mock read_config to return our test config data
-        with patch("app.main.read_config", return_value=config_data):
-            with patch("builtins.open", mock_open()) as mock_file:
-                # Should not raise exceptions for accounts without hyphens
-                export_qif_files(account_data, "dummy_config.yml")
+        # Should not raise exceptions for accounts without hyphens
+        files = self.export_to_work_dir(account_data, config_data)
 
-                # Should successfully create the file
-                mock_file.assert_called_with("output/No-Hyphen-Account.qif", "w")
+        # Should successfully create the file
+        self.assertEqual(list(files), ["No-Hyphen-Account.qif"])
 
     def test_export_qif_files_checking_account_default_currency_cad(self):
         """Test export_qif_files defaults to CAD for unclear checking account base names"""
         # Create test data with unclear base account name
         account_data = {
             "UNCLEAR123-USD": [  # Unclear base name, should default to CAD expectation
-                "D2025-07-15\nT1000.0\nO0.00\nCc\nPDeposit\n^"
+                "D07/15/2025\nT1000.00\nO0.00\nCc\nPDeposit\n^"
             ]
         }
 
@@ -2117,7 +2247,7 @@ TEST123CAD-USD:
         # Create test data
         account_data = {
             "TEST123CAD-USD": [
-                "D2025-07-15\nNBuy\nYAAPL-CT\nI150.0\nQ10.0\nT1500.0\nO0.00\nCc\n^"
+                "D07/15/2025\nNBuy\nYAAPL-CT\nI150.00\nQ10.0\nT1500.00\nO0.00\nCc\n^"
             ]
         }
 
@@ -2126,21 +2256,228 @@ TEST123CAD-USD:
             "TEST123CAD-USD": {"nickname": "Test-Investment", "type": "Investment"}
         }
 
-        # Mock read_config to return our test config data
+        self.export_to_work_dir(account_data, config_data)
+
+        # Verify print statements were called
+        self.assertTrue(mock_print.called)
+
+        # Check that config was printed (first call)
+        first_call_args = mock_print.call_args_list[0][0]
+        self.assertEqual(first_call_args[0], config_data)
+
+        # Check that account name was printed (second call)
+        second_call_args = mock_print.call_args_list[1][0]
+        self.assertEqual(second_call_args[0], "TEST123CAD-USD")
+
+    # Tests for the streaming pipeline
+    @patch("os.scandir")
+    @patch("builtins.open", new_callable=mock_open)
+    def test_iter_csv_entries_matches_read_csv_files_order(
+        self, mock_open_file, mock_scandir
+    ):
+        """Test iter_csv_entries yields entries in read_csv_files order"""
+        mock_scandir.side_effect = fake_scandir(
+            [
+                "monthly-statement-transactions-STREAM1-2025-07-01.csv",
+                "monthly-statement-transactions-STREAM2-2025-07-01.csv",
+            ]
+        )
+        csv_content = """date,transaction,description,amount,currency
+2025-07-01,BUY,AAPL - 10.0 shares,-1500.00,USD
+2025-07-02,DIV,TD - Dividend payment,15.75,CAD
+2025-07-03,SELL,MSFT - 8.0 shares,2400.00,USD"""
+        mock_open_file.side_effect = lambda *args, **kwargs: mock_open(
+            read_data=csv_content
+        ).return_value
+
+        streamed = {}
+        for account_name, qif in iter_csv_entries("stream_folder"):
+            streamed.setdefault(account_name, []).append(qif)
+
+        batched = read_csv_files("stream_folder")
+        self.assertEqual(
+            streamed, {name: qifs for name, qifs in batched.items() if qifs}
+        )
+
+    def test_stream_qif_files_byte_identical_to_batch(self):
+        """Test stream_qif_files writes the same bytes as export_qif_files"""
+        entries = [
+            (
+                "TEST123CAD-USD",
+                "D07/15/2025\nNBuy\nYAAPL-CT\nI150.00\nQ10.0\nT1500.00\nO0.00\nCc\n^",
+            ),
+            ("WK23MTV36CAD-CAD", "D07/15/2025\nT1000.00\nO0.00\nCc\nPDeposit\n^"),
+            (
+                "TEST123CAD-USD",
+                "D07/16/2025\nNSell\nYMSFT-CT\nI300.00\nQ5.0\nT1500.00\nO0.00\nCc\n^",
+            ),
+        ]
+        config_data = {
+            "TEST123CAD-USD": {"nickname": "My-Test-Investment", "type": "Investment"},
+            "WK23MTV36CAD-CAD": {"nickname": "My-Checking", "type": "Checking"},
+        }
+
+        def run(export):
+            with tempfile.TemporaryDirectory() as work_dir:
+                cwd = os.getcwd()
+                os.chdir(work_dir)
+                try:
+                    os.mkdir("output")
+                    with patch("app.main.read_config", return_value=config_data):
+                        with patch("builtins.print"):
+                            export()
+                    contents = {}
+                    for name in sorted(os.listdir("output")):
+                        with open(os.path.join("output", name), "rb") as file:
+                            contents[name] = file.read()
+                    return contents
+                finally:
+                    os.chdir(cwd)
+
+        account_data = {}
+        for account_name, qif in entries:
+            account_data.setdefault(account_name, []).append(qif)
+
+        batched = run(lambda: export_qif_files(account_data, "dummy_config.yml"))
+        streamed = run(
+            lambda: stream_qif_files(iter(entries), "dummy_config.yml", buffer_size=16)
+        )
+
+        self.assertEqual(
+            sorted(streamed.keys()), ["My-Checking.qif", "My-Test-Investment.qif"]
+        )
+        self.assertEqual(streamed, batched)
+
+    def test_stream_qif_files_unknown_account_error(self):
+        """Test stream_qif_files raises ValueError for unknown account"""
+        config_data = {
+            "DIFFERENT456CAD-USD": {
+                "nickname": "Different-Account",
+                "type": "Investment",
+            }
+        }
+        entries = [("UNKNOWN123CAD-USD", "D07/15/2025\nT1000.00\nO0.00\nCc\n^")]
+
         with patch("app.main.read_config", return_value=config_data):
             with patch("builtins.open", mock_open()) as mock_file:
-                export_qif_files(account_data, "dummy_config.yml")
+                with self.assertRaises(ValueError) as context:
+                    stream_qif_files(entries, "dummy_config.yml")
+
+        self.assertIn("Unknown account", str(context.exception))
+        mock_file.assert_not_called()
+
+    # Tests for parallel conversion
+    def test_read_csv_files_parallel_matches_serial(self):
+        """Test read_csv_files with jobs > 1 produces the same result as a serial run"""
+        with tempfile.TemporaryDirectory() as input_folder:
+            for index in range(6):
+                account = f"PAR{index % 2}CAD"
+                filename = (
+                    f"monthly-statement-transactions-{account}-2025-0{index + 1}-01.csv"
+                )
+                with open(os.path.join(input_folder, filename), "w") as csv_file:
+                    csv_file.write("date,transaction,description,amount,currency\n")
+                    csv_file.write(
+                        f"2025-0{index + 1}-02,BUY,AAPL - {index + 1}.0 shares,-{(index + 1) * 100}.00,USD\n"
+                    )
+                    csv_file.write(
+                        f"2025-0{index + 1}-03,CONT,Contribution,{index + 1}0.0,CAD\n"
+                    )
+
+            serial = read_csv_files(input_folder)
+            parallel = read_csv_files(input_folder, jobs=3)
+
+        self.assertEqual(list(parallel.keys()), list(serial.keys()))
+        self.assertEqual(parallel, serial)
+        self.assertEqual(len(parallel["PAR0CAD-USD"]), 3)
+        self.assertEqual(len(parallel["PAR1CAD-CAD"]), 3)
+
+    # Tests for the tuple-based CSV reader
+    def test_iter_csv_records_maps_header_once(self):
+        """Test iter_csv_records returns required columns regardless of header order"""
+        lines = [
+            "currency,balance,amount,description,transaction,date\n",
+            "USD,100.00,-1500.00,AAPL - 10.0 shares,BUY,2025-07-01\n",
+            "\n",
+            'CAD,200.00,15.75,"TD - Dividend, Q3",DIV,2025-07-02\n',
+        ]
+
+        records = list(iter_csv_records(lines))
+
+        self.assertEqual(
+            records,
+            [
+                ("2025-07-01", "BUY", "AAPL - 10.0 shares", "-1500.00", "USD"),
+                ("2025-07-02", "DIV", "TD - Dividend, Q3", "15.75", "CAD"),
+            ],
+        )
 
-                # Verify print statements were called
-                self.assertTrue(mock_print.called)
+    def test_iter_csv_records_empty_and_missing_columns(self):
+        """Test iter_csv_records with empty input and missing required columns"""
+        self.assertEqual(list(iter_csv_records([])), [])
+        self.assertEqual(
+            list(iter_csv_records(["date,transaction,description,amount,currency\n"])),
+            [],
+        )
 
-                # Check that config was printed (first call)
-                first_call_args = mock_print.call_args_list[0][0]
-                self.assertEqual(first_call_args[0], config_data)
+        with self.assertRaises(KeyError):
+            list(iter_csv_records(["date,transaction,description\n"]))
 
-                # Check that account name was printed (second call)
-                second_call_args = mock_print.call_args_list[1][0]
-                self.assertEqual(second_call_args[0], "TEST123CAD-USD")
+    def test_format_qif_entry_matches_generate_qif_entry(self):
+        """Test the positional and dict-based entry points produce the same entry"""
+        row = {
+            "date": "2025-07-23",
+            "transaction": "BUYTOOPEN",
+            "description": "SPY 450.00 USD CALL 2025-07-25: Bought 2 contract (executed at 2025-07-23), Fee: $1.50",
+            "amount": "-320.50",
+            "currency": "USD",
+        }
+        self.assertEqual(
+            format_qif_entry(
+                row["date"],
+                row["transaction"],
+                row["description"],
+                row["amount"],
+                row["currency"],
+            ),
+            generate_qif_entry(row, "USD"),
+        )
+
+    def test_format_qif_entry_ignored_types_skip_amount_parsing(self):
+        """Test ignored transaction types return before the amount is parsed"""
+        for transaction_type in ("RECALL", "LOAN", "STKDIS", "STKREORG"):
+            self.assertIsNone(
+                format_qif_entry(
+                    "2025-07-01", transaction_type, "Ignored", "n/a", "USD"
+                )
+            )
+
+    def test_format_qif_entry_registry(self):
+        """Test every registered code produces an entry and unknown codes still raise"""
+        descriptions = {
+            "BUYTOOPEN": "SPY 450.00 USD CALL 2025-07-25: Bought 2 contract (executed at 2025-07-23), Fee: $1.50",
+            "SELLTOCLOSE": "SPY 450.00 USD CALL 2025-07-25: Sold 2 contract (executed at 2025-07-23), Fee: $1.50",
+        }
+        for transaction_type in TRANSACTION_HANDLERS:
+            description = descriptions.get(transaction_type, "AAPL - 10.0 shares")
+            qif = format_qif_entry(
+                "2025-07-01", transaction_type, description, "-100.00", "USD"
+            )
+            self.assertTrue(qif.startswith("D07/01/2025\n"), transaction_type)
+            self.assertTrue(qif.endswith("^"), transaction_type)
+        self.assertTrue(IGNORED_TRANSACTIONS.isdisjoint(TRANSACTION_HANDLERS))
+
+        with self.assertRaises(ValueError):
+            format_qif_entry("2025-07-01", "BOGUS", "Unknown", "1.00", "USD")
+
+    def test_jobs_rejected_with_streaming_modes(self):
+        """Test --jobs is refused where statements are converted one at a time"""
+        for options in (["--stream"], ["--format", "qif,csv"], []):
+            argv = ["main.py", "--jobs", "2" if options else "0", *options]
+            with patch("sys.argv", argv), patch("sys.stderr"):
+                with self.assertRaises(SystemExit) as context:
+                    main()
+            self.assertEqual(context.exception.code, 2, options)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,120 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from app import main
+from app.memo import LRUCache
+
+CSV_CONTENT = """date,transaction,description,amount,currency
+2025-07-01,BUY,VFV - 2.0 shares,-250.00,CAD
+2025-07-02,DIV,VFV - Dividend payment,1.25,CAD
+2025-08-01,BUY,VFV - 2.0 shares,-252.00,CAD
+2025-08-02,DIV,VFV - Dividend payment,1.30,CAD
+2025-08-03,BUYTOOPEN,"SPY 450.00 USD CALL 2025-08-25: Bought 1 contract (executed at 2025-08-03), Fee: $0.75",-100.75,USD
+"""
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_counters_and_eviction(self):
+        """Test hits, misses and least recently used eviction"""
+        cache = LRUCache(maxsize=2)
+        self.assertIsNone(cache.get("a"))
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        # 'b' is now the least recently used key
+        cache.put("c", 3)
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.counters(), (2, 2, 1))
+        self.assertEqual(len(cache), 2)
+
+    def test_resize_and_disable(self):
+        """Test shrinking evicts the oldest keys and size 0 disables caching"""
+        cache = LRUCache(maxsize=3)
+        for key in "abc":
+            cache.put(key, key)
+
+        cache.resize(1)
+        self.assertEqual(cache.get("c"), "c")
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.evictions, 2)
+
+        cache.resize(0)
+        cache.put("d", "d")
+        self.assertIsNone(cache.get("d"))
+        with self.assertRaises(ValueError):
+            LRUCache(maxsize=-1)
+
+    def test_describe(self):
+        """Test the one-line summary printed by --stats"""
+        cache = LRUCache(maxsize=10)
+        cache.get("a")
+        cache.put("a", 1)
+        cache.get("a")
+        cache.get("a")
+
+        self.assertEqual(
+            cache.describe(),
+            "2 hits, 1 misses, 0 evictions (66.7% hit rate, 1/10 entries)",
+        )
+
+
+class TestParseCaches(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.input_folder = self.work_dir.name
+        for date in ("2025-07-31", "2025-08-31"):
+            filename = f"monthly-statement-transactions-MEMO123CAD-{date}.csv"
+            with open(os.path.join(self.input_folder, filename), "w") as csv_file:
+                csv_file.write(CSV_CONTENT)
+
+        patcher = patch.dict(
+            main.PARSE_CACHES,
+            {name: LRUCache() for name in main.PARSE_CACHES},
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        for name in ("EQUITY", "OPTION", "SYMBOL"):
+            attribute = f"{name}_PARSE_CACHE"
+            patcher = patch.object(main, attribute, main.PARSE_CACHES[name.lower()])
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.work_dir.cleanup()
+
+    def test_repeated_descriptions_hit_the_cache(self):
+        """Test each distinct (description, currency) is parsed once"""
+        uncached = main.read_csv_files(self.input_folder)
+        counters = {name: cache.counters() for name, cache in main.PARSE_CACHES.items()}
+
+        self.assertEqual(counters["equity"], (3, 1, 0))
+        self.assertEqual(counters["symbol"], (3, 1, 0))
+        self.assertEqual(counters["option"], (1, 1, 0))
+
+        main.configure_parse_caches(0)
+        self.assertEqual(main.read_csv_files(self.input_folder), uncached)
+
+    def test_worker_counters_are_collected(self):
+        """Test counters from worker processes are added to the parent's caches"""
+        main.read_csv_files(self.input_folder, jobs=2)
+
+        hits, misses, _ = main.PARSE_CACHES["equity"].counters()
+        self.assertEqual(hits + misses, 4)
+
+    def test_print_stats(self):
+        """Test --stats prints one line per parser cache"""
+        with patch("builtins.print") as mock_print:
+            main.print_stats()
+
+        self.assertEqual(mock_print.call_count, len(main.PARSE_CACHES))
+        mock_print.assert_any_call(
+            "Parse cache (equity): 0 hits, 0 misses, 0 evictions (0.0% hit rate, 0/4096 entries)"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+import tempfile
+import unittest
+from operator import itemgetter
+
+from app.dates import entry_date
+from app.main import iter_csv_entries, iter_csv_transactions, read_csv_files
+from app.merge import ChronologicalMerger, merge_runs, sorted_run
+from tests.helpers import StatementTestCase
+
+# Newest rows first, as some exports list them
+JULY_CONTENT = """date,transaction,description,amount,currency
+2025-07-20,CONT,Contribution,300.00,CAD
+2025-07-05,DIV,AAPL dividend,5.25,USD
+2025-07-05,CONT,Contribution,100.00,CAD
+2025-07-01,CONT,Contribution,200.00,CAD
+"""
+
+# Statement of a sub-account whose rows fall between the July rows
+LATE_CONTENT = """date,transaction,description,amount,currency
+2025-07-03,CONT,Contribution,50.00,CAD
+2025-07-05,CONT,Contribution,75.00,CAD
+2025-08-02,CONT,Contribution,25.00,CAD
+"""
+
+
+class TestMergeRuns(unittest.TestCase):
+    def test_sorted_run_is_stable(self):
+        """Test a run is sorted by key and equal keys keep their file order"""
+        items = [("b", 1), ("a", 2), ("b", 3), ("a", 4)]
+        self.assertEqual(
+            sorted_run(items, itemgetter(0)),
+            [("a", ("a", 2)), ("a", ("a", 4)), ("b", ("b", 1)), ("b", ("b", 3))],
+        )
+        self.assertEqual(sorted_run([], itemgetter(0)), [])
+
+    def test_merge_runs_keeps_statement_order_within_a_day(self):
+        """Test runs are merged by key and ties follow the order of the runs"""
+        runs = [[("2", "first"), ("1", "first")], [("1", "second"), ("3", "second")]]
+        self.assertEqual(
+            merge_runs(runs, itemgetter(0)),
+            [("1", "first"), ("1", "second"), ("2", "first"), ("3", "second")],
+        )
+        self.assertEqual(
+            merge_runs([[("2", "a"), ("1", "b")]], itemgetter(0)),
+            [("1", "b"), ("2", "a")],
+        )
+        self.assertEqual(merge_runs([], itemgetter(0)), [])
+
+    def test_merger_spills_to_disk(self):
+        """Test runs spilled to disk merge back exactly like runs held in memory"""
+        runs = [
+            [(day % 7, index) for index, day in enumerate(range(start, start + 5))]
+            for start in range(0, 30, 5)
+        ]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with ChronologicalMerger(
+                itemgetter(0), threshold=7, temp_dir=temp_dir
+            ) as merger:
+                for run in runs:
+                    merger.add("ACC-CAD", run)
+                    merger.add("OTHER-CAD", run[:1])
+                merger.add("EMPTY-CAD", [])
+
+                self.assertGreater(merger.spills, 0)
+                self.assertEqual(merger.accounts(), ["ACC-CAD", "OTHER-CAD"])
+                merged = {account: list(items) for account, items in merger.items()}
+
+        self.assertEqual(merged["ACC-CAD"], merge_runs(runs, itemgetter(0)))
+        self.assertEqual(
+            merged["OTHER-CAD"], merge_runs([run[:1] for run in runs], itemgetter(0))
+        )
+
+    def test_threshold_counts_every_account(self):
+        """Test the threshold bounds the items held across accounts, spilling the largest"""
+        with ChronologicalMerger(itemgetter(0), threshold=10) as merger:
+            for account in range(20):
+                merger.add(f"ACC{account}-CAD", [(1, account)])
+            merger.add("BIG-CAD", [(day, "big") for day in range(8)])
+
+            # Down to half the threshold after a spill: the largest account went to disk
+            self.assertLessEqual(merger.held, 5)
+            self.assertGreater(merger.spills, 1)
+            merged = {account: list(items) for account, items in merger.items()}
+
+        self.assertEqual(len(merged), 21)
+        self.assertEqual(merged["BIG-CAD"], [(day, "big") for day in range(8)])
+        self.assertEqual(merged["ACC7-CAD"], [(1, 7)])
+
+
+class TestChronologicalOrder(StatementTestCase):
+    def setUp(self):
+        super().setUp()
+        self.write_statement("ORD123CAD", JULY_CONTENT, "2025-07-31")
+        self.write_statement("ORD123CAD", LATE_CONTENT, "2025-08-05")
+
+    def test_read_csv_files_orders_by_date(self):
+        """Test entries of every statement come out oldest first, ties in statement order"""
+        result = read_csv_files(self.input_folder)
+
+        self.assertEqual(
+            [entry_date(qif) for qif in result["ORD123CAD-CAD"]],
+            [
+                "2025-07-01",
+                "2025-07-03",
+                "2025-07-05",
+                "2025-07-05",
+                "2025-07-20",
+                "2025-08-02",
+            ],
+        )
+        self.assertIn("T100.00", result["ORD123CAD-CAD"][2])
+        self.assertIn("T75.00", result["ORD123CAD-CAD"][3])
+        self.assertEqual(len(result["ORD123CAD-USD"]), 1)
+
+    def test_streaming_matches_batch(self):
+        """Test the streaming path yields the batch order, also once runs spill to disk"""
+        batch = read_csv_files(self.input_folder)
+        for threshold in (1, 100):
+            streamed = {}
+            for account_name, qif in iter_csv_entries(
+                self.input_folder, spill_threshold=threshold
+            ):
+                streamed.setdefault(account_name, []).append(qif)
+            self.assertEqual(streamed, batch)
+
+    def test_transactions_order_by_date(self):
+        """Test records are ordered by date like the QIF entries"""
+        dates = {}
+        for account_name, transaction in iter_csv_transactions(
+            self.input_folder, spill_threshold=2
+        ):
+            dates.setdefault(account_name, []).append(transaction.date)
+
+        self.assertEqual(dates["ORD123CAD-CAD"], sorted(dates["ORD123CAD-CAD"]))
+        self.assertEqual(len(dates["ORD123CAD-CAD"]), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
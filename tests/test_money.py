@@ -0,0 +1,118 @@
+import unittest
+
+from app.main import format_qif_entry
+from app.money import (
+    cents_from_float,
+    divide_half_even,
+    format_cents,
+    format_price,
+    format_price_units,
+    parse_amount,
+    parse_cents,
+    price_units,
+    quantity_ratio,
+)
+
+
+class TestMoney(unittest.TestCase):
+    def test_parse_cents(self):
+        """Test amount strings are parsed into exact integer cents"""
+        self.assertEqual(parse_cents("-1500.00"), -150000)
+        self.assertEqual(parse_cents("1000.0"), 100000)
+        self.assertEqual(parse_cents("12"), 1200)
+        self.assertEqual(parse_cents("-.05"), -5)
+        self.assertEqual(parse_cents(" 0.10 "), 10)
+        # Extra decimals are rounded half to even
+        self.assertEqual(parse_cents("0.125"), 12)
+        self.assertEqual(parse_cents("0.135"), 14)
+        self.assertEqual(parse_cents("-0.1251"), -13)
+
+        for amount in ("", "-", "oops", "1,500.00", "1.2.3"):
+            with self.assertRaises(ValueError):
+                parse_cents(amount)
+
+    def test_parse_amount(self):
+        """Test statement amounts are turned into absolute cents"""
+        self.assertEqual(parse_amount("-1500.00"), 150000)
+        self.assertEqual(parse_amount("0.05"), 5)
+        self.assertEqual(parse_amount("1000.0"), 100000)
+        self.assertEqual(parse_amount("+12.345"), 1234)
+        self.assertEqual(parse_amount("-0.00"), 0)
+        self.assertEqual(parse_amount(" -7.5"), 750)
+        # Trailing whitespace does not shift the decimal point
+        self.assertEqual(parse_amount("1.5 "), 150)
+
+        for amount in ("", "oops", "-a1.00", "--5.00", "1.2.00"):
+            with self.assertRaises(ValueError):
+                parse_amount(amount)
+
+    def test_format_cents(self):
+        """Test cents are always formatted with two decimals"""
+        self.assertEqual(format_cents(150000), "1500.00")
+        self.assertEqual(format_cents(5), "0.05")
+        self.assertEqual(format_cents(0), "0.00")
+        self.assertEqual(format_cents(-1234), "-12.34")
+
+    def test_cents_from_float(self):
+        """Test fees parsed as floats are converted from their decimal digits"""
+        self.assertEqual(cents_from_float(1.5), 150)
+        self.assertEqual(cents_from_float(0.29), 29)
+        self.assertEqual(cents_from_float(5), 500)
+        with self.assertRaises(TypeError):
+            cents_from_float(None)
+
+    def test_quantity_ratio(self):
+        """Test quantities are read as the decimals they were written as"""
+        self.assertEqual(quantity_ratio(10.0), (10, 1))
+        self.assertEqual(quantity_ratio(3), (3, 1))
+        self.assertEqual(quantity_ratio(0.7), (7, 10))
+        self.assertEqual(quantity_ratio(0.0001), (1, 10000))
+        self.assertEqual(quantity_ratio(1e-05), (1, 100000))
+
+    def test_divide_half_even(self):
+        """Test ties are rounded to the even quotient"""
+        self.assertEqual(divide_half_even(5, 2), 2)
+        self.assertEqual(divide_half_even(7, 2), 4)
+        self.assertEqual(divide_half_even(-5, 2), -2)
+        self.assertEqual(divide_half_even(5, -2), -2)
+        self.assertEqual(divide_half_even(10, 3), 3)
+        with self.assertRaises(ZeroDivisionError):
+            divide_half_even(1, 0)
+
+    def test_format_price(self):
+        """Test prices are exact, rounded to 6 decimals and keep at least 2 decimals"""
+        self.assertEqual(format_price(150000, 10.0), "150.00")
+        self.assertEqual(format_price(31900, 2), "159.50")
+        self.assertEqual(format_price(625075, 2.5), "2500.30")
+        self.assertEqual(format_price(10000, 0.7), "142.857143")
+        self.assertEqual(format_price(100, 8), "0.125")
+        self.assertEqual(format_price(-100, 3), "-0.333333")
+        with self.assertRaises(ZeroDivisionError):
+            format_price(100, 0.0)
+        with self.assertRaises(TypeError):
+            format_price(100, None)
+
+    def test_price_units(self):
+        """Test prices are kept as integer millionths until they are rendered"""
+        self.assertEqual(price_units(150000, 10.0), 150000000)
+        self.assertEqual(price_units(10000, 0.7), 142857143)
+        self.assertEqual(format_price_units(142857143), "142.857143")
+        self.assertEqual(format_price_units(-500000), "-0.50")
+
+    def test_no_float_artefacts_in_entries(self):
+        """Test entries whose float prices had representation errors"""
+        qif = format_qif_entry("2025-07-01", "BUY", "AAPL - 3.0 shares", "-0.30", "USD")
+        self.assertIn("\nI0.10\nQ3.0\nT0.30\n", qif)
+
+        qif = format_qif_entry(
+            "2025-07-01",
+            "SELLTOCLOSE",
+            "SPY 450.00 USD CALL 2025-07-25: Sold 1 contract (executed at 2025-07-23), Fee: $0.1",
+            "0.20",
+            "USD",
+        )
+        self.assertIn("\nI0.30\nQ1\nT0.20\nO0.10\n", qif)
+
+
+if __name__ == "__main__":
+    unittest.main()
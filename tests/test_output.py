@@ -0,0 +1,161 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from app.main import stream_qif_files, write_qif_files
+from app.output import QifFileWriter, write_qif_outputs
+
+ENTRIES = [
+    f"D07/{day:02d}/2025\nT{day}.00\nO0.00\nCc\nPDeposit\n^" for day in range(1, 29)
+]
+
+
+class TestQifFileWriter(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.work_dir, "account.qif")
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+
+    def read(self, path=None):
+        with open(path or self.path) as file:
+            return file.read()
+
+    def test_header_and_entries(self):
+        """Test the file is the header and the entries one per line, across write chunks"""
+        with patch("app.output.WRITE_CHUNK_ENTRIES", 5):
+            with QifFileWriter(self.path, "!Type:Bank", buffer_size=64) as writer:
+                writer.write(ENTRIES[0])
+                writer.write_entries(entry for entry in ENTRIES[1:])
+                writer.write_entries([])
+
+        self.assertEqual(writer.entries, len(ENTRIES))
+        self.assertEqual(self.read(), "\n".join(["!Type:Bank"] + ENTRIES) + "\n")
+
+    def test_empty_file_has_header(self):
+        """Test a writer without entries still leaves the header line"""
+        QifFileWriter(self.path, "!Type:Invst").publish()
+        self.assertEqual(self.read(), "!Type:Invst\n")
+
+    def test_file_appears_when_published(self):
+        """Test entries go to a temporary file that only replaces the QIF when published"""
+        with open(self.path, "w") as file:
+            file.write("previous\n")
+
+        writer = QifFileWriter(self.path, "!Type:Bank")
+        writer.write_entries(ENTRIES)
+        writer.finish()
+        self.assertEqual(self.read(), "previous\n")
+        self.assertEqual(len(os.listdir(self.work_dir)), 2)
+
+        writer.publish()
+        self.assertEqual(self.read(), "\n".join(["!Type:Bank"] + ENTRIES) + "\n")
+        self.assertEqual(os.listdir(self.work_dir), ["account.qif"])
+
+    def test_failed_write_keeps_previous_file(self):
+        """Test a writer left by an error is discarded and the previous QIF is kept"""
+        with open(self.path, "w") as file:
+            file.write("previous\n")
+
+        def broken_entries():
+            yield ENTRIES[0]
+            raise ValueError("Invalid transaction type: BOGUS")
+
+        with self.assertRaises(ValueError):
+            with QifFileWriter(self.path, "!Type:Bank") as writer:
+                writer.write_entries(broken_entries())
+
+        self.assertEqual(self.read(), "previous\n")
+        self.assertEqual(os.listdir(self.work_dir), ["account.qif"])
+
+    def test_write_qif_outputs_all_or_nothing(self):
+        """Test files written concurrently are published together, or not at all"""
+        paths = [
+            os.path.join(self.work_dir, f"account-{index}.qif") for index in range(6)
+        ]
+        files = [(path, "!Type:Bank", iter(ENTRIES)) for path in paths]
+        writers = write_qif_outputs(files, threads=3)
+
+        self.assertEqual([writer.path for writer in writers], paths)
+        self.assertEqual(
+            sorted(os.listdir(self.work_dir)),
+            [os.path.basename(path) for path in paths],
+        )
+        for path in paths:
+            self.assertEqual(
+                self.read(path), "\n".join(["!Type:Bank"] + ENTRIES) + "\n"
+            )
+
+        def broken_entries():
+            yield "D08/01/2025\nT1.00\nO0.00\nCc\nPNew\n^"
+            raise OSError("No space left on device")
+
+        for threads in (1, 3):
+            files = [(path, "!Type:Bank", iter(["D08/01/2025\n^"])) for path in paths]
+            files[3] = (paths[3], "!Type:Bank", broken_entries())
+            with self.assertRaises(OSError):
+                write_qif_outputs(files, threads=threads)
+            self.assertEqual(len(os.listdir(self.work_dir)), len(paths))
+            for path in paths:
+                self.assertEqual(
+                    self.read(path), "\n".join(["!Type:Bank"] + ENTRIES) + "\n"
+                )
+
+    def test_stream_error_keeps_previous_files(self):
+        """Test a conversion error in streaming mode publishes none of the files"""
+        config = {"TEST123CAD-CAD": {"nickname": "Listed", "type": "Checking"}}
+
+        def entries():
+            yield "TEST123CAD-CAD", ENTRIES[0]
+            raise ValueError("Invalid transaction type: BOGUS")
+
+        cwd = os.getcwd()
+        os.chdir(self.work_dir)
+        try:
+            os.mkdir("output")
+            with patch("app.main.read_config", return_value=config), patch(
+                "builtins.print"
+            ):
+                with self.assertRaises(ValueError):
+                    stream_qif_files(entries(), "dummy_config.yml")
+            self.assertEqual(os.listdir("output"), [])
+        finally:
+            os.chdir(cwd)
+
+    def test_write_qif_files_streams_lists_and_iterators(self):
+        """Test account lists are left untouched and iterators are written like lists"""
+        config = {
+            "TEST123CAD-CAD": {"nickname": "Listed", "type": "Checking"},
+            "TEST456CAD-CAD": {"nickname": "Iterated", "type": "Checking"},
+            "TEST789CAD-CAD": {"nickname": "Empty", "type": "Checking"},
+        }
+        listed = list(ENTRIES)
+        account_data = {
+            "TEST123CAD-CAD": listed,
+            "TEST456CAD-CAD": iter(ENTRIES),
+            "TEST789CAD-CAD": iter(()),
+        }
+
+        cwd = os.getcwd()
+        os.chdir(self.work_dir)
+        try:
+            os.mkdir("output")
+            with patch("builtins.print"):
+                write_qif_files(account_data, config, buffer_size=16)
+        finally:
+            os.chdir(cwd)
+
+        self.assertEqual(listed, ENTRIES)
+        output = os.path.join(self.work_dir, "output")
+        self.assertEqual(sorted(os.listdir(output)), ["Iterated.qif", "Listed.qif"])
+        self.assertEqual(
+            self.read(os.path.join(output, "Listed.qif")),
+            self.read(os.path.join(output, "Iterated.qif")),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
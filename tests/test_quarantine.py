@@ -0,0 +1,243 @@
+import csv
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+from app.cache import ConversionCache
+from app.main import iter_csv_entries, iter_csv_transactions, main, read_csv_files
+from app.quarantine import Quarantine
+from tests.helpers import StatementTestCase
+
+GOOD_CONTENT = """date,transaction,description,amount,currency
+2025-07-01,BUY,AAPL - 10.0 shares,-1500.00,USD
+2025-07-02,CONT,Contribution,1000.0,CAD
+"""
+
+BAD_CONTENT = """date,transaction,description,amount,currency
+2025-08-01,SPEND,Card purchase,-50.00,CAD
+2025-08-02,BOGUS,Mystery,20.00,CAD
+2025-08-03,BUY,AAPL - shares,-10.00,USD
+
+2025-08-04,EFT,Short row
+2025-08-05,EFT,Payroll,abc,CAD
+2025-08-06,SELL,MSFT - 2.0 shares,600.00,USD
+"""
+
+EXPECTED_REJECTS = [
+    (3, "ValueError: Invalid transaction type: BOGUS"),
+    (4, "TypeError: unsupported operand type(s) for %: 'NoneType' and 'int'"),
+    (6, "IndexError: list index out of range"),
+    (7, "ValueError: Invalid amount: 'abc'"),
+]
+
+
+class TestQuarantine(StatementTestCase):
+    def setUp(self):
+        super().setUp()
+        self.good_path = self.write_statement("GOOD123CAD", GOOD_CONTENT)
+        self.bad_path = self.write_statement("BAD456CAD", BAD_CONTENT)
+        self.quarantine_path = os.path.join(self.work_dir, "rejects", "quarantine.csv")
+
+    def rejects(self, quarantine):
+        return [(line, reason) for _, line, reason, _ in quarantine.rows]
+
+    def test_default_mode_raises(self):
+        """Test the first bad row still aborts a run without a quarantine"""
+        with self.assertRaises(ValueError):
+            read_csv_files(self.input_folder)
+
+    def test_bad_rows_are_set_aside(self):
+        """Test every bad row is recorded while the good rows are converted"""
+        quarantine = Quarantine(self.quarantine_path)
+        result = read_csv_files(self.input_folder, quarantine=quarantine)
+
+        self.assertEqual(self.rejects(quarantine), EXPECTED_REJECTS)
+        self.assertEqual(
+            [entry.split("\n")[:2] for entry in result["BAD456CAD-USD"]],
+            [["D08/06/2025", "NSell"]],
+        )
+        self.assertEqual(len(result["BAD456CAD-CAD"]), 1)
+        self.assertEqual(len(result["GOOD123CAD-USD"]), 1)
+
+    def test_all_paths_agree(self):
+        """Test parallel, columnar, streaming and record conversions reject the same rows"""
+        serial = Quarantine()
+        expected = read_csv_files(self.input_folder, quarantine=serial)
+
+        for kwargs in ({"jobs": 2}, {"engine": "columnar"}):
+            quarantine = Quarantine()
+            self.assertEqual(
+                read_csv_files(self.input_folder, quarantine=quarantine, **kwargs),
+                expected,
+            )
+            self.assertEqual(quarantine.rows, serial.rows)
+
+        for engine in ("scalar", "columnar"):
+            quarantine = Quarantine()
+            list(
+                iter_csv_entries(
+                    self.input_folder, engine=engine, quarantine=quarantine
+                )
+            )
+            self.assertEqual(quarantine.rows, serial.rows)
+
+            quarantine = Quarantine()
+            list(
+                iter_csv_transactions(
+                    self.input_folder, engine=engine, quarantine=quarantine
+                )
+            )
+            self.assertEqual(quarantine.rows, serial.rows)
+
+    def test_bad_dates_are_set_aside(self):
+        """Test rows with an unreadable date are rejected by every engine and path"""
+        os.remove(self.bad_path)
+        self.write_statement(
+            "DATE789CAD",
+            "date,transaction,description,amount,currency\n"
+            "2025-08-01,EFT,Payroll,100.00,CAD\n"
+            "2025-13-45,EFT,Payroll,100.00,CAD\n",
+        )
+        expected = [(3, "ValueError: Invalid date: '2025-13-45'")]
+
+        for engine in ("scalar", "columnar"):
+            quarantine = Quarantine()
+            result = read_csv_files(
+                self.input_folder, engine=engine, quarantine=quarantine
+            )
+            self.assertEqual(self.rejects(quarantine), expected)
+            self.assertEqual(len(result["DATE789CAD-CAD"]), 1)
+
+            quarantine = Quarantine()
+            accounts = [
+                account_name
+                for account_name, _ in iter_csv_transactions(
+                    self.input_folder, engine=engine, quarantine=quarantine
+                )
+            ]
+            self.assertEqual(self.rejects(quarantine), expected)
+            self.assertEqual(accounts.count("DATE789CAD-CAD"), 1)
+
+    def test_statements_with_rejects_are_not_cached(self):
+        """Test a statement with bad rows is converted and reported again on the next run"""
+        cache_dir = os.path.join(self.work_dir, "cache")
+        read_csv_files(
+            self.input_folder, cache=ConversionCache(cache_dir), quarantine=Quarantine()
+        )
+
+        cache = ConversionCache(cache_dir)
+        quarantine = Quarantine()
+        read_csv_files(self.input_folder, cache=cache, quarantine=quarantine)
+
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(self.rejects(quarantine), EXPECTED_REJECTS)
+
+    def test_lines_by_source(self):
+        """Test the rejected lines are returned per statement"""
+        quarantine = Quarantine()
+        quarantine.add("a.csv", [(3, "ValueError: x", ()), (5, "ValueError: y", ())])
+        quarantine.add("b.csv", [(4, "ValueError: z", ())])
+        quarantine.add("a.csv", [(7, "ValueError: w", ())])
+
+        self.assertEqual(quarantine.lines("a.csv"), {3, 5, 7})
+        self.assertEqual(quarantine.lines("b.csv"), {4})
+        self.assertEqual(quarantine.lines("c.csv"), set())
+
+    def test_save_and_report(self):
+        """Test the quarantine file lists the source, line, reason and row"""
+        quarantine = Quarantine(self.quarantine_path)
+        read_csv_files(self.input_folder, quarantine=quarantine)
+        quarantine.save()
+
+        with open(self.quarantine_path, newline="") as file:
+            rows = list(csv.reader(file))
+        self.assertEqual(
+            rows[0],
+            [
+                "file",
+                "line",
+                "reason",
+                "date",
+                "transaction",
+                "description",
+                "amount",
+                "currency",
+            ],
+        )
+        self.assertEqual(
+            rows[1],
+            [
+                self.bad_path,
+                "3",
+                EXPECTED_REJECTS[0][1],
+                "2025-08-02",
+                "BOGUS",
+                "Mystery",
+                "20.00",
+                "CAD",
+            ],
+        )
+        self.assertEqual(rows[3][3:], ["2025-08-04", "EFT", "Short row", "", ""])
+
+        with patch("builtins.print") as mock_print:
+            quarantine.report()
+        printed = [call.args[0] for call in mock_print.call_args_list]
+        self.assertEqual(
+            printed[0],
+            f"Quarantined 4 row(s) from 1 statement(s) to {self.quarantine_path}",
+        )
+        self.assertIn(
+            "  1 row(s): ValueError: Invalid transaction type: BOGUS", printed
+        )
+
+    def test_missing_column_rejects_statement(self):
+        """Test a statement lacking a required column is rejected as a whole"""
+        self.write_statement("NOCOL789CAD", "date,transaction,description,currency\n")
+        quarantine = Quarantine()
+        read_csv_files(self.input_folder, quarantine=quarantine)
+
+        self.assertIn((1, "Missing column: 'amount'"), self.rejects(quarantine))
+
+    def test_main_exits_non_zero(self):
+        """Test the command line converts everything, then exits with status 1"""
+        os.remove(self.good_path)
+        config_path = os.path.join(self.work_dir, "accounts.yml")
+        with open(config_path, "w") as config_file:
+            config_file.write(
+                "BAD456CAD-CAD:\n  nickname: Bad-CAD\n  type: Checking\n"
+                "BAD456CAD-USD:\n  nickname: Bad-USD\n  type: Investment\n"
+            )
+        argv = [
+            "ws-csv-to-qif",
+            "--input-folder",
+            self.input_folder,
+            "--account-config",
+            config_path,
+            "--no-cache",
+            "--on-error",
+            "quarantine",
+            "--quarantine-file",
+            self.quarantine_path,
+        ]
+
+        cwd = os.getcwd()
+        os.chdir(self.work_dir)
+        try:
+            os.mkdir("output")
+            with patch.object(sys, "argv", argv), patch("builtins.print"):
+                with self.assertRaises(SystemExit) as context:
+                    main()
+            self.assertEqual(
+                sorted(os.listdir("output")), ["Bad-CAD.qif", "Bad-USD.qif"]
+            )
+        finally:
+            os.chdir(cwd)
+
+        self.assertEqual(context.exception.code, 1)
+        with open(self.quarantine_path) as file:
+            self.assertEqual(len(file.read().splitlines()), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,235 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from app.main import export_qif_files, stream_qif_files
+from app.output import QifFileWriter, discard_all, publish_all
+from app.shards import ShardedQifWriter, qif_writer_factory, remove_stale_shards
+
+
+def bank_entry(date, amount="1.00"):
+    return f"D{date}\nT{amount}\nO0.00\nCc\nPDeposit\n^"
+
+
+ENTRIES = [
+    bank_entry("12/30/2023"),
+    bank_entry("12/31/2023"),
+    bank_entry("01/02/2024"),
+    bank_entry("03/31/2024"),
+    bank_entry("04/01/2024"),
+    bank_entry("04/01/2024", "2.00"),
+    bank_entry("11/15/2024"),
+]
+
+
+def qif(entries, header="!Type:Bank"):
+    return "\n".join([header] + entries) + "\n"
+
+
+class TestShardedQifWriter(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.work_dir, "My-TFSA.qif")
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+
+    def write(self, entries, **options):
+        writer = ShardedQifWriter(self.path, "!Type:Bank", **options)
+        writer.write_entries(entries)
+        publish_all([writer])
+        return writer
+
+    def read_all(self):
+        shards = {}
+        for name in sorted(os.listdir(self.work_dir)):
+            with open(os.path.join(self.work_dir, name)) as file:
+                shards[name] = file.read()
+        return shards
+
+    def test_split_by_year(self):
+        """Test each year gets its own file with the account header"""
+        writer = self.write(ENTRIES, split_by="year")
+
+        self.assertEqual(
+            self.read_all(),
+            {
+                "My-TFSA-2023.qif": qif(ENTRIES[:2]),
+                "My-TFSA-2024.qif": qif(ENTRIES[2:]),
+            },
+        )
+        self.assertEqual(writer.entries, len(ENTRIES))
+        self.assertEqual(len(writer.paths), 2)
+
+    def test_split_by_quarter_and_size(self):
+        """Test periods are split further into numbered parts of at most max_entries"""
+        self.write(ENTRIES, split_by="quarter", max_entries=1)
+        self.assertEqual(
+            sorted(self.read_all()),
+            [
+                "My-TFSA-2023-Q4-1.qif",
+                "My-TFSA-2023-Q4-2.qif",
+                "My-TFSA-2024-Q1-1.qif",
+                "My-TFSA-2024-Q1-2.qif",
+                "My-TFSA-2024-Q2-1.qif",
+                "My-TFSA-2024-Q2-2.qif",
+                "My-TFSA-2024-Q4-1.qif",
+            ],
+        )
+
+    def test_split_by_size(self):
+        """Test max_entries alone numbers the parts of the whole history"""
+        self.write(iter(ENTRIES), max_entries=3)
+        self.assertEqual(
+            self.read_all(),
+            {
+                "My-TFSA-1.qif": qif(ENTRIES[:3]),
+                "My-TFSA-2.qif": qif(ENTRIES[3:6]),
+                "My-TFSA-3.qif": qif(ENTRIES[6:]),
+            },
+        )
+
+    def test_month_labels_follow_date_style(self):
+        """Test periods are read from any QIF date style"""
+        self.write([bank_entry("2024-02-29"), bank_entry("03/01'24")], split_by="month")
+        self.assertEqual(
+            sorted(self.read_all()), ["My-TFSA-2024-02.qif", "My-TFSA-2024-03.qif"]
+        )
+
+    def test_out_of_order_entries_are_rejected(self):
+        """Test a period starting again raises and leaves no file behind"""
+        writer = ShardedQifWriter(self.path, "!Type:Bank", split_by="year")
+        with self.assertRaises(ValueError):
+            writer.write_entries([ENTRIES[0], ENTRIES[2], ENTRIES[1]])
+        discard_all([writer])
+        self.assertEqual(os.listdir(self.work_dir), [])
+
+    def test_remove_stale_shards(self):
+        """Test files of earlier layouts are removed, other accounts' files are kept"""
+        names = [
+            "My-TFSA.qif",
+            "My-TFSA-2023.qif",
+            "My-TFSA-2024-Q3-2.qif",
+            "My-TFSA-7.qif",
+            "My-TFSA-delta.qif",
+            "My-TFSA-USD.qif",
+            "My-TFSA-2025.qif",
+            "My-TFSA-2025-1.qif",
+        ]
+        for name in names:
+            with open(os.path.join(self.work_dir, name), "w") as file:
+                file.write("!Type:Bank\n")
+        kept = os.path.join(self.work_dir, "My-TFSA-2024.qif")
+        with open(kept, "w") as file:
+            file.write("!Type:Bank\n")
+
+        removed = remove_stale_shards(
+            self.path, [kept], [os.path.join(self.work_dir, "My-TFSA-2025.qif")]
+        )
+
+        self.assertEqual(
+            [os.path.basename(path) for path in removed],
+            [
+                "My-TFSA-2023.qif",
+                "My-TFSA-2024-Q3-2.qif",
+                "My-TFSA-7.qif",
+                "My-TFSA.qif",
+            ],
+        )
+        self.assertEqual(
+            sorted(os.listdir(self.work_dir)),
+            [
+                "My-TFSA-2024.qif",
+                "My-TFSA-2025-1.qif",
+                "My-TFSA-2025.qif",
+                "My-TFSA-USD.qif",
+                "My-TFSA-delta.qif",
+            ],
+        )
+
+    def test_invalid_options(self):
+        """Test unknown periods and empty parts are rejected"""
+        with self.assertRaises(ValueError):
+            ShardedQifWriter(self.path, "!Type:Bank", split_by="week")
+        with self.assertRaises(ValueError):
+            ShardedQifWriter(self.path, "!Type:Bank", max_entries=0)
+        self.assertIs(qif_writer_factory(), QifFileWriter)
+
+
+class TestShardedExport(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.cwd = os.getcwd()
+        os.chdir(self.work_dir)
+        os.mkdir("output")
+        self.config = {
+            "WK23MTV36CAD-CAD": {"nickname": "My-Checking", "type": "Checking"}
+        }
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        shutil.rmtree(self.work_dir)
+
+    def read_output(self):
+        shards = {}
+        for name in sorted(os.listdir("output")):
+            with open(os.path.join("output", name)) as file:
+                shards[name] = file.read()
+        return shards
+
+    def test_batch_and_streaming_write_the_same_shards(self):
+        """Test both export paths shard an account identically in one pass"""
+        with patch("app.main.read_config", return_value=self.config), patch(
+            "builtins.print"
+        ):
+            export_qif_files(
+                {"WK23MTV36CAD-CAD": ENTRIES},
+                "dummy_config.yml",
+                split_by="year",
+                max_entries=4,
+            )
+            batch = self.read_output()
+            shutil.rmtree("output")
+            os.mkdir("output")
+
+            stream_qif_files(
+                (("WK23MTV36CAD-CAD", entry) for entry in ENTRIES),
+                "dummy_config.yml",
+                split_by="year",
+                max_entries=4,
+            )
+
+        self.assertEqual(
+            batch,
+            {
+                "My-Checking-2023-1.qif": qif(ENTRIES[:2]),
+                "My-Checking-2024-1.qif": qif(ENTRIES[2:6]),
+                "My-Checking-2024-2.qif": qif(ENTRIES[6:]),
+            },
+        )
+        self.assertEqual(self.read_output(), batch)
+
+    def test_export_removes_earlier_layout(self):
+        """Test switching the split options leaves only the new files of the account"""
+        with patch("app.main.read_config", return_value=self.config), patch(
+            "builtins.print"
+        ):
+            export_qif_files({"WK23MTV36CAD-CAD": ENTRIES}, "dummy_config.yml")
+            export_qif_files(
+                {"WK23MTV36CAD-CAD": ENTRIES}, "dummy_config.yml", split_by="year"
+            )
+            self.assertEqual(
+                sorted(os.listdir("output")),
+                ["My-Checking-2023.qif", "My-Checking-2024.qif"],
+            )
+            stream_qif_files(
+                (("WK23MTV36CAD-CAD", entry) for entry in ENTRIES), "dummy_config.yml"
+            )
+
+        self.assertEqual(self.read_output(), {"My-Checking.qif": qif(ENTRIES)})
+
+
+if __name__ == "__main__":
+    unittest.main()
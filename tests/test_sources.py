@@ -0,0 +1,205 @@
+import bz2
+import gzip
+import lzma
+import os
+import tempfile
+import unittest
+import zipfile
+from unittest.mock import patch
+
+from app.cache import ConversionCache
+from app.main import extract_account_name, iter_statement_files, read_csv_files
+from app.sources import (
+    is_statement_name,
+    open_statement,
+    stat_statement,
+    statement_exists,
+)
+
+CSV_CONTENT = """date,transaction,description,amount,currency
+2025-07-01,BUY,AAPL - 10.0 shares,-1500.00,USD
+2025-07-02,CONT,Contribution,1000.0,CAD
+"""
+
+
+class TestStatementSources(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.input_folder = self.work_dir.name
+
+    def tearDown(self):
+        self.work_dir.cleanup()
+
+    def path(self, filename):
+        return os.path.join(self.input_folder, filename)
+
+    def write_compressed(self, filename, opener):
+        with opener(self.path(filename), "wt") as file:
+            file.write(CSV_CONTENT)
+        return self.path(filename)
+
+    def write_zip(self, filename, members):
+        with zipfile.ZipFile(self.path(filename), "w", zipfile.ZIP_DEFLATED) as archive:
+            for member in members:
+                archive.writestr(member, CSV_CONTENT)
+        return self.path(filename)
+
+    def test_is_statement_name(self):
+        """Test the recognized statement suffixes"""
+        for suffix in (".csv", ".csv.gz", ".csv.bz2", ".csv.xz"):
+            self.assertTrue(is_statement_name(f"statement{suffix}"))
+        for suffix in (".zip", ".gz", ".txt", ".csv.zst"):
+            self.assertFalse(is_statement_name(f"statement{suffix}"))
+
+    def test_extract_account_name_compressed(self):
+        """Test extract_account_name accepts compressed statement names"""
+        for suffix in (".csv.gz", ".csv.bz2", ".csv.xz"):
+            filename = f"monthly-statement-transactions-HQ8KJW805CAD-2025-07-01{suffix}"
+            self.assertEqual(extract_account_name(filename), "HQ8KJW805CAD")
+
+    def test_open_statement_compressed(self):
+        """Test compressed statements are decoded straight from the stream"""
+        for suffix, opener in (
+            (".gz", gzip.open),
+            (".bz2", bz2.open),
+            (".xz", lzma.open),
+        ):
+            file_path = self.write_compressed(f"statement.csv{suffix}", opener)
+            with open_statement(file_path) as csv_file:
+                self.assertEqual(csv_file.read(), CSV_CONTENT)
+
+    def test_open_statement_zip_member(self):
+        """Test statements inside zip archives are read without extraction"""
+        archive_path = self.write_zip("2025.zip", ["2025/07/statement.csv"])
+        source = f"{archive_path}::2025/07/statement.csv"
+
+        with open_statement(source) as csv_file:
+            self.assertEqual(csv_file.read(), CSV_CONTENT)
+
+        self.assertEqual(stat_statement(source)[0], len(CSV_CONTENT))
+        self.assertTrue(statement_exists(source))
+        self.assertFalse(statement_exists(f"{archive_path}::missing.csv"))
+        self.assertFalse(statement_exists(f"{self.path('missing.zip')}::statement.csv"))
+
+    def test_open_statement_compressed_zip_member(self):
+        """Test compressed statements stored inside zip archives"""
+        archive_path = self.path("bundle.zip")
+        with zipfile.ZipFile(archive_path, "w") as archive:
+            archive.writestr("statement.csv.gz", gzip.compress(CSV_CONTENT.encode()))
+
+        with open_statement(f"{archive_path}::statement.csv.gz") as csv_file:
+            self.assertEqual(csv_file.read(), CSV_CONTENT)
+
+    def test_open_statement_zip_member_closes_archive(self):
+        """Test closing a zip member statement closes the member and the archive"""
+        archive_path = self.path("bundle.zip")
+        with zipfile.ZipFile(archive_path, "w") as archive:
+            archive.writestr("statement.csv.gz", gzip.compress(CSV_CONTENT.encode()))
+            archive.writestr("statement.csv", CSV_CONTENT)
+
+        archives, members = [], []
+
+        class RecordingZipFile(zipfile.ZipFile):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                archives.append(self)
+
+            def open(self, *args, **kwargs):
+                members.append(super().open(*args, **kwargs))
+                return members[-1]
+
+        with patch("app.sources.zipfile.ZipFile", RecordingZipFile):
+            for member in ("statement.csv.gz", "statement.csv"):
+                with open_statement(f"{archive_path}::{member}") as csv_file:
+                    self.assertEqual(csv_file.read(), CSV_CONTENT)
+                    self.assertIsNotNone(archives[-1].fp)
+
+        self.assertEqual((len(archives), len(members)), (2, 2))
+        self.assertTrue(all(member.closed for member in members))
+        self.assertTrue(all(archive.fp is None for archive in archives))
+
+    def test_iter_statement_files_archives(self):
+        """Test discovery of compressed statements and zip members"""
+        self.write_compressed(
+            "monthly-statement-transactions-GZIP123CAD-2025-07-01.csv.gz", gzip.open
+        )
+        archive_path = self.write_zip(
+            "bundle.zip",
+            [
+                "monthly-statement-transactions-ZIP123CAD-2025-07-01.csv",
+                "nested/monthly-statement-transactions-ZIP456CAD-2025-08-01.csv.gz",
+                "readme.txt",
+            ],
+        )
+
+        statements = sorted(iter_statement_files(self.input_folder))
+
+        self.assertEqual(
+            statements,
+            [
+                (
+                    "GZIP123CAD",
+                    self.path(
+                        "monthly-statement-transactions-GZIP123CAD-2025-07-01.csv.gz"
+                    ),
+                ),
+                (
+                    "ZIP123CAD",
+                    f"{archive_path}::monthly-statement-transactions-ZIP123CAD-2025-07-01.csv",
+                ),
+                (
+                    "ZIP456CAD",
+                    f"{archive_path}::nested/monthly-statement-transactions-ZIP456CAD-2025-08-01.csv.gz",
+                ),
+            ],
+        )
+
+    def test_read_csv_files_compressed_and_archived(self):
+        """Test read_csv_files converts every kind of statement the same way"""
+        with open(
+            self.path("monthly-statement-transactions-PLAIN123CAD-2025-07-01.csv"), "w"
+        ) as file:
+            file.write(CSV_CONTENT)
+        self.write_compressed(
+            "monthly-statement-transactions-GZIP123CAD-2025-07-01.csv.gz", gzip.open
+        )
+        self.write_compressed(
+            "monthly-statement-transactions-BZIP123CAD-2025-07-01.csv.bz2", bz2.open
+        )
+        self.write_compressed(
+            "monthly-statement-transactions-XZ123CAD-2025-07-01.csv.xz", lzma.open
+        )
+        self.write_zip(
+            "bundle.zip", ["monthly-statement-transactions-ZIP123CAD-2025-07-01.csv"]
+        )
+
+        result = read_csv_files(self.input_folder)
+
+        expected = result["PLAIN123CAD-USD"], result["PLAIN123CAD-CAD"]
+        self.assertEqual(len(expected[0]), 1)
+        for account in ("GZIP123CAD", "BZIP123CAD", "XZ123CAD", "ZIP123CAD"):
+            self.assertEqual(
+                (result[f"{account}-USD"], result[f"{account}-CAD"]), expected
+            )
+
+    def test_cache_zip_members(self):
+        """Test the conversion cache tracks zip members and evicts removed archives"""
+        archive_path = self.write_zip(
+            "bundle.zip", ["monthly-statement-transactions-ZIP123CAD-2025-07-01.csv"]
+        )
+        cache_dir = os.path.join(self.input_folder, "cache")
+
+        first = read_csv_files(self.input_folder, cache=ConversionCache(cache_dir))
+        cache = ConversionCache(cache_dir)
+        second = read_csv_files(self.input_folder, cache=cache)
+        self.assertEqual(second, first)
+        self.assertEqual(cache.hits, 1)
+
+        os.remove(archive_path)
+        cache = ConversionCache(cache_dir)
+        read_csv_files(self.input_folder, cache=cache)
+        self.assertEqual(cache.files, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
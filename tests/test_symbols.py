@@ -0,0 +1,105 @@
+import os
+import pickle
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import yaml
+
+from app import main
+from app.symbols import SYMBOLS_CONFIG_KEY, SymbolMap, load_symbol_map
+
+
+class TestSymbolMap(unittest.TestCase):
+    def test_default_rules(self):
+        """Test the built-in rules match the historical CDR mapping"""
+        symbol_map = SymbolMap()
+
+        self.assertEqual(symbol_map.render("TSLA", "CAD"), "TSLA-QH")
+        self.assertEqual(symbol_map.render("TSLA", "USD"), "TSLA-CT")
+        self.assertEqual(symbol_map.render("SHOP", "CAD"), "SHOP-CT")
+
+    def test_from_config(self):
+        """Test rules from a symbols section are added to the built-in ones"""
+        symbol_map = SymbolMap.from_config(
+            {"default": "XX", "CAD": {"QH": ["amzn", "GOOGL"]}, "USD": {"NE": ["SHOP"]}}
+        )
+
+        self.assertEqual(symbol_map.render("AMZN", "CAD"), "AMZN-QH")
+        self.assertEqual(symbol_map.render("AAPL", "CAD"), "AAPL-QH")
+        self.assertEqual(symbol_map.render("SHOP", "USD"), "SHOP-NE")
+        self.assertEqual(symbol_map.render("SHOP", "CAD"), "SHOP-XX")
+        with self.assertRaises(TypeError):
+            symbol_map.suffixes[("MSFT", "CAD")] = "QH"
+
+    def test_invalid_config(self):
+        """Test malformed symbols sections are rejected"""
+        for section in (
+            ["TSLA"],
+            {"CAD": ["TSLA"]},
+            {"CAD": {"QH": "TSLA"}},
+            {"default": 1},
+        ):
+            with self.assertRaises(ValueError):
+                SymbolMap.from_config(section)
+
+    def test_pickle_and_fingerprint(self):
+        """Test maps survive the trip to worker processes and fingerprint their rules"""
+        symbol_map = SymbolMap.from_config({"CAD": {"QH": ["AMZN"]}})
+
+        self.assertEqual(pickle.loads(pickle.dumps(symbol_map)), symbol_map)
+        same_rules = SymbolMap.from_config({"CAD": {"QH": ["AMZN"]}})
+        self.assertEqual(symbol_map.fingerprint(), same_rules.fingerprint())
+        self.assertNotEqual(symbol_map.fingerprint(), SymbolMap().fingerprint())
+
+    def test_load_symbol_map(self):
+        """Test rules from accounts.yml and from a symbols file are combined"""
+        config = {
+            "ACCOUNT1-CAD": {"nickname": "Account", "type": "Investment"},
+            SYMBOLS_CONFIG_KEY: {"CAD": {"QH": ["AMZN"]}},
+        }
+        with tempfile.TemporaryDirectory() as work_dir:
+            symbols_filename = os.path.join(work_dir, "symbols.yml")
+            with open(symbols_filename, "w") as file:
+                yaml.dump({"CAD": {"QH": ["GOOGL"]}}, file)
+
+            symbol_map = load_symbol_map(config, symbols_filename)
+
+        self.assertEqual(symbol_map.render("AMZN", "CAD"), "AMZN-QH")
+        self.assertEqual(symbol_map.render("GOOGL", "CAD"), "GOOGL-QH")
+        self.assertEqual(load_symbol_map(None), SymbolMap())
+
+
+class TestConfiguredSymbols(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.object(main, "SYMBOL_MAP", main.SYMBOL_MAP)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(main.configure_symbol_map, main.SYMBOL_MAP)
+
+    def test_configured_map_is_used_by_every_parser(self):
+        """Test adding a ticker to the config changes the rendered symbols"""
+        main.configure_symbol_map(SymbolMap.from_config({"CAD": {"QH": ["AMZN"]}}))
+
+        self.assertEqual(main.extract_symbol("amzn - 2.0 shares", "CAD"), "AMZN-QH")
+        qif = main.format_qif_entry(
+            "2025-07-01", "DIV", "AMZN - Dividend", "1.00", "CAD"
+        )
+        self.assertIn("YAMZN-QH", qif)
+        qif = main.format_qif_entry(
+            "2025-07-01", "BUY", "AMZN - 2.0 shares", "-10.00", "CAD"
+        )
+        self.assertIn("YAMZN-QH", qif)
+
+    def test_map_change_clears_parse_caches(self):
+        """Test parsed descriptions rendered with a previous map are not reused"""
+        description = "AMZN - 2.0 shares"
+        self.assertEqual(main.extract_equity_info(description, "CAD")[0], "AMZN-CT")
+
+        main.configure_symbol_map(SymbolMap.from_config({"CAD": {"QH": ["AMZN"]}}))
+
+        self.assertEqual(main.extract_equity_info(description, "CAD")[0], "AMZN-QH")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+import os
+import tempfile
+import unittest
+
+from app.columnar import iter_column_transactions, load_columns
+from app.main import (
+    format_qif_entry,
+    iter_file_entries,
+    iter_file_transactions,
+    parse_transaction,
+    render_qif_entry,
+)
+from app.transactions import Transaction
+
+OPTION_DESCRIPTION = "SPY 450.00 USD CALL 2025-07-25: Bought 2 contract (executed at 2025-07-23), Fee: $1.50"
+
+CSV_CONTENT = f"""date,transaction,description,amount,balance,currency
+2025-07-01,BUY,AAPL - 10.0 shares,-1500.00,0.00,USD
+2025-07-02,SELL,TSLA - 3.0 shares,1000.00,0.00,CAD
+2025-07-04,BUYTOOPEN,"{OPTION_DESCRIPTION}",-320.50,0.00,USD
+2025-07-06,DIV,TD - Dividend payment,15.75,0.00,CAD
+2025-07-07,RECALL,Stock recall,0.00,0.00,USD
+2025-07-08,CONT,Contribution,1000.0,0.00,CAD
+2025-07-09,SPEND,Card purchase,-50.00,0.00,CAD
+"""
+
+
+class TestTransaction(unittest.TestCase):
+    def test_parse_trade(self):
+        """Test trade rows are parsed into typed fields"""
+        transaction = parse_transaction(
+            "2025-07-23", "BUYTOOPEN", OPTION_DESCRIPTION, "-320.50", "USD"
+        )
+
+        self.assertEqual(
+            transaction,
+            Transaction(
+                date="2025-07-23",
+                type="Buy",
+                currency="USD",
+                symbol="SPY 450.00 USD CALL 2025-07-25",
+                quantity=2,
+                price=159500000,
+                total=32050,
+                fee=150,
+            ),
+        )
+
+    def test_parse_cash_rows(self):
+        """Test cash rows carry their payee, memo and signed total"""
+        contribution = parse_transaction(
+            "2025-07-16", "CONT", "Monthly", "1000.0", "CAD"
+        )
+        self.assertEqual(
+            (
+                contribution.type,
+                contribution.total,
+                contribution.payee,
+                contribution.memo,
+            ),
+            ("XIn", 100000, "Contribution", "Monthly"),
+        )
+
+        withdrawal = parse_transaction(
+            "2025-08-01", "TRFOUT", "Transfer out", "-200.00", "CAD"
+        )
+        self.assertEqual(
+            (withdrawal.type, withdrawal.total, withdrawal.payee),
+            (None, -20000, "Transfer out"),
+        )
+
+        self.assertIsNone(parse_transaction("2025-08-01", "LOAN", "Loan", "n/a", "CAD"))
+        with self.assertRaises(ValueError):
+            parse_transaction("2025-08-01", "BOGUS", "Unknown", "1.00", "CAD")
+
+    def test_render_matches_format_qif_entry(self):
+        """Test rendering a parsed row gives the entry of the fused entry point"""
+        rows = [
+            ("2025-07-01", "SELL", "SHOP - 0.7 shares", "100.00", "CAD"),
+            ("2025-07-02", "DIV", "TD - Dividend payment", "15.75", "CAD"),
+            ("2025-07-03", "NRT", "Withholding", "-5.25", "USD"),
+            ("2025-07-04", "EFTOUT", "Transfer", "-75.00", "USD"),
+            ("2025-07-05", "REFUND", "Refund", "45.00", "USD"),
+        ]
+        for row in rows:
+            self.assertEqual(
+                render_qif_entry(parse_transaction(*row)), format_qif_entry(*row)
+            )
+
+        transaction = parse_transaction(*rows[0])
+        self.assertEqual(
+            render_qif_entry(transaction),
+            "D07/01/2025\nNSell\nYSHOP-CT\nI142.857143\nQ0.7\nT100.00\nO0.00\nCc\n^",
+        )
+
+
+class TestFileTransactions(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+        self.file_path = os.path.join(
+            self.work_dir.name,
+            "monthly-statement-transactions-TXN123CAD-2025-07-31.csv",
+        )
+        with open(self.file_path, "w") as csv_file:
+            csv_file.write(CSV_CONTENT)
+
+    def tearDown(self):
+        self.work_dir.cleanup()
+
+    def test_one_parse_shared_by_consumers(self):
+        """Test parsed records can be filtered and rendered without reading the file again"""
+        transactions = list(iter_file_transactions(self.file_path))
+
+        self.assertEqual(len(transactions), 6)
+        trades = [
+            transaction for transaction in transactions if transaction.price is not None
+        ]
+        self.assertEqual(sum(trade.total for trade in trades), 150000 + 100000 + 32050)
+        self.assertEqual(
+            [
+                (transaction.currency, render_qif_entry(transaction))
+                for transaction in transactions
+            ],
+            list(iter_file_entries(self.file_path)),
+        )
+
+    def test_columnar_records_match_scalar(self):
+        """Test the columnar engine produces the same records as the scalar path"""
+        with open(self.file_path, "r") as csv_file:
+            columnar = list(iter_column_transactions(load_columns(csv_file)))
+
+        self.assertEqual(columnar, list(iter_file_transactions(self.file_path)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,303 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import yaml
+
+from app.main import configure_symbol_map, convert_csv_files
+from app.symbols import SymbolMap
+from app.watch import (
+    InotifyNotifier,
+    PollingNotifier,
+    StatementWatcher,
+    create_notifier,
+)
+from tests.helpers import StatementTestCase
+
+CSV_CONTENT = """date,transaction,description,amount,currency
+2025-07-01,BUY,AAPL - 10.0 shares,-1500.00,USD
+2025-07-02,CONT,Contribution,1000.0,CAD
+"""
+
+CONFIG = {
+    "WATCH1CAD-CAD": {"nickname": "Watch-One-CAD", "type": "Investment"},
+    "WATCH1CAD-USD": {"nickname": "Watch-One-USD", "type": "Investment"},
+    "WATCH2CAD-CAD": {"nickname": "Watch-Two-CAD", "type": "Investment"},
+    "WATCH2CAD-USD": {"nickname": "Watch-Two-USD", "type": "Investment"},
+}
+
+
+class FakeNotifier:
+    """Replays a scripted sequence of wait() results, then interrupts the watcher."""
+
+    def __init__(self, results):
+        self.results = list(results)
+        self.timeouts = []
+        self.closed = False
+
+    def wait(self, timeout):
+        self.timeouts.append(timeout)
+        if not self.results:
+            raise KeyboardInterrupt
+        return self.results.pop(0)
+
+    def close(self):
+        self.closed = True
+
+
+class TestStatementWatcher(StatementTestCase):
+    def setUp(self):
+        super().setUp()
+        self.config_path = os.path.join(self.work_dir, "accounts.yml")
+        self.write_config(CONFIG)
+
+        patcher = patch("app.watch.write_qif_files")
+        self.mock_write = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def write_config(self, config):
+        with open(self.config_path, "w") as file:
+            yaml.dump(config, file)
+
+    def written_accounts(self):
+        account_data, _ = self.mock_write.call_args[0]
+        return {name: len(qifs) for name, qifs in account_data.items()}
+
+    def test_refresh_reconverts_only_changed_accounts(self):
+        """Test a new statement only rewrites its own account"""
+        self.write_statement("WATCH1CAD", CSV_CONTENT)
+        self.write_statement("WATCH2CAD", CSV_CONTENT)
+        watcher = StatementWatcher(self.input_folder, self.config_path)
+
+        updated = watcher.refresh()
+        self.assertEqual(
+            updated,
+            {"WATCH1CAD-CAD", "WATCH1CAD-USD", "WATCH2CAD-CAD", "WATCH2CAD-USD"},
+        )
+
+        self.write_statement("WATCH2CAD", CSV_CONTENT, date="2025-08-01")
+        with patch(
+            "app.watch.convert_csv_files", wraps=convert_csv_files
+        ) as mock_convert:
+            updated = watcher.refresh()
+
+        converted_paths = mock_convert.call_args[0][0]
+        self.assertEqual(len(converted_paths), 1)
+        self.assertIn("2025-08-01", converted_paths[0])
+        self.assertEqual(updated, {"WATCH2CAD-CAD", "WATCH2CAD-USD"})
+        self.assertEqual(
+            self.written_accounts(), {"WATCH2CAD-CAD": 2, "WATCH2CAD-USD": 2}
+        )
+
+    def test_refresh_without_changes_writes_nothing(self):
+        """Test a refresh with no change does not rewrite any account"""
+        self.write_statement("WATCH1CAD", CSV_CONTENT)
+        watcher = StatementWatcher(self.input_folder, self.config_path)
+        watcher.refresh()
+        self.mock_write.reset_mock()
+
+        with patch("app.watch.convert_csv_files") as mock_convert:
+            self.assertEqual(watcher.refresh(), set())
+        # Nothing converted, so the cache and the QIF files are left alone
+        mock_convert.assert_not_called()
+        self.mock_write.assert_not_called()
+
+    def test_refresh_removed_statement(self):
+        """Test removing a statement rewrites its account from the remaining ones"""
+        self.write_statement("WATCH1CAD", CSV_CONTENT)
+        removed = self.write_statement("WATCH1CAD", CSV_CONTENT, date="2025-08-01")
+        watcher = StatementWatcher(self.input_folder, self.config_path)
+        watcher.refresh()
+
+        os.remove(removed)
+        watcher.refresh()
+
+        self.assertEqual(
+            self.written_accounts(), {"WATCH1CAD-CAD": 1, "WATCH1CAD-USD": 1}
+        )
+
+    def test_refresh_account_without_statements(self):
+        """Test the QIF files of an account whose statements are all gone are removed"""
+        cwd = os.getcwd()
+        os.chdir(self.work_dir)
+        self.addCleanup(os.chdir, cwd)
+        os.mkdir("output")
+        removed = self.write_statement("WATCH1CAD", CSV_CONTENT)
+        self.write_statement("WATCH2CAD", CSV_CONTENT)
+        watcher = StatementWatcher(self.input_folder, self.config_path)
+        watcher.refresh()
+        for nickname in ("Watch-One-CAD", "Watch-One-USD", "Watch-Two-CAD"):
+            with open(os.path.join("output", f"{nickname}.qif"), "w") as file:
+                file.write("!Type:Invst\n")
+
+        os.remove(removed)
+        with patch("builtins.print"):
+            updated = watcher.refresh()
+
+        self.assertEqual(updated, {"WATCH1CAD-CAD", "WATCH1CAD-USD"})
+        self.assertEqual(os.listdir("output"), ["Watch-Two-CAD.qif"])
+        self.assertEqual(self.written_accounts(), {})
+
+    def test_refresh_config_change_rewrites_every_account(self):
+        """Test a config change is picked up live and rewrites every account"""
+        self.write_statement("WATCH1CAD", CSV_CONTENT)
+        self.write_statement("WATCH2CAD", CSV_CONTENT)
+        watcher = StatementWatcher(self.input_folder, self.config_path)
+        watcher.refresh()
+
+        config = dict(CONFIG)
+        config["WATCH1CAD-CAD"] = {"nickname": "Renamed", "type": "Investment"}
+        self.write_config(config)
+        os.utime(self.config_path, ns=(0, 0))
+
+        self.assertEqual(len(watcher.refresh()), 4)
+        self.assertEqual(watcher.config["WATCH1CAD-CAD"]["nickname"], "Renamed")
+        self.assertEqual(self.mock_write.call_args[0][1], watcher.config)
+
+    def test_refresh_symbol_change_reconverts_every_statement(self):
+        """Test new symbol suffix rules in the config are applied to every statement"""
+        self.write_statement("WATCH1CAD", CSV_CONTENT.replace("AAPL", "GOOGL"))
+        watcher = StatementWatcher(self.input_folder, self.config_path)
+        self.addCleanup(configure_symbol_map, SymbolMap())
+        watcher.refresh()
+
+        config = dict(CONFIG)
+        config["symbols"] = {"CAD": {"QH": ["GOOGL"]}}
+        self.write_config(config)
+        os.utime(self.config_path, ns=(0, 0))
+        with patch(
+            "app.watch.convert_csv_files", wraps=convert_csv_files
+        ) as mock_convert:
+            watcher.refresh()
+
+        self.assertEqual(len(mock_convert.call_args[0][0]), 1)
+        account_data, _ = self.mock_write.call_args[0]
+        self.assertIn("YGOOGL-CT", account_data["WATCH1CAD-USD"][0])
+
+        config["symbols"] = {"USD": {"QH": ["GOOGL"]}}
+        self.write_config(config)
+        os.utime(self.config_path, ns=(1, 1))
+        watcher.refresh()
+
+        account_data, _ = self.mock_write.call_args[0]
+        self.assertIn("YGOOGL-QH", account_data["WATCH1CAD-USD"][0])
+
+    def test_run_debounces_bursts(self):
+        """Test a burst of changes results in a single refresh"""
+        watcher = StatementWatcher(self.input_folder, self.config_path)
+        # One change, then two more inside the debounce window, then quiet
+        notifier = FakeNotifier([True, True, True, False])
+
+        with patch.object(watcher, "refresh", return_value=set()) as mock_refresh:
+            with patch("builtins.print"):
+                watcher.run(debounce=0.5, notifier=notifier)
+
+        # Initial conversion plus one refresh for the whole burst
+        self.assertEqual(mock_refresh.call_count, 2)
+        self.assertEqual(notifier.timeouts, [None, 0.5, 0.5, 0.5, None])
+        self.assertTrue(notifier.closed)
+
+    def test_run_watches_new_folders(self):
+        """Test folders created in the input folder are watched before they are scanned"""
+        watcher = StatementWatcher(self.input_folder, self.config_path)
+        subfolder = os.path.join(self.input_folder, "2026")
+        notifiers = [FakeNotifier([True, False]), FakeNotifier([])]
+
+        def wait(timeout):
+            # The folder appears while the first notifier is waiting
+            os.makedirs(subfolder, exist_ok=True)
+            return FakeNotifier.wait(notifiers[0], timeout)
+
+        notifiers[0].wait = wait
+        with patch("app.watch.create_notifier", side_effect=notifiers) as mock_create:
+            with patch.object(watcher, "refresh", return_value=set()):
+                with patch("builtins.print"):
+                    watcher.run(debounce=0)
+
+        self.assertEqual(mock_create.call_count, 2)
+        self.assertEqual(mock_create.call_args_list[0][0][0], [self.input_folder])
+        self.assertEqual(
+            mock_create.call_args_list[1][0][0], [self.input_folder, subfolder]
+        )
+        self.assertEqual(mock_create.call_args[0][2], [self.config_path])
+        self.assertTrue(all(notifier.closed for notifier in notifiers))
+
+    def test_run_survives_failed_refresh(self):
+        """Test a failing refresh is reported and the watcher keeps running"""
+        watcher = StatementWatcher(self.input_folder, self.config_path)
+        notifier = FakeNotifier([True, False, True, False])
+
+        with patch.object(
+            watcher,
+            "refresh",
+            side_effect=[set(), ValueError("Unknown account"), {"A"}],
+        ) as mock_refresh:
+            with patch("builtins.print") as mock_print:
+                watcher.run(debounce=0, notifier=notifier)
+
+        self.assertEqual(mock_refresh.call_count, 3)
+        mock_print.assert_any_call("Conversion failed: Unknown account")
+
+
+class TestNotifiers(unittest.TestCase):
+    def setUp(self):
+        self.work_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.work_dir.cleanup()
+
+    def touch(self, filename):
+        with open(os.path.join(self.work_dir.name, filename), "w") as file:
+            file.write("x")
+
+    def test_polling_notifier(self):
+        """Test the polling fallback reports changes and timeouts"""
+        notifier = PollingNotifier([self.work_dir.name], interval=0.01)
+
+        self.assertFalse(notifier.wait(0.03))
+        self.touch("statement.csv")
+        self.assertTrue(notifier.wait(0.03))
+        self.assertFalse(notifier.wait(0.03))
+        notifier.close()
+
+    def test_polling_notifier_watches_single_files(self):
+        """Test watched files are stat'ed alone, ignoring their neighbours"""
+        self.touch("accounts.yml")
+        config_path = os.path.join(self.work_dir.name, "accounts.yml")
+        notifier = PollingNotifier([], interval=0.01, files=[config_path])
+
+        os.mkdir(os.path.join(self.work_dir.name, "output"))
+        self.touch("output/My-TFSA.qif")
+        self.assertFalse(notifier.wait(0.03))
+        os.utime(config_path, ns=(0, 0))
+        self.assertTrue(notifier.wait(0.03))
+        os.remove(config_path)
+        self.assertTrue(notifier.wait(0.03))
+
+    def test_inotify_notifier(self):
+        """Test the inotify notifier where the platform supports it"""
+        try:
+            notifier = InotifyNotifier([self.work_dir.name])
+        except OSError:
+            self.skipTest("inotify is not available")
+
+        try:
+            self.assertFalse(notifier.wait(0.01))
+            self.touch("statement.csv")
+            self.assertTrue(notifier.wait(1))
+            self.assertFalse(notifier.wait(0.01))
+        finally:
+            notifier.close()
+
+    def test_create_notifier_falls_back_to_polling(self):
+        """Test create_notifier uses polling when inotify cannot be set up"""
+        with patch("app.watch.InotifyNotifier", side_effect=OSError("no inotify")):
+            notifier = create_notifier([self.work_dir.name], poll_interval=0.5)
+
+        self.assertIsInstance(notifier, PollingNotifier)
+        self.assertEqual(notifier.interval, 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()